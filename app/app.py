@@ -5,8 +5,11 @@ from app.app_exception.app_exception import AppException
 from app.routes import (
     auth,
     bookings,
+    dashboard,
     employees,
     feedbacks,
+    housekeeping,
+    manifest,
     profile,
     rooms,
     service_request,
@@ -62,3 +65,6 @@ app.include_router(feedbacks.router)
 app.include_router(bookings.booking_router)
 app.include_router(rooms.room_router)
 app.include_router(profile.router)
+app.include_router(manifest.manifest_router)
+app.include_router(housekeeping.housekeeping_router)
+app.include_router(dashboard.dashboard_router)
@@ -0,0 +1,140 @@
+from bisect import bisect_right, insort
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.dtos.booking_response import AllocationPlanDTO, BookingMoveDTO
+from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import Room, RoomType
+
+SHORT_GAP_NIGHTS = 2
+
+
+def short_gaps(assignment: Dict[int, List[Tuple[date, date]]]) -> int:
+    # free runs of one or two nights squeezed between two stays cannot be sold
+    gaps = 0
+    for stays in assignment.values():
+        stays = sorted(stays)
+        for (_, prev_out), (next_in, _) in zip(stays, stays[1:]):
+            if 0 < (next_in - prev_out).days <= SHORT_GAP_NIGHTS:
+                gaps += 1
+    return gaps
+
+
+def _pick(ready: List[Tuple[date, int]], booking: Booking) -> Optional[int]:
+    # Prefer a room that frees up exactly on arrival, then the latest room that
+    # still leaves a sellable gap, and only then one that leaves a short gap.
+    latest = bisect_right(ready, (booking.check_in, float("inf"))) - 1
+    if latest < 0:
+        return None
+
+    idx = latest
+    if ready[latest][0] != booking.check_in:
+        roomy = bisect_right(
+            ready,
+            (booking.check_in - timedelta(days=SHORT_GAP_NIGHTS + 1), float("inf")),
+        )
+        if roomy > 0:
+            idx = roomy - 1
+
+    # among equally good rooms keep the current one to avoid needless moves
+    current = (ready[idx][0], booking.room_num)
+    pos = bisect_right(ready, current) - 1
+    if pos >= 0 and ready[pos] == current:
+        idx = pos
+    return idx
+
+
+def _best_fit(
+    rooms: List[Room], fixed: List[Booking], movable: List[Booking], today: date
+) -> Optional[Dict[str, Room]]:
+    # Greedy by check-in over rooms ordered by the day they become free.
+    # Processing stays by start time finds a placement whenever one exists,
+    # whichever free room each stay is given.
+    by_number = {room.number: room for room in rooms}
+    free_from: Dict[int, date] = {room.number: today for room in rooms}
+    for booking in fixed:
+        if booking.room_num in free_from:
+            free_from[booking.room_num] = max(
+                free_from[booking.room_num], booking.check_out
+            )
+
+    ready = sorted((day, number) for number, day in free_from.items())
+    placement: Dict[str, Room] = {}
+
+    for booking in sorted(movable, key=lambda b: (b.check_in, b.check_out, b.id)):
+        idx = _pick(ready, booking)
+        if idx is None:
+            return None
+
+        _, number = ready.pop(idx)
+        insort(ready, (booking.check_out, number))
+        placement[booking.id] = by_number[number]
+
+    return placement
+
+
+def plan_allocation(
+    rooms: List[Room], bookings: List[Booking], today: date
+) -> AllocationPlanDTO:
+    rooms_by_type: Dict[RoomType, List[Room]] = defaultdict(list)
+    for room in rooms:
+        if room.is_available:
+            rooms_by_type[room.type].append(room)
+    room_types = {room.number: room.type for room in rooms}
+
+    fixed: Dict[RoomType, List[Booking]] = defaultdict(list)
+    movable: Dict[RoomType, List[Booking]] = defaultdict(list)
+    before: Dict[int, List[Tuple[date, date]]] = defaultdict(list)
+    after: Dict[int, List[Tuple[date, date]]] = defaultdict(list)
+
+    for booking in bookings:
+        if booking.status != BookingStatus.Booking_Status_Booked:
+            continue
+        room_type = room_types.get(booking.room_num)
+        if room_type is None:
+            continue
+        before[booking.room_num].append((booking.check_in, booking.check_out))
+        # guests arriving today or earlier keep their room
+        if booking.check_in <= today:
+            fixed[room_type].append(booking)
+        else:
+            movable[room_type].append(booking)
+
+    moves: List[BookingMoveDTO] = []
+    for room_type, type_bookings in movable.items():
+        placement = _best_fit(
+            rooms_by_type[room_type], fixed[room_type], type_bookings, today
+        )
+        for booking in fixed[room_type]:
+            after[booking.room_num].append((booking.check_in, booking.check_out))
+
+        for booking in type_bookings:
+            # an infeasible type keeps its current layout
+            target = placement[booking.id] if placement else None
+            room_num = target.number if target else booking.room_num
+            after[room_num].append((booking.check_in, booking.check_out))
+
+            if target and target.number != booking.room_num:
+                moves.append(
+                    BookingMoveDTO(
+                        booking_id=booking.id,
+                        user_id=booking.user_id,
+                        check_in=booking.check_in,
+                        check_out=booking.check_out,
+                        from_room=booking.room_num,
+                        to_room=target.number,
+                        to_room_id=target.id,
+                    )
+                )
+
+    for room_type, type_bookings in fixed.items():
+        if room_type not in movable:
+            for booking in type_bookings:
+                after[booking.room_num].append((booking.check_in, booking.check_out))
+
+    return AllocationPlanDTO(
+        moves=moves,
+        short_gaps_before=short_gaps(before),
+        short_gaps_after=short_gaps(after),
+    )
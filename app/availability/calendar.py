@@ -0,0 +1,112 @@
+import base64
+from datetime import date
+from typing import List
+
+import numpy as np
+
+from app.dtos.room_response import (
+    CalendarEncoding,
+    RoomCalendarDTO,
+    RoomCalendarRowDTO,
+    RoomTypeOccupancyDTO,
+)
+from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import Room
+
+OCCUPYING_STATUSES = (
+    BookingStatus.Booking_Status_Booked,
+    BookingStatus.Booking_Status_Completed,
+)
+
+
+def occupancy_grid(
+    rooms: List[Room], bookings: List[Booking], start: date, end: date
+) -> np.ndarray:
+    # rooms x nights boolean matrix; each stay adds +1 at its first night and
+    # -1 after its last, so a cumulative sum along the nights fills every stay
+    days = (end - start).days
+    origin = start.toordinal()
+    row_of = {room.number: row for row, room in enumerate(rooms)}
+
+    rows: List[int] = []
+    first: List[int] = []
+    last: List[int] = []
+    for booking in bookings:
+        row = row_of.get(booking.room_num)
+        if row is None or booking.status not in OCCUPYING_STATUSES:
+            continue
+        rows.append(row)
+        first.append(booking.check_in.toordinal() - origin)
+        last.append(booking.check_out.toordinal() - origin)
+
+    width = days + 1
+    size = len(rooms) * width
+    row_base = np.array(rows, dtype=np.int64) * width
+    first_idx = row_base + np.clip(np.array(first, dtype=np.int64), 0, days)
+    last_idx = row_base + np.clip(np.array(last, dtype=np.int64), 0, days)
+    diff = np.bincount(first_idx, minlength=size) - np.bincount(
+        last_idx, minlength=size
+    )
+    diff = diff.reshape(len(rooms), width)
+
+    return np.cumsum(diff[:, :days], axis=1) > 0
+
+
+def run_lengths(grid: np.ndarray) -> List[List[List[int]]]:
+    # [[first_night, nights], ...] per room for every occupied run
+    padded = np.zeros((grid.shape[0], grid.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = grid
+    edges = np.diff(padded, axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+
+    runs: List[List[List[int]]] = [[] for _ in range(grid.shape[0])]
+    for row, first, end in zip(
+        start_rows.tolist(), start_cols.tolist(), end_cols.tolist()
+    ):
+        runs[row].append([first, end - first])
+    return runs
+
+
+def bitsets(grid: np.ndarray) -> List[str]:
+    # one bit per night, first night in the most significant bit, base64 encoded
+    packed = np.packbits(grid, axis=1)
+    return [base64.b64encode(row.tobytes()).decode("ascii") for row in packed]
+
+
+def build_calendar(
+    rooms: List[Room],
+    bookings: List[Booking],
+    start: date,
+    end: date,
+    encoding: CalendarEncoding = "rle",
+) -> RoomCalendarDTO:
+    rooms = sorted(rooms, key=lambda room: room.number)
+    grid = occupancy_grid(rooms, bookings, start, end)
+    encoded = run_lengths(grid) if encoding == "rle" else bitsets(grid)
+
+    room_types = np.array([room.type.value for room in rooms])
+    totals: List[RoomTypeOccupancyDTO] = []
+    for room_type in dict.fromkeys(room_types.tolist()):
+        mask = room_types == room_type
+        totals.append(
+            RoomTypeOccupancyDTO(
+                type=room_type,
+                rooms=int(mask.sum()),
+                occupied=grid[mask].sum(axis=0).tolist(),
+            )
+        )
+
+    return RoomCalendarDTO(
+        start=start,
+        end=end,
+        encoding=encoding,
+        # rows are built from already validated rooms and plain lists
+        rooms=[
+            RoomCalendarRowDTO.model_construct(
+                number=room.number, type=room.type, occupancy=row
+            )
+            for room, row in zip(rooms, encoded)
+        ],
+        totals=totals,
+    )
@@ -0,0 +1,243 @@
+import threading
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import Room, RoomType
+
+IndexLoader = Callable[[], Tuple[List[Room], List[Booking]]]
+
+
+def table_loader(ddb_resource, table_name: str, hotel_id: str) -> IndexLoader:
+    # repositories import this module for nights(), so they are resolved lazily
+    from app.repository.booking_repository import BookingRepository
+    from app.repository.room_repository import RoomRepository
+
+    room_repo = RoomRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    booking_repo = BookingRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+
+    def load() -> Tuple[List[Room], List[Booking]]:
+        return room_repo.get_all_rooms(), booking_repo.get_active_bookings(date.today())
+
+    return load
+
+
+def nights(check_in: date, check_out: date) -> Iterator[date]:
+    night = check_in
+    while night < check_out:
+        yield night
+        night += timedelta(days=1)
+
+
+class RoomAvailabilityIndex:
+    # Every room owns one bit; each night maps to an int whose set bits are the
+    # rooms occupied that night. A stay query ORs the masks of its nights, so
+    # the cost depends on the stay length rather than on the number of rooms.
+    def __init__(self, loader: IndexLoader, max_age_seconds: float = 60.0) -> None:
+        self._loader = loader
+        self._max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rooms: Dict[int, Room] = {}
+        self._slots: Dict[int, int] = {}
+        self._slot_rooms: List[Optional[int]] = []
+        self._sellable_mask = 0
+        self._type_masks: Dict[RoomType, int] = {}
+        self._occupied: Dict[date, int] = {}
+        self._bookings: Dict[str, Tuple[int, date, date]] = {}
+        self._holds: Dict[Tuple[int, str], Tuple[date, date, float]] = {}
+
+    def rebuild(self, rooms: List[Room], bookings: List[Booking]) -> None:
+        with self._lock:
+            # holds only live here and in the night items, so keep them
+            holds = self._holds
+            self._reset()
+            self._holds = holds
+            for room in rooms:
+                self.add_room(room)
+            for booking in bookings:
+                self.add_booking(booking)
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_fresh(self) -> None:
+        if (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self._max_age_seconds
+        ):
+            self.rebuild(*self._loader())
+
+    def add_room(self, room: Room) -> None:
+        with self._lock:
+            if room.number in self._rooms:
+                self._clear_room_masks(self._rooms[room.number])
+            if room.number not in self._slots:
+                self._slots[room.number] = len(self._slot_rooms)
+                self._slot_rooms.append(room.number)
+            self._rooms[room.number] = room
+
+            bit = 1 << self._slots[room.number]
+            self._type_masks[room.type] = self._type_masks.get(room.type, 0) | bit
+            if room.is_available:
+                self._sellable_mask |= bit
+
+    def _clear_room_masks(self, room: Room) -> None:
+        bit = 1 << self._slots[room.number]
+        self._sellable_mask &= ~bit
+        self._type_masks[room.type] = self._type_masks.get(room.type, 0) & ~bit
+
+    def remove_room(self, room_number: int) -> None:
+        with self._lock:
+            room = self._rooms.get(room_number)
+            if room is not None:
+                self._clear_room_masks(room)
+            slot = self._slots.pop(room_number, None)
+            self._rooms.pop(room_number, None)
+            self._bookings = {
+                booking_id: entry
+                for booking_id, entry in self._bookings.items()
+                if entry[0] != room_number
+            }
+            if slot is not None:
+                self._slot_rooms[slot] = None
+                bit = 1 << slot
+                for night, mask in self._occupied.items():
+                    self._occupied[night] = mask & ~bit
+
+    def add_hold(
+        self,
+        room_number: int,
+        check_in: date,
+        check_out: date,
+        user_id: str,
+        expires_at: float,
+    ) -> None:
+        with self._lock:
+            self._holds[(room_number, user_id)] = (check_in, check_out, expires_at)
+
+    def _held_mask(
+        self, check_in: date, check_out: date, user_id: Optional[str]
+    ) -> int:
+        # holds are few and short-lived; lapsed ones are dropped as they are seen
+        now = time.time()
+        mask = 0
+        for (room_number, held_by), hold in list(self._holds.items()):
+            held_in, held_out, expires_at = hold
+            if expires_at <= now or room_number not in self._slots:
+                del self._holds[(room_number, held_by)]
+            elif held_by != user_id and held_in < check_out and check_in < held_out:
+                mask |= 1 << self._slots[room_number]
+        return mask
+
+    def add_booking(self, booking: Booking) -> None:
+        if booking.status != BookingStatus.Booking_Status_Booked:
+            return
+        with self._lock:
+            self._holds.pop((booking.room_num, booking.user_id), None)
+            slot = self._slots.get(booking.room_num)
+            if slot is None:
+                return
+            bit = 1 << slot
+            for night in nights(booking.check_in, booking.check_out):
+                self._occupied[night] = self._occupied.get(night, 0) | bit
+            self._bookings[booking.id] = (
+                booking.room_num,
+                booking.check_in,
+                booking.check_out,
+            )
+
+    def remove_booking(self, booking_id: str) -> None:
+        with self._lock:
+            entry = self._bookings.pop(booking_id, None)
+            if entry is None:
+                return
+            room_number, check_in, check_out = entry
+            slot = self._slots.get(room_number)
+            if slot is None:
+                return
+            bit = 1 << slot
+            for night in nights(check_in, check_out):
+                mask = self._occupied.get(night, 0) & ~bit
+                if mask:
+                    self._occupied[night] = mask
+                else:
+                    self._occupied.pop(night, None)
+
+    def _occupied_mask(self, check_in: date, check_out: date) -> int:
+        mask = 0
+        for night in nights(check_in, check_out):
+            mask |= self._occupied.get(night, 0)
+        return mask
+
+    def is_free(
+        self,
+        room_number: int,
+        check_in: date,
+        check_out: date,
+        user_id: Optional[str] = None,
+    ) -> bool:
+        with self._lock:
+            self._ensure_fresh()
+            slot = self._slots.get(room_number)
+            if slot is None:
+                return False
+            taken = self._occupied_mask(check_in, check_out) | self._held_mask(
+                check_in, check_out, user_id
+            )
+            return not (taken >> slot) & 1
+
+    def free_rooms(
+        self,
+        check_in: date,
+        check_out: date,
+        room_type: Optional[RoomType] = None,
+        user_id: Optional[str] = None,
+    ) -> List[Room]:
+        with self._lock:
+            self._ensure_fresh()
+            candidates = self._sellable_mask
+            if room_type is not None:
+                candidates &= self._type_masks.get(room_type, 0)
+            taken = self._occupied_mask(check_in, check_out) | self._held_mask(
+                check_in, check_out, user_id
+            )
+            free_mask = candidates & ~taken
+
+            free: List[Room] = []
+            while free_mask:
+                low_bit = free_mask & -free_mask
+                free_mask ^= low_bit
+                room_number = self._slot_rooms[low_bit.bit_length() - 1]
+                free.append(self._rooms[room_number])
+            return free
+
+    def get_room(self, room_number: int) -> Optional[Room]:
+        with self._lock:
+            self._ensure_fresh()
+            return self._rooms.get(room_number)
+
+    def capacity(self, room_type: RoomType) -> int:
+        with self._lock:
+            self._ensure_fresh()
+            return (
+                self._sellable_mask & self._type_masks.get(room_type, 0)
+            ).bit_count()
+
+    def has_bookings_from(self, room_number: int, from_date: date) -> bool:
+        with self._lock:
+            self._ensure_fresh()
+            return any(
+                booked_room == room_number and check_out > from_date
+                for booked_room, _, check_out in self._bookings.values()
+            )
@@ -0,0 +1,48 @@
+import threading
+import time
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+CACHE_TTL_SECONDS = 5.0
+
+CounterLoader = Callable[[date], Dict[str, int]]
+
+
+def table_loader(ddb_resource, table_name: str, hotel_id: str) -> CounterLoader:
+    from app.repository.counter_repository import CounterRepository
+
+    repo = CounterRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    return repo.read_counters
+
+
+class CounterCache:
+    # Dashboards poll; every poll within the TTL shares one summed read. The
+    # lock is held while loading so a burst of polls costs a single read.
+    def __init__(
+        self,
+        loader: CounterLoader,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entry: Optional[Tuple[date, float, Dict[str, int]]] = None
+
+    def get(self, day: date) -> Dict[str, int]:
+        with self._lock:
+            if self._entry is not None:
+                loaded_day, loaded_at, counters = self._entry
+                if loaded_day == day and self._clock() - loaded_at < self._ttl_seconds:
+                    return counters
+
+            counters = self._loader(day)
+            self._entry = (day, self._clock(), counters)
+            return counters
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
@@ -1,12 +1,19 @@
 from contextlib import asynccontextmanager
 import os
+import threading
 from typing import Callable
 
 import boto3
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 
 from app.utils import jwt
+from app.utils.tenancy import (
+    HOTEL_ID_PATTERN,
+    configured_hotel_ids,
+    default_hotel_id,
+    is_known_hotel_id,
+)
 
 
 @asynccontextmanager
@@ -20,8 +27,32 @@ async def lifespan(app: FastAPI):
     app.state.ddb_resource = ddb_resource
     app.state.table_name = str(os.getenv("table_name"))
     app.state.queue_url = str(os.getenv("queue_url"))
+
+    app.state.availability_indexes = {}
+    app.state.availability_lock = threading.Lock()
+
+    app.state.assignment_brokers = {}
+    app.state.assignment_lock = threading.Lock()
+
+    app.state.staff_presences = {}
+    app.state.presence_lock = threading.Lock()
+
+    app.state.counter_caches = {}
+    app.state.counter_lock = threading.Lock()
+
+    app.state.sla_schedulers = {}
+    app.state.sla_lock = threading.Lock()
+    # start the deadline workers now so overdue requests fire without traffic
+    for hotel_id in configured_hotel_ids():
+        _sla_scheduler(app, hotel_id)
     yield
 
+    for scheduler in app.state.sla_schedulers.values():
+        scheduler.stop()
+    # the presence workers write any availability still pending as they stop
+    for presence in app.state.staff_presences.values():
+        presence.stop()
+
 
 def get_token(request: Request) -> str:
     auth = request.headers.get("Authorization")
@@ -59,6 +90,111 @@ def get_table_name(req: Request):
     return req.app.state.table_name
 
 
+def get_hotel_id(request: Request) -> str:
+    # signed-in callers carry their property in the token; signup and login
+    # name it with a header
+    auth = request.headers.get("Authorization")
+    if auth and auth.startswith("Bearer "):
+        hotel_id = jwt.verify_jwt(auth.split(" ")[1]).get("hotel_id")
+    else:
+        hotel_id = request.headers.get("X-Hotel-Id")
+    hotel_id = hotel_id or default_hotel_id()
+
+    # checked before any per-hotel index or worker is created for it
+    if not HOTEL_ID_PATTERN.fullmatch(hotel_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid hotel id"
+        )
+    if not is_known_hotel_id(hotel_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Hotel not found"
+        )
+    return hotel_id
+
+
+def get_availability_index(req: Request, hotel_id: str = Depends(get_hotel_id)):
+    from app.availability.room_availability_index import (
+        RoomAvailabilityIndex,
+        table_loader,
+    )
+
+    # one index per property, created on its first request
+    indexes = req.app.state.availability_indexes
+    with req.app.state.availability_lock:
+        if hotel_id not in indexes:
+            indexes[hotel_id] = RoomAvailabilityIndex(
+                table_loader(
+                    req.app.state.ddb_resource, req.app.state.table_name, hotel_id
+                )
+            )
+        return indexes[hotel_id]
+
+
+def _sla_scheduler(app: FastAPI, hotel_id: str):
+    from app.scheduling.sla_scheduler import (
+        SlaScheduler,
+        alert_escalation,
+        table_source,
+    )
+
+    schedulers = app.state.sla_schedulers
+    with app.state.sla_lock:
+        if hotel_id not in schedulers:
+            schedulers[hotel_id] = SlaScheduler(
+                *table_source(app.state.ddb_resource, app.state.table_name, hotel_id),
+                alert_escalation(hotel_id),
+            )
+            schedulers[hotel_id].start()
+        return schedulers[hotel_id]
+
+
+def get_sla_scheduler(req: Request, hotel_id: str = Depends(get_hotel_id)):
+    return _sla_scheduler(req.app, hotel_id)
+
+
+def get_staff_presence(req: Request, hotel_id: str = Depends(get_hotel_id)):
+    from app.presence.staff_presence import StaffPresence, table_source
+
+    presences = req.app.state.staff_presences
+    with req.app.state.presence_lock:
+        if hotel_id not in presences:
+            presences[hotel_id] = StaffPresence(
+                *table_source(
+                    req.app.state.ddb_resource, req.app.state.table_name, hotel_id
+                )
+            )
+            presences[hotel_id].start()
+        return presences[hotel_id]
+
+
+def get_counter_cache(req: Request, hotel_id: str = Depends(get_hotel_id)):
+    from app.counters.counter_cache import CounterCache, table_loader
+
+    caches = req.app.state.counter_caches
+    with req.app.state.counter_lock:
+        if hotel_id not in caches:
+            caches[hotel_id] = CounterCache(
+                table_loader(
+                    req.app.state.ddb_resource, req.app.state.table_name, hotel_id
+                )
+            )
+        return caches[hotel_id]
+
+
+def get_assignment_broker(req: Request, hotel_id: str = Depends(get_hotel_id)):
+    from app.streaming.assignment_broker import AssignmentBroker
+
+    brokers = req.app.state.assignment_brokers
+    with req.app.state.assignment_lock:
+        if hotel_id not in brokers:
+            brokers[hotel_id] = AssignmentBroker()
+        return brokers[hotel_id]
+
+
 def get_queue_url():
     queue_url = os.getenv("queue_url")
     return queue_url
+
+
+def get_alert_queue_url():
+    return os.getenv("alert_queue_url")
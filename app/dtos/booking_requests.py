@@ -1,9 +1,15 @@
+from typing import List
+
 from pydantic import BaseModel, Field, field_validator
 from datetime import date
 
+from app.models.rooms import RoomType
 
-class CreateBookingRequest(BaseModel):
-    room_number: int = Field(..., gt=0)
+MAX_STAY_NIGHTS = 30
+MAX_GROUP_ROOMS = 30
+
+
+class StayDatesRequest(BaseModel):
     check_in_date: date
     check_out_date: date
 
@@ -25,4 +31,28 @@ class CreateBookingRequest(BaseModel):
         if check_out_date <= check_in_date:
             raise ValueError("check_out_date must be after check_in_date")
 
+        if (check_out_date - check_in_date).days > MAX_STAY_NIGHTS:
+            raise ValueError(f"stay cannot exceed {MAX_STAY_NIGHTS} nights")
+
         return check_out_date
+
+
+class CreateBookingRequest(StayDatesRequest):
+    room_number: int = Field(..., gt=0)
+
+
+class CreateBookingByTypeRequest(StayDatesRequest):
+    room_type: RoomType
+
+
+class CreateGroupBookingRequest(StayDatesRequest):
+    room_numbers: List[int] = Field(..., min_length=2, max_length=MAX_GROUP_ROOMS)
+
+    @field_validator("room_numbers")
+    @classmethod
+    def unique_positive_rooms(cls, room_numbers: List[int]):
+        if any(number <= 0 for number in room_numbers):
+            raise ValueError("room numbers must be positive")
+        if len(set(room_numbers)) != len(room_numbers):
+            raise ValueError("room numbers must be unique")
+        return room_numbers
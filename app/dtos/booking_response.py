@@ -0,0 +1,37 @@
+from datetime import date
+from typing import List
+
+from pydantic import BaseModel
+
+
+class BookingMoveDTO(BaseModel):
+    booking_id: str
+    user_id: str
+    check_in: date
+    check_out: date
+    from_room: int
+    to_room: int
+    to_room_id: str
+
+
+class AllocationPlanDTO(BaseModel):
+    moves: List[BookingMoveDTO]
+    short_gaps_before: int
+    short_gaps_after: int
+    applied: bool = False
+    # moves left in place because their group does not fit one transaction
+    skipped: List[BookingMoveDTO] = []
+
+
+class FolioDTO(BaseModel):
+    booking_id: str
+    user_id: str
+    room_num: int
+    check_in: date
+    check_out: date
+    nights: int
+    room_rate: int
+    room_charges: int
+    service_charges: int
+    service_count: int
+    total: int
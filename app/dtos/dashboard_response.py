@@ -0,0 +1,15 @@
+from datetime import date
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from app.models.service_request import ServiceType
+
+
+class DashboardCountersDTO(BaseModel):
+    day: date
+    rooms_available: int
+    pending_requests: Dict[ServiceType, int]
+    bookings_today: int
+    ratings: int
+    average_rating: Optional[float] = None
@@ -12,3 +12,7 @@ class CreateEmployeeRequest(BaseModel):
 
 class UpdateEmployeeRequest(BaseModel):
     available: bool = Field(..., description="Employee availability status")
+
+
+class HeartbeatRequest(BaseModel):
+    available: bool = Field(True, description="Whether the employee can take work")
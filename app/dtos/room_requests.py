@@ -1,8 +1,11 @@
 from typing import Optional
 from typing_extensions import Annotated
 from pydantic import BaseModel, Field
+from app.dtos.booking_requests import StayDatesRequest
 from app.models.rooms import RoomType
 
+MAX_HOLD_MINUTES = 15
+
 
 class AddRoomRequest(BaseModel):
     number: Annotated[int, Field(gt=0, description="Room number must be positive")]
@@ -16,3 +19,7 @@ class UpdateRoomRequest(BaseModel):
     price: Optional[int] = Field(None, gt=0)
     is_available: Optional[bool] = None
     description: Optional[str] = None
+
+
+class HoldRoomRequest(StayDatesRequest):
+    minutes: int = Field(10, ge=1, le=MAX_HOLD_MINUTES)
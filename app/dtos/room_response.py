@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from typing import List, Literal, Union
+
+from pydantic import BaseModel
+
+from app.models.rooms import RoomType
+
+CalendarEncoding = Literal["rle", "bitset"]
+
+
+class RoomCalendarRowDTO(BaseModel):
+    number: int
+    type: RoomType
+    # "rle": [[first_night, nights], ...]; "bitset": base64, one bit per night
+    occupancy: Union[List[List[int]], str]
+
+
+class RoomTypeOccupancyDTO(BaseModel):
+    type: RoomType
+    rooms: int
+    occupied: List[int]
+
+
+class RoomCalendarDTO(BaseModel):
+    start: date
+    end: date
+    encoding: CalendarEncoding
+    rooms: List[RoomCalendarRowDTO]
+    totals: List[RoomTypeOccupancyDTO]
+
+
+class RoomHoldDTO(BaseModel):
+    room_number: int
+    check_in: date
+    check_out: date
+    held_by: str
+    expires_at: datetime
@@ -1,5 +1,9 @@
+from typing import Annotated, Dict, List
+
 from pydantic import BaseModel, Field
-from app.models.service_request import ServiceStatus, ServiceType
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+
+BULK_UPDATE_LIMIT = 200
 
 
 class CreateServiceRequest(BaseModel):
@@ -29,6 +33,29 @@ class assign_service_request_dto(BaseModel):
     employee_id: str
 
 
+class ServiceRequestAssignment(BaseModel):
+    service_request_id: str = Field(..., min_length=1)
+    employee_id: str = Field(..., min_length=1)
+
+
+class BulkAssignServiceRequests(BaseModel):
+    assignments: List[ServiceRequestAssignment] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_UPDATE_LIMIT,
+        description="Service requests and the employee each one goes to",
+    )
+
+
+class ServiceRequestAssignmentFailure(ServiceRequestAssignment):
+    message: str
+
+
+class BulkAssignmentResult(BaseModel):
+    assigned: List[ServiceRequestAssignment]
+    failed: List[ServiceRequestAssignmentFailure]
+
+
 class AssignedPendingServiceRequestDTO(BaseModel):
     service_request_id: str = Field(..., description="Service request ID")
     user_id: str = Field(..., description="Customer user ID")
@@ -41,3 +68,40 @@ class AssignedPendingServiceRequestDTO(BaseModel):
 
 class UpdateServiceRequestStatus(BaseModel):
     status: ServiceStatus
+    charge: int = Field(
+        0,
+        ge=0,
+        description="Amount billed to the booking's folio",
+        examples=[350],
+    )
+
+
+class BulkUpdateServiceRequestStatus(BaseModel):
+    service_request_ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_UPDATE_LIMIT,
+        description="Service requests to move to the new status",
+        examples=[["sr-1", "sr-2"]],
+    )
+    status: ServiceStatus
+    charges: Dict[str, Annotated[int, Field(ge=0)]] = Field(
+        default_factory=dict,
+        description="Amount billed to the booking's folio, by service request ID",
+        examples=[{"sr-1": 350}],
+    )
+
+
+class ServiceRequestUpdateFailure(BaseModel):
+    service_request_id: str
+    message: str
+
+
+class BulkServiceRequestStatusResult(BaseModel):
+    updated: List[str]
+    failed: List[ServiceRequestUpdateFailure]
+
+
+class ServiceRequestChangesDTO(BaseModel):
+    changes: List[ServiceRequest]
+    cursor: str = Field(..., description="Pass as `since` on the next poll")
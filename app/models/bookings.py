@@ -1,7 +1,10 @@
 from datetime import date
+from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 from enum import Enum
 
+from app.models.rooms import RoomType
+
 
 class BookingStatus(str, Enum):
     Booking_Status_Booked = "Booked"
@@ -15,6 +18,9 @@ class Booking(BaseModel):
     room_id: str = Field(..., min_length=1)
 
     room_num: int = Field(..., ge=1)
+    room_type: Optional[RoomType] = None
+    room_rate: Optional[int] = None
+    group_id: Optional[str] = None
 
     check_in: date
     check_out: date
@@ -25,3 +31,20 @@ class Booking(BaseModel):
     clean_req: bool
 
     model_config = ConfigDict(extra="ignore")
+
+
+class Folio(BaseModel):
+    booking_id: str = Field(..., min_length=1)
+    user_id: str = Field(..., min_length=1)
+    room_num: int = Field(..., ge=1)
+
+    check_in: date
+    check_out: date
+
+    nights: int = 0
+    room_rate: int = 0
+    room_charges: int = 0
+    service_charges: int = 0
+    service_count: int = 0
+
+    model_config = ConfigDict(extra="ignore")
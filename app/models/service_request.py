@@ -30,4 +30,7 @@ class ServiceRequest(BaseModel):
 
     details: str = Field(..., min_length=1)
 
+    change_id: Optional[str] = None
+    charge: Optional[int] = None
+
     model_config = ConfigDict(extra="ignore")
@@ -0,0 +1,183 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import status
+
+from app.app_exception.app_exception import AppException
+from app.models import users
+
+PRESENCE_TTL_SECONDS = 90.0
+FLUSH_INTERVAL_SECONDS = 5.0
+# availability writes per flush, so a burst of toggles is spread out
+FLUSH_WRITE_LIMIT = 25
+
+PresenceLoader = Callable[[], List[users.User]]
+PresenceWriter = Callable[[str, users.Role, bool], None]
+
+
+def table_source(
+    ddb_resource, table_name: str, hotel_id: str
+) -> Tuple[PresenceLoader, PresenceWriter]:
+    from app.repository.employee_repository import EmployeeRepository
+
+    repo = EmployeeRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    return repo.get_employees, repo.write_availability
+
+
+class StaffPresence:
+    # Heartbeats only touch dicts under a lock. A worker thread writes the
+    # latest availability of each employee whose stored flag differs, at most
+    # FLUSH_WRITE_LIMIT per interval, so repeated toggles coalesce into one
+    # write and the stored flag trails memory by about ttl + interval.
+    # Other instances write the same flag, so an employee still heartbeating
+    # here is also rewritten once their last write is older than the ttl, and
+    # one whose heartbeats lapsed is written unavailable once and forgotten.
+    def __init__(
+        self,
+        loader: PresenceLoader,
+        writer: PresenceWriter,
+        ttl_seconds: float = PRESENCE_TTL_SECONDS,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        write_limit: int = FLUSH_WRITE_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loader = loader
+        self._writer = writer
+        self._ttl_seconds = ttl_seconds
+        self._flush_interval = flush_interval
+        self._write_limit = write_limit
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._last_seen: Dict[str, float] = {}
+        self._live: Dict[str, bool] = {}
+        self._roles: Dict[str, users.Role] = {}
+        self._stored: Dict[str, bool] = {}
+        self._written_at: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def load(self, employees: List[users.User]) -> None:
+        with self._condition:
+            now = self._clock()
+            for employee in employees:
+                if employee.id not in self._stored:
+                    self._stored[employee.id] = employee.available
+                    self._written_at[employee.id] = now
+
+    def heartbeat(
+        self, employee_id: str, role: users.Role, available: bool = True
+    ) -> None:
+        with self._condition:
+            self._last_seen[employee_id] = self._clock()
+            self._live[employee_id] = available
+            self._roles[employee_id] = role
+
+    def record(self, employee_id: str, available: bool) -> None:
+        # an availability written directly wins over the last heartbeat
+        with self._condition:
+            self._stored[employee_id] = available
+            self._written_at[employee_id] = self._clock()
+            if employee_id in self._live:
+                self._live[employee_id] = available
+
+    def forget(self, employee_id: str) -> None:
+        with self._condition:
+            self._last_seen.pop(employee_id, None)
+            self._live.pop(employee_id, None)
+            self._roles.pop(employee_id, None)
+            self._stored.pop(employee_id, None)
+            self._written_at.pop(employee_id, None)
+
+    def _desired(self, employee_id: str, now: float) -> bool:
+        if now - self._last_seen[employee_id] > self._ttl_seconds:
+            return False
+        return self._live[employee_id]
+
+    def is_available(self, employee: users.User) -> bool:
+        with self._condition:
+            if employee.id not in self._last_seen:
+                # never heard from here; the stored flag is all there is
+                return employee.available
+            return self._desired(employee.id, self._clock())
+
+    def overlay(self, employees: List[users.User]) -> List[users.User]:
+        return [
+            employee.model_copy(update={"available": self.is_available(employee)})
+            for employee in employees
+        ]
+
+    def _needs_write(self, employee_id: str, now: float) -> bool:
+        if self._stored.get(employee_id) != self._desired(employee_id, now):
+            return True
+        if now - self._last_seen[employee_id] > self._ttl_seconds:
+            return False
+        written_at = self._written_at.get(employee_id)
+        return written_at is None or now - written_at > self._ttl_seconds
+
+    def flush(self) -> int:
+        pending: List[Tuple[str, users.Role, bool]] = []
+        with self._condition:
+            now = self._clock()
+            for employee_id in list(self._last_seen):
+                if self._needs_write(employee_id, now):
+                    desired = self._desired(employee_id, now)
+                    pending.append((employee_id, self._roles[employee_id], desired))
+                    if len(pending) == self._write_limit:
+                        break
+                elif now - self._last_seen[employee_id] > self._ttl_seconds:
+                    # written unavailable already; whichever instance hears
+                    # from them next owns the stored flag
+                    self.forget(employee_id)
+
+        written = 0
+        for employee_id, role, available in pending:
+            try:
+                self._writer(employee_id, role, available)
+            except AppException as e:
+                if e.status_code == status.HTTP_404_NOT_FOUND:
+                    self.forget(employee_id)
+                # anything else is retried on the next flush
+                continue
+            with self._condition:
+                self._stored[employee_id] = available
+                self._written_at[employee_id] = self._clock()
+            written += 1
+        return written
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._last_seen)
+
+    def _run(self) -> None:
+        try:
+            self.load(self._loader())
+        except Exception:
+            # the first heartbeat of each employee then costs one write
+            pass
+
+        while True:
+            with self._condition:
+                if not self._stopped:
+                    self._condition.wait(self._flush_interval)
+                stopped = self._stopped
+            try:
+                self.flush()
+            except Exception:
+                pass
+            if stopped:
+                return
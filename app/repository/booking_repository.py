@@ -1,47 +1,394 @@
+import time
 from datetime import date
-from typing import Any, Dict, List
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
 from boto3.dynamodb.conditions import Attr, Key
 from botocore.utils import ClientError
 from fastapi import Depends, status
 from app.app_exception.app_exception import AppException
-from app.dependencies import get_ddb_resource, get_table_name
+from app.availability.room_availability_index import nights
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
+from app.dtos.booking_response import BookingMoveDTO
 from app.models import bookings
+from app.repository.counter_repository import ARRIVALS, counter_updates
+from app.utils.tenancy import hotel_key
+
+ACTIVE_BOOKING_INDEX = "ActiveBookingIndex"
+ARRIVALS_INDEX = "ArrivalsIndex"
+DEPARTURES_INDEX = "DeparturesIndex"
+NIGHT_TAKEN_MESSAGE = "Room already booked for the selected dates"
+SOLD_OUT_MESSAGE = "No rooms of this type left for the selected dates"
+HELD_MESSAGE = "Room is held or booked for the selected dates"
+TRANSACTION_ITEM_LIMIT = 100
+GROUP_HOLD_SECONDS = 300
+HOLD_ATTEMPTS = 3
+MAX_ACTIVE_HOLDS = 3
+# renewals keep a room held by one user for at most this long in total
+MAX_HELD_SECONDS = 30 * 60
+TOO_MANY_HOLDS_MESSAGE = f"Cannot hold more than {MAX_ACTIVE_HOLDS} rooms at once"
+HELD_TOO_LONG_MESSAGE = "Room has been held too long; book it or let the hold lapse"
+
+# a night can be claimed if it is free, held by the same user or its hold lapsed
+CLAIMABLE_NIGHT = (
+    "attribute_not_exists(pk) OR (attribute_not_exists(booking_id)"
+    " AND (held_by = :user_id OR hold_expires_at < :now))"
+)
+
+
+def folio_key(hotel_id: str, booking_id: str) -> Dict[str, str]:
+    return {"pk": hotel_key(hotel_id, f"Booking#{booking_id}"), "sk": "FOLIO"}
+
+
+def request_flag_resets(
+    table_name: str, hotel_id: str, user_id: str, booking_id: str, flags: List[str]
+) -> List[Dict[str, Any]]:
+    # both copies of the booking carry the food_req / clean_req flags
+    update = {
+        "TableName": table_name,
+        "UpdateExpression": "SET " + ", ".join(f"{flag} = :false" for flag in flags),
+        "ConditionExpression": "attribute_exists(pk)",
+        "ExpressionAttributeValues": {":false": False},
+    }
+    return [
+        {
+            "Update": {
+                **update,
+                "Key": {
+                    "pk": hotel_key(hotel_id, f"User#{user_id}"),
+                    "sk": f"booking#{booking_id}",
+                },
+            }
+        },
+        {
+            "Update": {
+                **update,
+                "Key": {
+                    "pk": hotel_key(hotel_id, f"Booking#{booking_id}"),
+                    "sk": "META",
+                },
+            }
+        },
+    ]
 
 
 class BookingRepository:
     def __init__(
-        self, ddb_resource=Depends(get_ddb_resource), table_name=Depends(get_table_name)
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
     ):
         self.table = ddb_resource.Table(table_name)
         self.table_name = table_name
+        self.hotel_id = hotel_id
         self.ddb_client = ddb_resource.meta.client
 
-    def save_booking(self, booking: bookings.Booking):
+    def _pk(self, key: str) -> str:
+        return hotel_key(self.hotel_id, key)
+
+    def night_key(self, room_num: int, night: date) -> Dict[str, str]:
+        return {"pk": self._pk(f"Room#{room_num}"), "sk": f"Night#{night.isoformat()}"}
+
+    def _night_puts(self, booking: bookings.Booking) -> List[Dict[str, Any]]:
+        return [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": {
+                        **self.night_key(booking.room_num, night),
+                        "booking_id": booking.id,
+                        "user_id": booking.user_id,
+                        **({"group_id": booking.group_id} if booking.group_id else {}),
+                    },
+                    "ConditionExpression": CLAIMABLE_NIGHT,
+                    "ExpressionAttributeValues": {
+                        ":user_id": booking.user_id,
+                        ":now": int(time.time()),
+                    },
+                }
+            }
+            for night in nights(booking.check_in, booking.check_out)
+        ]
+
+    def _holds_key(self, user_id: str) -> Dict[str, str]:
+        return {"pk": self._pk(f"User#{user_id}"), "sk": "HOLDS"}
+
+    def _user_holds_put(
+        self, room_num: int, user_id: str, expires_at: int
+    ) -> Dict[str, Any]:
+        # one item per user lists their active holds by room; it is rewritten
+        # with an optimistic version check in the same transaction as the
+        # nights, so concurrent holds cannot slip past the limits
+        now = int(time.time())
+        response = self.table.get_item(
+            Key=self._holds_key(user_id), ConsistentRead=True
+        )
+        item = response.get("Item") or {}
+        version = int(item.get("hold_version", 0))
+        holds = {
+            room: {
+                "held_since": int(hold["held_since"]),
+                "expires_at": int(hold["expires_at"]),
+            }
+            for room, hold in item.get("holds", {}).items()
+            if int(hold["expires_at"]) > now
+        }
+
+        held = holds.get(str(room_num))
+        if held is None and len(holds) >= MAX_ACTIVE_HOLDS:
+            raise AppException(
+                status_code=status.HTTP_409_CONFLICT,
+                message=TOO_MANY_HOLDS_MESSAGE,
+            )
+        held_since = held["held_since"] if held else now
+        if expires_at - held_since > MAX_HELD_SECONDS:
+            raise AppException(
+                status_code=status.HTTP_409_CONFLICT,
+                message=HELD_TOO_LONG_MESSAGE,
+            )
+        holds[str(room_num)] = {"held_since": held_since, "expires_at": expires_at}
+
+        return {
+            "Put": {
+                "TableName": self.table_name,
+                "Item": {
+                    **self._holds_key(user_id),
+                    "holds": holds,
+                    "hold_version": version + 1,
+                    "hold_expires_at": max(h["expires_at"] for h in holds.values()),
+                },
+                "ConditionExpression": "attribute_not_exists(pk) OR hold_version = :version",
+                "ExpressionAttributeValues": {":version": version},
+            }
+        }
+
+    def hold_nights(
+        self,
+        room_num: int,
+        check_in: date,
+        check_out: date,
+        user_id: str,
+        expires_at: int,
+    ) -> None:
+        for _ in range(HOLD_ATTEMPTS):
+            if self._try_hold_nights(
+                room_num, check_in, check_out, user_id, expires_at
+            ):
+                return
+
+        raise AppException(
+            status_code=status.HTTP_409_CONFLICT,
+            message="Holds changed concurrently, try again",
+        )
+
+    def _try_hold_nights(
+        self,
+        room_num: int,
+        check_in: date,
+        check_out: date,
+        user_id: str,
+        expires_at: int,
+    ) -> bool:
+        # hold_expires_at doubles as the table's TTL attribute, so lapsed holds
+        # are ignored by the conditions above and later removed by DynamoDB
         try:
             self.ddb_client.transact_write_items(
                 TransactItems=[
-                    {
-                        "Put": {
-                            "TableName": self.table_name,
-                            "Item": {
-                                "pk": f"User#{booking.user_id}",
-                                "sk": f"booking#{booking.id}",
-                                **booking.model_dump(mode="json"),
-                            },
-                            "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                    self._user_holds_put(room_num, user_id, expires_at),
+                    *(
+                        {
+                            "Put": {
+                                "TableName": self.table_name,
+                                "Item": {
+                                    **self.night_key(room_num, night),
+                                    "held_by": user_id,
+                                    "hold_expires_at": expires_at,
+                                },
+                                "ConditionExpression": CLAIMABLE_NIGHT,
+                                "ExpressionAttributeValues": {
+                                    ":user_id": user_id,
+                                    ":now": int(time.time()),
+                                },
+                            }
                         }
+                        for night in nights(check_in, check_out)
+                    ),
+                ]
+            )
+            return True
+
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+
+            if code == "TransactionCanceledException":
+                reasons = e.response.get("CancellationReasons", [])
+                if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                    # another hold by the same user changed the list
+                    return False
+                raise AppException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    message=HELD_MESSAGE,
+                )
+
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to hold room",
+            )
+
+    def _night_deletes(self, booking: bookings.Booking) -> List[Dict[str, Any]]:
+        return [
+            {
+                "Delete": {
+                    "TableName": self.table_name,
+                    "Key": self.night_key(booking.room_num, night),
+                    "ConditionExpression": "attribute_not_exists(pk) OR booking_id = :booking_id",
+                    "ExpressionAttributeValues": {":booking_id": booking.id},
+                }
+            }
+            for night in nights(booking.check_in, booking.check_out)
+        ]
+
+    def inventory_key(self, room_type: str, night: date) -> Dict[str, str]:
+        return {
+            "pk": self._pk(f"Inventory#{room_type}"),
+            "sk": f"Night#{night.isoformat()}",
+        }
+
+    def _inventory_updates(
+        self,
+        group: List[bookings.Booking],
+        sign: int,
+        capacities: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        # one update per type and night; a transaction may touch an item once
+        counts: Dict[Tuple[str, date], int] = defaultdict(int)
+        for booking in group:
+            if booking.room_type is None:
+                continue
+            for night in nights(booking.check_in, booking.check_out):
+                counts[(booking.room_type.value, night)] += 1
+
+        updates: List[Dict[str, Any]] = []
+        for (room_type, night), count in counts.items():
+            update: Dict[str, Any] = {
+                "TableName": self.table_name,
+                "Key": self.inventory_key(room_type, night),
+                "UpdateExpression": "ADD booked :delta",
+                "ExpressionAttributeValues": {":delta": sign * count},
+            }
+            if capacities is not None:
+                limit = capacities.get(room_type, 0) - count
+                if limit < 0:
+                    raise AppException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        message=SOLD_OUT_MESSAGE,
+                    )
+                update["ConditionExpression"] = (
+                    "attribute_not_exists(booked) OR booked <= :limit"
+                )
+                update["ExpressionAttributeValues"][":limit"] = limit
+            updates.append({"Update": update})
+        return updates
+
+    def _arrival_counters(
+        self, group: List[bookings.Booking], sign: int
+    ) -> List[Dict[str, Any]]:
+        arrivals: Dict[date, int] = defaultdict(int)
+        for booking in group:
+            arrivals[booking.check_in] += 1
+        return [
+            op
+            for day, count in arrivals.items()
+            for op in counter_updates(
+                self.table_name, self.hotel_id, {ARRIVALS: sign * count}, day
+            )
+        ]
+
+    def folio_key(self, booking_id: str) -> Dict[str, str]:
+        return folio_key(self.hotel_id, booking_id)
+
+    def _folio_open(self, booking: bookings.Booking) -> Dict[str, Any]:
+        # charges are added, not set, so service charges written first survive
+        stay_nights = (booking.check_out - booking.check_in).days
+        room_rate = booking.room_rate or 0
+        return {
+            "Update": {
+                "TableName": self.table_name,
+                "Key": self.folio_key(booking.id),
+                "UpdateExpression": """
+                    SET booking_id = :booking_id,
+                        user_id = :user_id,
+                        room_num = :room_num,
+                        check_in = :check_in,
+                        check_out = :check_out,
+                        room_rate = :room_rate
+                    ADD nights :nights, room_charges :room_charges
+                """,
+                "ExpressionAttributeValues": {
+                    ":booking_id": booking.id,
+                    ":user_id": booking.user_id,
+                    ":room_num": booking.room_num,
+                    ":check_in": booking.check_in.isoformat(),
+                    ":check_out": booking.check_out.isoformat(),
+                    ":room_rate": room_rate,
+                    ":nights": stay_nights,
+                    ":room_charges": stay_nights * room_rate,
+                },
+            }
+        }
+
+    def _booking_puts(self, booking: bookings.Booking) -> List[Dict[str, Any]]:
+        return [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": {
+                        "pk": self._pk(f"User#{booking.user_id}"),
+                        "sk": f"booking#{booking.id}",
+                        **booking.model_dump(mode="json"),
                     },
-                    {
-                        "Put": {
-                            "TableName": self.table_name,
-                            "Item": {
-                                "pk": f"Booking#{booking.id}",
-                                "sk": "META",
-                                **booking.model_dump(mode="json"),
-                            },
-                            "ConditionExpression": "attribute_not_exists(pk)",
-                        }
+                    "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                }
+            },
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": {
+                        "pk": self._pk(f"Booking#{booking.id}"),
+                        "sk": "META",
+                        "active_pk": self._pk("ActiveBookings"),
+                        "active_sk": f"{booking.check_out.isoformat()}#{booking.id}",
+                        "arrivals_pk": self._pk(
+                            f"Arrivals#{booking.check_in.isoformat()}"
+                        ),
+                        "departures_pk": self._pk(
+                            f"Departures#{booking.check_out.isoformat()}"
+                        ),
+                        **booking.model_dump(mode="json"),
                     },
+                    "ConditionExpression": "attribute_not_exists(pk)",
+                }
+            },
+        ]
+
+    def save_booking(self, booking: bookings.Booking, capacity: int):
+        night_puts = self._night_puts(booking)
+        try:
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    *self._booking_puts(booking),
+                    *night_puts,
+                    *self._inventory_updates(
+                        [booking],
+                        1,
+                        (
+                            {booking.room_type.value: capacity}
+                            if booking.room_type
+                            else None
+                        ),
+                    ),
+                    self._folio_open(booking),
+                    *self._arrival_counters([booking], 1),
                 ]
             )
         except ClientError as e:
@@ -50,6 +397,25 @@ class BookingRepository:
 
             if code == "TransactionCanceledException":
                 reasons = e.response.get("CancellationReasons", [])
+                counters_from = 2 + len(night_puts)
+
+                if any(
+                    r.get("Code") == "ConditionalCheckFailed"
+                    for r in reasons[counters_from:]
+                ):
+                    raise AppException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        message=SOLD_OUT_MESSAGE,
+                    )
+
+                if any(
+                    r.get("Code") == "ConditionalCheckFailed"
+                    for r in reasons[2:counters_from]
+                ):
+                    raise AppException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        message=NIGHT_TAKEN_MESSAGE,
+                    )
 
                 if any(r.get("Code") == "ConditionalCheckFailed" for r in reasons):
                     raise AppException(
@@ -63,7 +429,7 @@ class BookingRepository:
             )
 
     def get_booking_by_ID(self, bookingID: str) -> bookings.Booking:
-        pk = f"Booking#{bookingID}"
+        pk = self._pk(f"Booking#{bookingID}")
         sk = "META"
 
         try:
@@ -97,7 +463,7 @@ class BookingRepository:
                         "Update": {
                             "TableName": self.table_name,
                             "Key": {
-                                "pk": f"User#{booking.user_id}",
+                                "pk": self._pk(f"User#{booking.user_id}"),
                                 "sk": f"booking#{booking.id}",
                             },
                             "UpdateExpression": """
@@ -125,7 +491,7 @@ class BookingRepository:
                         "Update": {
                             "TableName": self.table_name,
                             "Key": {
-                                "pk": f"Booking#{booking.id}",
+                                "pk": self._pk(f"Booking#{booking.id}"),
                                 "sk": "META",
                             },
                             "UpdateExpression": """
@@ -167,11 +533,29 @@ class BookingRepository:
                 message="Failed to update booking",
             )
 
+    def get_folio(self, booking_id: str) -> bookings.Folio:
+        try:
+            response = self.table.get_item(Key=self.folio_key(booking_id))
+        except ClientError:
+            raise AppException(
+                message="Failed to fetch folio",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        item = response.get("Item")
+        if not item or "booking_id" not in item:
+            raise AppException(
+                message="Folio not found",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        return bookings.Folio(**item)
+
     def get_bookings_by_userID(self, userID: str) -> List[bookings.Booking]:
         try:
             response = self.table.query(
                 KeyConditionExpression=(
-                    Key("pk").eq(f"User#{userID}") & Key("sk").begins_with("booking#")
+                    Key("pk").eq(self._pk(f"User#{userID}"))
+                    & Key("sk").begins_with("booking#")
                 ),
                 FilterExpression=Attr("status").eq("Booked"),
             )
@@ -185,3 +569,453 @@ class BookingRepository:
         items = response.get("Items", [])
 
         return [bookings.Booking(**item) for item in items]
+
+    def cancel_booking(self, booking: bookings.Booking) -> None:
+        status_update = {
+            "UpdateExpression": "SET #status = :status",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {
+                ":status": bookings.BookingStatus.Booking_Status_Cancelled.value,
+                ":booked": bookings.BookingStatus.Booking_Status_Booked.value,
+            },
+            "ConditionExpression": "#status = :booked",
+        }
+
+        try:
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Update": {
+                            "TableName": self.table_name,
+                            "Key": {
+                                "pk": self._pk(f"User#{booking.user_id}"),
+                                "sk": f"booking#{booking.id}",
+                            },
+                            **status_update,
+                        }
+                    },
+                    {
+                        "Update": {
+                            "TableName": self.table_name,
+                            "Key": {
+                                "pk": self._pk(f"Booking#{booking.id}"),
+                                "sk": "META",
+                            },
+                            **status_update,
+                            "UpdateExpression": "SET #status = :status REMOVE active_pk, active_sk, arrivals_pk, departures_pk",
+                        }
+                    },
+                    *self._night_deletes(booking),
+                    *self._inventory_updates([booking], -1),
+                    *self._arrival_counters([booking], -1),
+                    {
+                        "Update": {
+                            "TableName": self.table_name,
+                            "Key": self.folio_key(booking.id),
+                            "UpdateExpression": "SET user_id = :user_id, nights = :zero, room_charges = :zero",
+                            "ExpressionAttributeValues": {
+                                ":user_id": booking.user_id,
+                                ":zero": 0,
+                            },
+                        }
+                    },
+                ]
+            )
+
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+
+            if code == "TransactionCanceledException":
+                raise AppException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    message="Booking not found or already cancelled",
+                )
+
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to cancel booking",
+            )
+
+    def _bookings_on_day(
+        self, index_name: str, key_name: str, day_key: str
+    ) -> List[bookings.Booking]:
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": index_name,
+            "KeyConditionExpression": Key(key_name).eq(day_key),
+        }
+        day_bookings: List[bookings.Booking] = []
+
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                day_bookings += [bookings.Booking(**item) for item in response["Items"]]
+
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    return day_bookings
+                query_kwargs["ExclusiveStartKey"] = last_key
+
+        except ClientError:
+            raise AppException(
+                message="Failed to fetch bookings for the day",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def get_arrivals(self, day: date) -> List[bookings.Booking]:
+        return self._bookings_on_day(
+            ARRIVALS_INDEX, "arrivals_pk", self._pk(f"Arrivals#{day.isoformat()}")
+        )
+
+    def get_departures(self, day: date) -> List[bookings.Booking]:
+        return self._bookings_on_day(
+            DEPARTURES_INDEX, "departures_pk", self._pk(f"Departures#{day.isoformat()}")
+        )
+
+    def get_active_bookings(self, from_date: date) -> List[bookings.Booking]:
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": ACTIVE_BOOKING_INDEX,
+            "KeyConditionExpression": Key("active_pk").eq(self._pk("ActiveBookings"))
+            & Key("active_sk").gt(from_date.isoformat()),
+        }
+        active: List[bookings.Booking] = []
+
+        try:
+            while True:
+                response = self.table.query(**query_kwargs)
+                active += [bookings.Booking(**item) for item in response["Items"]]
+
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    return active
+                query_kwargs["ExclusiveStartKey"] = last_key
+
+        except ClientError:
+            raise AppException(
+                message="Failed to fetch active bookings",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def _move_ops(
+        self,
+        move: BookingMoveDTO,
+        owners: Dict[Tuple[int, date], str],
+        claimed: Set[Tuple[int, date]],
+    ) -> List[Dict[str, Any]]:
+        room_update = {
+            "UpdateExpression": "SET room_num = :to_room, room_id = :to_room_id",
+            "ConditionExpression": "room_num = :from_room",
+            "ExpressionAttributeValues": {
+                ":to_room": move.to_room,
+                ":to_room_id": move.to_room_id,
+                ":from_room": move.from_room,
+            },
+        }
+        ops: List[Dict[str, Any]] = [
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    "Key": {
+                        "pk": self._pk(f"User#{move.user_id}"),
+                        "sk": f"booking#{move.booking_id}",
+                    },
+                    **room_update,
+                }
+            },
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    "Key": {"pk": self._pk(f"Booking#{move.booking_id}"), "sk": "META"},
+                    **room_update,
+                }
+            },
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    "Key": self.folio_key(move.booking_id),
+                    "UpdateExpression": "SET room_num = :to_room",
+                    "ExpressionAttributeValues": {":to_room": move.to_room},
+                }
+            },
+        ]
+
+        # each night key is written once with its final owner, conditioned on
+        # the owner the plan was computed against
+        for night in nights(move.check_in, move.check_out):
+            put: Dict[str, Any] = {
+                "TableName": self.table_name,
+                "Item": {
+                    **self.night_key(move.to_room, night),
+                    "booking_id": move.booking_id,
+                    "user_id": move.user_id,
+                },
+                "ConditionExpression": "attribute_not_exists(pk)",
+            }
+            previous = owners.get((move.to_room, night))
+            if previous:
+                put["ConditionExpression"] = "booking_id = :previous"
+                put["ExpressionAttributeValues"] = {":previous": previous}
+            ops.append({"Put": put})
+
+        for night in nights(move.check_in, move.check_out):
+            if (move.from_room, night) in claimed:
+                continue
+            ops.append(
+                {
+                    "Delete": {
+                        "TableName": self.table_name,
+                        "Key": self.night_key(move.from_room, night),
+                        "ConditionExpression": "booking_id = :booking_id",
+                        "ExpressionAttributeValues": {":booking_id": move.booking_id},
+                    }
+                }
+            )
+        return ops
+
+    @staticmethod
+    def _move_groups(
+        moves: List[BookingMoveDTO], owners: Dict[Tuple[int, date], str]
+    ) -> List[List[BookingMoveDTO]]:
+        # moves that take over each other's nights (swaps, chains) are kept
+        # together so they always commit in the same transaction
+        parent = list(range(len(moves)))
+        position = {move.booking_id: i for i, move in enumerate(moves)}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, move in enumerate(moves):
+            for night in nights(move.check_in, move.check_out):
+                other = owners.get((move.to_room, night))
+                if other is not None:
+                    parent[find(i)] = find(position[other])
+
+        groups: Dict[int, List[BookingMoveDTO]] = defaultdict(list)
+        for i, move in enumerate(moves):
+            groups[find(i)].append(move)
+        return list(groups.values())
+
+    def apply_booking_moves(self, moves: List[BookingMoveDTO]) -> List[BookingMoveDTO]:
+        # Returns the moves that were skipped. A group is never split across
+        # transactions: half a swap would leave one booking without nights,
+        # so a group over the transaction limit is left where it is.
+        owners = {
+            (move.from_room, night): move.booking_id
+            for move in moves
+            for night in nights(move.check_in, move.check_out)
+        }
+        claimed = {
+            (move.to_room, night)
+            for move in moves
+            for night in nights(move.check_in, move.check_out)
+        }
+
+        skipped: List[BookingMoveDTO] = []
+        batches: List[Tuple[int, List[Dict[str, Any]]]] = []
+        batch_moves, batch_ops = 0, []
+        for group in self._move_groups(moves, owners):
+            group_ops = [
+                op for move in group for op in self._move_ops(move, owners, claimed)
+            ]
+            if len(group_ops) > TRANSACTION_ITEM_LIMIT:
+                skipped += group
+                continue
+            if len(batch_ops) + len(group_ops) > TRANSACTION_ITEM_LIMIT:
+                batches.append((batch_moves, batch_ops))
+                batch_moves, batch_ops = 0, []
+            batch_moves += len(group)
+            batch_ops += group_ops
+        if batch_ops:
+            batches.append((batch_moves, batch_ops))
+
+        applied = 0
+        for move_count, ops in batches:
+            try:
+                self.ddb_client.transact_write_items(TransactItems=ops)
+            except ClientError as e:
+                reasons = e.response.get("CancellationReasons", [])
+                if e.response["Error"][
+                    "Code"
+                ] == "TransactionCanceledException" and any(
+                    reason.get("Code") == "ConditionalCheckFailed" for reason in reasons
+                ):
+                    raise AppException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        message=f"Reallocation stopped after {applied} moves: bookings changed concurrently",
+                    )
+                raise AppException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message=f"Reallocation stopped after {applied} moves",
+                )
+            applied += move_count
+
+        return skipped
+
+    def _transact_group(self, ops: List[Dict[str, Any]]) -> None:
+        try:
+            self.ddb_client.transact_write_items(TransactItems=ops)
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code != "TransactionCanceledException":
+                raise AppException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    message="Failed to create group booking",
+                )
+
+            reasons = e.response.get("CancellationReasons", [])
+            if any(
+                r.get("Code") == "ConditionalCheckFailed" and "Update" in op
+                for r, op in zip(reasons, ops)
+            ):
+                raise AppException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    message=SOLD_OUT_MESSAGE,
+                )
+            raise AppException(
+                status_code=status.HTTP_409_CONFLICT,
+                message=NIGHT_TAKEN_MESSAGE,
+            )
+
+    def save_group_booking(
+        self,
+        group: List[bookings.Booking],
+        capacities: Dict[str, int],
+    ) -> None:
+        counters = self._inventory_updates(group, 1, capacities)
+        arrivals = self._arrival_counters(group, 1)
+        ops = [
+            op
+            for booking in group
+            for op in self._booking_puts(booking)
+            + self._night_puts(booking)
+            + [self._folio_open(booking)]
+        ]
+
+        if len(ops) + len(counters) + len(arrivals) <= TRANSACTION_ITEM_LIMIT:
+            self._transact_group(ops + counters + arrivals)
+            return
+
+        self._reserve_group(group, counters, arrivals)
+
+    def _reserve_group(
+        self,
+        group: List[bookings.Booking],
+        counters: List[Dict[str, Any]],
+        arrivals: List[Dict[str, Any]],
+    ) -> None:
+        # Too big for one transaction: first hold every night and take the
+        # inventory in chunks, then turn the holds into bookings. Anything
+        # written is undone if a later chunk fails, and the holds expire
+        # on their own if even that is interrupted.
+        group_id = group[0].group_id
+        user_id = group[0].user_id
+        now = int(time.time())
+
+        holds = [
+            {
+                "Put": {
+                    "TableName": self.table_name,
+                    "Item": {
+                        **self.night_key(booking.room_num, night),
+                        "held_by": group_id,
+                        "hold_expires_at": now + GROUP_HOLD_SECONDS,
+                    },
+                    "ConditionExpression": CLAIMABLE_NIGHT,
+                    "ExpressionAttributeValues": {":user_id": user_id, ":now": now},
+                }
+            }
+            for booking in group
+            for night in nights(booking.check_in, booking.check_out)
+        ]
+
+        reserve_chunks = [
+            (holds + counters)[i : i + TRANSACTION_ITEM_LIMIT]
+            for i in range(0, len(holds) + len(counters), TRANSACTION_ITEM_LIMIT)
+        ]
+
+        # each booking's items stay in one chunk so a booking is never partial
+        book_chunks: List[List[Dict[str, Any]]] = [[]]
+        for booking in group:
+            booking_ops = (
+                self._booking_puts(booking)
+                + [
+                    {
+                        "Put": {
+                            **op["Put"],
+                            "ConditionExpression": "held_by = :group_id",
+                            "ExpressionAttributeValues": {":group_id": group_id},
+                        }
+                    }
+                    for op in self._night_puts(booking)
+                ]
+                + [self._folio_open(booking)]
+            )
+            if len(book_chunks[-1]) + len(booking_ops) > TRANSACTION_ITEM_LIMIT:
+                book_chunks.append([])
+            book_chunks[-1] += booking_ops
+
+        # the arrival counts go with the last chunk, which is never undone
+        if len(book_chunks[-1]) + len(arrivals) > TRANSACTION_ITEM_LIMIT:
+            book_chunks.append([])
+        book_chunks[-1] += arrivals
+
+        written: List[Dict[str, Any]] = []
+        try:
+            for chunk in reserve_chunks + book_chunks:
+                self._transact_group(chunk)
+                written += chunk
+        except AppException:
+            self._undo_group(group_id, written)
+            raise
+
+    def _undo_group(self, group_id: str, written: List[Dict[str, Any]]) -> None:
+        undo: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for op in written:
+            if "Update" in op and op["Update"]["Key"]["pk"].startswith(
+                self._pk("Inventory#")
+            ):
+                update = op["Update"]
+                key = update["Key"]
+                undo[(key["pk"], key["sk"])] = {
+                    "Update": {
+                        "TableName": self.table_name,
+                        "Key": key,
+                        "UpdateExpression": "ADD booked :delta",
+                        "ExpressionAttributeValues": {
+                            ":delta": -update["ExpressionAttributeValues"][":delta"]
+                        },
+                    }
+                }
+                continue
+
+            if "Update" in op:
+                # the folio of a booking that is rolled back
+                key = op["Update"]["Key"]
+                undo[(key["pk"], key["sk"])] = {
+                    "Delete": {"TableName": self.table_name, "Key": key}
+                }
+                continue
+
+            item = op["Put"]["Item"]
+            key = {"pk": item["pk"], "sk": item["sk"]}
+            delete: Dict[str, Any] = {"TableName": self.table_name, "Key": key}
+            if item["pk"].startswith(self._pk("Room#")):
+                # a night is only released while this group still owns it
+                delete["ConditionExpression"] = (
+                    "attribute_not_exists(pk) OR held_by = :group_id"
+                    " OR group_id = :group_id"
+                )
+                delete["ExpressionAttributeValues"] = {":group_id": group_id}
+            undo[(key["pk"], key["sk"])] = {"Delete": delete}
+
+        ops = list(undo.values())
+        for i in range(0, len(ops), TRANSACTION_ITEM_LIMIT):
+            try:
+                self.ddb_client.transact_write_items(
+                    TransactItems=ops[i : i + TRANSACTION_ITEM_LIMIT]
+                )
+            except ClientError:
+                # best effort: lapsed holds no longer block anyone
+                continue
@@ -0,0 +1,104 @@
+import random
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from botocore.utils import ClientError
+from fastapi import Depends, status
+
+from app.app_exception.app_exception import AppException
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
+from app.models.service_request import ServiceType
+from app.utils.tenancy import hotel_key
+
+COUNTER_SHARDS = 10
+TOTALS_SK = "TOTALS"
+ROOMS_AVAILABLE = "rooms_available"
+ARRIVALS = "arrivals"
+RATINGS = "ratings"
+RATING_TOTAL = "rating_total"
+
+
+def pending_counter(service_type: ServiceType) -> str:
+    return f"pending_{service_type.value.lower()}"
+
+
+def counter_key(
+    hotel_id: str, shard: int, day: Optional[date] = None
+) -> Dict[str, str]:
+    # each shard is its own partition; day counters sit beside the totals
+    return {
+        "pk": hotel_key(hotel_id, f"Counters#{shard}"),
+        "sk": f"Day#{day.isoformat()}" if day else TOTALS_SK,
+    }
+
+
+def counter_updates(
+    table_name: str,
+    hotel_id: str,
+    deltas: Dict[str, int],
+    day: Optional[date] = None,
+) -> List[Dict[str, Any]]:
+    # Joins the caller's transaction as one ADD on a random shard, so a hot
+    # counter spreads its writes over COUNTER_SHARDS items. Readers sum them.
+    changed = sorted((name, delta) for name, delta in deltas.items() if delta)
+    if not changed:
+        return []
+    return [
+        {
+            "Update": {
+                "TableName": table_name,
+                "Key": counter_key(hotel_id, random.randrange(COUNTER_SHARDS), day),
+                "UpdateExpression": "ADD "
+                + ", ".join(f"#c{i} :c{i}" for i in range(len(changed))),
+                "ExpressionAttributeNames": {
+                    f"#c{i}": name for i, (name, _) in enumerate(changed)
+                },
+                "ExpressionAttributeValues": {
+                    f":c{i}": delta for i, (_, delta) in enumerate(changed)
+                },
+            }
+        }
+    ]
+
+
+class CounterRepository:
+    def __init__(
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
+    ) -> None:
+        self.ddb_resource = ddb_resource
+        self.table_name = table_name
+        self.hotel_id = hotel_id
+
+    def read_counters(self, day: date, consistent: bool = False) -> Dict[str, int]:
+        # a fixed 2 * COUNTER_SHARDS keys, however large the table grows
+        counters: Dict[str, int] = {}
+        request_items: Dict[str, Any] = {
+            self.table_name: {
+                "Keys": [
+                    counter_key(self.hotel_id, shard, scope)
+                    for shard in range(COUNTER_SHARDS)
+                    for scope in (None, day)
+                ],
+                "ConsistentRead": consistent,
+            }
+        }
+
+        try:
+            while request_items:
+                response = self.ddb_resource.batch_get_item(RequestItems=request_items)
+                for item in response.get("Responses", {}).get(self.table_name, []):
+                    for name, value in item.items():
+                        if name not in ("pk", "sk"):
+                            counters[name] = counters.get(name, 0) + int(value)
+                request_items = response.get("UnprocessedKeys") or {}
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch counters",
+            )
+
+        return counters
@@ -1,22 +1,46 @@
-from typing import List
+from typing import List, Optional
 
 from boto3.dynamodb.conditions import Key
 from botocore.utils import ClientError
 from fastapi import Depends, status
 
 from app.app_exception.app_exception import AppException
-from app.dependencies import get_ddb_resource, get_table_name
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
 from app.models import users
+from app.utils.pagination import query_all
+from app.utils.tenancy import hotel_key
+
+EMPLOYEE_DIRECTORY_INDEX = "EmployeeDirectoryIndex"
 
 
 class EmployeeRepository:
     def __init__(
-        self, ddb_resource=Depends(get_ddb_resource), table_name=Depends(get_table_name)
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
     ) -> None:
         self.table = ddb_resource.Table(table_name)
         self.table_name = table_name
+        self.hotel_id = hotel_id
+        self.employee_pk = hotel_key(hotel_id, "Employee")
         self.ddb_client = ddb_resource.meta.client
 
+    @staticmethod
+    def directory_sk(role: str, available: bool, employee_id: str) -> str:
+        return f"Employee#{role}#{str(available).lower()}#{employee_id}"
+
+    @staticmethod
+    def _to_user(item: dict) -> users.User:
+        return users.User(
+            id=item["id"],
+            name=item["name"],
+            email=item["email"],
+            password="",
+            role=item["role"],
+            available=item["available"],
+        )
+
     def create_employee(self, user: users.User) -> None:
         try:
             self.ddb_client.transact_write_items(
@@ -25,7 +49,7 @@ class EmployeeRepository:
                         "Put": {
                             "TableName": self.table_name,
                             "Item": {
-                                "pk": f"User#{user.id}",
+                                "pk": hotel_key(self.hotel_id, f"User#{user.id}"),
                                 "sk": "PROFILE",
                                 **user.model_dump(),
                             },
@@ -35,7 +59,7 @@ class EmployeeRepository:
                         "Put": {
                             "TableName": self.table_name,
                             "Item": {
-                                "pk": f"Email#{user.email}",
+                                "pk": hotel_key(self.hotel_id, f"Email#{user.email}"),
                                 "sk": "USER",
                                 "user_id": user.id,
                             },
@@ -46,8 +70,11 @@ class EmployeeRepository:
                         "Put": {
                             "TableName": self.table_name,
                             "Item": {
-                                "pk": "Employee",
+                                "pk": self.employee_pk,
                                 "sk": f"Employee#{user.id}",
+                                "directory_sk": self.directory_sk(
+                                    user.role.value, user.available, user.id
+                                ),
                                 "id": user.id,
                                 "email": user.email,
                                 "name": user.name,
@@ -76,25 +103,30 @@ class EmployeeRepository:
                 message="Failed to create employee",
             )
 
-    def get_employees(self) -> List[users.User]:
-        try:
-            response = self.table.query(KeyConditionExpression=Key("pk").eq("Employee"))
+    def get_employees(
+        self, role: Optional[users.Role] = None, available: Optional[bool] = None
+    ) -> List[users.User]:
+        if role is None:
+            key_condition = Key("pk").eq(self.employee_pk)
+            index_kwargs = {}
+        else:
+            prefix = f"Employee#{role.value}#"
+            if available is not None:
+                prefix += f"{str(available).lower()}#"
+            key_condition = Key("pk").eq(self.employee_pk) & Key(
+                "directory_sk"
+            ).begins_with(prefix)
+            index_kwargs = {"IndexName": EMPLOYEE_DIRECTORY_INDEX}
 
-            items = response.get("Items", [])
+        try:
+            items = query_all(
+                self.table, KeyConditionExpression=key_condition, **index_kwargs
+            )
 
             employees: list[users.User] = []
 
             for item in items:
-                employees.append(
-                    users.User(
-                        id=item["id"],
-                        name=item["name"],
-                        email=item["email"],
-                        password="",
-                        role=item["role"],
-                        available=item["available"],
-                    )
-                )
+                employees.append(self._to_user(item))
 
             return employees
 
@@ -105,15 +137,24 @@ class EmployeeRepository:
             )
 
     def update_employee_availability(self, employee_id: str, available: bool) -> None:
+        employee = self.get_employee_by_id(employee_id)
+        self.write_availability(employee_id, employee.role, available)
+
+    def write_availability(
+        self, employee_id: str, role: users.Role, available: bool
+    ) -> None:
         try:
             self.table.update_item(
                 Key={
-                    "pk": "Employee",
+                    "pk": self.employee_pk,
                     "sk": f"Employee#{employee_id}",
                 },
-                UpdateExpression="SET available = :available",
+                UpdateExpression="SET available = :available, directory_sk = :directory_sk",
                 ExpressionAttributeValues={
                     ":available": available,
+                    ":directory_sk": self.directory_sk(
+                        role.value, available, employee_id
+                    ),
                 },
                 ConditionExpression="attribute_exists(pk)",
             )
@@ -133,7 +174,7 @@ class EmployeeRepository:
     def get_employee_by_id(self, employee_id: str) -> users.User:
         try:
             response = self.table.get_item(
-                Key={"pk": "Employee", "sk": f"Employee#{employee_id}"}
+                Key={"pk": self.employee_pk, "sk": f"Employee#{employee_id}"}
             )
             item = response.get("Item")
             if not item:
@@ -141,14 +182,7 @@ class EmployeeRepository:
                     status_code=status.HTTP_404_NOT_FOUND,
                     message="Employee not found",
                 )
-            return users.User(
-                id=item["id"],
-                name=item["name"],
-                email=item["email"],
-                password="",
-                role=item["role"],
-                available=item["available"],
-            )
+            return self._to_user(item)
         except ClientError:
             raise AppException(
                 message="employee not found", status_code=status.HTTP_404_NOT_FOUND
@@ -162,7 +196,7 @@ class EmployeeRepository:
                         "Delete": {
                             "TableName": self.table_name,
                             "Key": {
-                                "pk": "Employee",
+                                "pk": self.employee_pk,
                                 "sk": f"Employee#{employee_id}",
                             },
                             "ConditionExpression": "attribute_exists(pk)",
@@ -172,7 +206,7 @@ class EmployeeRepository:
                         "Delete": {
                             "TableName": self.table_name,
                             "Key": {
-                                "pk": f"User#{employee_id}",
+                                "pk": hotel_key(self.hotel_id, f"User#{employee_id}"),
                                 "sk": "PROFILE",
                             },
                             "ConditionExpression": "attribute_exists(pk)",
@@ -182,7 +216,7 @@ class EmployeeRepository:
                         "Delete": {
                             "TableName": self.table_name,
                             "Key": {
-                                "pk": f"Email#{email}",
+                                "pk": hotel_key(self.hotel_id, f"Email#{email}"),
                                 "sk": "USER",
                             },
                             "ConditionExpression": "attribute_exists(pk)",
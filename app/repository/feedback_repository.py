@@ -1,28 +1,57 @@
-from typing import List
+from typing import Any, Dict, List
 from boto3.dynamodb.conditions import Key
-from app.dependencies import get_ddb_resource, get_table_name
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
 from app.models.feedbacks import Feedback
 from botocore.utils import ClientError
 from app.app_exception.app_exception import AppException
 from fastapi import Depends, status
+from app.repository.counter_repository import RATING_TOTAL, RATINGS, counter_updates
+from app.utils.pagination import query_all
+from app.utils.tenancy import hotel_key
 
 
 class FeedbackRepository:
     def __init__(
-        self, ddb_resource=Depends(get_ddb_resource), table_name=Depends(get_table_name)
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
     ):
         self.table = ddb_resource.Table(table_name)
         self.table_name = table_name
+        self.hotel_id = hotel_id
         self.ddb_client = ddb_resource.meta.client
 
+    def _key(self, feedback_id: str) -> Dict[str, str]:
+        return {
+            "pk": hotel_key(self.hotel_id, "Feedbacks"),
+            "sk": f"Feedback#{feedback_id}",
+        }
+
+    def _rating_counters(self, feedback: Feedback, sign: int) -> List[Dict[str, Any]]:
+        if feedback.rating is None:
+            return []
+        return counter_updates(
+            self.table_name,
+            self.hotel_id,
+            {RATINGS: sign, RATING_TOTAL: sign * feedback.rating},
+        )
+
     def save_feedback(self, feedback: Feedback) -> None:
         try:
-            self.table.put_item(
-                Item={
-                    **feedback.model_dump(mode="json"),
-                    "pk": "Feedbacks",
-                    "sk": f"Feedback#{feedback.id}",
-                }
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": self.table_name,
+                            "Item": {
+                                **feedback.model_dump(mode="json"),
+                                **self._key(feedback.id),
+                            },
+                        }
+                    },
+                    *self._rating_counters(feedback, 1),
+                ]
             )
         except ClientError:
             raise AppException(
@@ -32,10 +61,13 @@ class FeedbackRepository:
 
     def get_all_feedbacks(self) -> List[Feedback]:
         try:
-            feedback_items = self.table.query(
-                KeyConditionExpression=Key("pk").eq("Feedbacks")
-                & Key("sk").begins_with("Feedback#")
-            ).get("Items", [])
+            feedback_items = query_all(
+                self.table,
+                KeyConditionExpression=Key("pk").eq(
+                    hotel_key(self.hotel_id, "Feedbacks")
+                )
+                & Key("sk").begins_with("Feedback#"),
+            )
             return [Feedback(**item) for item in feedback_items]
         except ClientError:
             raise AppException(
@@ -45,13 +77,26 @@ class FeedbackRepository:
 
     def delete_feedback(self, feedback_id: str) -> None:
         try:
-            self.table.delete_item(
-                Key={
-                    "pk": "Feedbacks",
-                    "sk": f"Feedback#{feedback_id}",
-                }
+            item = self.table.get_item(Key=self._key(feedback_id)).get("Item")
+            if not item:
+                return
+
+            # the rating is taken back only if this call removed the feedback
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Delete": {
+                            "TableName": self.table_name,
+                            "Key": self._key(feedback_id),
+                            "ConditionExpression": "attribute_exists(pk)",
+                        }
+                    },
+                    *self._rating_counters(Feedback(**item), -1),
+                ]
             )
-        except ClientError:
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "TransactionCanceledException":
+                return
             raise AppException(
                 message="Failed to delete feedback",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,6 @@
+from app.repository.view_repository import ViewRepository
+
+
+class HousekeepingRepository(ViewRepository):
+    VIEW = "HousekeepingBoard"
+    VIEW_NAME = "housekeeping board"
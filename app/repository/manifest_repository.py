@@ -0,0 +1,6 @@
+from app.repository.view_repository import ViewRepository
+
+
+class ManifestRepository(ViewRepository):
+    VIEW = "Manifest"
+    VIEW_NAME = "manifest"
@@ -1,35 +1,66 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 from boto3.dynamodb.conditions import Attr, Key
 from botocore.utils import ClientError
 from fastapi import Depends, status
 from app.app_exception.app_exception import AppException
-from app.dependencies import get_ddb_resource, get_table_name
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
 from app.models import rooms
+from app.repository.counter_repository import ROOMS_AVAILABLE, counter_updates
+from app.utils.pagination import query_all
+from app.utils.tenancy import hotel_key
+
+ROOM_CATALOG_INDEX = "RoomCatalogIndex"
+PRICE_DIGITS = 10
 
 
 class RoomRepository:
     def __init__(
-        self, ddb_resource=Depends(get_ddb_resource), table_name=Depends(get_table_name)
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
     ) -> None:
         self.table = ddb_resource.Table(table_name)
         self.table_name = table_name
+        self.hotel_id = hotel_id
+        self.rooms_pk = hotel_key(hotel_id, "ROOMS")
         self.ddb_client = ddb_resource.meta.client
 
+    @staticmethod
+    def catalog_sk(room_type: str, price: int, room_number: int) -> str:
+        return f"{room_type}#{price:0{PRICE_DIGITS}d}#{room_number}"
+
+    def _counter_updates(self, available_delta: int) -> List[Dict[str, Any]]:
+        return counter_updates(
+            self.table_name, self.hotel_id, {ROOMS_AVAILABLE: available_delta}
+        )
+
     def add_room(self, room: rooms.Room) -> None:
-        pk = "ROOMS"
+        pk = self.rooms_pk
         sk = f"room#{room.number}"
 
         try:
-            self.table.put_item(
-                Item={
-                    "pk": pk,
-                    "sk": sk,
-                    **room.model_dump(mode="json"),
-                },
-                ConditionExpression="attribute_not_exists(pk) AND attribute_not_exists(sk)",
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Put": {
+                            "TableName": self.table_name,
+                            "Item": {
+                                "pk": pk,
+                                "sk": sk,
+                                "catalog_sk": self.catalog_sk(
+                                    room.type.value, room.price, room.number
+                                ),
+                                **room.model_dump(mode="json"),
+                            },
+                            "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                        }
+                    },
+                    *self._counter_updates(int(room.is_available)),
+                ]
             )
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if e.response["Error"]["Code"] == "TransactionCanceledException":
                 raise AppException(
                     message="Room already exists", status_code=status.HTTP_409_CONFLICT
                 )
@@ -39,7 +70,7 @@ class RoomRepository:
             )
 
     def get_room_by_number(self, room_number: int) -> rooms.Room:
-        pk = "ROOMS"
+        pk = self.rooms_pk
         sk = f"room#{room_number}"
 
         try:
@@ -62,7 +93,7 @@ class RoomRepository:
         return rooms.Room(**item)
 
     def update_room_availability(self, room_num: int, is_available: bool) -> None:
-        pk = "ROOMS"
+        pk = self.rooms_pk
         sk = f"room#{room_num}"
 
         try:
@@ -90,12 +121,13 @@ class RoomRepository:
             )
 
     def get_all_rooms(self) -> List[rooms.Room]:
-        pk = "ROOMS"
+        pk = self.rooms_pk
         try:
-            response = self.table.query(
+            items = query_all(
+                self.table,
                 KeyConditionExpression=(
                     Key("pk").eq(pk) & Key("sk").begins_with("room#")
-                )
+                ),
             )
         except ClientError:
             raise AppException(
@@ -103,16 +135,15 @@ class RoomRepository:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        items = response.get("Items", [])
-
         return [rooms.Room(**item) for item in items]
 
     def get_available_rooms(self) -> List[rooms.Room]:
-        pk = "ROOMS"
+        pk = self.rooms_pk
         rooms_list = []
 
         try:
-            response = self.table.query(
+            items = query_all(
+                self.table,
                 KeyConditionExpression=(
                     Key("pk").eq(pk) & Key("sk").begins_with("room#")
                 ),
@@ -123,7 +154,6 @@ class RoomRepository:
                 message="Failed to fetch available rooms",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-        items = response.get("Items", [])
 
         for item in items:
             rooms_list.append(rooms.Room(**item))
@@ -131,22 +161,30 @@ class RoomRepository:
         return rooms_list
 
     def delete_room(self, room_num: int) -> None:
-        pk = "ROOMS"
-        sk = f"room#{room_num}"
+        room = self.get_room_by_number(room_num)
 
         try:
-            self.table.delete_item(
-                Key={
-                    "pk": pk,
-                    "sk": sk,
-                },
-                ConditionExpression="attribute_exists(pk) AND attribute_exists(sk)",
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Delete": {
+                            "TableName": self.table_name,
+                            "Key": {"pk": self.rooms_pk, "sk": f"room#{room_num}"},
+                            # the counter moves by what was read
+                            "ConditionExpression": "attribute_exists(pk) AND is_available = :available",
+                            "ExpressionAttributeValues": {
+                                ":available": room.is_available
+                            },
+                        }
+                    },
+                    *self._counter_updates(-int(room.is_available)),
+                ]
             )
 
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if e.response["Error"]["Code"] == "TransactionCanceledException":
                 raise AppException(
-                    message="Room not found",
+                    message="Room not found or modified concurrently",
                     status_code=status.HTTP_404_NOT_FOUND,
                 )
 
@@ -155,28 +193,102 @@ class RoomRepository:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def search_rooms(
+        self,
+        room_type: rooms.RoomType,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        available_only: bool = False,
+    ) -> List[rooms.Room]:
+        lower = f"{room_type.value}#{(min_price or 0):0{PRICE_DIGITS}d}#"
+        upper = f"{room_type.value}#{'9' * PRICE_DIGITS}#~"
+        if max_price is not None:
+            upper = f"{room_type.value}#{max_price:0{PRICE_DIGITS}d}#~"
+
+        query_kwargs = {
+            "IndexName": ROOM_CATALOG_INDEX,
+            "KeyConditionExpression": (
+                Key("pk").eq(self.rooms_pk) & Key("catalog_sk").between(lower, upper)
+            ),
+        }
+        if available_only:
+            query_kwargs["FilterExpression"] = Attr("is_available").eq(True)
+
+        try:
+            items = query_all(self.table, **query_kwargs)
+        except ClientError:
+            raise AppException(
+                message="Failed to search rooms",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return [rooms.Room(**item) for item in items]
+
     def update_room(self, room_num: int, fields: dict) -> None:
-        pk = "ROOMS"
+        pk = self.rooms_pk
         sk = f"room#{room_num}"
 
         update_expr = []
+        expr_names = {}
         expr_values = {}
+        condition = "attribute_exists(pk)"
+        available_delta = 0
+
+        if "type" in fields or "price" in fields or "is_available" in fields:
+            room = self.get_room_by_number(room_num)
+
+        if "type" in fields or "price" in fields:
+            room_type = fields.get("type", room.type)
+            price = fields.get("price", room.price)
+            fields = {
+                **fields,
+                "catalog_sk": self.catalog_sk(
+                    rooms.RoomType(room_type).value, price, room_num
+                ),
+            }
+            condition += " AND #old_type = :old_type AND #old_price = :old_price"
+            expr_names["#old_type"] = "type"
+            expr_names["#old_price"] = "price"
+            expr_values[":old_type"] = room.type.value
+            expr_values[":old_price"] = room.price
+
+        if "is_available" in fields:
+            available_delta = int(fields["is_available"]) - int(room.is_available)
+            condition += " AND #old_available = :old_available"
+            expr_names["#old_available"] = "is_available"
+            expr_values[":old_available"] = room.is_available
 
         for key, value in fields.items():
-            update_expr.append(f"{key} = :{key}")
+            update_expr.append(f"#{key} = :{key}")
+            expr_names[f"#{key}"] = key
             expr_values[f":{key}"] = value
 
+        update = {
+            "Key": {"pk": pk, "sk": sk},
+            "UpdateExpression": "SET " + ", ".join(update_expr),
+            "ExpressionAttributeNames": expr_names,
+            "ExpressionAttributeValues": expr_values,
+            "ConditionExpression": condition,
+        }
+
         try:
-            self.table.update_item(
-                Key={"pk": pk, "sk": sk},
-                UpdateExpression="SET " + ", ".join(update_expr),
-                ExpressionAttributeValues=expr_values,
-                ConditionExpression="attribute_exists(pk)",
+            if not available_delta:
+                self.table.update_item(**update)
+                return
+
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {"Update": {"TableName": self.table_name, **update}},
+                    *self._counter_updates(available_delta),
+                ]
             )
         except ClientError as e:
-            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            if e.response["Error"]["Code"] in (
+                "ConditionalCheckFailedException",
+                "TransactionCanceledException",
+            ):
                 raise AppException(
-                    message="Room not found",
+                    message="Room not found or modified concurrently",
                     status_code=status.HTTP_404_NOT_FOUND,
                 )
             raise AppException(
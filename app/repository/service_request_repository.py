@@ -1,25 +1,186 @@
-from typing import List
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from boto3.dynamodb.conditions import Key
 from app.app_exception.app_exception import AppException
 from fastapi import Depends, status
 from botocore.utils import ClientError
-from app.dependencies import get_ddb_resource, get_table_name
-from app.models.service_request import ServiceRequest, ServiceStatus
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from app.repository.booking_repository import (
+    TRANSACTION_ITEM_LIMIT,
+    folio_key,
+    request_flag_resets,
+)
+from app.repository.counter_repository import counter_updates, pending_counter
+from app.utils import ids
+from app.utils.pagination import query_all
+from app.utils.tenancy import hotel_key
+
+STATUS_TYPE_INDEX = "StatusTypeIndex"
+GUEST_INDEX = "GuestIndex"
+BOOKING_INDEX = "BookingIndex"
+ASSIGNEE_INDEX = "AssigneeIndex"
+CHANGES_INDEX = "ChangesIndex"
+ASSIGNEE_CHANGES_INDEX = "AssigneeChangesIndex"
+QUEUE_INDEX = "QueueIndex"
+CHANGES_PAGE_SIZE = 100
+ASSIGN_ATTEMPTS = 3
+STATUS_UPDATE_ATTEMPTS = 3
+DELETE_ATTEMPTS = 3
+BATCH_GET_LIMIT = 100
+REQUEST_FLAGS = {ServiceType.FOOD: "food_req", ServiceType.CLEANING: "clean_req"}
+NOT_PENDING_MESSAGE = "Service request not found or not pending"
 
 
 class ServiceRequestRepository:
     def __init__(
-        self, ddb_resource=Depends(get_ddb_resource), table_name=Depends(get_table_name)
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
     ) -> None:
+        self.ddb_resource = ddb_resource
         self.table = ddb_resource.Table(table_name)
         self.table_name = table_name
+        self.hotel_id = hotel_id
         self.ddb_client = ddb_resource.meta.client
 
+    def _pk(self, key: str) -> str:
+        return hotel_key(self.hotel_id, key)
+
+    def _key(self, service_request_id: str) -> Dict[str, str]:
+        return {
+            "pk": self._pk(f"ServiceRequest#{service_request_id}"),
+            "sk": "META",
+        }
+
+    def _index_keys(
+        self,
+        service_request_id: str,
+        service_type: str,
+        service_status: str,
+        user_id: str,
+        booking_id: str,
+        assigned_to: Optional[str],
+    ) -> Dict[str, Any]:
+        keys = {
+            "status_type": self._pk(f"{service_status}#{service_type}"),
+            "guest_pk": self._pk(f"User#{user_id}"),
+            "guest_sk": f"Made#{service_status}#{service_request_id}",
+            "booking_pk": self._pk(f"Booking#{booking_id}"),
+            "booking_sk": f"Service#{service_request_id}",
+        }
+        if assigned_to:
+            keys["assignee_pk"] = self._pk(f"User#{assigned_to}")
+            keys["assignee_sk"] = f"Service#{service_status}#{service_request_id}"
+        elif service_status == ServiceStatus.PENDING.value:
+            # sparse: only requests waiting for someone are in the queue
+            keys["queue_pk"] = self._pk(f"Queue#{service_type}")
+        return keys
+
+    def _changes_pk(self, day) -> str:
+        return self._pk(f"ServiceRequestChanges#{day.isoformat()}")
+
+    def _change_keys(self, change_id: Optional[str]) -> Dict[str, str]:
+        if not change_id:
+            return {}
+        return {
+            "change_id": change_id,
+            "changes_pk": self._changes_pk(ids.id_timestamp(change_id).date()),
+        }
+
+    def to_item(self, service_request: ServiceRequest) -> Dict[str, Any]:
+        return {
+            **self._change_keys(service_request.change_id),
+            **self._key(service_request.id),
+            **self._index_keys(
+                service_request.id,
+                service_request.type.value,
+                service_request.status.value,
+                service_request.user_id,
+                service_request.booking_id,
+                service_request.assigned_to,
+            ),
+            **service_request.model_dump(mode="json", exclude_none=True),
+        }
+
+    def _pending_counters(
+        self, service_requests: List[ServiceRequest], update_status: ServiceStatus
+    ) -> List[Dict[str, Any]]:
+        # the status conditions make each delta exact: a request only leaves
+        # Pending once
+        deltas: Dict[str, int] = defaultdict(int)
+        for service_request in service_requests:
+            was_pending = service_request.status == ServiceStatus.PENDING
+            is_pending = update_status == ServiceStatus.PENDING
+            deltas[pending_counter(service_request.type)] += int(is_pending) - int(
+                was_pending
+            )
+        return counter_updates(self.table_name, self.hotel_id, deltas)
+
+    def _deleted_counters(
+        self, service_requests: List[ServiceRequest]
+    ) -> List[Dict[str, Any]]:
+        deltas: Dict[str, int] = defaultdict(int)
+        for service_request in service_requests:
+            if service_request.status == ServiceStatus.PENDING:
+                deltas[pending_counter(service_request.type)] -= 1
+        return counter_updates(self.table_name, self.hotel_id, deltas)
+
+    def _load_key(self, employee_id: str) -> Dict[str, str]:
+        return {"pk": self._pk("OpenAssignments"), "sk": f"Employee#{employee_id}"}
+
+    def _load_updates(self, deltas: Dict[str, int]) -> List[Dict[str, Any]]:
+        # each employee's open tasks, changed in the same transaction as the
+        # assignments they count so dispatch reads every load with one query
+        return [
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    "Key": self._load_key(employee_id),
+                    "UpdateExpression": "ADD open_tasks :delta",
+                    "ExpressionAttributeValues": {":delta": delta},
+                }
+            }
+            for employee_id, delta in sorted(deltas.items())
+            if delta
+        ]
+
+    def _status_loads(
+        self, service_requests: List[ServiceRequest], update_status: ServiceStatus
+    ) -> List[Dict[str, Any]]:
+        if update_status == ServiceStatus.PENDING:
+            return []
+        return self._released_loads(service_requests)
+
+    @staticmethod
+    def _assignee_condition(
+        service_request: ServiceRequest, expr_values: Dict[str, Any]
+    ) -> str:
+        # holds only while the request has the assignee it was read with, so
+        # the load released with it is taken from the right employee
+        if service_request.assigned_to:
+            expr_values[":assigned_to"] = service_request.assigned_to
+            return "assigned_to = :assigned_to"
+        return "attribute_not_exists(assigned_to)"
+
+    def _released_loads(
+        self, service_requests: List[ServiceRequest]
+    ) -> List[Dict[str, Any]]:
+        # pending requests leaving their assignee, by completion or deletion
+        deltas: Dict[str, int] = defaultdict(int)
+        for service_request in service_requests:
+            if service_request.status == ServiceStatus.PENDING and (
+                service_request.assigned_to
+            ):
+                deltas[service_request.assigned_to] -= 1
+        return self._load_updates(deltas)
+
     def save_service_request(self, service_request: ServiceRequest) -> None:
-        sk1 = f"Service#{service_request.status.value}#{service_request.id}"
-        sk2 = f"Made#{service_request.status.value}#{service_request.id}"
-        sk3 = f"Service#{service_request.id}"
+        service_request.change_id = ids.new_id()
+        pending = int(service_request.status == ServiceStatus.PENDING)
 
         try:
             self.ddb_client.transact_write_items(
@@ -27,54 +188,24 @@ class ServiceRequestRepository:
                     {
                         "Put": {
                             "TableName": self.table_name,
-                            "Item": {
-                                "pk": "ServiceRequests",
-                                "sk": sk1,
-                                **service_request.model_dump(mode="json"),
-                            },
-                            "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
-                        }
-                    },
-                    {
-                        "Put": {
-                            "TableName": self.table_name,
-                            "Item": {
-                                "pk": f"User#{service_request.user_id}",
-                                "sk": sk2,
-                                **service_request.model_dump(mode="json"),
-                            },
-                            "ConditionExpression": "attribute_not_exists(pk) AND attribute_not_exists(sk)",
+                            "Item": self.to_item(service_request),
+                            "ConditionExpression": "attribute_not_exists(pk)",
                         }
                     },
-                    {
-                        "Put": {
-                            "TableName": self.table_name,
-                            "Item": {
-                                "pk": f"Booking#{service_request.booking_id}",
-                                "sk": sk3,
-                                "service_request_id": service_request.id,
-                                "user_id": service_request.user_id,
-                                "is_assigned": service_request.is_assigned,
-                                "assigned_to": service_request.assigned_to,
-                                "status": service_request.status.value,
-                            },
-                        },
-                    },
+                    *counter_updates(
+                        self.table_name,
+                        self.hotel_id,
+                        {pending_counter(service_request.type): pending},
+                    ),
                 ]
             )
 
         except ClientError as e:
-            error = e.response.get("Error", {})
-            code = error.get("Code")
-
-            if code == "TransactionCanceledException":
-                reasons = e.response.get("CancellationReasons", [])
-
-                if any(r.get("Code") == "ConditionalCheckFailed" for r in reasons):
-                    raise AppException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        message="Booking already exists",
-                    )
+            if e.response["Error"]["Code"] == "TransactionCanceledException":
+                raise AppException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    message="Service request already exists",
+                )
 
             raise AppException(
                 message="Failed to create service request",
@@ -82,125 +213,211 @@ class ServiceRequestRepository:
             )
 
     def get_all_pending_service_requests(self) -> List[ServiceRequest]:
-        try:
-            response = self.table.query(
-                KeyConditionExpression=Key("pk").eq("ServiceRequests")
-                & Key("sk").begins_with("Service#Pending#")
+        service_requests: List[ServiceRequest] = []
+        for service_type in ServiceType:
+            service_requests += self.query_service_requests_by_status_type(
+                ServiceStatus.PENDING, service_type
             )
 
-            items = response.get("Items", [])
+        return sorted(service_requests, key=lambda req: req.created_at)
+
+    def get_pending_service_requests_by_user_id(
+        self, user_id: str
+    ) -> List[ServiceRequest]:
+        try:
+            items = query_all(
+                self.table,
+                IndexName=GUEST_INDEX,
+                KeyConditionExpression=Key("guest_pk").eq(self._pk(f"User#{user_id}"))
+                & Key("guest_sk").begins_with("Made#Pending#"),
+            )
 
             return [ServiceRequest(**item) for item in items]
 
         except ClientError:
             raise AppException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                message="Failed to fetch pending service requests",
+                message="Failed to fetch user's pending service requests",
             )
 
-    def get_pending_service_requests_by_user_id(
-        self, user_id: str
+    def get_service_requests_by_booking_id(
+        self, booking_id: str
     ) -> List[ServiceRequest]:
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key("pk").eq(f"User#{user_id}")
-                & Key("sk").begins_with("Made#Pending#")
+            items = query_all(
+                self.table,
+                IndexName=BOOKING_INDEX,
+                KeyConditionExpression=Key("booking_pk").eq(
+                    self._pk(f"Booking#{booking_id}")
+                )
+                & Key("booking_sk").begins_with("Service#"),
             )
 
-            items = response.get("Items", [])
-
             return [ServiceRequest(**item) for item in items]
 
         except ClientError:
             raise AppException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                message="Failed to fetch user's pending service requests",
+                message="Failed to fetch booking's service requests",
             )
 
-    def assign_service_request(self, service_request_id: str, employee_id: str):
-        try:
-            response = self.table.get_item(
-                Key={
-                    "pk": "ServiceRequests",
-                    "sk": f"Service#Pending#{service_request_id}",
-                }
-            )
+    def _delete_op(self, service_request: ServiceRequest) -> Dict[str, Any]:
+        expr_values: Dict[str, Any] = {":status": service_request.status.value}
+        assignee = self._assignee_condition(service_request, expr_values)
+        return {
+            "Delete": {
+                "TableName": self.table_name,
+                "Key": self._key(service_request.id),
+                "ConditionExpression": f"#status = :status AND {assignee}",
+                "ExpressionAttributeNames": {"#status": "status"},
+                "ExpressionAttributeValues": expr_values,
+            }
+        }
 
-            item = response.get("Item")
-            if not item:
+    def delete_service_requests_by_booking(self, booking_id: str) -> None:
+        # each delete is conditioned on the status and assignee it was read
+        # with, so the counters and loads it takes back are exact; requests that changed
+        # meanwhile are read again and retried, and ones already gone dropped
+        service_requests = self.get_service_requests_by_booking_id(booking_id)
+
+        # each request may also release its assignee's load, and one slot is
+        # kept for the counter update
+        batch_size = (TRANSACTION_ITEM_LIMIT - 1) // 2
+        for start in range(0, len(service_requests), batch_size):
+            batch = service_requests[start : start + batch_size]
+            for _ in range(DELETE_ATTEMPTS):
+                if not batch:
+                    break
+                try:
+                    self.ddb_client.transact_write_items(
+                        TransactItems=[
+                            *(self._delete_op(r) for r in batch),
+                            *self._deleted_counters(batch),
+                            *self._released_loads(batch),
+                        ]
+                    )
+                    batch = []
+
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "TransactionCanceledException":
+                        raise AppException(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            message="Failed to delete booking's service requests",
+                        )
+                    batch = self.get_service_requests_by_ids(
+                        [service_request.id for service_request in batch]
+                    )
+
+            if batch:
                 raise AppException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    message="Service request not found or not pending",
+                    status_code=status.HTTP_409_CONFLICT,
+                    message="Booking's service requests kept changing, try again",
                 )
 
-            user_id = item["user_id"]
+    def query_service_requests_by_status_type(
+        self,
+        service_status: ServiceStatus,
+        service_type: ServiceType,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[ServiceRequest]:
+        key_condition = Key("status_type").eq(
+            self._pk(f"{service_status.value}#{service_type.value}")
+        )
+
+        if created_from is not None and created_to is not None:
+            key_condition &= Key("created_at").between(
+                created_from.isoformat(), created_to.isoformat()
+            )
+        elif created_from is not None:
+            key_condition &= Key("created_at").gte(created_from.isoformat())
+        elif created_to is not None:
+            key_condition &= Key("created_at").lte(created_to.isoformat())
+
+        try:
+            items = query_all(
+                self.table,
+                IndexName=STATUS_TYPE_INDEX,
+                KeyConditionExpression=key_condition,
+            )
+
+            return [ServiceRequest(**item) for item in items]
 
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch service requests",
+            )
+
+    def _assign_update(
+        self, service_request_id: str, employee_id: str, change_id: str
+    ) -> Dict[str, Any]:
+        change_keys = self._change_keys(change_id)
+
+        return {
+            "Key": self._key(service_request_id),
+            "UpdateExpression": """
+                SET is_assigned = :true,
+                    assigned_to = :emp,
+                    assignee_pk = :assignee_pk,
+                    assignee_sk = :assignee_sk,
+                    change_id = :change_id,
+                    changes_pk = :changes_pk
+                REMOVE queue_pk
+            """,
+            "ConditionExpression": "attribute_exists(pk) AND #status = :pending AND is_assigned = :false",
+            "ExpressionAttributeNames": {
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": {
+                ":true": True,
+                ":false": False,
+                ":emp": employee_id,
+                ":pending": ServiceStatus.PENDING.value,
+                ":assignee_pk": self._pk(f"User#{employee_id}"),
+                ":assignee_sk": f"Service#{ServiceStatus.PENDING.value}#{service_request_id}",
+                ":change_id": change_keys["change_id"],
+                ":changes_pk": change_keys["changes_pk"],
+            },
+        }
+
+    def assign_service_request(
+        self, service_request_id: str, employee_id: str
+    ) -> ServiceRequest:
+        try:
+            # through the client, which unlike the table resource is safe to
+            # share with the bulk assignment worker threads
             self.ddb_client.transact_write_items(
                 TransactItems=[
                     {
                         "Update": {
                             "TableName": self.table_name,
-                            "Key": {
-                                "pk": "ServiceRequests",
-                                "sk": f"Service#Pending#{service_request_id}",
-                            },
-                            "UpdateExpression": """
-                                SET is_assigned = :true,
-                                    assigned_to = :emp
-                            """,
-                            "ConditionExpression": "attribute_exists(pk) AND is_assigned = :false",
-                            "ExpressionAttributeValues": {
-                                ":true": True,
-                                ":false": False,
-                                ":emp": employee_id,
-                            },
-                        }
-                    },
-                    {
-                        "Update": {
-                            "TableName": self.table_name,
-                            "Key": {
-                                "pk": f"User#{user_id}",
-                                "sk": f"Made#Pending#{service_request_id}",
-                            },
-                            "UpdateExpression": """
-                                SET is_assigned = :true,
-                                    assigned_to = :emp
-                            """,
-                            "ConditionExpression": "attribute_exists(pk)",
-                            "ExpressionAttributeValues": {
-                                ":true": True,
-                                ":emp": employee_id,
-                            },
-                        }
-                    },
-                    {
-                        "Put": {
-                            "TableName": self.table_name,
-                            "Item": {
-                                "pk": f"User#{employee_id}",
-                                "sk": f"Service#Pending#{service_request_id}",
-                                "id": item["id"],
-                                "user_id": item["user_id"],
-                                "booking_id": item["booking_id"],
-                                "room_num": int(item["room_num"]),
-                                "type": item["type"],
-                                "status": item["status"],
-                                "is_assigned": item["is_assigned"],
-                                "assigned_to": item["assigned_to"],
-                                "details": item["details"],
-                                "created_at": item["created_at"],
-                            },
-                            "ConditionExpression": "attribute_not_exists(pk)",
+                            **self._assign_update(
+                                service_request_id, employee_id, ids.new_id()
+                            ),
+                            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
                         }
                     },
+                    *self._load_updates({employee_id: 1}),
                 ]
             )
+            response = self.ddb_client.get_item(
+                TableName=self.table_name,
+                Key=self._key(service_request_id),
+                ConsistentRead=True,
+            )
+            return ServiceRequest(**response["Item"])
 
         except ClientError as e:
             code = e.response.get("Error", {}).get("Code")
 
             if code == "TransactionCanceledException":
+                reasons = e.response.get("CancellationReasons", [{}])
+                if not reasons[0].get("Item"):
+                    raise AppException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        message="Service request not found or not pending",
+                    )
                 raise AppException(
                     status_code=status.HTTP_409_CONFLICT,
                     message="Service request already assigned or state changed",
@@ -211,17 +428,168 @@ class ServiceRequestRepository:
                 message="Failed to assign service request",
             )
 
+    def assign_service_requests(
+        self, assignments: List[Tuple[ServiceRequest, str]]
+    ) -> List[ServiceRequest]:
+        # assignments commit together with their assignees' loads; requests
+        # taken by someone else meanwhile are dropped and the rest retried
+        assigned: List[ServiceRequest] = []
+
+        # half of each transaction is kept for the assignees' loads
+        batch_size = TRANSACTION_ITEM_LIMIT // 2
+        for start in range(0, len(assignments), batch_size):
+            batch = assignments[start : start + batch_size]
+            for _ in range(ASSIGN_ATTEMPTS):
+                if not batch:
+                    break
+                change_ids = [ids.new_id() for _ in batch]
+                loads: Dict[str, int] = defaultdict(int)
+                for _, employee_id in batch:
+                    loads[employee_id] += 1
+                try:
+                    self.ddb_client.transact_write_items(
+                        TransactItems=[
+                            *(
+                                {
+                                    "Update": {
+                                        "TableName": self.table_name,
+                                        **self._assign_update(
+                                            service_request.id, employee_id, change_id
+                                        ),
+                                    }
+                                }
+                                for (service_request, employee_id), change_id in zip(
+                                    batch, change_ids
+                                )
+                            ),
+                            *self._load_updates(loads),
+                        ]
+                    )
+                    assigned += [
+                        service_request.model_copy(
+                            update={
+                                "is_assigned": True,
+                                "assigned_to": employee_id,
+                                "change_id": change_id,
+                            }
+                        )
+                        for (service_request, employee_id), change_id in zip(
+                            batch, change_ids
+                        )
+                    ]
+                    break
+
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "TransactionCanceledException":
+                        raise AppException(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            message="Failed to assign service requests",
+                        )
+                    reasons = e.response.get("CancellationReasons", [])
+                    batch = [
+                        assignment
+                        for assignment, reason in zip(batch, reasons)
+                        if reason.get("Code") != "ConditionalCheckFailed"
+                    ]
+
+        return assigned
+
+    def get_queued_service_requests(
+        self, service_type: ServiceType, limit: int
+    ) -> List[ServiceRequest]:
+        kwargs: Dict[str, Any] = {
+            "IndexName": QUEUE_INDEX,
+            "KeyConditionExpression": Key("queue_pk").eq(
+                self._pk(f"Queue#{service_type.value}")
+            ),
+        }
+        queued: List[ServiceRequest] = []
+
+        try:
+            while len(queued) < limit:
+                response = self.table.query(**kwargs, Limit=limit - len(queued))
+                queued += [ServiceRequest(**item) for item in response.get("Items", [])]
+
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs["ExclusiveStartKey"] = last_key
+
+            return queued
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch queued service requests",
+            )
+
+    def count_open_assignments(self, employee_id: str) -> int:
+        kwargs: Dict[str, Any] = {
+            "IndexName": ASSIGNEE_INDEX,
+            "KeyConditionExpression": Key("assignee_pk").eq(
+                self._pk(f"User#{employee_id}")
+            )
+            & Key("assignee_sk").begins_with("Service#Pending#"),
+            "Select": "COUNT",
+        }
+        count = 0
+
+        try:
+            while True:
+                response = self.table.query(**kwargs)
+                count += response.get("Count", 0)
+
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    return count
+                kwargs["ExclusiveStartKey"] = last_key
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to count assigned service requests",
+            )
+
+    def get_open_assignments(self, consistent: bool = False) -> Dict[str, int]:
+        try:
+            items = query_all(
+                self.table,
+                KeyConditionExpression=Key("pk").eq(self._pk("OpenAssignments")),
+                ConsistentRead=consistent,
+            )
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch open assignments",
+            )
+
+        return {
+            item["sk"].split("#", 1)[1]: int(item.get("open_tasks", 0))
+            for item in items
+        }
+
+    def add_open_tasks(self, employee_id: str, delta: int) -> None:
+        # outside any transaction, for reconciling a load with its requests
+        try:
+            for op in self._load_updates({employee_id: delta}):
+                self.ddb_client.update_item(**op["Update"])
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to update open assignments",
+            )
+
     def get_assigned_service_requests(self, employee_id: str) -> List[ServiceRequest]:
         try:
-            response = self.table.query(
+            items = query_all(
+                self.table,
+                IndexName=ASSIGNEE_INDEX,
                 KeyConditionExpression=(
-                    Key("pk").eq(f"User#{employee_id}")
-                    & Key("sk").begins_with("Service#Pending#")
-                )
+                    Key("assignee_pk").eq(self._pk(f"User#{employee_id}"))
+                    & Key("assignee_sk").begins_with("Service#Pending#")
+                ),
             )
 
-            items = response.get("Items", [])
-
             service_requests: List[ServiceRequest] = []
 
             for item in items:
@@ -235,20 +603,206 @@ class ServiceRequestRepository:
                 message="Failed to fetch assigned pending service requests",
             )
 
-    def get_service_request_by_id(self, service_request_id: str) -> ServiceRequest:
+    def assigned_pending_pages(
+        self, employee_id: str, page_size: int = TRANSACTION_ITEM_LIMIT
+    ) -> Iterator[List[ServiceRequest]]:
+        kwargs: Dict[str, Any] = {
+            "IndexName": ASSIGNEE_INDEX,
+            "KeyConditionExpression": Key("assignee_pk").eq(
+                self._pk(f"User#{employee_id}")
+            )
+            & Key("assignee_sk").begins_with("Service#Pending#"),
+            "Limit": page_size,
+        }
+
         try:
-            response = self.table.get_item(
-                Key={
-                    "pk": "ServiceRequests",
-                    "sk": f"Service#Pending#{service_request_id}",
-                }
+            while True:
+                response = self.table.query(**kwargs)
+                page = [ServiceRequest(**item) for item in response.get("Items", [])]
+                if page:
+                    yield page
+
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    return
+                kwargs["ExclusiveStartKey"] = last_key
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch assigned pending service requests",
+            )
+
+    def _unassign_update(
+        self, service_request: ServiceRequest, employee_id: str
+    ) -> Dict[str, Any]:
+        service_request.change_id = ids.new_id()
+        change_keys = self._change_keys(service_request.change_id)
+
+        return {
+            "Key": self._key(service_request.id),
+            "UpdateExpression": """
+                SET is_assigned = :false,
+                    queue_pk = :queue_pk,
+                    change_id = :change_id,
+                    changes_pk = :changes_pk
+                REMOVE assigned_to, assignee_pk, assignee_sk
+            """,
+            "ConditionExpression": "#status = :pending AND assigned_to = :emp",
+            "ExpressionAttributeNames": {
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": {
+                ":false": False,
+                ":emp": employee_id,
+                ":pending": ServiceStatus.PENDING.value,
+                ":queue_pk": self._pk(f"Queue#{service_request.type.value}"),
+                ":change_id": change_keys["change_id"],
+                ":changes_pk": change_keys["changes_pk"],
+            },
+        }
+
+    def _unassigned_change(
+        self, service_request: ServiceRequest, employee_id: str
+    ) -> Dict[str, Any]:
+        # the request leaves the employee's assignee partition, so the change
+        # is kept there for their feed; without assignee_sk it stays out of
+        # AssigneeIndex
+        unassigned = service_request.model_copy(
+            update={"is_assigned": False, "assigned_to": None}
+        )
+        return {
+            "Put": {
+                "TableName": self.table_name,
+                "Item": {
+                    "pk": self._pk(f"User#{employee_id}"),
+                    "sk": f"Unassigned#{service_request.change_id}",
+                    "assignee_pk": self._pk(f"User#{employee_id}"),
+                    **unassigned.model_dump(mode="json", exclude_none=True),
+                },
+            }
+        }
+
+    def unassign_service_requests(
+        self, service_requests: List[ServiceRequest], employee_id: str
+    ) -> List[ServiceRequest]:
+        # puts the employee's pending requests back in the queue; ones that
+        # were finished or moved meanwhile are dropped and the rest retried
+        unassigned: List[ServiceRequest] = []
+
+        # each request is an update and a change for the old assignee's
+        # feed, and one slot is kept for the employee's load
+        batch_size = (TRANSACTION_ITEM_LIMIT - 1) // 2
+        for start in range(0, len(service_requests), batch_size):
+            batch = service_requests[start : start + batch_size]
+            for _ in range(ASSIGN_ATTEMPTS):
+                if not batch:
+                    break
+                try:
+                    self.ddb_client.transact_write_items(
+                        TransactItems=[
+                            *(
+                                op
+                                for service_request in batch
+                                for op in (
+                                    {
+                                        "Update": {
+                                            "TableName": self.table_name,
+                                            **self._unassign_update(
+                                                service_request, employee_id
+                                            ),
+                                        }
+                                    },
+                                    self._unassigned_change(
+                                        service_request, employee_id
+                                    ),
+                                )
+                            ),
+                            *self._load_updates({employee_id: -len(batch)}),
+                        ]
+                    )
+                    unassigned += batch
+                    break
+
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "TransactionCanceledException":
+                        raise AppException(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            message="Failed to unassign service requests",
+                        )
+                    # every request's update comes first of its two ops
+                    reasons = e.response.get("CancellationReasons", [])[::2]
+                    batch = [
+                        service_request
+                        for service_request, reason in zip(batch, reasons)
+                        if reason.get("Code") != "ConditionalCheckFailed"
+                    ]
+
+        return [
+            service_request.model_copy(
+                update={"is_assigned": False, "assigned_to": None}
+            )
+            for service_request in unassigned
+        ]
+
+    def get_changes_since(
+        self, since: str, limit: int = CHANGES_PAGE_SIZE
+    ) -> List[ServiceRequest]:
+        day = ids.id_timestamp(since).date()
+        today = datetime.now(timezone.utc).date()
+        changes: List[ServiceRequest] = []
+
+        try:
+            while day <= today and len(changes) < limit:
+                response = self.table.query(
+                    IndexName=CHANGES_INDEX,
+                    KeyConditionExpression=Key("changes_pk").eq(self._changes_pk(day))
+                    & Key("change_id").gt(since),
+                    Limit=limit - len(changes),
+                )
+                changes += [
+                    ServiceRequest(**item) for item in response.get("Items", [])
+                ]
+                day += timedelta(days=1)
+
+            return changes
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch service request changes",
             )
 
+    def get_assigned_changes_since(
+        self, employee_id: str, since: str, limit: int = CHANGES_PAGE_SIZE
+    ) -> List[ServiceRequest]:
+        try:
+            response = self.table.query(
+                IndexName=ASSIGNEE_CHANGES_INDEX,
+                KeyConditionExpression=Key("assignee_pk").eq(
+                    self._pk(f"User#{employee_id}")
+                )
+                & Key("change_id").gt(since),
+                Limit=limit,
+            )
+
+            return [ServiceRequest(**item) for item in response.get("Items", [])]
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch assigned service request changes",
+            )
+
+    def get_service_request_by_id(self, service_request_id: str) -> ServiceRequest:
+        try:
+            response = self.table.get_item(Key=self._key(service_request_id))
+
             item = response.get("Item")
             if not item:
                 raise AppException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    message="Service request not found or not pending",
+                    message="Service request not found",
                 )
 
             return ServiceRequest(**item)
@@ -259,130 +813,303 @@ class ServiceRequestRepository:
                 message="Failed to fetch service request",
             )
 
+    def claim_escalation(self, service_request_id: str, stage: int) -> bool:
+        # stages only move forward, so of the instances racing to escalate a
+        # request the first write wins and the others see it already claimed
+        try:
+            self.table.update_item(
+                Key=self._key(service_request_id),
+                UpdateExpression="SET escalated_stage = :stage",
+                ConditionExpression="attribute_exists(pk) AND "
+                "(attribute_not_exists(escalated_stage) OR escalated_stage < :stage)",
+                ExpressionAttributeValues={":stage": stage},
+            )
+            return True
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to claim service request escalation",
+            )
+
+    def release_escalation(self, service_request_id: str, stage: int) -> None:
+        # hands back a claim whose alert could not be sent
+        try:
+            self.table.update_item(
+                Key=self._key(service_request_id),
+                UpdateExpression="SET escalated_stage = :previous",
+                ConditionExpression="escalated_stage = :stage",
+                ExpressionAttributeValues={":stage": stage, ":previous": stage - 1},
+            )
+
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to release service request escalation",
+            )
+
+    def get_service_requests_by_ids(
+        self, service_request_ids: List[str]
+    ) -> List[ServiceRequest]:
+        service_requests: List[ServiceRequest] = []
+
+        try:
+            for start in range(0, len(service_request_ids), BATCH_GET_LIMIT):
+                request_items: Dict[str, Any] = {
+                    self.table_name: {
+                        "Keys": [
+                            self._key(service_request_id)
+                            for service_request_id in service_request_ids[
+                                start : start + BATCH_GET_LIMIT
+                            ]
+                        ]
+                    }
+                }
+                while request_items:
+                    response = self.ddb_resource.batch_get_item(
+                        RequestItems=request_items
+                    )
+                    service_requests += [
+                        ServiceRequest(**item)
+                        for item in response.get("Responses", {}).get(
+                            self.table_name, []
+                        )
+                    ]
+                    request_items = response.get("UnprocessedKeys") or {}
+
+            return service_requests
+
+        except ClientError:
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to fetch service requests",
+            )
+
+    def _status_update(
+        self,
+        service_request: ServiceRequest,
+        update_status: ServiceStatus,
+        charge: int = 0,
+    ) -> Dict[str, Any]:
+        index_keys = self._index_keys(
+            service_request.id,
+            service_request.type.value,
+            update_status.value,
+            service_request.user_id,
+            service_request.booking_id,
+            service_request.assigned_to,
+        )
+        service_request.change_id = ids.new_id()
+        index_keys.update(self._change_keys(service_request.change_id))
+
+        set_expr = ["#status = :new_status"]
+        expr_values: Dict[str, Any] = {
+            ":new_status": update_status.value,
+            ":old_status": service_request.status.value,
+        }
+        for attr in (
+            "status_type",
+            "guest_sk",
+            "assignee_sk",
+            "change_id",
+            "changes_pk",
+        ):
+            if attr in index_keys:
+                set_expr.append(f"{attr} = :{attr}")
+                expr_values[f":{attr}"] = index_keys[attr]
+
+        if charge:
+            set_expr.append("charge = :charge")
+            expr_values[":charge"] = charge
+
+        remove_expr = "" if "queue_pk" in index_keys else " REMOVE queue_pk"
+
+        return {
+            "Key": self._key(service_request.id),
+            "UpdateExpression": "SET " + ", ".join(set_expr) + remove_expr,
+            "ConditionExpression": "attribute_exists(pk) AND #status = :old_status AND "
+            + self._assignee_condition(service_request, expr_values),
+            "ExpressionAttributeNames": {
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": expr_values,
+        }
+
     def update_service_request(
         self,
-        service_request_id: str,
+        service_request: ServiceRequest,
         update_status: ServiceStatus,
+        charge: int = 0,
     ) -> None:
+        update = self._status_update(service_request, update_status, charge)
+        # the charge lands on the folio in the same transaction as the status
+        related = [
+            *(
+                [self._folio_charge(service_request.booking_id, charge, 1)]
+                if charge
+                else []
+            ),
+            *self._pending_counters([service_request], update_status),
+            *self._status_loads([service_request], update_status),
+        ]
+
         try:
-            response = self.table.get_item(
-                Key={
-                    "pk": "ServiceRequests",
-                    "sk": f"Service#Pending#{service_request_id}",
-                }
+            if not related:
+                self.table.update_item(**update)
+                return
+
+            self.ddb_client.transact_write_items(
+                TransactItems=[
+                    {"Update": {"TableName": self.table_name, **update}},
+                    *related,
+                ]
             )
 
-            item = response.get("Item")
-            if not item:
+        except ClientError as e:
+            if e.response["Error"]["Code"] in (
+                "ConditionalCheckFailedException",
+                "TransactionCanceledException",
+            ):
                 raise AppException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    message="Service request not found or not pending",
+                    message=NOT_PENDING_MESSAGE,
                 )
 
-            user_id = item["user_id"]
-            booking_id = item["booking_id"]
-            employee_id = item.get("assigned_to")
-            old_status = item["status"]
-
-            new_status = update_status.value
-
-            transact_items = []
+            raise AppException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                message="Failed to update service request status",
+            )
 
-            transact_items += [
-                {
-                    "Delete": {
-                        "TableName": self.table_name,
-                        "Key": {
-                            "pk": "ServiceRequests",
-                            "sk": f"Service#{old_status}#{service_request_id}",
-                        },
-                    }
-                },
-                {
-                    "Put": {
-                        "TableName": self.table_name,
-                        "Item": {
-                            **item,
-                            "pk": "ServiceRequests",
-                            "sk": f"Service#{new_status}#{service_request_id}",
-                            "status": new_status,
-                        },
-                    }
-                },
-            ]
-
-            transact_items += [
-                {
-                    "Delete": {
-                        "TableName": self.table_name,
-                        "Key": {
-                            "pk": f"User#{user_id}",
-                            "sk": f"Made#{old_status}#{service_request_id}",
-                        },
-                    }
-                },
-                {
-                    "Put": {
-                        "TableName": self.table_name,
-                        "Item": {
-                            **item,
-                            "pk": f"User#{user_id}",
-                            "sk": f"Made#{new_status}#{service_request_id}",
-                            "status": new_status,
-                        },
-                    }
+    def _folio_charge(self, booking_id: str, charge: int, count: int) -> Dict[str, Any]:
+        return {
+            "Update": {
+                "TableName": self.table_name,
+                "Key": folio_key(self.hotel_id, booking_id),
+                "UpdateExpression": "ADD service_charges :charge, service_count :count",
+                "ExpressionAttributeValues": {
+                    ":charge": charge,
+                    ":count": count,
                 },
-            ]
-
-            transact_items.append(
-                {
-                    "Update": {
-                        "TableName": self.table_name,
-                        "Key": {
-                            "pk": f"Booking#{booking_id}",
-                            "sk": f"Service#{service_request_id}",
-                        },
-                        "UpdateExpression": "SET #s = :new_status",
-                        "ExpressionAttributeNames": {
-                            "#s": "status",
-                        },
-                        "ExpressionAttributeValues": {
-                            ":new_status": new_status,
-                        },
-                    }
+            }
+        }
+
+    def _status_group_ops(
+        self,
+        service_requests: List[ServiceRequest],
+        update_status: ServiceStatus,
+        charges: Dict[str, int],
+    ) -> List[Dict[str, Any]]:
+        # one booking's requests, its flag resets and folio charge; a booking
+        # appears once per transaction since DynamoDB rejects two actions on
+        # one item
+        ops: List[Dict[str, Any]] = [
+            {
+                "Update": {
+                    "TableName": self.table_name,
+                    **self._status_update(
+                        service_request,
+                        update_status,
+                        charges.get(service_request.id, 0),
+                    ),
                 }
+            }
+            for service_request in service_requests
+        ]
+        first = service_requests[0]
+        if update_status == ServiceStatus.DONE:
+            ops += request_flag_resets(
+                self.table_name,
+                self.hotel_id,
+                first.user_id,
+                first.booking_id,
+                sorted({REQUEST_FLAGS[r.type] for r in service_requests}),
             )
+        charged = [charges[r.id] for r in service_requests if charges.get(r.id)]
+        if charged:
+            ops.append(self._folio_charge(first.booking_id, sum(charged), len(charged)))
+        return ops
 
-            if employee_id:
-                transact_items += [
-                    {
-                        "Delete": {
-                            "TableName": self.table_name,
-                            "Key": {
-                                "pk": f"User#{employee_id}",
-                                "sk": f"Service#{old_status}#{service_request_id}",
-                            },
-                        }
-                    },
-                    {
-                        "Put": {
-                            "TableName": self.table_name,
-                            "Item": {
-                                "pk": f"User#{employee_id}",
-                                "sk": f"Service#{new_status}#{service_request_id}",
-                                "service_request_id": service_request_id,
-                                "user_id": user_id,
-                                "room_num": item["room_num"],
-                                "status": new_status,
-                            },
-                        }
-                    },
+    def update_service_requests_status(
+        self,
+        service_requests: List[ServiceRequest],
+        update_status: ServiceStatus,
+        charges: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, str]:
+        # returns the failure message of each request that was not updated;
+        # charges are billed to each booking's folio in the same transaction
+        charges = charges or {}
+        failed: Dict[str, str] = {}
+        by_booking: Dict[str, List[ServiceRequest]] = defaultdict(list)
+        for service_request in service_requests:
+            by_booking[service_request.booking_id].append(service_request)
+
+        # one slot of each transaction is kept for the pending counters, and
+        # one for each assignee whose load the batch releases
+        batches: List[List[List[ServiceRequest]]] = [[]]
+        batch_size = 0
+        batch_assignees: Set[str] = set()
+        for group in by_booking.values():
+            group_size = len(self._status_group_ops(group, update_status, charges))
+            assignees = batch_assignees | {
+                r.assigned_to for r in group if r.assigned_to
+            }
+            if batch_size + group_size + len(assignees) > TRANSACTION_ITEM_LIMIT - 1:
+                batches.append([])
+                batch_size = 0
+                assignees = {r.assigned_to for r in group if r.assigned_to}
+            batches[-1].append(group)
+            batch_size += group_size
+            batch_assignees = assignees
+
+        for batch in batches:
+            for _ in range(STATUS_UPDATE_ATTEMPTS):
+                if not batch:
+                    break
+                group_ops = [
+                    self._status_group_ops(group, update_status, charges)
+                    for group in batch
                 ]
+                batch_requests = [r for group in batch for r in group]
+                related = self._pending_counters(
+                    batch_requests, update_status
+                ) + self._status_loads(batch_requests, update_status)
+                try:
+                    self.ddb_client.transact_write_items(
+                        TransactItems=[op for ops in group_ops for op in ops] + related
+                    )
+                    batch = []
+                    break
 
-            self.ddb_client.transact_write_items(TransactItems=transact_items)
+                except ClientError as e:
+                    if e.response["Error"]["Code"] != "TransactionCanceledException":
+                        raise AppException(
+                            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                            message="Failed to update service request statuses",
+                        )
+                    reasons = iter(e.response.get("CancellationReasons", []))
+                    retry: List[List[ServiceRequest]] = []
+                    for group, ops in zip(batch, group_ops):
+                        codes = [next(reasons, {}).get("Code") for _ in ops]
+                        if "ConditionalCheckFailed" in codes[len(group) :]:
+                            for service_request in group:
+                                failed[service_request.id] = "Booking not found"
+                            continue
+                        for service_request, code in zip(group, codes):
+                            if code == "ConditionalCheckFailed":
+                                failed[service_request.id] = NOT_PENDING_MESSAGE
+                        remaining = [r for r in group if r.id not in failed]
+                        if remaining:
+                            retry.append(remaining)
+                    batch = retry
 
-        except ClientError:
-            raise AppException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                message="Failed to update service request status",
-            )
+            for group in batch:
+                for service_request in group:
+                    failed[service_request.id] = (
+                        "Service request changed concurrently, try again"
+                    )
+
+        return failed
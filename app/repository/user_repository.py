@@ -1,9 +1,14 @@
+from typing import Any, Dict, List
+
 from boto3.dynamodb.conditions import Key
 from botocore.utils import ClientError
 from fastapi import Depends, status
 from app.app_exception.app_exception import AppException
-from app.dependencies import get_ddb_resource, get_table_name
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
 from app.models import users
+from app.utils.tenancy import hotel_key
+
+BATCH_GET_LIMIT = 100
 
 
 class UserRepository:
@@ -11,9 +16,12 @@ class UserRepository:
         self,
         table_name=Depends(get_table_name),
         ddb_resource=Depends(get_ddb_resource),
+        hotel_id: str = Depends(get_hotel_id),
     ) -> None:
+        self.ddb_resource = ddb_resource
         self.table = ddb_resource.Table(table_name)
         self.table_name = table_name
+        self.hotel_id = hotel_id
         self.ddb_client = ddb_resource.meta.client
 
     def save_user(self, user: users.User) -> None:
@@ -24,7 +32,7 @@ class UserRepository:
                         "Put": {
                             "TableName": self.table_name,
                             "Item": {
-                                "pk": f"User#{user.id}",
+                                "pk": hotel_key(self.hotel_id, f"User#{user.id}"),
                                 "sk": "PROFILE",
                                 **user.model_dump(),
                             },
@@ -34,7 +42,7 @@ class UserRepository:
                         "Put": {
                             "TableName": self.table_name,
                             "Item": {
-                                "pk": f"Email#{user.email}",
+                                "pk": hotel_key(self.hotel_id, f"Email#{user.email}"),
                                 "sk": "USER",
                                 "user_id": user.id,
                             },
@@ -62,7 +70,8 @@ class UserRepository:
         try:
             email_resp = self.table.query(
                 KeyConditionExpression=(
-                    Key("pk").eq(f"Email#{email}") & Key("sk").eq("USER")
+                    Key("pk").eq(hotel_key(self.hotel_id, f"Email#{email}"))
+                    & Key("sk").eq("USER")
                 ),
                 Limit=1,
             )
@@ -84,7 +93,7 @@ class UserRepository:
         try:
             user_resp = self.table.get_item(
                 Key={
-                    "pk": f"User#{user_id}",
+                    "pk": hotel_key(self.hotel_id, f"User#{user_id}"),
                     "sk": "PROFILE",
                 },
                 ConsistentRead=True,
@@ -113,7 +122,7 @@ class UserRepository:
         try:
             user_resp = self.table.get_item(
                 Key={
-                    "pk": f"User#{user_id}",
+                    "pk": hotel_key(self.hotel_id, f"User#{user_id}"),
                     "sk": "PROFILE",
                 },
                 ConsistentRead=True,
@@ -138,3 +147,42 @@ class UserRepository:
         return users.User(
             **item,
         )
+
+    def get_users_by_ids(self, user_ids: List[str]) -> Dict[str, users.User]:
+        found: Dict[str, users.User] = {}
+
+        try:
+            for start in range(0, len(user_ids), BATCH_GET_LIMIT):
+                request_items: Dict[str, Any] = {
+                    self.table_name: {
+                        "Keys": [
+                            {
+                                "pk": hotel_key(self.hotel_id, f"User#{user_id}"),
+                                "sk": "PROFILE",
+                            }
+                            for user_id in user_ids[start : start + BATCH_GET_LIMIT]
+                        ],
+                        "ConsistentRead": True,
+                        "ProjectionExpression": "id, email, #name, password, #role, available",
+                        "ExpressionAttributeNames": {
+                            "#name": "name",
+                            "#role": "role",
+                        },
+                    }
+                }
+                while request_items:
+                    response = self.ddb_resource.batch_get_item(
+                        RequestItems=request_items
+                    )
+                    for item in response.get("Responses", {}).get(self.table_name, []):
+                        user = users.User(**item)
+                        found[user.id] = user
+                    request_items = response.get("UnprocessedKeys") or {}
+
+        except ClientError:
+            raise AppException(
+                message="Failed to fetch user profiles",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return found
@@ -0,0 +1,154 @@
+import logging
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Key
+from botocore.utils import ClientError
+from fastapi import Depends, status
+
+from app.app_exception.app_exception import AppException
+from app.dependencies import get_ddb_resource, get_hotel_id, get_table_name
+from app.utils.pagination import query_all
+from app.utils.tenancy import hotel_key
+
+META_SK = "META"
+
+Entries = Dict[str, Dict[str, Any]]
+
+logger = logging.getLogger(__name__)
+
+
+def _plain(value: Any) -> Any:
+    # the resource hands numbers back as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+class ViewRepository:
+    # A per-day read model stored as one item per entry under one partition.
+    # Every change is a put, delete or attribute update of its own item, so
+    # concurrent writers never conflict and no single item grows with the
+    # hotel; the META item marks the day as built.
+    VIEW = ""
+    VIEW_NAME = ""
+
+    def __init__(
+        self,
+        ddb_resource=Depends(get_ddb_resource),
+        table_name=Depends(get_table_name),
+        hotel_id: str = Depends(get_hotel_id),
+    ) -> None:
+        self.table = ddb_resource.Table(table_name)
+        self.table_name = table_name
+        self.hotel_id = hotel_id
+
+    def _pk(self, day: date) -> str:
+        return hotel_key(self.hotel_id, f"{self.VIEW}#{day.isoformat()}")
+
+    def _key(self, day: date, entry_key: str) -> Dict[str, str]:
+        return {"pk": self._pk(day), "sk": entry_key}
+
+    def _query(self, day: date, **kwargs: Any) -> List[Dict[str, Any]]:
+        return query_all(
+            self.table,
+            KeyConditionExpression=Key("pk").eq(self._pk(day)),
+            ConsistentRead=True,
+            **kwargs,
+        )
+
+    def get_entries(self, day: date) -> Optional[Entries]:
+        try:
+            items = self._query(day)
+        except ClientError:
+            raise AppException(
+                message=f"Failed to fetch {self.VIEW_NAME}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        entries: Entries = {}
+        for item in items:
+            item.pop("pk")
+            entry_key = item.pop("sk")
+            entries[entry_key] = _plain(item)
+        # entries recorded before the day was built are not a view yet
+        return entries if META_SK in entries else None
+
+    def replace_entries(self, day: date, build: Callable[[], Entries]) -> Entries:
+        # keys are listed before the sources are read, so an entry recorded
+        # while the build runs is not deleted as stale
+        try:
+            stale = {item["sk"] for item in self._query(day, ProjectionExpression="sk")}
+            entries = build()
+            entries[META_SK] = {"built_at": datetime.now(timezone.utc).isoformat()}
+
+            with self.table.batch_writer() as batch:
+                for entry_key in stale - entries.keys():
+                    batch.delete_item(Key=self._key(day, entry_key))
+                for entry_key, entry in entries.items():
+                    batch.put_item(Item={**self._key(day, entry_key), **entry})
+            return entries
+
+        except ClientError:
+            raise AppException(
+                message=f"Failed to save {self.VIEW_NAME}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def save_entries(
+        self, day: date, entries: Dict[str, Optional[Dict[str, Any]]]
+    ) -> None:
+        # whole entries are written from their source rows; None deletes one.
+        # The change itself is already stored, so a failed write must not fail
+        # the request: it is logged, and the next build restores the entry.
+        try:
+            with self.table.batch_writer() as batch:
+                for entry_key, entry in entries.items():
+                    if entry is None:
+                        batch.delete_item(Key=self._key(day, entry_key))
+                    else:
+                        batch.put_item(Item={**self._key(day, entry_key), **entry})
+
+        except ClientError:
+            logger.exception(
+                "Lost %s update for hotel %s on %s: %s",
+                self.VIEW_NAME,
+                self.hotel_id,
+                day.isoformat(),
+                sorted(entries),
+            )
+
+    def update_entries(self, day: date, updates: Dict[str, Dict[str, Any]]) -> None:
+        # sets fields on entries already in the view; keys that are not in it
+        # are skipped rather than created half filled. Failures are logged
+        # like those of save_entries.
+        for entry_key, fields in updates.items():
+            try:
+                self.table.update_item(
+                    Key=self._key(day, entry_key),
+                    UpdateExpression="SET "
+                    + ", ".join(f"#f{i} = :f{i}" for i in range(len(fields))),
+                    ConditionExpression="attribute_exists(pk)",
+                    ExpressionAttributeNames={
+                        f"#f{i}": field for i, field in enumerate(fields)
+                    },
+                    ExpressionAttributeValues={
+                        f":f{i}": value for i, value in enumerate(fields.values())
+                    },
+                )
+
+            except ClientError as e:
+                if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                    continue
+                logger.exception(
+                    "Lost %s update for hotel %s on %s: %s",
+                    self.VIEW_NAME,
+                    self.hotel_id,
+                    day.isoformat(),
+                    entry_key,
+                )
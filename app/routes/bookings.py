@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, status
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
 from app.response.response import APIResponse
 from app.dependencies import (
     require_roles,
 )
-from app.dtos.booking_requests import CreateBookingRequest
+from app.dtos.booking_requests import (
+    CreateBookingByTypeRequest,
+    CreateBookingRequest,
+    CreateGroupBookingRequest,
+)
 from app.models.users import Role
 from app.services.booking_service import BookingService
+from app.utils.hotel_time import hotel_today
 
 booking_router = APIRouter(prefix="/bookings")
 
@@ -26,6 +34,54 @@ def book_room(
     )
 
 
+@booking_router.post(
+    "/by-type", response_model=APIResponse, status_code=status.HTTP_201_CREATED
+)
+def book_room_by_type(
+    create_booking_request: CreateBookingByTypeRequest,
+    booking_service: BookingService = Depends(BookingService),
+    current_user=Depends(require_roles(Role.GUEST.value)),
+):
+    booking = booking_service.book_room_by_type(create_booking_request, current_user)
+    return APIResponse(
+        status_code=status.HTTP_201_CREATED,
+        message="Room Booked Successfully",
+        data=booking,
+    )
+
+
+@booking_router.post(
+    "/group", response_model=APIResponse, status_code=status.HTTP_201_CREATED
+)
+def book_group(
+    create_group_booking_request: CreateGroupBookingRequest,
+    booking_service: BookingService = Depends(BookingService),
+    current_user=Depends(require_roles(Role.GUEST.value)),
+):
+    bookings = booking_service.book_group(create_group_booking_request, current_user)
+    return APIResponse(
+        status_code=status.HTTP_201_CREATED,
+        message="Rooms Booked Successfully",
+        data=bookings,
+    )
+
+
+@booking_router.post(
+    "/reallocate", response_model=APIResponse, status_code=status.HTTP_200_OK
+)
+def reallocate_rooms(
+    apply: bool = Query(False),
+    booking_service: BookingService = Depends(BookingService),
+    _=Depends(require_roles(Role.MANAGER.value)),
+):
+    plan = booking_service.reallocate_rooms(apply)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Rooms Reallocated" if plan.applied else "Reallocation Planned",
+        data=plan,
+    )
+
+
 @booking_router.delete(
     "/{booking_id}", status_code=status.HTTP_200_OK, response_model=APIResponse
 )
@@ -52,3 +108,51 @@ def get_bookings(
         message="Bookings Fetched Successfully",
         data=bookings,
     )
+
+
+@booking_router.get(
+    "/{booking_id}/folio", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_folio(
+    booking_id: str,
+    current_user=Depends(require_roles(Role.GUEST.value, Role.MANAGER.value)),
+    booking_service: BookingService = Depends(BookingService),
+):
+    folio = booking_service.get_folio(booking_id, current_user)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Folio Fetched Successfully",
+        data=folio,
+    )
+
+
+@booking_router.get(
+    "/arrivals", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_arrivals(
+    day: Optional[date] = Query(None, alias="date"),
+    _=Depends(require_roles(Role.MANAGER.value)),
+    booking_service: BookingService = Depends(BookingService),
+):
+    bookings = booking_service.get_arrivals(day or hotel_today())
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Arrivals Fetched Successfully",
+        data=bookings,
+    )
+
+
+@booking_router.get(
+    "/departures", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_departures(
+    day: Optional[date] = Query(None, alias="date"),
+    _=Depends(require_roles(Role.MANAGER.value)),
+    booking_service: BookingService = Depends(BookingService),
+):
+    bookings = booking_service.get_departures(day or hotel_today())
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Departures Fetched Successfully",
+        data=bookings,
+    )
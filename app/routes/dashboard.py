@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, status
+
+from app.dependencies import require_roles
+from app.models.users import Role
+from app.response.response import APIResponse
+from app.services.dashboard_service import DashboardService
+
+dashboard_router = APIRouter(prefix="/dashboard")
+
+
+@dashboard_router.get(
+    "/counters", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_dashboard_counters(
+    _=Depends(require_roles(Role.MANAGER.value)),
+    dashboard_service: DashboardService = Depends(DashboardService),
+):
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Dashboard counters fetched successfully",
+        data=dashboard_service.get_counters(),
+    )
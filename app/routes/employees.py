@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, status
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, status
+from fastapi.responses import StreamingResponse
 from app.dependencies import (
     require_roles,
 )
 from app.response.response import APIResponse
 from app.dtos.service_request import (
+    BulkUpdateServiceRequestStatus,
     UpdateServiceRequestStatus,
 )
 from app.models.users import Role
 
-from app.dtos.employee_requests import CreateEmployeeRequest, UpdateEmployeeRequest
+from app.dtos.employee_requests import (
+    CreateEmployeeRequest,
+    HeartbeatRequest,
+    UpdateEmployeeRequest,
+)
+from app.services.assignment_stream_service import AssignmentStreamService
+from app.services.dispatch_service import DispatchService
 from app.services.employee_service import EmployeeService
 from app.services.service_request_service import ServiceRequestService
 
@@ -34,8 +44,10 @@ def create_employee(
 def get_employees(
     _=Depends(require_roles(Role.MANAGER.value)),
     employee_service: EmployeeService = Depends(EmployeeService),
+    role: Optional[Role] = None,
+    available: Optional[bool] = None,
 ):
-    employees = employee_service.get_employees()
+    employees = employee_service.get_employees(role, available)
     return APIResponse(
         status_code=status.HTTP_200_OK,
         message="Employees Fetched Successfully",
@@ -65,15 +77,39 @@ def update_employee_availability(
     )
 
 
+@employee_router.post(
+    "/heartbeat", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def employee_heartbeat(
+    request: HeartbeatRequest,
+    current_user=Depends(
+        require_roles(
+            Role.KITCHEN_STAFF.value, Role.CLEANING_STAFF.value, Role.MANAGER.value
+        )
+    ),
+    employee_service: EmployeeService = Depends(EmployeeService),
+):
+    employee_service.heartbeat(current_user, request)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Heartbeat received",
+    )
+
+
 @employee_router.delete(
     "/{employee_id}", status_code=status.HTTP_200_OK, response_model=APIResponse
 )
 def delete_employee(
     employee_id: str,
+    background_tasks: BackgroundTasks,
     _=Depends(require_roles(Role.MANAGER)),
     employee_service: EmployeeService = Depends(EmployeeService),
+    dispatch_service: DispatchService = Depends(DispatchService),
 ):
-    employee_service.delete_employee(employee_id)
+    requeued_types = employee_service.delete_employee(employee_id)
+    # their open work goes to the rest of the staff after the response
+    for service_type in sorted(requeued_types):
+        background_tasks.add_task(dispatch_service.dispatch_quietly, service_type)
     return APIResponse(
         status_code=status.HTTP_200_OK,
         message="Employee deleted successfully",
@@ -97,6 +133,97 @@ def get_assigned_service_request(
     )
 
 
+@employee_router.get(
+    "/service-requests/queue",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_service_request_queue(
+    current_user=Depends(
+        require_roles(Role.KITCHEN_STAFF.value, Role.CLEANING_STAFF.value)
+    ),
+    service_reqeust_service: ServiceRequestService = Depends(ServiceRequestService),
+):
+    requests = service_reqeust_service.get_service_queue(current_user)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service request queue fetched successfully",
+        data=requests,
+    )
+
+
+@employee_router.post(
+    "/service-requests/claim",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+def claim_service_request(
+    current_user=Depends(
+        require_roles(Role.KITCHEN_STAFF.value, Role.CLEANING_STAFF.value)
+    ),
+    service_reqeust_service: ServiceRequestService = Depends(ServiceRequestService),
+):
+    claimed = service_reqeust_service.claim_service_request(current_user)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service request claimed successfully",
+        data=claimed,
+    )
+
+
+@employee_router.get("/service-requests/stream")
+def stream_assigned_service_requests(
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user=Depends(
+        require_roles(Role.KITCHEN_STAFF.value, Role.CLEANING_STAFF.value)
+    ),
+    stream_service: AssignmentStreamService = Depends(AssignmentStreamService),
+):
+    return StreamingResponse(
+        stream_service.events(current_user.get("sub"), last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@employee_router.get(
+    "/service-requests/changes",
+    response_model=APIResponse,
+    status_code=status.HTTP_200_OK,
+)
+def get_assigned_service_request_changes(
+    since: Optional[str] = None,
+    current_user=Depends(
+        require_roles(Role.KITCHEN_STAFF.value, Role.CLEANING_STAFF.value)
+    ),
+    service_reqeust_service: ServiceRequestService = Depends(ServiceRequestService),
+):
+    changes = service_reqeust_service.get_assigned_changes(current_user, since)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service request changes fetched successfully",
+        data=changes,
+    )
+
+
+@employee_router.put(
+    "/service-requests/status",
+    status_code=status.HTTP_200_OK,
+    response_model=APIResponse,
+)
+def update_service_request_statuses(
+    request: BulkUpdateServiceRequestStatus,
+    _=Depends(require_roles(Role.KITCHEN_STAFF.value, Role.CLEANING_STAFF.value)),
+    service_reqeust_service: ServiceRequestService = Depends(ServiceRequestService),
+):
+    result = service_reqeust_service.update_service_requests(request)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service request statuses updated",
+        data=result,
+    )
+
+
 @employee_router.put(
     "/service-requests/status/{service_request_id}",
     status_code=status.HTTP_200_OK,
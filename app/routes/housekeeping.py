@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, status
+
+from app.dependencies import require_roles
+from app.models.users import Role
+from app.response.response import APIResponse
+from app.services.housekeeping_service import HousekeepingService
+
+housekeeping_router = APIRouter(prefix="/housekeeping")
+
+
+@housekeeping_router.get(
+    "/board", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_housekeeping_board(
+    _=Depends(require_roles(Role.MANAGER.value, Role.CLEANING_STAFF.value)),
+    housekeeping_service: HousekeepingService = Depends(HousekeepingService),
+):
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Housekeeping board fetched successfully",
+        data=housekeeping_service.get_board(),
+    )
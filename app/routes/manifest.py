@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, status
+
+from app.dependencies import require_roles
+from app.models.users import Role
+from app.response.response import APIResponse
+from app.services.manifest_service import ManifestService
+from app.utils.hotel_time import hotel_today
+
+manifest_router = APIRouter(prefix="/manifest")
+
+
+@manifest_router.get(
+    "/today", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_today_manifest(
+    _=Depends(require_roles(Role.MANAGER.value)),
+    manifest_service: ManifestService = Depends(ManifestService),
+):
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Manifest Fetched Successfully",
+        data=manifest_service.get_manifest(hotel_today()),
+    )
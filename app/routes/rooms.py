@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, status
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, status
 from app.response.response import APIResponse
 from app.dependencies import (
     require_roles,
 )
-from app.dtos.room_requests import AddRoomRequest, UpdateRoomRequest
+from app.dtos.room_requests import AddRoomRequest, HoldRoomRequest, UpdateRoomRequest
+from app.dtos.room_response import CalendarEncoding
+from app.models.rooms import RoomType
 from app.models.users import Role
 from app.services.room_service import RoomService
 
@@ -14,9 +19,24 @@ room_router = APIRouter(prefix="/rooms")
 def get_rooms_by_role(
     room_service: RoomService = Depends(RoomService),
     current_user=Depends(require_roles(Role.GUEST.value, Role.MANAGER.value)),
+    room_type: Optional[RoomType] = Query(None, alias="type"),
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
 ):
     role = current_user.get("role")
-    if role == Role.MANAGER.value:
+    if any(f is not None for f in (room_type, min_price, max_price)):
+        rooms = room_service.search_rooms(
+            room_type,
+            min_price,
+            max_price,
+            available_only=role == Role.GUEST.value,
+        )
+        return APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Rooms Fetched Successfully",
+            data=rooms,
+        )
+    elif role == Role.MANAGER.value:
         rooms = room_service.get_all_rooms()
         return APIResponse(
             status_code=status.HTTP_200_OK,
@@ -32,6 +52,44 @@ def get_rooms_by_role(
         )
 
 
+@room_router.get(
+    "/availability", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_room_availability(
+    check_in: date,
+    check_out: date,
+    room_type: Optional[RoomType] = Query(None, alias="type"),
+    room_service: RoomService = Depends(RoomService),
+    current_user=Depends(require_roles(Role.GUEST.value, Role.MANAGER.value)),
+):
+    rooms = room_service.get_free_rooms(
+        check_in, check_out, room_type, current_user.get("sub")
+    )
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Available rooms fetched successfully",
+        data=rooms,
+    )
+
+
+@room_router.get(
+    "/calendar", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_room_calendar(
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    encoding: CalendarEncoding = Query("rle"),
+    room_service: RoomService = Depends(RoomService),
+    _=Depends(require_roles(Role.MANAGER.value)),
+):
+    calendar = room_service.get_calendar(start, end, encoding)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Room calendar fetched successfully",
+        data=calendar,
+    )
+
+
 @room_router.post("", status_code=status.HTTP_201_CREATED, response_model=APIResponse)
 def add_room(
     add_room_request: AddRoomRequest,
@@ -46,6 +104,23 @@ def add_room(
     )
 
 
+@room_router.post(
+    "/{room_num}/hold", status_code=status.HTTP_201_CREATED, response_model=APIResponse
+)
+def hold_room(
+    room_num: int,
+    hold_room_request: HoldRoomRequest,
+    room_service: RoomService = Depends(RoomService),
+    current_user=Depends(require_roles(Role.GUEST.value)),
+):
+    hold = room_service.hold_room(room_num, hold_room_request, current_user)
+    return APIResponse(
+        status_code=status.HTTP_201_CREATED,
+        message="Room held successfully",
+        data=hold,
+    )
+
+
 @room_router.delete(
     "/{room_num}", status_code=status.HTTP_200_OK, response_model=APIResponse
 )
@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, status
 from app.response.response import APIResponse
+from app.models.service_request import ServiceStatus, ServiceType
 from app.models.users import Role
-from app.dtos.service_request import CreateServiceRequest, assign_service_request_dto
+from app.dtos.service_request import (
+    BulkAssignServiceRequests,
+    CreateServiceRequest,
+    assign_service_request_dto,
+)
 from app.dependencies import require_roles
+from app.services.dispatch_service import DispatchService
 from app.services.service_request_service import ServiceRequestService
 
 service_request_router = APIRouter(prefix="/service-requests")
@@ -13,10 +22,15 @@ service_request_router = APIRouter(prefix="/service-requests")
 )
 def create_service_request(
     create_service_request: CreateServiceRequest,
+    background_tasks: BackgroundTasks,
     current_user=Depends(require_roles(Role.GUEST.value)),
     service_request_service: ServiceRequestService = Depends(ServiceRequestService),
+    dispatch_service: DispatchService = Depends(DispatchService),
 ):
     service_request_service.save_service_request(create_service_request, current_user)
+    background_tasks.add_task(
+        dispatch_service.dispatch_quietly, create_service_request.type
+    )
     return APIResponse(
         status_code=status.HTTP_201_CREATED,
         message="Service request created successfully",
@@ -29,9 +43,26 @@ def create_service_request(
 def get_pending_service_request_by_role(
     current_user=Depends(require_roles(Role.MANAGER.value, Role.GUEST.value)),
     service_request_service: ServiceRequestService = Depends(ServiceRequestService),
+    service_status: Optional[ServiceStatus] = Query(None, alias="status"),
+    service_type: Optional[ServiceType] = Query(None, alias="type"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
 ):
     role = current_user.get("role")
-    if role == Role.MANAGER.value:
+    filters = (service_status, service_type, created_from, created_to)
+    if role == Role.MANAGER.value and any(f is not None for f in filters):
+        requests = service_request_service.search_service_requests(
+            service_status or ServiceStatus.PENDING,
+            service_type,
+            created_from,
+            created_to,
+        )
+        return APIResponse(
+            status_code=status.HTTP_200_OK,
+            message="Service requests fetched successfully",
+            data=requests,
+        )
+    elif role == Role.MANAGER.value:
         requests = service_request_service.get_all_pending_service_requests()
         return APIResponse(
             status_code=status.HTTP_200_OK,
@@ -47,6 +78,38 @@ def get_pending_service_request_by_role(
         )
 
 
+@service_request_router.get(
+    "/changes", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def get_service_request_changes(
+    since: Optional[str] = None,
+    _=Depends(require_roles(Role.MANAGER.value)),
+    service_request_service: ServiceRequestService = Depends(ServiceRequestService),
+):
+    changes = service_request_service.get_changes(since)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service request changes fetched successfully",
+        data=changes,
+    )
+
+
+@service_request_router.post(
+    "/assign", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def assign_service_requests(
+    request: BulkAssignServiceRequests,
+    _=Depends(require_roles(Role.MANAGER.value)),
+    service_request_service: ServiceRequestService = Depends(ServiceRequestService),
+):
+    result = service_request_service.assign_service_requests(request)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service requests assigned",
+        data=result,
+    )
+
+
 @service_request_router.post(
     "/assign/{service_request_id}",
     status_code=status.HTTP_200_OK,
@@ -63,3 +126,19 @@ def assign_service_request(
         status_code=status.HTTP_200_OK,
         message="Service request assigned successfully",
     )
+
+
+@service_request_router.post(
+    "/dispatch", status_code=status.HTTP_200_OK, response_model=APIResponse
+)
+def dispatch_service_requests(
+    service_type: Optional[ServiceType] = Query(None, alias="type"),
+    _=Depends(require_roles(Role.MANAGER.value)),
+    dispatch_service: DispatchService = Depends(DispatchService),
+):
+    assigned = dispatch_service.dispatch(service_type)
+    return APIResponse(
+        status_code=status.HTTP_200_OK,
+        message="Service requests dispatched successfully",
+        data={"assigned": assigned},
+    )
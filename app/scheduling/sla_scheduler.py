@@ -0,0 +1,265 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import timedelta
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import status
+
+from app.app_exception.app_exception import AppException
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.sqs_event_publisher.event_publisher import ServiceRequestEventPublisher
+
+# (time to get assigned, time to get done), both counted from created_at
+SLA_DEADLINES = {
+    ServiceType.FOOD: (timedelta(minutes=10), timedelta(minutes=45)),
+    ServiceType.CLEANING: (timedelta(minutes=20), timedelta(minutes=90)),
+}
+# a failed escalation is retried after 30s, doubling up to 15 minutes
+RETRY_DELAY = 30.0
+MAX_RETRY_DELAY = 15 * 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class EscalationStage(str, Enum):
+    UNASSIGNED = "Unassigned"
+    UNFINISHED = "Unfinished"
+
+
+# stored as escalated_stage; a stage is only ever claimed once
+STAGE_RANK = {EscalationStage.UNASSIGNED: 1, EscalationStage.UNFINISHED: 2}
+
+
+SlaLoader = Callable[[], List[ServiceRequest]]
+SlaFetch = Callable[[str], Optional[ServiceRequest]]
+SlaClaim = Callable[[str, EscalationStage], bool]
+SlaRelease = Callable[[str, EscalationStage], None]
+Escalate = Callable[[ServiceRequest, EscalationStage], None]
+
+
+def table_source(
+    ddb_resource, table_name: str, hotel_id: str
+) -> Tuple[SlaLoader, SlaFetch, SlaClaim, SlaRelease]:
+    repo = ServiceRequestRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+
+    def fetch(service_request_id: str) -> Optional[ServiceRequest]:
+        try:
+            return repo.get_service_request_by_id(service_request_id)
+        except AppException as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND:
+                return None
+            raise
+
+    def claim(service_request_id: str, stage: EscalationStage) -> bool:
+        return repo.claim_escalation(service_request_id, STAGE_RANK[stage])
+
+    def release(service_request_id: str, stage: EscalationStage) -> None:
+        repo.release_escalation(service_request_id, STAGE_RANK[stage])
+
+    return repo.get_all_pending_service_requests, fetch, claim, release
+
+
+def alert_escalation(hotel_id: str) -> Escalate:
+    def escalate(service_request: ServiceRequest, stage: EscalationStage) -> None:
+        ServiceRequestEventPublisher().publish_service_request_overdue(
+            service_request, stage, hotel_id
+        )
+
+    return escalate
+
+
+class SlaScheduler:
+    # A min-heap of (deadline, seq, id). Rescheduling or cancelling a request
+    # only replaces its entry in _entries; stale heap items are skipped when
+    # they surface, so every update is O(log n) and nothing is ever scanned.
+    def __init__(
+        self,
+        loader: SlaLoader,
+        fetch: SlaFetch,
+        claim: SlaClaim,
+        release: SlaRelease,
+        escalate: Escalate,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._loader = loader
+        self._fetch = fetch
+        self._claim = claim
+        self._release = release
+        self._escalate = escalate
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, Tuple[int, EscalationStage, ServiceRequest]] = {}
+        self._failures: Dict[str, int] = {}
+        self._seq = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @staticmethod
+    def deadline(service_request: ServiceRequest, stage: EscalationStage) -> float:
+        to_assign, to_finish = SLA_DEADLINES[service_request.type]
+        allowed = to_assign if stage == EscalationStage.UNASSIGNED else to_finish
+        return (service_request.created_at + allowed).timestamp()
+
+    def start(self) -> None:
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def load(self, service_requests: List[ServiceRequest]) -> None:
+        for service_request in service_requests:
+            self.track(service_request)
+
+    def track(self, service_request: ServiceRequest) -> None:
+        if service_request.status != ServiceStatus.PENDING:
+            self.cancel(service_request.id)
+            return
+
+        stage = (
+            EscalationStage.UNFINISHED
+            if service_request.is_assigned
+            else EscalationStage.UNASSIGNED
+        )
+        self._schedule(service_request, stage)
+
+    def assigned(self, service_request_id: str, employee_id: str) -> None:
+        with self._condition:
+            entry = self._entries.get(service_request_id)
+            if entry is None:
+                return
+            service_request = entry[2].model_copy(
+                update={"is_assigned": True, "assigned_to": employee_id}
+            )
+            self._schedule(service_request, EscalationStage.UNFINISHED)
+
+    def cancel(self, service_request_id: str) -> None:
+        with self._condition:
+            self._entries.pop(service_request_id, None)
+            self._failures.pop(service_request_id, None)
+
+    def _schedule(
+        self,
+        service_request: ServiceRequest,
+        stage: EscalationStage,
+        at: Optional[float] = None,
+    ):
+        with self._condition:
+            if at is None:
+                self._failures.pop(service_request.id, None)
+            self._seq += 1
+            self._entries[service_request.id] = (self._seq, stage, service_request)
+            deadline = self.deadline(service_request, stage) if at is None else at
+            heapq.heappush(self._heap, (deadline, self._seq, service_request.id))
+            # wake the worker if this is now the earliest deadline
+            if self._heap[0][1] == self._seq:
+                self._condition.notify()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._entries)
+
+    def _settled(self, service_request_id: str) -> None:
+        with self._condition:
+            self._failures.pop(service_request_id, None)
+
+    def _retry(self, service_request: ServiceRequest, stage: EscalationStage):
+        with self._condition:
+            # re-tracked by a newer change while the alert was failing
+            if service_request.id in self._entries:
+                return
+            attempts = self._failures.get(service_request.id, 0) + 1
+            self._failures[service_request.id] = attempts
+            delay = min(RETRY_DELAY * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+            self._schedule(service_request, stage, self._clock() + delay)
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._heap:
+            _, seq, service_request_id = self._heap[0]
+            entry = self._entries.get(service_request_id)
+            if entry is not None and entry[0] == seq:
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self) -> List[Tuple[ServiceRequest, EscalationStage]]:
+        due: List[Tuple[ServiceRequest, EscalationStage]] = []
+        with self._condition:
+            now = self._clock()
+            while True:
+                deadline = self._next_deadline()
+                if deadline is None or deadline > now:
+                    break
+                _, _, service_request_id = heapq.heappop(self._heap)
+                _, stage, service_request = self._entries.pop(service_request_id)
+                due.append((service_request, stage))
+        return due
+
+    def fire_due(self) -> int:
+        fired = 0
+        for service_request, stage in self.pop_due():
+            try:
+                # other instances may have assigned or finished it meanwhile
+                current = self._fetch(service_request.id)
+                if current is None or current.status != ServiceStatus.PENDING:
+                    self._settled(service_request.id)
+                    continue
+                if stage == EscalationStage.UNASSIGNED and current.is_assigned:
+                    self.track(current)
+                    continue
+
+                # every instance tracks every request; only the one that
+                # claims the stage sends its alert
+                if self._claim(current.id, stage):
+                    try:
+                        self._escalate(current, stage)
+                    except Exception:
+                        self._release(current.id, stage)
+                        raise
+                    fired += 1
+
+                if stage == EscalationStage.UNASSIGNED:
+                    # still tracked until done, against the completion deadline
+                    self._schedule(current, EscalationStage.UNFINISHED)
+                else:
+                    self._settled(current.id)
+            except Exception:
+                # a failed alert must not stop the worker; later deadlines
+                # still have to fire, and this one is tried again
+                logger.exception(
+                    "Failed to escalate service request %s (%s)",
+                    service_request.id,
+                    stage.value,
+                )
+                self._retry(service_request, stage)
+        return fired
+
+    def _run(self) -> None:
+        try:
+            self.load(self._loader())
+        except Exception:
+            # requests saved after startup are still tracked
+            logger.exception("Failed to load pending service requests")
+
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                deadline = self._next_deadline()
+                timeout = None if deadline is None else deadline - self._clock()
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+            self.fire_due()
@@ -0,0 +1,68 @@
+from typing import AsyncIterator, List, Optional
+
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+
+from app.dependencies import get_assignment_broker
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.streaming.assignment_broker import AssignmentBroker, AssignmentEvent
+from app.utils import ids
+
+HEARTBEAT_SECONDS = 15.0
+
+
+class AssignmentStreamService:
+    def __init__(
+        self,
+        broker: AssignmentBroker = Depends(get_assignment_broker),
+        service_request_repo: ServiceRequestRepository = Depends(
+            ServiceRequestRepository
+        ),
+    ):
+        self.broker = broker
+        self.service_request_repo = service_request_repo
+
+    def _missed_events(
+        self, employee_id: str, last_event_id: str
+    ) -> List[AssignmentEvent]:
+        # only a reconnect the buffer cannot serve reads the table
+        try:
+            ids.id_timestamp(last_event_id)
+        except ValueError:
+            return []
+
+        return [
+            AssignmentEvent(
+                id=change.change_id,
+                employee_id=employee_id,
+                event="changed",
+                data=change.model_dump_json(),
+            )
+            for change in self.service_request_repo.get_assigned_changes_since(
+                employee_id, last_event_id
+            )
+            if change.change_id
+        ]
+
+    async def events(
+        self, employee_id: str, last_event_id: Optional[str]
+    ) -> AsyncIterator[str]:
+        subscription, replay = self.broker.subscribe(employee_id, last_event_id)
+        try:
+            if replay is None and last_event_id is not None:
+                # boto3 blocks, so the read stays off the event loop
+                replay = await run_in_threadpool(
+                    self._missed_events, employee_id, last_event_id
+                )
+            for event in replay or []:
+                yield event.encode()
+
+            while True:
+                events = await subscription.next_events(HEARTBEAT_SECONDS)
+                if not events:
+                    # keeps proxies from closing an idle connection
+                    yield ": heartbeat\n\n"
+                for event in events:
+                    yield event.encode()
+        finally:
+            self.broker.unsubscribe(subscription)
@@ -1,14 +1,31 @@
-import uuid
+import random
+from datetime import date
 from typing import List
 
 from fastapi import Depends, status
 
 from app.app_exception.app_exception import AppException
-from app.dtos.booking_requests import CreateBookingRequest
+from app.availability.allocator import plan_allocation
+from app.availability.room_availability_index import RoomAvailabilityIndex
+from app.dependencies import get_availability_index
+from app.dtos.booking_requests import (
+    CreateBookingByTypeRequest,
+    CreateBookingRequest,
+    CreateGroupBookingRequest,
+)
+from app.dtos.booking_response import AllocationPlanDTO, FolioDTO
 from app.models.bookings import Booking, BookingStatus
-from app.repository.booking_repository import BookingRepository
+from app.models.rooms import Room
+from app.models.users import Role
+from app.repository.booking_repository import NIGHT_TAKEN_MESSAGE, BookingRepository
 from app.repository.room_repository import RoomRepository
+from app.services.manifest_service import ManifestService
+from app.services.housekeeping_service import HousekeepingService
 from app.sqs_event_publisher.event_publisher import BookingEventPublisher
+from app.utils import ids
+from app.utils.hotel_time import hotel_today
+
+ALLOCATION_ATTEMPTS = 3
 
 
 class BookingService:
@@ -16,9 +33,15 @@ class BookingService:
         self,
         booking_repo: BookingRepository = Depends(BookingRepository),
         room_repo: RoomRepository = Depends(RoomRepository),
+        availability_index: RoomAvailabilityIndex = Depends(get_availability_index),
+        manifest_service: ManifestService = Depends(ManifestService),
+        housekeeping_service: HousekeepingService = Depends(HousekeepingService),
     ):
         self.booking_repo = booking_repo
         self.room_repo = room_repo
+        self.availability_index = availability_index
+        self.manifest_service = manifest_service
+        self.housekeeping_service = housekeeping_service
 
     def book_room(
         self,
@@ -33,22 +56,171 @@ class BookingService:
 
         if not room.is_available:
             raise AppException(
-                message="Room already booked",
+                message="Room is not available for booking",
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
+        user_id = self._user_id(current_user)
+
+        # refresh the room in case it was added through another instance
+        self.availability_index.add_room(room)
+        if not self.availability_index.is_free(
+            room_number, check_in, check_out, user_id
+        ):
+            raise AppException(
+                message=NIGHT_TAKEN_MESSAGE,
+                status_code=status.HTTP_409_CONFLICT,
+            )
+
+        try:
+            return self._save_booking(user_id, room, check_in, check_out)
+        except AppException as e:
+            if e.status_code == status.HTTP_409_CONFLICT:
+                # another instance took these nights; reload on the next query
+                self.availability_index.invalidate()
+            raise
+
+    def book_room_by_type(
+        self,
+        request: CreateBookingByTypeRequest,
+        current_user: dict,
+    ) -> Booking:
+        user_id = self._user_id(current_user)
+        check_in = request.check_in_date
+        check_out = request.check_out_date
+
+        for _ in range(ALLOCATION_ATTEMPTS):
+            candidates = self.availability_index.free_rooms(
+                check_in, check_out, request.room_type, user_id
+            )
+            if not candidates:
+                break
+
+            # spread concurrent guests over the pool instead of one room item
+            room = random.choice(candidates)
+            try:
+                return self._save_booking(user_id, room, check_in, check_out)
+            except AppException as e:
+                if e.message != NIGHT_TAKEN_MESSAGE:
+                    raise
+                self.availability_index.invalidate()
+
+        raise AppException(
+            message="No rooms of this type left for the selected dates",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+    def book_group(
+        self,
+        request: CreateGroupBookingRequest,
+        current_user: dict,
+    ) -> List[Booking]:
+        user_id = self._user_id(current_user)
+        check_in = request.check_in_date
+        check_out = request.check_out_date
+        group_id = ids.new_id()
+
+        group: List[Booking] = []
+        for room_number in request.room_numbers:
+            # rooms come from the index; only unknown ones cost a read
+            room = self.availability_index.get_room(room_number)
+            if room is None:
+                room = self.room_repo.get_room_by_number(room_number)
+                self.availability_index.add_room(room)
+
+            if not room.is_available:
+                raise AppException(
+                    message=f"Room {room_number} is not available for booking",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+
+            if not self.availability_index.is_free(
+                room_number, check_in, check_out, user_id
+            ):
+                raise AppException(
+                    message=f"Room {room_number} already booked for the selected dates",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+
+            group.append(
+                Booking(
+                    id=ids.new_id(),
+                    user_id=user_id,
+                    room_id=room.id,
+                    room_num=room.number,
+                    room_type=room.type,
+                    room_rate=room.price,
+                    group_id=group_id,
+                    check_in=check_in,
+                    check_out=check_out,
+                    status=BookingStatus.Booking_Status_Booked,
+                    food_req=False,
+                    clean_req=False,
+                )
+            )
+
+        capacities = {
+            booking.room_type.value: self.availability_index.capacity(booking.room_type)
+            for booking in group
+            if booking.room_type
+        }
+
+        try:
+            self.booking_repo.save_group_booking(group, capacities)
+        except AppException as e:
+            if e.status_code == status.HTTP_409_CONFLICT:
+                self.availability_index.invalidate()
+            raise
+
+        for booking in group:
+            self.availability_index.add_booking(booking)
+            self.manifest_service.record_booking(booking)
+            self.housekeeping_service.record_booking(booking)
+        return group
+
+    def reallocate_rooms(self, apply: bool = False) -> AllocationPlanDTO:
+        today = hotel_today()
+        plan = plan_allocation(
+            self.room_repo.get_all_rooms(),
+            self.booking_repo.get_active_bookings(today),
+            today,
+        )
+
+        # moving guests around is only worth it if it frees sellable nights
+        if plan.short_gaps_after >= plan.short_gaps_before:
+            plan.moves = []
+
+        if apply and plan.moves:
+            try:
+                plan.skipped = self.booking_repo.apply_booking_moves(plan.moves)
+            finally:
+                self.availability_index.invalidate()
+            skipped = {move.booking_id for move in plan.skipped}
+            plan.moves = [m for m in plan.moves if m.booking_id not in skipped]
+            plan.applied = True
+            self.housekeeping_service.record_booking_moves(plan.moves)
+
+        return plan
+
+    def _user_id(self, current_user: dict) -> str:
         user_id = current_user.get("sub")
         if not user_id:
             raise AppException(
                 message="Invalid user context",
                 status_code=status.HTTP_401_UNAUTHORIZED,
             )
+        return user_id
 
+    def _save_booking(
+        self, user_id: str, room: Room, check_in: date, check_out: date
+    ) -> Booking:
         new_booking = Booking(
-            id=str(uuid.uuid4()),
+            id=ids.new_id(),
             user_id=user_id,
             room_id=room.id,
-            room_num=room_number,
+            room_num=room.number,
+            room_type=room.type,
+            room_rate=room.price,
             check_in=check_in,
             check_out=check_out,
             status=BookingStatus.Booking_Status_Booked,
@@ -56,13 +228,13 @@ class BookingService:
             clean_req=False,
         )
 
-        try:
-            self.room_repo.update_room_availability(room_number, False)
-            self.booking_repo.save_booking(new_booking)
-            return new_booking
-
-        except AppException:
-            raise
+        self.booking_repo.save_booking(
+            new_booking, self.availability_index.capacity(room.type)
+        )
+        self.availability_index.add_booking(new_booking)
+        self.manifest_service.record_booking(new_booking)
+        self.housekeeping_service.record_booking(new_booking)
+        return new_booking
 
     def cancel_booking(self, booking_id: str) -> None:
         try:
@@ -76,13 +248,43 @@ class BookingService:
                 status_code=status.HTTP_409_CONFLICT,
             )
 
+        if booking.room_type is None:
+            # bookings made before inventory counters did not record the type
+            room = self.room_repo.get_room_by_number(booking.room_num)
+            booking.room_type = room.type
+
+        self.booking_repo.cancel_booking(booking)
         booking.status = BookingStatus.Booking_Status_Cancelled
-        self.room_repo.update_room_availability(booking.room_num, True)
-        self.booking_repo.update_booking(booking)
+        self.availability_index.remove_booking(booking.id)
+        self.manifest_service.record_booking(booking)
+        self.housekeeping_service.record_booking(booking)
 
         if booking.clean_req or booking.food_req:
             event_pub = BookingEventPublisher()
-            event_pub.publish_booking_cancelled(booking)
+            event_pub.publish_booking_cancelled(booking, self.booking_repo.hotel_id)
+
+    def get_folio(self, booking_id: str, current_user: dict) -> FolioDTO:
+        folio = self.booking_repo.get_folio(booking_id)
+
+        # guests only see their own bill; do not reveal that others exist
+        if current_user.get(
+            "role"
+        ) == Role.GUEST.value and folio.user_id != current_user.get("sub"):
+            raise AppException(
+                message="Folio not found",
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        return FolioDTO(
+            **folio.model_dump(),
+            total=folio.room_charges + folio.service_charges,
+        )
+
+    def get_arrivals(self, day: date) -> List[Booking]:
+        return self.booking_repo.get_arrivals(day)
+
+    def get_departures(self, day: date) -> List[Booking]:
+        return self.booking_repo.get_departures(day)
 
     def get_active_bookings_by_user(self, user_id: str) -> List[Booking]:
         return self.booking_repo.get_bookings_by_userID(user_id)
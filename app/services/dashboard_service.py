@@ -0,0 +1,40 @@
+from fastapi import Depends
+
+from app.counters.counter_cache import CounterCache
+from app.dependencies import get_counter_cache
+from app.dtos.dashboard_response import DashboardCountersDTO
+from app.models.service_request import ServiceType
+from app.repository.counter_repository import (
+    ARRIVALS,
+    RATING_TOTAL,
+    RATINGS,
+    ROOMS_AVAILABLE,
+    pending_counter,
+)
+from app.utils.hotel_time import hotel_today
+
+
+class DashboardService:
+    def __init__(
+        self, counter_cache: CounterCache = Depends(get_counter_cache)
+    ) -> None:
+        self.counter_cache = counter_cache
+
+    def get_counters(self) -> DashboardCountersDTO:
+        today = hotel_today()
+        counters = self.counter_cache.get(today)
+        ratings = counters.get(RATINGS, 0)
+
+        return DashboardCountersDTO(
+            day=today,
+            rooms_available=counters.get(ROOMS_AVAILABLE, 0),
+            pending_requests={
+                service_type: counters.get(pending_counter(service_type), 0)
+                for service_type in ServiceType
+            },
+            bookings_today=counters.get(ARRIVALS, 0),
+            ratings=ratings,
+            average_rating=(
+                round(counters.get(RATING_TOTAL, 0) / ratings, 2) if ratings else None
+            ),
+        )
@@ -0,0 +1,116 @@
+import heapq
+from typing import List, Optional, Tuple
+
+from fastapi import Depends
+
+from app.app_exception.app_exception import AppException
+from app.dependencies import (
+    get_assignment_broker,
+    get_sla_scheduler,
+    get_staff_presence,
+)
+from app.models.service_request import ServiceRequest, ServiceType
+from app.models.users import Role
+from app.presence.staff_presence import StaffPresence
+from app.repository.employee_repository import EmployeeRepository
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.scheduling.sla_scheduler import SlaScheduler
+from app.streaming.assignment_broker import AssignmentBroker
+from app.services.manifest_service import ManifestService
+from app.services.housekeeping_service import HousekeepingService
+
+SERVICE_TYPE_ROLES = {
+    ServiceType.FOOD: Role.KITCHEN_STAFF,
+    ServiceType.CLEANING: Role.CLEANING_STAFF,
+}
+DISPATCH_BATCH_SIZE = 500
+
+
+class DispatchService:
+    def __init__(
+        self,
+        service_request_repo: ServiceRequestRepository = Depends(
+            ServiceRequestRepository
+        ),
+        employee_repo: EmployeeRepository = Depends(EmployeeRepository),
+        manifest_service: ManifestService = Depends(ManifestService),
+        housekeeping_service: HousekeepingService = Depends(HousekeepingService),
+        sla_scheduler: SlaScheduler = Depends(get_sla_scheduler),
+        assignment_broker: AssignmentBroker = Depends(get_assignment_broker),
+        staff_presence: StaffPresence = Depends(get_staff_presence),
+    ):
+        self.service_request_repo = service_request_repo
+        self.employee_repo = employee_repo
+        self.manifest_service = manifest_service
+        self.housekeeping_service = housekeeping_service
+        self.sla_scheduler = sla_scheduler
+        self.assignment_broker = assignment_broker
+        self.staff_presence = staff_presence
+
+    def dispatch(
+        self,
+        service_type: Optional[ServiceType] = None,
+        limit: int = DISPATCH_BATCH_SIZE,
+    ) -> int:
+        service_types = [service_type] if service_type else list(ServiceType)
+
+        assigned: List[Tuple[str, str]] = []
+        for s_type in service_types:
+            assigned += self._dispatch_type(s_type, limit)
+
+        if assigned:
+            self.manifest_service.record_assignments(assigned)
+            self.housekeeping_service.record_assignments(assigned)
+        for service_request_id, employee_id in assigned:
+            self.sla_scheduler.assigned(service_request_id, employee_id)
+        return len(assigned)
+
+    def dispatch_quietly(self, service_type: Optional[ServiceType] = None) -> None:
+        # runs after the response; a request left queued is picked up next time
+        try:
+            self.dispatch(service_type)
+        except AppException:
+            pass
+
+    def _dispatch_type(
+        self, service_type: ServiceType, limit: int
+    ) -> List[Tuple[str, str]]:
+        queued = self.service_request_repo.get_queued_service_requests(
+            service_type, limit
+        )
+        if not queued:
+            return []
+
+        # live presence decides who can take work, not the stored flag
+        employees = [
+            employee
+            for employee in self.employee_repo.get_employees(
+                SERVICE_TYPE_ROLES[service_type]
+            )
+            if self.staff_presence.is_available(employee)
+        ]
+        if not employees:
+            return []
+
+        # min-heap on open tasks, so each request goes to the least loaded;
+        # every employee's load comes from one query
+        open_tasks = self.service_request_repo.get_open_assignments()
+        load = [(open_tasks.get(e.id, 0), e.id) for e in employees]
+        heapq.heapify(load)
+
+        assignments: List[Tuple[ServiceRequest, str]] = []
+        for service_request in queued:
+            open_tasks, employee_id = heapq.heappop(load)
+            assignments.append((service_request, employee_id))
+            heapq.heappush(load, (open_tasks + 1, employee_id))
+
+        assigned = self.service_request_repo.assign_service_requests(assignments)
+
+        for service_request in assigned:
+            self.assignment_broker.publish(
+                service_request.assigned_to, "assigned", service_request
+            )
+        return [
+            (service_request.id, service_request.assigned_to)
+            for service_request in assigned
+        ]
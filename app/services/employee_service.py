@@ -1,20 +1,49 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set
 import uuid
 from fastapi import Depends, status
 from app.app_exception.app_exception import AppException
 from app.dtos.employee_response import EmployeeResponseDTO
 from app.models import users
+from app.dependencies import get_sla_scheduler, get_staff_presence
+from app.models.service_request import ServiceRequest, ServiceType
 from app.models.users import Role
+from app.presence.staff_presence import StaffPresence
 from app.repository.employee_repository import EmployeeRepository
-from app.dtos.employee_requests import CreateEmployeeRequest, UpdateEmployeeRequest
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.scheduling.sla_scheduler import SlaScheduler
+from app.services.manifest_service import ManifestService
+from app.services.housekeeping_service import HousekeepingService
+from app.dtos.employee_requests import (
+    CreateEmployeeRequest,
+    HeartbeatRequest,
+    UpdateEmployeeRequest,
+)
 from app.utils import auth
 
+EMPLOYEE_ROLES = (Role.KITCHEN_STAFF, Role.CLEANING_STAFF, Role.MANAGER)
+# unassignment transactions in flight at once while offboarding
+OFFBOARD_CONCURRENCY = 4
+
 
 class EmployeeService:
     def __init__(
-        self, employee_repo: EmployeeRepository = Depends(EmployeeRepository)
+        self,
+        employee_repo: EmployeeRepository = Depends(EmployeeRepository),
+        service_request_repo: ServiceRequestRepository = Depends(
+            ServiceRequestRepository
+        ),
+        manifest_service: ManifestService = Depends(ManifestService),
+        housekeeping_service: HousekeepingService = Depends(HousekeepingService),
+        sla_scheduler: SlaScheduler = Depends(get_sla_scheduler),
+        staff_presence: StaffPresence = Depends(get_staff_presence),
     ) -> None:
         self.employee_repo = employee_repo
+        self.service_request_repo = service_request_repo
+        self.manifest_service = manifest_service
+        self.housekeeping_service = housekeeping_service
+        self.sla_scheduler = sla_scheduler
+        self.staff_presence = staff_presence
 
     def _create_employee(
         self,
@@ -35,7 +64,7 @@ class EmployeeService:
     def create_employee(self, create_employee_request: CreateEmployeeRequest) -> None:
         emp_role = create_employee_request.role
 
-        if emp_role not in {Role.KITCHEN_STAFF, Role.CLEANING_STAFF, Role.MANAGER}:
+        if emp_role not in EMPLOYEE_ROLES:
             raise AppException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 message="Invalid role for employee",
@@ -50,8 +79,19 @@ class EmployeeService:
 
         self.employee_repo.create_employee(new_emp)
 
-    def get_employees(self) -> List[EmployeeResponseDTO]:
-        employees = self.employee_repo.get_employees()
+    def get_employees(
+        self, role: Optional[Role] = None, available: Optional[bool] = None
+    ) -> List[EmployeeResponseDTO]:
+        # the stored flag can trail heartbeats, so availability is filtered
+        # after the live presence is laid over it
+        if role is None:
+            employees = self.employee_repo.get_employees()
+        else:
+            employees = self.employee_repo.get_employees(role)
+
+        employees = self.staff_presence.overlay(employees)
+        if available is not None:
+            employees = [e for e in employees if e.available == available]
 
         return [EmployeeResponseDTO(**e.model_dump(mode="json")) for e in employees]
 
@@ -61,11 +101,45 @@ class EmployeeService:
         self.employee_repo.update_employee_availability(
             employee_id=employee_id, available=update_employee_request.available
         )
+        self.staff_presence.record(employee_id, update_employee_request.available)
+
+    def heartbeat(self, current_user, request: HeartbeatRequest) -> None:
+        self.staff_presence.heartbeat(
+            current_user.get("sub"), Role(current_user.get("role")), request.available
+        )
 
-    def delete_employee(self, employee_id: str) -> None:
+    def delete_employee(self, employee_id: str) -> Set[ServiceType]:
         employee: users.User = self.employee_repo.get_employee_by_id(employee_id)
 
+        # removed from the directory first so nothing new is dispatched to them
         self.employee_repo.delete_employee(
             employee_id=employee_id,
             email=employee.email,
         )
+
+        requeued = self._requeue_assignments(employee_id)
+        for service_request in requeued:
+            self.sla_scheduler.track(service_request)
+        self.manifest_service.record_service_requests(requeued)
+        self.housekeeping_service.record_service_requests(requeued)
+
+        return {service_request.type for service_request in requeued}
+
+    def _requeue_assignments(self, employee_id: str) -> List[ServiceRequest]:
+        # the next page is read while earlier ones are being written
+        with ThreadPoolExecutor(max_workers=OFFBOARD_CONCURRENCY) as pool:
+            futures = [
+                pool.submit(
+                    self.service_request_repo.unassign_service_requests,
+                    page,
+                    employee_id,
+                )
+                for page in self.service_request_repo.assigned_pending_pages(
+                    employee_id
+                )
+            ]
+            return [
+                service_request
+                for future in futures
+                for service_request in future.result()
+            ]
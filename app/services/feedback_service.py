@@ -1,11 +1,11 @@
 from typing import List
-import uuid
 from datetime import datetime
 
 from fastapi import Depends
 from app.dtos.feedback_dtos import CreateFeedbackDTO
 from app.models.feedbacks import Feedback
 from app.repository.feedback_repository import FeedbackRepository
+from app.utils import ids
 
 
 class FeedbackService:
@@ -14,7 +14,7 @@ class FeedbackService:
 
     def save_feedback(self, request: CreateFeedbackDTO, current_user) -> None:
         new_feedback = Feedback(
-            id=str(uuid.uuid4()),
+            id=ids.new_id(),
             user_id=current_user.get("sub"),
             rating=request.rating,
             user_name=current_user.get("user_name"),
@@ -0,0 +1,233 @@
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Depends
+
+from app.dtos.booking_response import BookingMoveDTO
+from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import Room
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from app.repository.booking_repository import BookingRepository
+from app.repository.housekeeping_repository import HousekeepingRepository
+from app.repository.room_repository import RoomRepository
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.repository.view_repository import META_SK, Entries
+from app.utils.hotel_time import hotel_today
+
+# a room shows the first of these that applies
+BOARD_STATUSES = (
+    "cleaning_in_progress",
+    "pending_cleaning",
+    "occupied",
+    "out_of_service",
+    "ready",
+)
+# entry keys of the board; rooms, bookings and cleaning requests are kept
+# apart and joined when the board is read
+ROOM = "Room#"
+BOOKING = "Booking#"
+CLEANING = "Cleaning#"
+
+Board = Dict[str, Any]
+
+
+def _occupies(booking: Booking, day: date) -> bool:
+    return (
+        booking.status == BookingStatus.Booking_Status_Booked
+        and booking.check_in <= day < booking.check_out
+    )
+
+
+def _room_entry(room: Room) -> Dict[str, Any]:
+    return {
+        "number": room.number,
+        "type": room.type.value,
+        "is_available": room.is_available,
+    }
+
+
+def _booking_entry(
+    booking_id: str, room_num: int, occupying: bool, cancelled: bool = False
+) -> Dict[str, Any]:
+    return {
+        "id": booking_id,
+        "room_num": room_num,
+        "occupying": occupying,
+        "cancelled": cancelled,
+    }
+
+
+def _cleaning_entry(service_request: ServiceRequest) -> Dict[str, Any]:
+    return {
+        "id": service_request.id,
+        "booking_id": service_request.booking_id,
+        "room_num": service_request.room_num,
+        "state": "in_progress" if service_request.is_assigned else "pending",
+    }
+
+
+def _room_status(room: Dict[str, Any]) -> str:
+    states = {cleaning["state"] for cleaning in room["cleaning"]}
+    if "in_progress" in states:
+        return "cleaning_in_progress"
+    if "pending" in states:
+        return "pending_cleaning"
+    if room["bookings"]:
+        return "occupied"
+    if not room["is_available"]:
+        return "out_of_service"
+    return "ready"
+
+
+def _of(entries: Entries, prefix: str) -> List[Dict[str, Any]]:
+    return [entries[key] for key in sorted(entries) if key.startswith(prefix)]
+
+
+def _render(day: date, entries: Entries) -> Board:
+    rooms = {
+        room["number"]: {**room, "bookings": [], "cleaning": []}
+        for room in _of(entries, ROOM)
+    }
+    bookings = {booking["id"]: booking for booking in _of(entries, BOOKING)}
+
+    for booking in bookings.values():
+        room = rooms.get(booking["room_num"])
+        if room is not None and booking["occupying"]:
+            room["bookings"].append(booking["id"])
+    for cleaning in _of(entries, CLEANING):
+        # a request follows its booking across room moves; a cancelled
+        # booking's requests are deleted with it
+        booking = bookings.get(cleaning["booking_id"])
+        if booking is not None and booking["cancelled"]:
+            continue
+        room_num = booking["room_num"] if booking else cleaning["room_num"]
+        room = rooms.get(room_num)
+        if room is not None:
+            room["cleaning"].append(
+                {k: cleaning[k] for k in ("id", "booking_id", "state")}
+            )
+
+    board_rooms = sorted(rooms.values(), key=lambda r: r["number"])
+    for room in board_rooms:
+        room["status"] = _room_status(room)
+    return {
+        "date": day.isoformat(),
+        "rooms": board_rooms,
+        "counts": {
+            state: sum(1 for r in board_rooms if r["status"] == state)
+            for state in BOARD_STATUSES
+        },
+        "built_at": entries[META_SK]["built_at"],
+    }
+
+
+class HousekeepingService:
+    def __init__(
+        self,
+        housekeeping_repo: HousekeepingRepository = Depends(HousekeepingRepository),
+        room_repo: RoomRepository = Depends(RoomRepository),
+        booking_repo: BookingRepository = Depends(BookingRepository),
+        service_request_repo: ServiceRequestRepository = Depends(
+            ServiceRequestRepository
+        ),
+    ):
+        self.housekeeping_repo = housekeeping_repo
+        self.room_repo = room_repo
+        self.booking_repo = booking_repo
+        self.service_request_repo = service_request_repo
+
+    def get_board(self) -> Board:
+        today = hotel_today()
+        entries = self.housekeeping_repo.get_entries(today)
+        if entries is None:
+            # first read of the day builds it; later writes keep it current
+            return self.build_board(today)
+        return _render(today, entries)
+
+    def build_board(self, day: date) -> Board:
+        def build() -> Entries:
+            entries: Entries = {}
+            for room in self.room_repo.get_all_rooms():
+                entries[f"{ROOM}{room.number}"] = _room_entry(room)
+            for booking in self.booking_repo.get_active_bookings(day):
+                if _occupies(booking, day):
+                    entries[BOOKING + booking.id] = _booking_entry(
+                        booking.id, booking.room_num, True
+                    )
+            for r in self.service_request_repo.query_service_requests_by_status_type(
+                ServiceStatus.PENDING, ServiceType.CLEANING
+            ):
+                entries[CLEANING + r.id] = _cleaning_entry(r)
+            return entries
+
+        return _render(day, self.housekeeping_repo.replace_entries(day, build))
+
+    def record_room(self, room: Room) -> None:
+        self.housekeeping_repo.save_entries(
+            hotel_today(), {f"{ROOM}{room.number}": _room_entry(room)}
+        )
+
+    def record_room_changes(self, room_num: int, fields: Dict[str, Any]) -> None:
+        changes = {f: fields[f] for f in ("type", "is_available") if f in fields}
+        if not changes:
+            return
+
+        self.housekeeping_repo.update_entries(
+            hotel_today(), {f"{ROOM}{room_num}": changes}
+        )
+
+    def remove_room(self, room_num: int) -> None:
+        self.housekeeping_repo.save_entries(hotel_today(), {f"{ROOM}{room_num}": None})
+
+    def record_booking(self, booking: Booking) -> None:
+        today = hotel_today()
+        entry = _booking_entry(
+            booking.id,
+            booking.room_num,
+            _occupies(booking, today),
+            booking.status == BookingStatus.Booking_Status_Cancelled,
+        )
+        self.housekeeping_repo.save_entries(today, {BOOKING + booking.id: entry})
+
+    def record_booking_moves(self, moves: List[BookingMoveDTO]) -> None:
+        if not moves:
+            return
+        today = hotel_today()
+
+        # the booking's cleaning requests follow it to the new room
+        entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        for move in moves:
+            occupying = move.check_in <= today < move.check_out
+            entries[BOOKING + move.booking_id] = _booking_entry(
+                move.booking_id, move.to_room, occupying
+            )
+        self.housekeeping_repo.save_entries(today, entries)
+
+    def record_service_request(self, service_request: ServiceRequest) -> None:
+        self.record_service_requests([service_request])
+
+    def record_service_requests(self, service_requests: List[ServiceRequest]) -> None:
+        cleaning = [r for r in service_requests if r.type == ServiceType.CLEANING]
+        if not cleaning:
+            return
+
+        entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        for service_request in cleaning:
+            pending = service_request.status == ServiceStatus.PENDING
+            entries[CLEANING + service_request.id] = (
+                _cleaning_entry(service_request) if pending else None
+            )
+        self.housekeeping_repo.save_entries(hotel_today(), entries)
+
+    def record_assignments(self, assignments: List[Tuple[str, str]]) -> None:
+        if not assignments:
+            return
+
+        # food requests are never on the board, so their ids simply miss
+        self.housekeeping_repo.update_entries(
+            hotel_today(),
+            {
+                CLEANING + service_request_id: {"state": "in_progress"}
+                for service_request_id, _ in assignments
+            },
+        )
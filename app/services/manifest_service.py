@@ -0,0 +1,162 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Depends
+
+from app.availability.room_availability_index import RoomAvailabilityIndex
+from app.dependencies import get_availability_index
+from app.models.bookings import Booking, BookingStatus
+from app.models.service_request import ServiceRequest, ServiceStatus
+from app.models.users import Role
+from app.repository.booking_repository import BookingRepository
+from app.repository.employee_repository import EmployeeRepository
+from app.repository.manifest_repository import ManifestRepository
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.repository.view_repository import META_SK, Entries
+from app.utils.hotel_time import hotel_today
+
+SHIFT_ROLES = (Role.KITCHEN_STAFF, Role.CLEANING_STAFF)
+# entry keys of the manifest's sections
+ARRIVAL = "Arrival#"
+DEPARTURE = "Departure#"
+PENDING = "Pending#"
+AVAILABLE_ROOMS = "AvailableRooms"
+STAFF = "Staff"
+
+Manifest = Dict[str, Any]
+
+
+def _booking_entry(booking: Booking) -> Dict[str, Any]:
+    return booking.model_dump(
+        mode="json",
+        include={"id", "user_id", "room_num", "check_in", "check_out", "status"},
+    )
+
+
+def _service_request_entry(service_request: ServiceRequest) -> Dict[str, Any]:
+    return service_request.model_dump(
+        mode="json",
+        include={"id", "room_num", "type", "is_assigned", "assigned_to", "created_at"},
+    )
+
+
+def _section(entries: Entries, prefix: str, sort_key: str) -> List[Dict[str, Any]]:
+    return sorted(
+        (entry for key, entry in entries.items() if key.startswith(prefix)),
+        key=lambda entry: entry[sort_key],
+    )
+
+
+def _render(day: date, entries: Entries) -> Manifest:
+    return {
+        "date": day.isoformat(),
+        "arrivals": _section(entries, ARRIVAL, "room_num"),
+        "departures": _section(entries, DEPARTURE, "room_num"),
+        "pending_service_requests": _section(entries, PENDING, "created_at"),
+        "available_rooms": entries.get(AVAILABLE_ROOMS, {}).get("rooms", {}),
+        "staff_on_shift": entries.get(STAFF, {}).get("staff", []),
+        "built_at": entries[META_SK]["built_at"],
+    }
+
+
+class ManifestService:
+    def __init__(
+        self,
+        manifest_repo: ManifestRepository = Depends(ManifestRepository),
+        booking_repo: BookingRepository = Depends(BookingRepository),
+        service_request_repo: ServiceRequestRepository = Depends(
+            ServiceRequestRepository
+        ),
+        employee_repo: EmployeeRepository = Depends(EmployeeRepository),
+        availability_index: RoomAvailabilityIndex = Depends(get_availability_index),
+    ):
+        self.manifest_repo = manifest_repo
+        self.booking_repo = booking_repo
+        self.service_request_repo = service_request_repo
+        self.employee_repo = employee_repo
+        self.availability_index = availability_index
+
+    def get_manifest(self, day: date) -> Manifest:
+        entries = self.manifest_repo.get_entries(day)
+        if entries is None:
+            # first read of a day the scheduled job has not built yet
+            return self.build_manifest(day)
+        return _render(day, entries)
+
+    def build_manifest(self, day: date) -> Manifest:
+        def build() -> Entries:
+            entries: Entries = {}
+            for booking in self.booking_repo.get_arrivals(day):
+                entries[ARRIVAL + booking.id] = _booking_entry(booking)
+            for booking in self.booking_repo.get_departures(day):
+                entries[DEPARTURE + booking.id] = _booking_entry(booking)
+            for r in self.service_request_repo.get_all_pending_service_requests():
+                entries[PENDING + r.id] = _service_request_entry(r)
+            entries[AVAILABLE_ROOMS] = {"rooms": self._available_rooms(day)}
+            entries[STAFF] = {
+                "staff": [
+                    {"id": e.id, "name": e.name, "role": e.role.value}
+                    for role in SHIFT_ROLES
+                    for e in self.employee_repo.get_employees(role, True)
+                ]
+            }
+            return entries
+
+        return _render(day, self.manifest_repo.replace_entries(day, build))
+
+    def record_booking(self, booking: Booking) -> None:
+        today = hotel_today()
+        if not booking.check_in <= today <= booking.check_out:
+            return
+
+        active = booking.status != BookingStatus.Booking_Status_Cancelled
+        entry = _booking_entry(booking)
+        arrival = entry if active and booking.check_in == today else None
+        departure = entry if active and booking.check_out == today else None
+        self.manifest_repo.save_entries(
+            today,
+            {
+                ARRIVAL + booking.id: arrival,
+                DEPARTURE + booking.id: departure,
+                # recomputed from the index rather than patched
+                AVAILABLE_ROOMS: {"rooms": self._available_rooms(today)},
+            },
+        )
+
+    def record_service_request(self, service_request: ServiceRequest) -> None:
+        self.record_service_requests([service_request])
+
+    def record_service_requests(self, service_requests: List[ServiceRequest]) -> None:
+        if not service_requests:
+            return
+
+        entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        for service_request in service_requests:
+            pending = service_request.status == ServiceStatus.PENDING
+            entries[PENDING + service_request.id] = (
+                _service_request_entry(service_request) if pending else None
+            )
+        self.manifest_repo.save_entries(hotel_today(), entries)
+
+    def record_assignment(self, service_request_id: str, employee_id: str) -> None:
+        self.record_assignments([(service_request_id, employee_id)])
+
+    def record_assignments(self, assignments: List[Tuple[str, str]]) -> None:
+        if not assignments:
+            return
+
+        updates: Dict[str, Dict[str, Any]] = {}
+        for service_request_id, employee_id in assignments:
+            updates[PENDING + service_request_id] = {
+                "is_assigned": True,
+                "assigned_to": employee_id,
+            }
+        self.manifest_repo.update_entries(hotel_today(), updates)
+
+    def _available_rooms(self, day: date) -> Dict[str, List[int]]:
+        available: Dict[str, List[int]] = {}
+        for room in self.availability_index.free_rooms(day, day + timedelta(days=1)):
+            available.setdefault(room.type.value, []).append(room.number)
+        for numbers in available.values():
+            numbers.sort()
+        return available
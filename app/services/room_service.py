@@ -1,15 +1,35 @@
+import time
 import uuid
-from typing import List
+from datetime import date, datetime, timezone
+from typing import List, Optional
 from fastapi import Depends, status
 from app.app_exception.app_exception import AppException
-from app.dtos.room_requests import AddRoomRequest, UpdateRoomRequest
+from app.availability.calendar import build_calendar
+from app.availability.room_availability_index import RoomAvailabilityIndex
+from app.dependencies import get_availability_index
+from app.dtos.booking_requests import MAX_STAY_NIGHTS
+from app.dtos.room_requests import AddRoomRequest, HoldRoomRequest, UpdateRoomRequest
+from app.dtos.room_response import CalendarEncoding, RoomCalendarDTO, RoomHoldDTO
 from app.models import rooms
+from app.repository.booking_repository import HELD_MESSAGE, BookingRepository
 from app.repository.room_repository import RoomRepository
+from app.services.housekeeping_service import HousekeepingService
+
+CALENDAR_MAX_NIGHTS = 366
 
 
 class RoomService:
-    def __init__(self, room_repo: RoomRepository = Depends(RoomRepository)) -> None:
+    def __init__(
+        self,
+        room_repo: RoomRepository = Depends(RoomRepository),
+        availability_index: RoomAvailabilityIndex = Depends(get_availability_index),
+        booking_repo: BookingRepository = Depends(BookingRepository),
+        housekeeping_service: HousekeepingService = Depends(HousekeepingService),
+    ) -> None:
         self.room_repo = room_repo
+        self.availability_index = availability_index
+        self.booking_repo = booking_repo
+        self.housekeeping_service = housekeeping_service
 
     def get_all_rooms(self) -> List[rooms.Room]:
         return self.room_repo.get_all_rooms()
@@ -17,6 +37,127 @@ class RoomService:
     def get_available_rooms(self) -> List[rooms.Room]:
         return self.room_repo.get_available_rooms()
 
+    def search_rooms(
+        self,
+        room_type: Optional[rooms.RoomType] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        available_only: bool = False,
+    ) -> List[rooms.Room]:
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise AppException(
+                message="min_price cannot be greater than max_price",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        room_types = [room_type] if room_type else list(rooms.RoomType)
+
+        result: List[rooms.Room] = []
+        for r_type in room_types:
+            result += self.room_repo.search_rooms(
+                r_type, min_price, max_price, available_only
+            )
+
+        return result
+
+    def get_free_rooms(
+        self,
+        check_in: date,
+        check_out: date,
+        room_type: Optional[rooms.RoomType] = None,
+        user_id: Optional[str] = None,
+    ) -> List[rooms.Room]:
+        if check_in < date.today():
+            raise AppException(
+                message="check_in cannot be in the past",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if check_out <= check_in:
+            raise AppException(
+                message="check_out must be after check_in",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if (check_out - check_in).days > MAX_STAY_NIGHTS:
+            raise AppException(
+                message=f"stay cannot exceed {MAX_STAY_NIGHTS} nights",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return self.availability_index.free_rooms(
+            check_in, check_out, room_type, user_id
+        )
+
+    def hold_room(
+        self, room_num: int, request: HoldRoomRequest, current_user: dict
+    ) -> RoomHoldDTO:
+        room = self.room_repo.get_room_by_number(room_num)
+
+        if not room.is_available:
+            raise AppException(
+                message="Room is not available for booking",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user_id = current_user.get("sub")
+        if not user_id:
+            raise AppException(
+                message="Invalid user context",
+                status_code=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        check_in = request.check_in_date
+        check_out = request.check_out_date
+
+        # answer obvious conflicts from memory before touching the table
+        self.availability_index.add_room(room)
+        if not self.availability_index.is_free(room_num, check_in, check_out, user_id):
+            raise AppException(
+                message=HELD_MESSAGE,
+                status_code=status.HTTP_409_CONFLICT,
+            )
+
+        expires_at = int(time.time()) + request.minutes * 60
+        self.booking_repo.hold_nights(
+            room_num, check_in, check_out, user_id, expires_at
+        )
+        self.availability_index.add_hold(
+            room_num, check_in, check_out, user_id, expires_at
+        )
+
+        return RoomHoldDTO(
+            room_number=room_num,
+            check_in=check_in,
+            check_out=check_out,
+            held_by=user_id,
+            expires_at=datetime.fromtimestamp(expires_at, tz=timezone.utc),
+        )
+
+    def get_calendar(
+        self, start: date, end: date, encoding: CalendarEncoding = "rle"
+    ) -> RoomCalendarDTO:
+        if end <= start:
+            raise AppException(
+                message="to must be after from",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if (end - start).days > CALENDAR_MAX_NIGHTS:
+            raise AppException(
+                message=f"calendar cannot exceed {CALENDAR_MAX_NIGHTS} nights",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        bookings = [
+            booking
+            for booking in self.booking_repo.get_active_bookings(start)
+            if booking.check_in < end
+        ]
+        return build_calendar(
+            self.room_repo.get_all_rooms(), bookings, start, end, encoding
+        )
+
     def add_room(self, request: AddRoomRequest) -> rooms.Room:
         new_room = rooms.Room(
             id=str(uuid.uuid4()),
@@ -28,18 +169,22 @@ class RoomService:
         )
 
         self.room_repo.add_room(new_room)
+        self.availability_index.add_room(new_room)
+        self.housekeeping_service.record_room(new_room)
         return new_room
 
     def delete_room(self, room_num: int) -> None:
-        room: rooms.Room = self.room_repo.get_room_by_number(room_num)
+        self.room_repo.get_room_by_number(room_num)
 
-        if not room.is_available:
+        if self.availability_index.has_bookings_from(room_num, date.today()):
             raise AppException(
                 message="Room is booked and cannot be deleted",
                 status_code=status.HTTP_400_BAD_REQUEST,
             )
 
         self.room_repo.delete_room(room_num)
+        self.availability_index.remove_room(room_num)
+        self.housekeeping_service.remove_room(room_num)
 
     def update_room(self, room_num: int, data: UpdateRoomRequest) -> None:
         if len(data.model_dump(exclude_unset=True)) == 0:
@@ -50,7 +195,7 @@ class RoomService:
         update_fields = {}
 
         if data.type is not None:
-            update_fields["room_type"] = data.type
+            update_fields["type"] = data.type.value
 
         if data.price is not None:
             update_fields["price"] = data.price
@@ -68,3 +213,5 @@ class RoomService:
             )
 
         self.room_repo.update_room(room_num, update_fields)
+        self.availability_index.invalidate()
+        self.housekeeping_service.record_room_changes(room_num, update_fields)
@@ -1,12 +1,20 @@
-import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, status
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from app.app_exception.app_exception import AppException
 from app.dtos.service_request import (
     AssignedPendingServiceRequestDTO,
+    BulkAssignServiceRequests,
+    BulkAssignmentResult,
+    BulkServiceRequestStatusResult,
+    BulkUpdateServiceRequestStatus,
     CreateServiceRequest,
+    ServiceRequestAssignment,
+    ServiceRequestAssignmentFailure,
+    ServiceRequestChangesDTO,
+    ServiceRequestUpdateFailure,
     UpdateServiceRequestStatus,
     assign_service_request_dto,
 )
@@ -14,7 +22,33 @@ from app.models.bookings import Booking
 from app.models.service_request import ServiceStatus, ServiceType, ServiceRequest
 from app.repository.booking_repository import BookingRepository
 from app.repository.service_request_repository import ServiceRequestRepository
+from app.models.users import Role
 from app.repository.user_repository import UserRepository
+from app.dependencies import get_assignment_broker, get_sla_scheduler
+from app.scheduling.sla_scheduler import SlaScheduler
+from app.streaming.assignment_broker import AssignmentBroker
+from app.services.manifest_service import ManifestService
+from app.services.housekeeping_service import HousekeepingService
+from app.utils import ids
+
+ROLE_SERVICE_TYPES = {
+    Role.KITCHEN_STAFF.value: ServiceType.FOOD,
+    Role.CLEANING_STAFF.value: ServiceType.CLEANING,
+}
+CHANGES_MAX_LOOKBACK = timedelta(days=7)
+# oldest queued requests tried per read when staff claim work
+CLAIM_WINDOW = 5
+CLAIM_ATTEMPTS = 3
+# conditional assignment writes in flight at once for a bulk assignment
+ASSIGN_CONCURRENCY = 8
+
+
+def _stored_time(value: Optional[datetime]) -> Optional[datetime]:
+    # created_at is stored as the server's naive local time, so an aware
+    # bound is converted to it before comparing or querying
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
 
 
 class ServiceRequestService:
@@ -25,10 +59,18 @@ class ServiceRequestService:
         ),
         booking_repo: BookingRepository = Depends(BookingRepository),
         user_repo: UserRepository = Depends(UserRepository),
+        manifest_service: ManifestService = Depends(ManifestService),
+        housekeeping_service: HousekeepingService = Depends(HousekeepingService),
+        sla_scheduler: SlaScheduler = Depends(get_sla_scheduler),
+        assignment_broker: AssignmentBroker = Depends(get_assignment_broker),
     ):
         self.service_request_repo = service_request_repo
         self.booking_repo = booking_repo
         self.user_repo = user_repo
+        self.manifest_service = manifest_service
+        self.housekeeping_service = housekeeping_service
+        self.sla_scheduler = sla_scheduler
+        self.assignment_broker = assignment_broker
 
     def _create_service_request(
         self,
@@ -40,7 +82,7 @@ class ServiceRequestService:
         created_at: datetime,
     ):
         return ServiceRequest(
-            id=str(uuid.uuid4()),
+            id=ids.new_id(),
             room_num=room_num,
             type=type,
             details=details,
@@ -100,10 +142,132 @@ class ServiceRequestService:
         )
 
         self.service_request_repo.save_service_request(service_request)
+        self.manifest_service.record_service_request(service_request)
+        self.housekeeping_service.record_service_request(service_request)
+        self.sla_scheduler.track(service_request)
 
     def get_all_pending_service_requests(self) -> List[ServiceRequest]:
         return self.service_request_repo.get_all_pending_service_requests()
 
+    def search_service_requests(
+        self,
+        service_status: ServiceStatus,
+        service_type: Optional[ServiceType] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> List[ServiceRequest]:
+        created_from = _stored_time(created_from)
+        created_to = _stored_time(created_to)
+        if created_from and created_to and created_from > created_to:
+            raise AppException(
+                message="created_from must be before created_to",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        service_types = [service_type] if service_type else list(ServiceType)
+
+        results: List[ServiceRequest] = []
+        for s_type in service_types:
+            results += self.service_request_repo.query_service_requests_by_status_type(
+                service_status, s_type, created_from, created_to
+            )
+
+        return sorted(results, key=lambda req: req.created_at)
+
+    def _role_service_type(self, current_user) -> ServiceType:
+        service_type = ROLE_SERVICE_TYPES.get(current_user.get("role"))
+        if service_type is None:
+            raise AppException(
+                message="No service queue for this role",
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+        return service_type
+
+    def get_service_queue(self, current_user) -> List[ServiceRequest]:
+        service_type = self._role_service_type(current_user)
+
+        return self.service_request_repo.query_service_requests_by_status_type(
+            ServiceStatus.PENDING, service_type
+        )
+
+    def claim_service_request(self, current_user) -> ServiceRequest:
+        service_type = self._role_service_type(current_user)
+        employee_id = current_user.get("sub")
+
+        for _ in range(CLAIM_ATTEMPTS):
+            candidates = self.service_request_repo.get_queued_service_requests(
+                service_type, CLAIM_WINDOW
+            )
+            if not candidates:
+                break
+
+            for candidate in candidates:
+                try:
+                    # conditional on still pending and unassigned
+                    claimed = self.service_request_repo.assign_service_request(
+                        candidate.id, employee_id
+                    )
+                except AppException as e:
+                    if e.status_code in (
+                        status.HTTP_404_NOT_FOUND,
+                        status.HTTP_409_CONFLICT,
+                    ):
+                        continue
+                    raise
+
+                self.manifest_service.record_assignment(claimed.id, employee_id)
+                self.housekeeping_service.record_assignments(
+                    [(claimed.id, employee_id)]
+                )
+                self.sla_scheduler.assigned(claimed.id, employee_id)
+                self.assignment_broker.publish(employee_id, "assigned", claimed)
+                return claimed
+
+        raise AppException(
+            message="No service requests to claim",
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    def _resolve_cursor(self, since: Optional[str]) -> str:
+        now = datetime.now(timezone.utc)
+        if since is None:
+            return ids.min_id_at(now.replace(hour=0, minute=0, second=0, microsecond=0))
+
+        try:
+            cursor_time = ids.id_timestamp(since)
+        except ValueError:
+            raise AppException(
+                message="Invalid cursor",
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if now - cursor_time > CHANGES_MAX_LOOKBACK:
+            raise AppException(
+                message="Cursor expired, reload the full list",
+                status_code=status.HTTP_410_GONE,
+            )
+        return since
+
+    def get_changes(self, since: Optional[str]) -> ServiceRequestChangesDTO:
+        cursor = self._resolve_cursor(since)
+        changes = self.service_request_repo.get_changes_since(cursor)
+        return ServiceRequestChangesDTO(
+            changes=changes,
+            cursor=changes[-1].change_id if changes else cursor,
+        )
+
+    def get_assigned_changes(
+        self, current_user, since: Optional[str]
+    ) -> ServiceRequestChangesDTO:
+        cursor = self._resolve_cursor(since)
+        changes = self.service_request_repo.get_assigned_changes_since(
+            current_user.get("sub"), cursor
+        )
+        return ServiceRequestChangesDTO(
+            changes=changes,
+            cursor=changes[-1].change_id if changes else cursor,
+        )
+
     def get_service_request_by_userID(self, current_user) -> List[ServiceRequest]:
         user_id = current_user.get("sub")
         return self.service_request_repo.get_pending_service_requests_by_user_id(
@@ -121,9 +285,79 @@ class ServiceRequestService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 message="Employee not found",
             )
-        self.service_request_repo.assign_service_request(
+        assigned = self.service_request_repo.assign_service_request(
             service_request_id, employee_id
         )
+        self.manifest_service.record_assignment(service_request_id, employee_id)
+        self.housekeeping_service.record_assignments(
+            [(service_request_id, employee_id)]
+        )
+        self.sla_scheduler.assigned(service_request_id, employee_id)
+        self.assignment_broker.publish(employee_id, "assigned", assigned)
+
+    def _try_assign(
+        self, assignment: ServiceRequestAssignment
+    ) -> Tuple[Optional[ServiceRequest], str]:
+        try:
+            return (
+                self.service_request_repo.assign_service_request(
+                    assignment.service_request_id, assignment.employee_id
+                ),
+                "",
+            )
+        except AppException as e:
+            return None, e.message
+
+    def assign_service_requests(
+        self, request: BulkAssignServiceRequests
+    ) -> BulkAssignmentResult:
+        employees = self.user_repo.get_users_by_ids(
+            sorted({a.employee_id for a in request.assignments})
+        )
+
+        failed: Dict[int, str] = {}
+        candidates: List[int] = []
+        seen = set()
+        for i, assignment in enumerate(request.assignments):
+            if assignment.service_request_id in seen:
+                failed[i] = "Service request listed more than once"
+            elif assignment.employee_id not in employees:
+                failed[i] = "Employee not found"
+            else:
+                candidates.append(i)
+            seen.add(assignment.service_request_id)
+
+        with ThreadPoolExecutor(max_workers=ASSIGN_CONCURRENCY) as pool:
+            outcomes = list(
+                pool.map(self._try_assign, [request.assignments[i] for i in candidates])
+            )
+
+        assigned: List[ServiceRequestAssignment] = []
+        for i, (service_request, message) in zip(candidates, outcomes):
+            if service_request is None:
+                failed[i] = message
+                continue
+            assignment = request.assignments[i]
+            assigned.append(assignment)
+            self.sla_scheduler.assigned(
+                assignment.service_request_id, assignment.employee_id
+            )
+            self.assignment_broker.publish(
+                assignment.employee_id, "assigned", service_request
+            )
+        pairs = [(a.service_request_id, a.employee_id) for a in assigned]
+        self.manifest_service.record_assignments(pairs)
+        self.housekeeping_service.record_assignments(pairs)
+
+        return BulkAssignmentResult(
+            assigned=assigned,
+            failed=[
+                ServiceRequestAssignmentFailure(
+                    **request.assignments[i].model_dump(), message=failed[i]
+                )
+                for i in sorted(failed)
+            ],
+        )
 
     def get_assigned_service_requests(
         self, current_user
@@ -160,8 +394,14 @@ class ServiceRequestService:
                 message="Invalid status",
             )
         self.service_request_repo.update_service_request(
-            service_request_id, update_status
+            req, update_status, request.charge
         )
+        req.status = update_status
+        self.manifest_service.record_service_request(req)
+        self.housekeeping_service.record_service_request(req)
+        self.sla_scheduler.track(req)
+        if req.assigned_to:
+            self.assignment_broker.publish(req.assigned_to, "status", req)
         booking_id = req.booking_id
         booking = self.booking_repo.get_booking_by_ID(booking_id)
         if req.type == ServiceType.FOOD:
@@ -169,3 +409,59 @@ class ServiceRequestService:
         else:
             booking.clean_req = False
         self.booking_repo.update_booking(booking)
+
+    def update_service_requests(
+        self, request: BulkUpdateServiceRequestStatus
+    ) -> BulkServiceRequestStatusResult:
+        update_status = request.status
+        if update_status != ServiceStatus.DONE:
+            raise AppException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="Invalid status",
+            )
+
+        service_request_ids = list(dict.fromkeys(request.service_request_ids))
+        found = {
+            req.id: req
+            for req in self.service_request_repo.get_service_requests_by_ids(
+                service_request_ids
+            )
+        }
+
+        failed: Dict[str, str] = {}
+        pending: List[ServiceRequest] = []
+        for service_request_id in service_request_ids:
+            req = found.get(service_request_id)
+            if req is None:
+                failed[service_request_id] = "Service request not found"
+            elif req.status != ServiceStatus.PENDING:
+                failed[service_request_id] = "Service request not pending"
+            else:
+                pending.append(req)
+
+        failed.update(
+            self.service_request_repo.update_service_requests_status(
+                pending, update_status, request.charges
+            )
+        )
+
+        updated = [req for req in pending if req.id not in failed]
+        for req in updated:
+            req.status = update_status
+            self.sla_scheduler.track(req)
+            if req.assigned_to:
+                self.assignment_broker.publish(req.assigned_to, "status", req)
+        self.manifest_service.record_service_requests(updated)
+        self.housekeeping_service.record_service_requests(updated)
+
+        return BulkServiceRequestStatusResult(
+            updated=[req.id for req in updated],
+            failed=[
+                ServiceRequestUpdateFailure(
+                    service_request_id=service_request_id,
+                    message=failed[service_request_id],
+                )
+                for service_request_id in service_request_ids
+                if service_request_id in failed
+            ],
+        )
@@ -66,6 +66,7 @@ class UserService:
             "sub": user.id,
             "user_name": user.name,
             "role": user.role,
+            "hotel_id": self.user_repo.hotel_id,
             "iat": datetime.now(tz=timezone.utc),
         }
 
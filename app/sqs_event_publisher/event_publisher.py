@@ -6,7 +6,7 @@ from botocore.utils import ClientError
 from fastapi import status
 
 from app.app_exception.app_exception import AppException
-from app.dependencies import get_queue_url
+from app.dependencies import get_alert_queue_url, get_queue_url
 
 
 class BookingEventPublisher:
@@ -14,9 +14,10 @@ class BookingEventPublisher:
         self.sqs = boto3.client("sqs")
         self.queue_url = get_queue_url()
 
-    def publish_booking_cancelled(self, booking):
+    def publish_booking_cancelled(self, booking, hotel_id: str):
         message = {
             "event_type": "BOOKING_CANCELLED",
+            "hotel_id": hotel_id,
             "booking_id": booking.id,
             "food_req": booking.food_req,
             "clean_req": booking.clean_req,
@@ -33,3 +34,33 @@ class BookingEventPublisher:
                 message=f"Failed to send message to SQS and the response is {e.response}",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class ServiceRequestEventPublisher:
+    def __init__(self):
+        self.sqs = boto3.client("sqs")
+        self.queue_url = get_alert_queue_url()
+
+    def publish_service_request_overdue(self, service_request, stage, hotel_id: str):
+        message = {
+            "event_type": "SERVICE_REQUEST_OVERDUE",
+            "hotel_id": hotel_id,
+            "service_request_id": service_request.id,
+            "stage": stage.value,
+            "type": service_request.type.value,
+            "room_num": service_request.room_num,
+            "assigned_to": service_request.assigned_to,
+            "created_at": service_request.created_at.isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+        try:
+            self.sqs.send_message(
+                QueueUrl=self.queue_url,
+                MessageBody=json.dumps(message),
+            )
+        except ClientError as e:
+            raise AppException(
+                message=f"Failed to send message to SQS and the response is {e.response}",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from app.models.service_request import ServiceRequest
+
+EVENT_BUFFER_SIZE = 1000
+
+
+class AssignmentEvent(BaseModel):
+    id: str
+    employee_id: str
+    event: str
+    data: str
+
+    def encode(self) -> str:
+        return f"id: {self.id}\nevent: {self.event}\ndata: {self.data}\n\n"
+
+
+class Subscription:
+    # lives on the event loop of the streaming response; publishers on
+    # worker threads hand events over with call_soon_threadsafe
+    def __init__(self, employee_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.employee_id = employee_id
+        self.loop = loop
+        self._pending: Deque[AssignmentEvent] = deque()
+        self._wakeup = asyncio.Event()
+
+    def deliver(self, event: AssignmentEvent) -> None:
+        self._pending.append(event)
+        self._wakeup.set()
+
+    async def next_events(self, timeout: float) -> List[AssignmentEvent]:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._wakeup.clear()
+        events = list(self._pending)
+        self._pending.clear()
+        return events
+
+
+class AssignmentBroker:
+    # Recent events sit in a ring buffer so a reconnecting device can resume
+    # from Last-Event-ID; an event's id is the change_id of the write, the
+    # same cursor the table's change index is read with.
+    def __init__(self, capacity: int = EVENT_BUFFER_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._events: Deque[AssignmentEvent] = deque(maxlen=capacity)
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def publish(
+        self, employee_id: str, event: str, service_request: ServiceRequest
+    ) -> AssignmentEvent:
+        published = AssignmentEvent(
+            id=service_request.change_id,
+            employee_id=employee_id,
+            event=event,
+            data=service_request.model_dump_json(),
+        )
+        with self._lock:
+            self._events.append(published)
+            subscribers = list(self._subscribers.get(employee_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, published)
+            except RuntimeError:
+                # the connection's loop is gone
+                self.unsubscribe(subscription)
+        return published
+
+    def subscribe(
+        self, employee_id: str, last_event_id: Optional[str]
+    ) -> Tuple[Subscription, Optional[List[AssignmentEvent]]]:
+        subscription = Subscription(employee_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(employee_id, set()).add(subscription)
+            return subscription, self._replay(employee_id, last_event_id)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.employee_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.employee_id]
+
+    def _replay(
+        self, employee_id: str, last_event_id: Optional[str]
+    ) -> Optional[List[AssignmentEvent]]:
+        # None means the id is not in this buffer (evicted, issued by another
+        # instance or before a restart) and the table has to be read
+        if last_event_id is None:
+            return []
+        for position, event in enumerate(self._events):
+            if event.id == last_event_id:
+                return [
+                    e
+                    for e in islice(self._events, position + 1, None)
+                    if e.employee_id == employee_id
+                ]
+        return None
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(s) for s in self._subscribers.values())
@@ -0,0 +1,12 @@
+import os
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+DEFAULT_HOTEL_TIMEZONE = "Asia/Kolkata"
+
+
+def hotel_today() -> date:
+    # the hotel's calendar day, the one the scheduled lambdas build for; the
+    # server clock's own date rolls over at a different hour
+    timezone = os.getenv("hotel_timezone", DEFAULT_HOTEL_TIMEZONE)
+    return datetime.now(ZoneInfo(timezone)).date()
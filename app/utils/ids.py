@@ -0,0 +1,49 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def new_id() -> str:
+    # UUIDv7 with a 12-bit counter so ids from one process are strictly increasing
+    global _last_ms, _counter
+
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                _last_ms += 1
+                _counter = 0
+        timestamp_ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return str(uuid.UUID(int=value))
+
+
+def id_timestamp(value: str) -> datetime:
+    parsed = uuid.UUID(value)
+    if parsed.version != 7:
+        raise ValueError("Not a time-ordered id")
+    return datetime.fromtimestamp((parsed.int >> 80) / 1000, tz=timezone.utc)
+
+
+def min_id_at(moment: datetime) -> str:
+    timestamp_ms = int(moment.timestamp() * 1000)
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | 0b10 << 62
+    return str(uuid.UUID(int=value))
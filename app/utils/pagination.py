@@ -0,0 +1,14 @@
+from typing import Any, Dict, List
+
+
+def query_all(table, **kwargs: Any) -> List[Dict[str, Any]]:
+    # a query page stops at 1MB; follow LastEvaluatedKey to the last page
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = table.query(**kwargs)
+        items += response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        kwargs["ExclusiveStartKey"] = last_key
@@ -0,0 +1,25 @@
+import os
+import re
+
+DEFAULT_HOTEL_ID = "main"
+# ids are part of every key, so "#" and other separators are never allowed
+HOTEL_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def default_hotel_id() -> str:
+    # single-property deployments and tokens issued before tenancy use this
+    return os.getenv("default_hotel_id", DEFAULT_HOTEL_ID)
+
+
+def hotel_key(hotel_id: str, key: str) -> str:
+    return f"Hotel#{hotel_id}#{key}"
+
+
+def configured_hotel_ids() -> list[str]:
+    # scheduled jobs have no request context, so they walk every property
+    hotels = os.getenv("hotel_ids", "")
+    return [h.strip() for h in hotels.split(",") if h.strip()] or [default_hotel_id()]
+
+
+def is_known_hotel_id(hotel_id: str) -> bool:
+    return hotel_id in configured_hotel_ids()
@@ -0,0 +1,44 @@
+import boto3
+
+from app.availability.room_availability_index import (
+    RoomAvailabilityIndex,
+    table_loader,
+)
+from app.repository.booking_repository import BookingRepository
+from app.repository.employee_repository import EmployeeRepository
+from app.repository.manifest_repository import ManifestRepository
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.services.manifest_service import ManifestService
+from app.utils.hotel_time import hotel_today
+from app.utils.tenancy import configured_hotel_ids
+
+TABLE_NAME = "letstayinn_fastapi"
+
+
+def getddbresource():
+    return boto3.resource("dynamodb", region_name="ap-south-1")
+
+
+def lambda_handler(event, context):
+    ddb_resource = getddbresource()
+    today = hotel_today()
+    hotel_ids = configured_hotel_ids()
+
+    for hotel_id in hotel_ids:
+        manifest_service = ManifestService(
+            manifest_repo=ManifestRepository(ddb_resource, TABLE_NAME, hotel_id),
+            booking_repo=BookingRepository(ddb_resource, TABLE_NAME, hotel_id),
+            service_request_repo=ServiceRequestRepository(
+                ddb_resource, TABLE_NAME, hotel_id
+            ),
+            employee_repo=EmployeeRepository(ddb_resource, TABLE_NAME, hotel_id),
+            availability_index=RoomAvailabilityIndex(
+                table_loader(ddb_resource, TABLE_NAME, hotel_id)
+            ),
+        )
+        manifest_service.build_manifest(today)
+
+    return {
+        "statusCode": 200,
+        "body": f"Built manifests for {today.isoformat()} in {len(hotel_ids)} hotels",
+    }
@@ -1,8 +1,11 @@
-import boto3
 import json
 
-from letstayinn_package.service_request_repository import ServiceRequestRepository
-from mypy_boto3_dynamodb import ServiceResource
+import boto3
+
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.utils.tenancy import default_hotel_id
+
+TABLE_NAME = "letstayinn_fastapi"
 
 
 def getddbresource():
@@ -10,14 +13,16 @@ def getddbresource():
 
 
 def lambda_handler(event, context):
-    ddb_resource: ServiceResource = getddbresource()
-    service_request_repository: ServiceRequestRepository = ServiceRequestRepository(
-        "letstayinn_fastapi", ddb_resource=ddb_resource
-    )
+    ddb_resource = getddbresource()
 
     body = json.loads(event["Records"][0]["body"])
     booking_id = body["booking_id"]
+    # messages queued before tenancy carry no hotel
+    hotel_id = body.get("hotel_id") or default_hotel_id()
 
+    service_request_repository = ServiceRequestRepository(
+        ddb_resource, TABLE_NAME, hotel_id
+    )
     service_request_repository.delete_service_requests_by_booking(booking_id)
 
     return {
@@ -1,26 +1,81 @@
-from typing import Any, Dict, List
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
+
+from app.models.bookings import BookingStatus
+from app.repository.booking_repository import BookingRepository
+from app.utils.hotel_time import hotel_today
+from app.utils.tenancy import configured_hotel_ids, hotel_key
 
-from letstayinn_package.booking_repository import BookingRepository
-from mypy_boto3_dynamodb import ServiceResource
+TABLE_NAME = "letstayinn_fastapi"
+DEPARTURES_INDEX = "DeparturesIndex"
+# departure day up to which every booking has been completed
+PROGRESS_SK = "CompletedBookings"
+# how far the first run reaches back when no progress is recorded yet
+BACKFILL_DAYS = 365
 
 
-def getddbresource() -> ServiceResource:
+def getddbresource():
     return boto3.resource("dynamodb", region_name="ap-south-1")
 
 
-def lambda_handler(event, context):
-    ddb_resource: ServiceResource = getddbresource()
-    booking_repository: BookingRepository = BookingRepository(
-        "letstayinn_fastapi", ddb_resource=ddb_resource
+def departed_bookings(table, hotel_id: str, day) -> List[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "IndexName": DEPARTURES_INDEX,
+        "KeyConditionExpression": Key("departures_pk").eq(
+            hotel_key(hotel_id, f"Departures#{day.isoformat()}")
+        ),
+        "FilterExpression": Attr("status").eq("Booked"),
+    }
+    items: List[Dict[str, Any]] = []
+    while True:
+        response = table.query(**kwargs)
+        items += response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return items
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def progress_key(hotel_id: str) -> Dict[str, str]:
+    return {"pk": hotel_key(hotel_id, "Jobs"), "sk": PROGRESS_SK}
+
+
+def completed_through(table, hotel_id: str) -> Optional[date]:
+    item = table.get_item(Key=progress_key(hotel_id), ConsistentRead=True).get("Item")
+    if not item:
+        return None
+    return date.fromisoformat(item["completed_through"])
+
+
+def save_progress(table, hotel_id: str, day: date):
+    table.put_item(
+        Item={**progress_key(hotel_id), "completed_through": day.isoformat()}
     )
 
-    expired_bookings: List[Dict[str, Any]] = booking_repository.scan_expired_bookings()
 
-    for booking in expired_bookings:
-        booking_id = booking.get("id")
-        user_id = booking.get("user_id")
-        booking_repository.mark_booking_completed(str(booking_id), str(user_id))
+def lambda_handler(event, context):
+    ddb_resource = getddbresource()
+    table = ddb_resource.Table(TABLE_NAME)
+    # guests departing today may still be in house, so stop at yesterday
+    last_day = hotel_today() - timedelta(days=1)
+
+    for hotel_id in configured_hotel_ids():
+        booking_repository = BookingRepository(ddb_resource, TABLE_NAME, hotel_id)
+
+        done = completed_through(table, hotel_id)
+        day = (done or last_day - timedelta(days=BACKFILL_DAYS)) + timedelta(days=1)
+        while day <= last_day:
+            for item in departed_bookings(table, hotel_id, day):
+                booking = booking_repository.get_booking_by_ID(str(item.get("id")))
+                booking.status = BookingStatus.Booking_Status_Completed
+                booking_repository.update_booking(booking)
+            # record each finished day so a failed run resumes where it stopped
+            save_progress(table, hotel_id, day)
+            day += timedelta(days=1)
 
     return {
         "statusCode": 200,
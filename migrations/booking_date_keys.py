@@ -0,0 +1,63 @@
+"""Backfill ``arrivals_pk``/``departures_pk`` on bookings created before the
+ArrivalsIndex and DeparturesIndex existed.
+
+Usage: ``python -m migrations.booking_date_keys``
+"""
+
+import os
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+from app.models.bookings import BookingStatus
+from app.repository.booking_repository import BookingRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids, hotel_key
+
+
+def bookings_without_date_keys(table, hotel_id: str) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "FilterExpression": Attr("pk").begins_with(hotel_key(hotel_id, "Booking#"))
+        & Attr("sk").eq("META")
+        & Attr("status").ne(BookingStatus.Booking_Status_Cancelled.value)
+        & Attr("arrivals_pk").not_exists(),
+    }
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = BookingRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    migrated = 0
+
+    for item in bookings_without_date_keys(repo.table, hotel_id):
+        repo.table.update_item(
+            Key={"pk": item["pk"], "sk": item["sk"]},
+            UpdateExpression="SET arrivals_pk = :arrivals, departures_pk = :departures",
+            ExpressionAttributeValues={
+                ":arrivals": hotel_key(hotel_id, f"Arrivals#{item['check_in']}"),
+                ":departures": hotel_key(hotel_id, f"Departures#{item['check_out']}"),
+            },
+        )
+        migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Backfilled arrival and departure keys on {count} bookings")
@@ -0,0 +1,97 @@
+"""Open a folio for bookings made before folios existed.
+
+The room charge uses the room's current price. Service charges added
+before the migration are kept.
+
+Usage: ``python -m migrations.booking_folios``
+"""
+
+import os
+from datetime import date
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.utils import ClientError
+
+from app.models.bookings import BookingStatus
+from app.repository.booking_repository import BookingRepository
+from app.repository.room_repository import RoomRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids, hotel_key
+
+
+def bookings(table, hotel_id: str) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "FilterExpression": Attr("pk").begins_with(hotel_key(hotel_id, "Booking#"))
+        & Attr("sk").eq("META")
+        & Attr("status").ne(BookingStatus.Booking_Status_Cancelled.value),
+    }
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = BookingRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    room_repo = RoomRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    prices = {room.number: room.price for room in room_repo.get_all_rooms()}
+    migrated = 0
+
+    for item in bookings(repo.table, hotel_id):
+        room_rate = prices.get(int(item["room_num"]), 0)
+        stay_nights = (
+            date.fromisoformat(item["check_out"]) - date.fromisoformat(item["check_in"])
+        ).days
+        try:
+            repo.table.update_item(
+                Key=repo.folio_key(item["id"]),
+                UpdateExpression="""
+                    SET booking_id = :booking_id,
+                        user_id = :user_id,
+                        room_num = :room_num,
+                        check_in = :check_in,
+                        check_out = :check_out,
+                        room_rate = :room_rate,
+                        nights = :nights,
+                        room_charges = :room_charges
+                """,
+                ConditionExpression="attribute_not_exists(room_rate)",
+                ExpressionAttributeValues={
+                    ":booking_id": item["id"],
+                    ":user_id": item["user_id"],
+                    ":room_num": int(item["room_num"]),
+                    ":check_in": item["check_in"],
+                    ":check_out": item["check_out"],
+                    ":room_rate": room_rate,
+                    ":nights": stay_nights,
+                    ":room_charges": stay_nights * room_rate,
+                },
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                # already has a folio
+                continue
+            raise
+        migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Opened folios for {count} bookings")
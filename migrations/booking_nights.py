@@ -0,0 +1,75 @@
+"""Backfill active-booking keys and per-night room items for upcoming bookings.
+
+Usage: ``python -m migrations.booking_nights``
+"""
+
+import os
+from datetime import date
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+from app.availability.room_availability_index import nights
+from app.models.bookings import Booking, BookingStatus
+from app.repository.booking_repository import BookingRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids, hotel_key
+
+
+def upcoming_bookings(table, hotel_id: str, today: date) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "FilterExpression": Attr("pk").begins_with(hotel_key(hotel_id, "Booking#"))
+        & Attr("sk").eq("META")
+        & Attr("status").eq(BookingStatus.Booking_Status_Booked.value)
+        & Attr("check_out").gt(today.isoformat())
+        & Attr("active_pk").not_exists(),
+    }
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = BookingRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    migrated = 0
+
+    for item in upcoming_bookings(repo.table, hotel_id, date.today()):
+        booking = Booking(**item)
+        with repo.table.batch_writer() as batch:
+            for night in nights(booking.check_in, booking.check_out):
+                batch.put_item(
+                    Item={
+                        **repo.night_key(booking.room_num, night),
+                        "booking_id": booking.id,
+                        "user_id": booking.user_id,
+                    }
+                )
+        repo.table.update_item(
+            Key={"pk": item["pk"], "sk": item["sk"]},
+            UpdateExpression="SET active_pk = :active_pk, active_sk = :active_sk",
+            ExpressionAttributeValues={
+                ":active_pk": hotel_key(hotel_id, "ActiveBookings"),
+                ":active_sk": f"{booking.check_out.isoformat()}#{booking.id}",
+            },
+        )
+        migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Backfilled nights for {count} bookings")
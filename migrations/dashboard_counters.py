@@ -0,0 +1,154 @@
+"""Reconcile the sharded dashboard counters with the items they count.
+
+Each counter is recounted from the table and the difference from the summed
+shards is added to one shard, so writes made while this runs are kept and
+the script can be re-run at any time. The shards are read before and after
+each recount; a counter that moved in between may or may not be in the
+recount, so it is left alone and recounted on the next pass, up to
+RECOUNT_ATTEMPTS passes. One still moving after that waits for a re-run.
+
+Usage: ``python -m migrations.dashboard_counters``
+"""
+
+import os
+from collections import Counter
+from datetime import date
+from typing import Dict, Optional, Set, Tuple
+
+import boto3
+
+from app.models.service_request import ServiceStatus, ServiceType
+from app.repository.booking_repository import BookingRepository
+from app.repository.counter_repository import (
+    ARRIVALS,
+    RATING_TOTAL,
+    RATINGS,
+    ROOMS_AVAILABLE,
+    CounterRepository,
+    counter_updates,
+    pending_counter,
+)
+from app.repository.feedback_repository import FeedbackRepository
+from app.repository.room_repository import RoomRepository
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.utils.hotel_time import hotel_today
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids
+
+RECOUNT_ATTEMPTS = 3
+
+# a counter is its day and name; the totals have no day
+CounterId = Tuple[Optional[date], str]
+
+
+def recount(ddb_resource, table_name: str, hotel_id: str) -> Dict[str, int]:
+    repo_kwargs = {
+        "ddb_resource": ddb_resource,
+        "table_name": table_name,
+        "hotel_id": hotel_id,
+    }
+    service_request_repo = ServiceRequestRepository(**repo_kwargs)
+    rated = [
+        feedback.rating
+        for feedback in FeedbackRepository(**repo_kwargs).get_all_feedbacks()
+        if feedback.rating is not None
+    ]
+
+    totals = {
+        ROOMS_AVAILABLE: sum(
+            room.is_available for room in RoomRepository(**repo_kwargs).get_all_rooms()
+        ),
+        RATINGS: len(rated),
+        RATING_TOTAL: sum(rated),
+    }
+    for service_type in ServiceType:
+        totals[pending_counter(service_type)] = len(
+            service_request_repo.query_service_requests_by_status_type(
+                ServiceStatus.PENDING, service_type
+            )
+        )
+    return totals
+
+
+def _stored(
+    counter_repo: CounterRepository, today: date, days: Set[date]
+) -> Dict[CounterId, int]:
+    stored: Dict[CounterId, int] = {}
+    for day in days:
+        counters = counter_repo.read_counters(day, consistent=True)
+        stored[(day, ARRIVALS)] = counters.pop(ARRIVALS, 0)
+        if day == today:
+            stored.update({(None, name): count for name, count in counters.items()})
+    return stored
+
+
+def _counted(
+    ddb_resource, table_name: str, hotel_id: str, today: date
+) -> Dict[CounterId, int]:
+    counted: Dict[CounterId, int] = {
+        (None, name): count
+        for name, count in recount(ddb_resource, table_name, hotel_id).items()
+    }
+
+    # arrivals only matter from today on; earlier days are never read again
+    booking_repo = BookingRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    arrivals: Dict[date, int] = Counter(
+        booking.check_in
+        for booking in booking_repo.get_active_bookings(today)
+        if booking.check_in >= today
+    )
+    arrivals.setdefault(today, 0)
+    counted.update({(day, ARRIVALS): count for day, count in arrivals.items()})
+    return counted
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    today = hotel_today()
+    client = ddb_resource.meta.client
+    counter_repo = CounterRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+
+    days = {today}
+    settled: Set[CounterId] = set()
+    adjusted = 0
+    for _ in range(RECOUNT_ATTEMPTS):
+        read_days = set(days)
+        before = _stored(counter_repo, today, read_days)
+        counted = _counted(ddb_resource, table_name, hotel_id, today)
+        days |= {day for day, _ in counted if day is not None}
+        after = _stored(counter_repo, today, days)
+
+        for counter in (counted.keys() | after.keys()) - settled:
+            day, name = counter
+            if day is not None and day not in read_days:
+                continue
+            if before.get(counter, 0) != after.get(counter, 0):
+                continue
+
+            settled.add(counter)
+            for op in counter_updates(
+                table_name,
+                hotel_id,
+                {name: counted.get(counter, 0) - after.get(counter, 0)},
+                day,
+            ):
+                client.update_item(**op["Update"])
+                adjusted += 1
+
+        if counted.keys() | after.keys() <= settled:
+            break
+
+    return adjusted
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Adjusted {count} dashboard counters")
@@ -0,0 +1,62 @@
+"""Backfill ``directory_sk`` on employees created before the EmployeeDirectoryIndex.
+
+Usage: ``python -m migrations.employee_directory_keys``
+"""
+
+import os
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr, Key
+
+from app.repository.employee_repository import EmployeeRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids
+
+
+def employees_without_directory_key(
+    table, employee_pk: str
+) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": Key("pk").eq(employee_pk),
+        "FilterExpression": Attr("directory_sk").not_exists(),
+    }
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = EmployeeRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    migrated = 0
+
+    for item in employees_without_directory_key(repo.table, repo.employee_pk):
+        repo.table.update_item(
+            Key={"pk": item["pk"], "sk": item["sk"]},
+            UpdateExpression="SET directory_sk = :directory_sk",
+            ExpressionAttributeValues={
+                ":directory_sk": EmployeeRepository.directory_sk(
+                    item["role"], item["available"], item["id"]
+                ),
+            },
+        )
+        migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Backfilled directory keys on {count} employees")
@@ -0,0 +1,71 @@
+"""Move items written before multi-property tenancy into a hotel's partition.
+
+Every key that is not yet prefixed with ``Hotel#`` is rewritten as
+``Hotel#{hotel_id}#{key}`` (the ``pk`` and the GSI partition keys), and the
+unprefixed item is deleted. It is safe to re-run.
+
+Usage: ``python -m migrations.hotel_partitions`` (uses ``default_hotel_id``)
+"""
+
+import os
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+
+from app.utils.tenancy import default_hotel_id, hotel_key
+
+PARTITION_ATTRIBUTES = (
+    "pk",
+    "active_pk",
+    "arrivals_pk",
+    "departures_pk",
+    "status_type",
+    "guest_pk",
+    "booking_pk",
+    "assignee_pk",
+    "changes_pk",
+)
+
+
+def unpartitioned_items(table) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "FilterExpression": ~Attr("pk").begins_with("Hotel#"),
+    }
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def partitioned(item: Dict[str, Any], hotel_id: str) -> Dict[str, Any]:
+    moved = dict(item)
+    for attribute in PARTITION_ATTRIBUTES:
+        if attribute in moved:
+            moved[attribute] = hotel_key(hotel_id, moved[attribute])
+    return moved
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str) -> int:
+    table = ddb_resource.Table(table_name)
+    migrated = 0
+
+    with table.batch_writer() as batch:
+        for item in list(unpartitioned_items(table)):
+            batch.put_item(Item=partitioned(item, hotel_id))
+            batch.delete_item(Key={"pk": item["pk"], "sk": item["sk"]})
+            migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = migrate(resource, str(os.getenv("table_name")), default_hotel_id())
+    print(f"Moved {count} items into hotel partitions")
@@ -0,0 +1,61 @@
+"""Recompute per-type, per-night inventory counters from upcoming bookings.
+
+Usage: ``python -m migrations.inventory_counters``
+"""
+
+import os
+from collections import Counter
+from datetime import date
+from typing import Dict, Tuple
+
+import boto3
+
+from app.availability.room_availability_index import nights
+from app.repository.booking_repository import BookingRepository
+from app.repository.room_repository import RoomRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    room_repo = RoomRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    booking_repo = BookingRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+
+    room_types = {room.number: room.type.value for room in room_repo.get_all_rooms()}
+    booked: Dict[Tuple[str, date], int] = Counter()
+
+    for booking in booking_repo.get_active_bookings(date.today()):
+        room_type = (
+            booking.room_type.value
+            if booking.room_type
+            else room_types.get(booking.room_num)
+        )
+        if room_type is None:
+            continue
+        for night in nights(booking.check_in, booking.check_out):
+            booked[(room_type, night)] += 1
+
+    with booking_repo.table.batch_writer() as batch:
+        for (room_type, night), count in booked.items():
+            batch.put_item(
+                Item={
+                    **booking_repo.inventory_key(room_type, night),
+                    "booked": count,
+                }
+            )
+
+    return len(booked)
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Wrote {count} inventory counters")
@@ -0,0 +1,69 @@
+"""Seed each employee's open-assignment count from their pending requests.
+
+Dispatch reads every employee's load from the ``OpenAssignments`` items,
+which assigning, finishing, unassigning and deleting requests keep current in
+their own transactions. Assignments made before those items existed are
+counted here from ``AssigneeIndex`` and the difference is added, so writes
+made while this runs are kept. A load that moved between the reads before
+and after its count is counted again on the next pass, up to
+RECOUNT_ATTEMPTS passes; one still moving after that waits for a re-run.
+
+Usage: ``python -m migrations.open_assignments``
+"""
+
+import os
+from typing import Set
+
+import boto3
+
+from app.repository.employee_repository import EmployeeRepository
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids
+
+RECOUNT_ATTEMPTS = 3
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo_kwargs = {
+        "ddb_resource": ddb_resource,
+        "table_name": table_name,
+        "hotel_id": hotel_id,
+    }
+    service_request_repo = ServiceRequestRepository(**repo_kwargs)
+    employee_ids = {e.id for e in EmployeeRepository(**repo_kwargs).get_employees()}
+
+    settled: Set[str] = set()
+    adjusted = 0
+    for _ in range(RECOUNT_ATTEMPTS):
+        unsettled = employee_ids - settled
+        if not unsettled:
+            break
+
+        before = service_request_repo.get_open_assignments(consistent=True)
+        counted = {
+            employee_id: service_request_repo.count_open_assignments(employee_id)
+            for employee_id in unsettled
+        }
+        after = service_request_repo.get_open_assignments(consistent=True)
+
+        for employee_id, count in counted.items():
+            stored = after.get(employee_id, 0)
+            if before.get(employee_id, 0) != stored:
+                continue
+            settled.add(employee_id)
+            if count != stored:
+                service_request_repo.add_open_tasks(employee_id, count - stored)
+                adjusted += 1
+
+    return adjusted
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Adjusted {count} employee loads")
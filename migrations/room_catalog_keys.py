@@ -0,0 +1,61 @@
+"""Backfill ``catalog_sk`` on rooms created before the RoomCatalogIndex existed.
+
+Usage: ``python -m migrations.room_catalog_keys``
+"""
+
+import os
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr, Key
+
+from app.repository.room_repository import RoomRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids
+
+
+def rooms_without_catalog_key(table, rooms_pk: str) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": Key("pk").eq(rooms_pk)
+        & Key("sk").begins_with("room#"),
+        "FilterExpression": Attr("catalog_sk").not_exists(),
+    }
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = RoomRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    migrated = 0
+
+    for item in rooms_without_catalog_key(repo.table, repo.rooms_pk):
+        repo.table.update_item(
+            Key={"pk": item["pk"], "sk": item["sk"]},
+            UpdateExpression="SET catalog_sk = :catalog_sk",
+            ExpressionAttributeValues={
+                ":catalog_sk": RoomRepository.catalog_sk(
+                    item["type"], int(item["price"]), int(item["number"])
+                ),
+            },
+        )
+        migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Backfilled catalog keys on {count} rooms")
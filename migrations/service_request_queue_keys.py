@@ -0,0 +1,70 @@
+"""Backfill ``queue_pk`` on unassigned pending service requests created before
+the QueueIndex existed.
+
+Usage: ``python -m migrations.service_request_queue_keys``
+"""
+
+import os
+from typing import Any, Dict, Iterator
+
+import boto3
+from boto3.dynamodb.conditions import Attr, Key
+
+from app.models.service_request import ServiceStatus, ServiceType
+from app.repository.service_request_repository import (
+    STATUS_TYPE_INDEX,
+    ServiceRequestRepository,
+)
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids, hotel_key
+
+
+def unqueued_requests(
+    table, hotel_id: str, service_type: ServiceType
+) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "IndexName": STATUS_TYPE_INDEX,
+        "KeyConditionExpression": Key("status_type").eq(
+            hotel_key(hotel_id, f"{ServiceStatus.PENDING.value}#{service_type.value}")
+        ),
+        "FilterExpression": Attr("is_assigned").eq(False)
+        & Attr("queue_pk").not_exists(),
+    }
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = ServiceRequestRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    migrated = 0
+
+    for service_type in ServiceType:
+        for item in unqueued_requests(repo.table, hotel_id, service_type):
+            repo.table.update_item(
+                Key={"pk": item["pk"], "sk": item["sk"]},
+                UpdateExpression="SET queue_pk = :queue_pk",
+                ExpressionAttributeValues={
+                    ":queue_pk": hotel_key(hotel_id, f"Queue#{service_type.value}"),
+                },
+            )
+            migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Queued {count} unassigned service requests")
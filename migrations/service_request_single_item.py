@@ -0,0 +1,90 @@
+"""Move service requests from the duplicated layout to one canonical item.
+
+The legacy layout stored every service request up to four times:
+``ServiceRequests/Service#{status}#{id}``, ``User#{user}/Made#{status}#{id}``,
+``Booking#{booking}/Service#{id}`` and ``User#{employee}/Service#{status}#{id}``.
+This script writes the canonical ``ServiceRequest#{id}/META`` item (with its
+GSI attributes) and deletes the legacy copies. It is safe to re-run.
+
+Usage: ``python -m migrations.service_request_single_item``
+"""
+
+import os
+from typing import Any, Dict, Iterator, List
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from app.models.service_request import ServiceRequest
+from app.repository.service_request_repository import ServiceRequestRepository
+from app.utils.tenancy import DEFAULT_HOTEL_ID, configured_hotel_ids, hotel_key
+
+
+def legacy_items(table, hotel_id: str) -> Iterator[Dict[str, Any]]:
+    kwargs: Dict[str, Any] = {
+        "KeyConditionExpression": Key("pk").eq(hotel_key(hotel_id, "ServiceRequests"))
+        & Key("sk").begins_with("Service#"),
+    }
+    while True:
+        response = table.query(**kwargs)
+        yield from response.get("Items", [])
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def legacy_keys(item: Dict[str, Any], hotel_id: str) -> List[Dict[str, str]]:
+    service_request_id = item["id"]
+    item_status = item["status"]
+
+    keys = [
+        {
+            "pk": hotel_key(hotel_id, "ServiceRequests"),
+            "sk": f"Service#{item_status}#{service_request_id}",
+        },
+        {
+            "pk": hotel_key(hotel_id, f"User#{item['user_id']}"),
+            "sk": f"Made#{item_status}#{service_request_id}",
+        },
+        {
+            "pk": hotel_key(hotel_id, f"Booking#{item['booking_id']}"),
+            "sk": f"Service#{service_request_id}",
+        },
+    ]
+    if item.get("assigned_to"):
+        keys.append(
+            {
+                "pk": hotel_key(hotel_id, f"User#{item['assigned_to']}"),
+                "sk": f"Service#{item_status}#{service_request_id}",
+            }
+        )
+    return keys
+
+
+def migrate(ddb_resource, table_name: str, hotel_id: str = DEFAULT_HOTEL_ID) -> int:
+    repo = ServiceRequestRepository(
+        ddb_resource=ddb_resource, table_name=table_name, hotel_id=hotel_id
+    )
+    migrated = 0
+
+    with repo.table.batch_writer() as batch:
+        for item in list(legacy_items(repo.table, hotel_id)):
+            batch.put_item(Item=repo.to_item(ServiceRequest(**item)))
+            for key in legacy_keys(item, hotel_id):
+                batch.delete_item(Key=key)
+            migrated += 1
+
+    return migrated
+
+
+if __name__ == "__main__":
+    resource = boto3.resource(
+        "dynamodb", region_name=os.getenv("AWS_REGION", "ap-south-1")
+    )
+    count = sum(
+        migrate(resource, str(os.getenv("table_name")), hotel_id)
+        for hotel_id in configured_hotel_ids()
+    )
+    print(f"Migrated {count} service requests")
@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import Room, RoomType
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from app.models.users import Role, User
+from app.utils import ids
+
+CREATED_AT = datetime(2026, 3, 10, 9)
+
+
+def make_room(number: int, room_type=RoomType.RoomTypeStandard, **fields) -> Room:
+    return Room(
+        **{
+            "id": f"room-{number}",
+            "number": number,
+            "type": room_type,
+            "price": 2000,
+            "is_available": True,
+            "description": "Room",
+            **fields,
+        }
+    )
+
+
+def make_booking(
+    booking_id: str, room_num: int, check_in: date, check_out: date, **fields
+) -> Booking:
+    return Booking(
+        **{
+            "id": booking_id,
+            "user_id": "user-1",
+            "room_id": f"room-{room_num}",
+            "room_num": room_num,
+            "check_in": check_in,
+            "check_out": check_out,
+            "status": BookingStatus.Booking_Status_Booked,
+            "food_req": False,
+            "clean_req": False,
+            **fields,
+        }
+    )
+
+
+def make_stay(
+    booking_id: str, room_num: int, first_day: date, start: int, nights: int, **fields
+) -> Booking:
+    # a booking placed by its offset from first_day and its length
+    check_in = first_day + timedelta(days=start)
+    return make_booking(
+        booking_id, room_num, check_in, check_in + timedelta(days=nights), **fields
+    )
+
+
+def make_service_request(
+    request_id: str,
+    service_type=ServiceType.FOOD,
+    assigned_to: Optional[str] = None,
+    **fields,
+) -> ServiceRequest:
+    return ServiceRequest(
+        **{
+            "id": request_id,
+            "user_id": "user-1",
+            "booking_id": "booking-1",
+            "room_num": 101,
+            "type": service_type,
+            "status": ServiceStatus.PENDING,
+            "is_assigned": assigned_to is not None,
+            "assigned_to": assigned_to,
+            "created_at": CREATED_AT,
+            "details": "Tea",
+            "change_id": ids.new_id(),
+            **fields,
+        }
+    )
+
+
+def make_employee(employee_id: str, role=Role.KITCHEN_STAFF, **fields) -> User:
+    return User(
+        **{
+            "id": employee_id,
+            "name": employee_id,
+            "email": f"{employee_id}@example.com",
+            "password": "x",
+            "role": role,
+            "available": True,
+            **fields,
+        }
+    )
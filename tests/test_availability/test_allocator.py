@@ -0,0 +1,70 @@
+import unittest
+from datetime import date
+
+from app.availability.allocator import plan_allocation, short_gaps
+from app.models.rooms import RoomType
+from tests.factories import make_room, make_stay
+
+TODAY = date(2026, 3, 1)
+
+
+class TestAllocator(unittest.TestCase):
+    def test_short_gaps(self):
+        stays = {
+            101: [
+                (date(2026, 3, 1), date(2026, 3, 3)),
+                (date(2026, 3, 4), date(2026, 3, 6)),
+                (date(2026, 3, 10), date(2026, 3, 11)),
+            ]
+        }
+
+        self.assertEqual(short_gaps(stays), 1)
+
+    def test_packs_stays_back_to_back(self):
+        rooms = [make_room(101), make_room(102)]
+        bookings = [
+            make_stay("a", 101, TODAY, 1, 2),
+            make_stay("b", 102, TODAY, 3, 2),
+            make_stay("c", 101, TODAY, 4, 2),
+        ]
+
+        plan = plan_allocation(rooms, bookings, TODAY)
+
+        self.assertEqual(plan.short_gaps_before, 1)
+        self.assertEqual(plan.short_gaps_after, 0)
+        self.assertEqual(
+            [(m.booking_id, m.from_room, m.to_room) for m in plan.moves],
+            [("b", 102, 101), ("c", 101, 102)],
+        )
+
+    def test_checked_in_stays_are_not_moved(self):
+        rooms = [make_room(101), make_room(102)]
+        bookings = [
+            make_stay("in-house", 102, TODAY, 0, 3),
+            make_stay("next", 101, TODAY, 3, 2),
+        ]
+
+        plan = plan_allocation(rooms, bookings, TODAY)
+
+        self.assertEqual(len(plan.moves), 1)
+        self.assertEqual(plan.moves[0].booking_id, "next")
+        self.assertEqual(plan.moves[0].to_room, 102)
+
+    def test_room_types_are_not_mixed(self):
+        rooms = [make_room(101), make_room(201, RoomType.RoomTypeDeluxe)]
+        bookings = [
+            make_stay("a", 101, TODAY, 1, 2),
+            make_stay("b", 201, TODAY, 3, 2),
+        ]
+
+        plan = plan_allocation(rooms, bookings, TODAY)
+
+        self.assertEqual(plan.moves, [])
+
+    def test_keeps_current_room_on_ties(self):
+        rooms = [make_room(101), make_room(102)]
+        bookings = [make_stay("a", 102, TODAY, 5, 2)]
+
+        plan = plan_allocation(rooms, bookings, TODAY)
+
+        self.assertEqual(plan.moves, [])
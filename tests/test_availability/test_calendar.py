@@ -0,0 +1,50 @@
+import unittest
+from datetime import date
+
+from app.availability.calendar import build_calendar, occupancy_grid
+from app.models.bookings import BookingStatus
+from app.models.rooms import RoomType
+from tests.factories import make_room, make_stay
+
+START = date(2026, 3, 1)
+END = date(2026, 3, 11)
+
+
+class TestCalendar(unittest.TestCase):
+    def setUp(self):
+        self.rooms = [make_room(102, RoomType.RoomTypeDeluxe), make_room(101)]
+        self.bookings = [
+            make_stay("b-1", 101, START, -2, 4),
+            make_stay("b-2", 101, START, 5, 2),
+            make_stay("b-3", 102, START, 8, 5),
+            make_stay(
+                "b-4",
+                102,
+                START,
+                3,
+                1,
+                status=BookingStatus.Booking_Status_Cancelled,
+            ),
+        ]
+
+    def test_occupancy_grid_clips_to_range(self):
+        grid = occupancy_grid(self.rooms[1:], self.bookings, START, END)
+
+        self.assertEqual(grid[0].astype(int).tolist(), [1, 1, 0, 0, 0, 1, 1, 0, 0, 0])
+
+    def test_run_lengths_and_totals(self):
+        calendar = build_calendar(self.rooms, self.bookings, START, END)
+
+        self.assertEqual([row.number for row in calendar.rooms], [101, 102])
+        self.assertEqual(calendar.rooms[0].occupancy, [[0, 2], [5, 2]])
+        self.assertEqual(calendar.rooms[1].occupancy, [[8, 2]])
+        deluxe = next(t for t in calendar.totals if t.type == RoomType.RoomTypeDeluxe)
+        self.assertEqual(deluxe.rooms, 1)
+        self.assertEqual(deluxe.occupied, [0] * 8 + [1, 1])
+
+    def test_bitset_encoding(self):
+        calendar = build_calendar(self.rooms, self.bookings, START, END, "bitset")
+
+        # 1100011000 padded to two bytes
+        self.assertEqual(calendar.rooms[0].occupancy, "xgA=")
+        self.assertEqual(calendar.model_dump(mode="json")["encoding"], "bitset")
@@ -0,0 +1,111 @@
+import time
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.availability.room_availability_index import RoomAvailabilityIndex
+from app.models.rooms import RoomType
+from tests.factories import make_booking, make_room
+
+
+class TestRoomAvailabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.rooms = [
+            make_room(101),
+            make_room(102, RoomType.RoomTypeDeluxe),
+            make_room(103, is_available=False),
+        ]
+        self.bookings = [make_booking("b-1", 101, date(2026, 3, 10), date(2026, 3, 12))]
+        self.loader = MagicMock(return_value=(self.rooms, self.bookings))
+        self.index = RoomAvailabilityIndex(self.loader)
+
+    def load(self):
+        self.index.free_rooms(date(2026, 1, 1), date(2026, 1, 2))
+
+    def test_loads_lazily_once(self):
+        self.index.is_free(101, date(2026, 3, 1), date(2026, 3, 2))
+        self.index.is_free(102, date(2026, 3, 1), date(2026, 3, 2))
+
+        self.loader.assert_called_once()
+
+    def test_overlapping_stay_is_not_free(self):
+        self.assertFalse(self.index.is_free(101, date(2026, 3, 11), date(2026, 3, 13)))
+
+    def test_back_to_back_stays_are_free(self):
+        self.assertTrue(self.index.is_free(101, date(2026, 3, 12), date(2026, 3, 14)))
+        self.assertTrue(self.index.is_free(101, date(2026, 3, 8), date(2026, 3, 10)))
+
+    def test_free_rooms_skips_booked_and_out_of_service(self):
+        free = self.index.free_rooms(date(2026, 3, 10), date(2026, 3, 11))
+
+        self.assertEqual([r.number for r in free], [102])
+
+    def test_free_rooms_by_type(self):
+        free = self.index.free_rooms(
+            date(2026, 3, 1), date(2026, 3, 2), RoomType.RoomTypeStandard
+        )
+
+        self.assertEqual([r.number for r in free], [101])
+
+    def test_remove_booking_frees_nights(self):
+        self.load()
+        self.index.remove_booking("b-1")
+
+        self.assertTrue(self.index.is_free(101, date(2026, 3, 10), date(2026, 3, 12)))
+
+    def test_add_booking_after_load(self):
+        self.load()
+        self.index.add_booking(
+            make_booking("b-2", 102, date(2026, 3, 1), date(2026, 3, 3))
+        )
+
+        self.assertFalse(self.index.is_free(102, date(2026, 3, 2), date(2026, 3, 4)))
+
+    def test_remove_room(self):
+        self.load()
+        self.index.remove_room(101)
+
+        free = self.index.free_rooms(date(2026, 3, 1), date(2026, 3, 2))
+        self.assertEqual([r.number for r in free], [102])
+        self.assertFalse(self.index.has_bookings_from(101, date(2026, 3, 1)))
+
+    def test_has_bookings_from(self):
+        self.assertTrue(self.index.has_bookings_from(101, date(2026, 3, 11)))
+        self.assertFalse(self.index.has_bookings_from(101, date(2026, 3, 12)))
+
+    def test_invalidate_reloads(self):
+        self.index.is_free(101, date(2026, 3, 1), date(2026, 3, 2))
+        self.index.invalidate()
+        self.index.is_free(101, date(2026, 3, 1), date(2026, 3, 2))
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_holds_hide_room_from_other_users(self):
+        self.load()
+        self.index.add_hold(
+            102, date(2026, 3, 1), date(2026, 3, 3), "user-2", time.time() + 60
+        )
+
+        self.assertFalse(self.index.is_free(102, date(2026, 3, 2), date(2026, 3, 4)))
+        self.assertTrue(
+            self.index.is_free(102, date(2026, 3, 2), date(2026, 3, 4), "user-2")
+        )
+        self.assertTrue(self.index.is_free(102, date(2026, 3, 3), date(2026, 3, 4)))
+
+    def test_lapsed_holds_are_ignored(self):
+        self.load()
+        self.index.add_hold(
+            102, date(2026, 3, 1), date(2026, 3, 3), "user-2", time.time() - 1
+        )
+
+        free = self.index.free_rooms(date(2026, 3, 1), date(2026, 3, 2))
+        self.assertEqual([r.number for r in free], [101, 102])
+
+    def test_holds_survive_reload(self):
+        self.load()
+        self.index.add_hold(
+            102, date(2026, 3, 1), date(2026, 3, 3), "user-2", time.time() + 60
+        )
+        self.index.invalidate()
+
+        self.assertFalse(self.index.is_free(102, date(2026, 3, 1), date(2026, 3, 2)))
@@ -0,0 +1,54 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.counters.counter_cache import CounterCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCounterCache(unittest.TestCase):
+    def setUp(self):
+        self.loader = MagicMock(return_value={"rooms_available": 4})
+        self.clock = FakeClock()
+        self.cache = CounterCache(self.loader, ttl_seconds=5, clock=self.clock)
+        self.day = date(2026, 3, 10)
+
+    def test_reads_within_ttl_share_one_load(self):
+        first = self.cache.get(self.day)
+        self.clock.now += 4
+        second = self.cache.get(self.day)
+
+        self.assertEqual(first, {"rooms_available": 4})
+        self.assertIs(first, second)
+        self.loader.assert_called_once_with(self.day)
+
+    def test_reloads_after_ttl(self):
+        self.cache.get(self.day)
+        self.clock.now += 5
+        self.loader.return_value = {"rooms_available": 3}
+
+        self.assertEqual(self.cache.get(self.day), {"rooms_available": 3})
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_new_day_reloads(self):
+        self.cache.get(self.day)
+
+        self.cache.get(date(2026, 3, 11))
+
+        self.loader.assert_called_with(date(2026, 3, 11))
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_invalidate(self):
+        self.cache.get(self.day)
+
+        self.cache.invalidate()
+        self.cache.get(self.day)
+
+        self.assertEqual(self.loader.call_count, 2)
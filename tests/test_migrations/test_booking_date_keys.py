@@ -0,0 +1,37 @@
+import unittest
+from unittest.mock import MagicMock
+
+from migrations.booking_date_keys import migrate
+
+
+class TestBookingDateKeysMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+    def test_migrate_backfills_date_keys(self):
+        self.mock_table.scan.side_effect = [
+            {
+                "Items": [
+                    {
+                        "pk": "Hotel#h1#Booking#booking-1",
+                        "sk": "META",
+                        "check_in": "2026-01-10",
+                        "check_out": "2026-01-12",
+                    }
+                ],
+                "LastEvaluatedKey": {"pk": "Booking#booking-1"},
+            },
+            {"Items": []},
+        ]
+
+        count = migrate(self.mock_ddb_resource, "test-table", "h1")
+
+        self.assertEqual(count, 1)
+        self.assertEqual(self.mock_table.scan.call_count, 2)
+        values = self.mock_table.update_item.call_args.kwargs[
+            "ExpressionAttributeValues"
+        ]
+        self.assertEqual(values[":arrivals"], "Hotel#h1#Arrivals#2026-01-10")
+        self.assertEqual(values[":departures"], "Hotel#h1#Departures#2026-01-12")
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from migrations.booking_folios import migrate
+
+
+class TestBookingFoliosMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+    def booking_item(self, booking_id):
+        return {
+            "pk": f"Hotel#h1#Booking#{booking_id}",
+            "sk": "META",
+            "id": booking_id,
+            "user_id": "user-1",
+            "room_num": 101,
+            "check_in": "2026-01-10",
+            "check_out": "2026-01-13",
+        }
+
+    def test_migrate_opens_missing_folios(self):
+        self.mock_table.query.return_value = {
+            "Items": [
+                {
+                    "id": "room-1",
+                    "number": 101,
+                    "type": "Deluxe",
+                    "price": 4500,
+                    "is_available": True,
+                    "description": "Room",
+                }
+            ]
+        }
+        self.mock_table.scan.return_value = {
+            "Items": [self.booking_item("b-1"), self.booking_item("b-2")]
+        }
+        self.mock_table.update_item.side_effect = [
+            None,
+            ClientError(
+                error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
+                operation_name="UpdateItem",
+            ),
+        ]
+
+        count = migrate(self.mock_ddb_resource, "test-table", "h1")
+
+        self.assertEqual(count, 1)
+        kwargs = self.mock_table.update_item.call_args_list[0].kwargs
+        self.assertEqual(kwargs["Key"], {"pk": "Hotel#h1#Booking#b-1", "sk": "FOLIO"})
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":room_charges"], 13500)
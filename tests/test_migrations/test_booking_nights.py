@@ -0,0 +1,42 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+from app.models.bookings import Booking, BookingStatus
+from migrations.booking_nights import migrate
+
+
+class TestBookingNightsMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+        self.batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+
+    def test_migrate_writes_nights_and_active_key(self):
+        check_in = date.today() + timedelta(days=1)
+        booking = Booking(
+            id="booking-1",
+            user_id="user-1",
+            room_id="room-1",
+            room_num=101,
+            check_in=check_in,
+            check_out=check_in + timedelta(days=3),
+            status=BookingStatus.Booking_Status_Booked,
+            food_req=False,
+            clean_req=False,
+        )
+        self.mock_table.scan.return_value = {
+            "Items": [{"pk": "Booking#booking-1", "sk": "META", **booking.model_dump()}]
+        }
+
+        count = migrate(self.mock_ddb_resource, "test-table")
+
+        self.assertEqual(count, 1)
+        self.assertEqual(self.batch.put_item.call_count, 3)
+        values = self.mock_table.update_item.call_args.kwargs[
+            "ExpressionAttributeValues"
+        ]
+        self.assertEqual(
+            values[":active_sk"], f"{booking.check_out.isoformat()}#booking-1"
+        )
@@ -0,0 +1,79 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.models.bookings import Booking, BookingStatus
+from migrations.dashboard_counters import migrate
+
+
+class TestDashboardCountersMigration(unittest.TestCase):
+    @patch("migrations.dashboard_counters.hotel_today")
+    @patch("migrations.dashboard_counters.CounterRepository.read_counters")
+    @patch("migrations.dashboard_counters.BookingRepository.get_active_bookings")
+    @patch("migrations.dashboard_counters.recount")
+    def test_migrate_adds_the_difference(
+        self, mock_recount, mock_bookings, mock_read_counters, mock_today
+    ):
+        mock_ddb_resource = MagicMock()
+        client = mock_ddb_resource.meta.client
+        today = date(2026, 3, 10)
+        mock_today.return_value = today
+        mock_recount.return_value = {
+            "rooms_available": 10,
+            "pending_food": 2,
+            "ratings": 0,
+        }
+        mock_bookings.return_value = [
+            Booking(
+                id=f"booking-{number}",
+                user_id="user-1",
+                room_id=f"room-{number}",
+                room_num=number,
+                check_in=today + timedelta(days=offset),
+                check_out=today + timedelta(days=offset + 1),
+                status=BookingStatus.Booking_Status_Booked,
+                food_req=False,
+                clean_req=False,
+            )
+            for number, offset in ((101, -1), (102, 1), (103, 1))
+        ]
+        mock_read_counters.return_value = {"rooms_available": 7, "pending_food": 2}
+
+        adjusted = migrate(mock_ddb_resource, "test-table", "h1")
+
+        updates = [c.kwargs for c in client.update_item.call_args_list]
+        # rooms +3, pending unchanged; today's arrivals match; tomorrow +2
+        self.assertEqual(adjusted, 2)
+        self.assertEqual(updates[0]["Key"]["sk"], "TOTALS")
+        self.assertEqual(updates[0]["ExpressionAttributeValues"], {":c0": 3})
+        self.assertEqual(
+            updates[1]["Key"]["sk"],
+            f"Day#{(today + timedelta(days=1)).isoformat()}",
+        )
+        self.assertEqual(updates[1]["ExpressionAttributeValues"], {":c0": 2})
+
+    @patch("migrations.dashboard_counters.CounterRepository.read_counters")
+    @patch("migrations.dashboard_counters.BookingRepository.get_active_bookings")
+    @patch("migrations.dashboard_counters.recount")
+    def test_migrate_recounts_a_counter_written_meanwhile(
+        self, mock_recount, mock_bookings, mock_read_counters
+    ):
+        mock_ddb_resource = MagicMock()
+        client = mock_ddb_resource.meta.client
+        mock_recount.return_value = {"rooms_available": 10}
+        mock_bookings.return_value = []
+        # a room is freed while the first recount runs, which may include it
+        stored = iter([7, 8, 8, 8])
+        mock_read_counters.side_effect = lambda day, consistent: {
+            "rooms_available": next(stored)
+        }
+
+        adjusted = migrate(mock_ddb_resource, "test-table", "h1")
+
+        # settled on the second pass: 10 - 8, not 10 - 7
+        self.assertEqual(adjusted, 1)
+        self.assertEqual(mock_recount.call_count, 2)
+        update = client.update_item.call_args.kwargs
+        self.assertEqual(update["ExpressionAttributeValues"], {":c0": 2})
+        for call in mock_read_counters.call_args_list:
+            self.assertTrue(call.kwargs["consistent"])
@@ -0,0 +1,33 @@
+import unittest
+from unittest.mock import MagicMock
+
+from migrations.employee_directory_keys import migrate
+
+
+class TestEmployeeDirectoryKeysMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+    def test_migrate_backfills_directory_key(self):
+        self.mock_table.query.return_value = {
+            "Items": [
+                {
+                    "pk": "Employee",
+                    "sk": "Employee#emp-1",
+                    "id": "emp-1",
+                    "role": "KitchenStaff",
+                    "available": False,
+                }
+            ]
+        }
+
+        count = migrate(self.mock_ddb_resource, "test-table")
+
+        self.assertEqual(count, 1)
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(
+            kwargs["ExpressionAttributeValues"][":directory_sk"],
+            "Employee#KitchenStaff#false#emp-1",
+        )
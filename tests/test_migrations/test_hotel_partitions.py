@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock
+
+from migrations.hotel_partitions import migrate, partitioned
+
+
+class TestHotelPartitionsMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+        self.batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+
+    def test_partitioned_prefixes_partition_keys_only(self):
+        item = partitioned(
+            {
+                "pk": "Booking#b-1",
+                "sk": "META",
+                "active_pk": "ActiveBookings",
+                "active_sk": "2026-01-12#b-1",
+            },
+            "h1",
+        )
+
+        self.assertEqual(item["pk"], "Hotel#h1#Booking#b-1")
+        self.assertEqual(item["sk"], "META")
+        self.assertEqual(item["active_pk"], "Hotel#h1#ActiveBookings")
+        self.assertEqual(item["active_sk"], "2026-01-12#b-1")
+
+    def test_migrate_moves_items_and_deletes_originals(self):
+        self.mock_table.scan.side_effect = [
+            {
+                "Items": [{"pk": "ROOMS", "sk": "room#101"}],
+                "LastEvaluatedKey": {"pk": "ROOMS"},
+            },
+            {"Items": [{"pk": "Employee", "sk": "emp-1"}]},
+        ]
+
+        count = migrate(self.mock_ddb_resource, "test-table", "h1")
+
+        self.assertEqual(count, 2)
+        self.batch.put_item.assert_any_call(
+            Item={"pk": "Hotel#h1#ROOMS", "sk": "room#101"}
+        )
+        self.batch.delete_item.assert_any_call(Key={"pk": "Employee", "sk": "emp-1"})
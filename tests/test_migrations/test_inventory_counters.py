@@ -0,0 +1,51 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import Room, RoomType
+from migrations.inventory_counters import migrate
+
+
+class TestInventoryCountersMigration(unittest.TestCase):
+    @patch("migrations.inventory_counters.BookingRepository.get_active_bookings")
+    @patch("migrations.inventory_counters.RoomRepository.get_all_rooms")
+    def test_migrate_counts_booked_nights(self, mock_rooms, mock_bookings):
+        mock_ddb_resource = MagicMock()
+        batch = (
+            mock_ddb_resource.Table.return_value.batch_writer.return_value.__enter__.return_value
+        )
+        check_in = date.today() + timedelta(days=1)
+        mock_rooms.return_value = [
+            Room(
+                id=f"room-{number}",
+                number=number,
+                type=RoomType.RoomTypeDeluxe,
+                price=4000,
+                is_available=True,
+                description="Deluxe",
+            )
+            for number in (101, 102)
+        ]
+        mock_bookings.return_value = [
+            Booking(
+                id=f"booking-{number}",
+                user_id="user-1",
+                room_id=f"room-{number}",
+                room_num=number,
+                check_in=check_in,
+                check_out=check_in + timedelta(days=nights),
+                status=BookingStatus.Booking_Status_Booked,
+                food_req=False,
+                clean_req=False,
+            )
+            for number, nights in ((101, 2), (102, 1))
+        ]
+
+        count = migrate(mock_ddb_resource, "test-table", "h1")
+
+        self.assertEqual(count, 2)
+        items = [c.kwargs["Item"] for c in batch.put_item.call_args_list]
+        self.assertEqual(items[0]["pk"], "Hotel#h1#Inventory#Deluxe")
+        self.assertEqual(items[0]["booked"], 2)
+        self.assertEqual(items[1]["booked"], 1)
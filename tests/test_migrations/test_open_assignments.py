@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from migrations.open_assignments import migrate
+
+REPO = "migrations.open_assignments.ServiceRequestRepository"
+
+
+class TestOpenAssignmentsMigration(unittest.TestCase):
+    @patch(f"{REPO}.add_open_tasks")
+    @patch(f"{REPO}.count_open_assignments")
+    @patch(f"{REPO}.get_open_assignments")
+    @patch("migrations.open_assignments.EmployeeRepository.get_employees")
+    def test_migrate_adds_the_difference(
+        self, mock_employees, mock_loads, mock_count, mock_add
+    ):
+        mock_employees.return_value = [MagicMock(id="emp-1"), MagicMock(id="emp-2")]
+        mock_loads.return_value = {"emp-1": 1}
+        mock_count.side_effect = {"emp-1": 3, "emp-2": 0}.get
+
+        adjusted = migrate(MagicMock(), "test-table", "h1")
+
+        self.assertEqual(adjusted, 1)
+        mock_add.assert_called_once_with("emp-1", 2)
+        mock_loads.assert_called_with(consistent=True)
+
+    @patch(f"{REPO}.add_open_tasks")
+    @patch(f"{REPO}.count_open_assignments")
+    @patch(f"{REPO}.get_open_assignments")
+    @patch("migrations.open_assignments.EmployeeRepository.get_employees")
+    def test_migrate_recounts_a_load_that_moved(
+        self, mock_employees, mock_loads, mock_count, mock_add
+    ):
+        mock_employees.return_value = [MagicMock(id="emp-1")]
+        # a dispatch lands while the first count runs
+        mock_loads.side_effect = [{}, {"emp-1": 1}, {"emp-1": 1}, {"emp-1": 1}]
+        mock_count.return_value = 1
+
+        adjusted = migrate(MagicMock(), "test-table", "h1")
+
+        self.assertEqual(adjusted, 0)
+        self.assertEqual(mock_count.call_count, 2)
+        mock_add.assert_not_called()
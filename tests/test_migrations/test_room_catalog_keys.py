@@ -0,0 +1,33 @@
+import unittest
+from unittest.mock import MagicMock
+
+from migrations.room_catalog_keys import migrate
+
+
+class TestRoomCatalogKeysMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+    def test_migrate_backfills_catalog_key(self):
+        self.mock_table.query.return_value = {
+            "Items": [
+                {
+                    "pk": "ROOMS",
+                    "sk": "room#101",
+                    "type": "Deluxe",
+                    "price": 4500,
+                    "number": 101,
+                }
+            ]
+        }
+
+        count = migrate(self.mock_ddb_resource, "test-table")
+
+        self.assertEqual(count, 1)
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(
+            kwargs["ExpressionAttributeValues"][":catalog_sk"],
+            "Deluxe#0000004500#101",
+        )
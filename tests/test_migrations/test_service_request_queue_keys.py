@@ -0,0 +1,25 @@
+import unittest
+from unittest.mock import MagicMock
+
+from migrations.service_request_queue_keys import migrate
+
+
+class TestServiceRequestQueueKeysMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+    def test_migrate_backfills_queue_key(self):
+        self.mock_table.query.side_effect = [
+            {"Items": [{"pk": "Hotel#h1#ServiceRequest#sr-1", "sk": "META"}]},
+            {"Items": []},
+        ]
+
+        count = migrate(self.mock_ddb_resource, "test-table", "h1")
+
+        self.assertEqual(count, 1)
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(
+            kwargs["ExpressionAttributeValues"][":queue_pk"], "Hotel#h1#Queue#Cleaning"
+        )
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime
+
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from migrations.service_request_single_item import legacy_keys, migrate
+
+
+class TestServiceRequestSingleItemMigration(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+        self.batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+
+        self.legacy_item = {
+            "pk": "Hotel#h1#ServiceRequests",
+            "sk": "Service#Pending#sr-1",
+            **ServiceRequest(
+                id="sr-1",
+                user_id="user-1",
+                booking_id="booking-1",
+                room_num=101,
+                type=ServiceType.FOOD,
+                status=ServiceStatus.PENDING,
+                is_assigned=True,
+                assigned_to="emp-1",
+                details="Sandwich",
+                created_at=datetime(2026, 1, 10, 9),
+            ).model_dump(mode="json"),
+        }
+
+    def test_legacy_keys_include_employee_copy(self):
+        keys = legacy_keys(self.legacy_item, "h1")
+
+        self.assertEqual(len(keys), 4)
+        self.assertIn({"pk": "Hotel#h1#User#emp-1", "sk": "Service#Pending#sr-1"}, keys)
+
+    def test_migrate_writes_canonical_item_and_deletes_copies(self):
+        self.mock_table.query.side_effect = [
+            {"Items": [self.legacy_item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": []},
+        ]
+
+        count = migrate(self.mock_ddb_resource, "test-table", "h1")
+
+        self.assertEqual(count, 1)
+        item = self.batch.put_item.call_args.kwargs["Item"]
+        self.assertEqual(item["pk"], "Hotel#h1#ServiceRequest#sr-1")
+        self.assertEqual(item["assignee_pk"], "Hotel#h1#User#emp-1")
+        self.assertEqual(self.batch.delete_item.call_count, 4)
+
+    def test_migrate_nothing_to_do(self):
+        self.mock_table.query.return_value = {"Items": []}
+
+        self.assertEqual(migrate(self.mock_ddb_resource, "test-table", "h1"), 0)
+        self.batch.put_item.assert_not_called()
@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi import status
+
+from app.app_exception.app_exception import AppException
+from app.models.users import Role
+from app.presence.staff_presence import StaffPresence
+from tests.factories import make_employee
+
+
+class TestStaffPresence(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.writer = MagicMock()
+        self.presence = StaffPresence(
+            loader=lambda: [],
+            writer=self.writer,
+            ttl_seconds=90,
+            write_limit=2,
+            clock=lambda: self.now,
+        )
+
+    def test_unseen_employee_keeps_stored_flag(self):
+        self.assertFalse(
+            self.presence.is_available(make_employee("emp-1", available=False))
+        )
+        self.assertTrue(
+            self.presence.is_available(make_employee("emp-2", available=True))
+        )
+
+    def test_heartbeat_overrides_stored_flag_until_ttl(self):
+        employee = make_employee("emp-1", available=False)
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+
+        self.assertTrue(self.presence.is_available(employee))
+        self.assertTrue(self.presence.overlay([employee])[0].available)
+
+        self.now += 91
+        self.assertFalse(
+            self.presence.is_available(make_employee("emp-1", available=True))
+        )
+
+    def test_flush_coalesces_toggles_into_one_write(self):
+        self.presence.load([make_employee("emp-1", available=False)])
+        for available in (True, False, True):
+            self.presence.heartbeat("emp-1", Role.CLEANING_STAFF, available)
+
+        self.assertEqual(self.presence.flush(), 1)
+        self.writer.assert_called_once_with("emp-1", Role.CLEANING_STAFF, True)
+
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+        self.assertEqual(self.presence.flush(), 0)
+
+    def test_flush_writes_expiry_as_unavailable(self):
+        self.presence.load([make_employee("emp-1", available=True)])
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+        self.assertEqual(self.presence.flush(), 0)
+
+        self.now += 91
+
+        self.assertEqual(self.presence.flush(), 1)
+        self.writer.assert_called_once_with("emp-1", Role.CLEANING_STAFF, False)
+
+    def test_live_employee_is_rewritten_after_ttl(self):
+        # another instance may have written them unavailable meanwhile
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+        self.assertEqual(self.presence.flush(), 1)
+
+        self.now += 60
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+        self.assertEqual(self.presence.flush(), 0)
+
+        self.now += 31
+        self.assertEqual(self.presence.flush(), 1)
+        self.assertEqual(self.writer.call_count, 2)
+
+    def test_lapsed_employee_is_written_once_and_forgotten(self):
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+        self.presence.flush()
+
+        self.now += 91
+        self.assertEqual(self.presence.flush(), 1)
+        self.assertEqual(self.presence.flush(), 0)
+
+        self.now += 91
+        self.assertEqual(self.presence.flush(), 0)
+        self.assertEqual(len(self.presence), 0)
+        # the stored flag, kept current by other instances, is used again
+        self.assertTrue(self.presence.is_available(make_employee("emp-1")))
+
+    def test_flush_is_rate_limited(self):
+        for i in range(3):
+            self.presence.heartbeat(f"emp-{i}", Role.CLEANING_STAFF)
+
+        self.assertEqual(self.presence.flush(), 2)
+        self.assertEqual(self.presence.flush(), 1)
+        self.assertEqual(self.writer.call_count, 3)
+
+    def test_failed_write_is_retried_and_deleted_employee_forgotten(self):
+        self.writer.side_effect = [
+            AppException(message="Failed", status_code=500),
+            None,
+            AppException(message="Employee not found", status_code=404),
+        ]
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+
+        self.assertEqual(self.presence.flush(), 0)
+        self.assertEqual(self.presence.flush(), 1)
+
+        self.presence.heartbeat("emp-2", Role.CLEANING_STAFF)
+        self.assertEqual(self.presence.flush(), 0)
+        self.assertEqual(len(self.presence), 1)
+
+    def test_record_makes_direct_write_win(self):
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF, True)
+
+        self.presence.record("emp-1", False)
+
+        self.assertFalse(self.presence.is_available(make_employee("emp-1")))
+        self.assertEqual(self.presence.flush(), 0)
+
+    def test_stop_flushes_pending_writes(self):
+        self.presence.heartbeat("emp-1", Role.CLEANING_STAFF)
+
+        self.presence.start()
+        self.presence.stop()
+        self.presence._thread.join(timeout=1)
+
+        self.writer.assert_called_once_with("emp-1", Role.CLEANING_STAFF, True)
@@ -1,12 +1,15 @@
 import unittest
-from unittest.mock import MagicMock
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
 from datetime import date
 from botocore.exceptions import ClientError
 from fastapi import status
 
 from app.repository.booking_repository import BookingRepository
 from app.app_exception.app_exception import AppException
+from app.dtos.booking_response import BookingMoveDTO
 from app.models.bookings import Booking, BookingStatus
+from app.models.rooms import RoomType
 
 
 class TestBookingRepository(unittest.TestCase):
@@ -21,6 +24,7 @@ class TestBookingRepository(unittest.TestCase):
         self.repo = BookingRepository(
             ddb_resource=self.mock_ddb_resource,
             table_name="test-table",
+            hotel_id="h1",
         )
 
         self.booking = Booking(
@@ -28,6 +32,8 @@ class TestBookingRepository(unittest.TestCase):
             user_id="user-1",
             room_id="room-1",
             room_num=101,
+            room_type=RoomType.RoomTypeDeluxe,
+            room_rate=4500,
             check_in=date(2026, 1, 10),
             check_out=date(2026, 1, 12),
             status=BookingStatus.Booking_Status_Booked,
@@ -36,9 +42,268 @@ class TestBookingRepository(unittest.TestCase):
         )
 
     def test_save_booking_success(self):
-        self.repo.save_booking(self.booking)
+        self.repo.save_booking(self.booking, 5)
 
         self.mock_ddb_client.transact_write_items.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(items), 8)
+        self.assertEqual(items[1]["Put"]["Item"]["active_sk"], "2026-01-12#booking-1")
+        self.assertEqual(
+            items[1]["Put"]["Item"]["arrivals_pk"], "Hotel#h1#Arrivals#2026-01-10"
+        )
+        self.assertEqual(
+            items[1]["Put"]["Item"]["departures_pk"], "Hotel#h1#Departures#2026-01-12"
+        )
+        self.assertEqual(
+            [i["Put"]["Item"]["sk"] for i in items[2:4]],
+            ["Night#2026-01-10", "Night#2026-01-11"],
+        )
+        counter = items[4]["Update"]
+        self.assertEqual(counter["Key"]["pk"], "Hotel#h1#Inventory#Deluxe")
+        self.assertEqual(counter["ExpressionAttributeValues"][":limit"], 4)
+        folio = items[6]["Update"]
+        self.assertEqual(
+            folio["Key"], {"pk": "Hotel#h1#Booking#booking-1", "sk": "FOLIO"}
+        )
+        self.assertIn("ADD nights :nights", folio["UpdateExpression"])
+        self.assertEqual(folio["ExpressionAttributeValues"][":room_charges"], 9000)
+        arrivals = items[7]["Update"]
+        self.assertEqual(arrivals["Key"]["sk"], "Day#2026-01-10")
+        self.assertEqual(arrivals["ExpressionAttributeNames"], {"#c0": "arrivals"})
+        self.assertEqual(arrivals["ExpressionAttributeValues"], {":c0": 1})
+
+    def test_save_booking_sold_out(self):
+        error_response = {
+            "Error": {"Code": "TransactionCanceledException"},
+            "CancellationReasons": [{"Code": "None"}] * 5
+            + [{"Code": "ConditionalCheckFailed"}],
+        }
+
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response=error_response,
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.save_booking(self.booking, 5)
+
+        self.assertEqual(
+            ctx.exception.message, "No rooms of this type left for the selected dates"
+        )
+
+    def test_save_booking_claims_own_or_lapsed_holds(self):
+        self.repo.save_booking(self.booking, 5)
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        night = items[2]["Put"]
+        self.assertIn("held_by = :user_id", night["ConditionExpression"])
+        self.assertEqual(night["ExpressionAttributeValues"][":user_id"], "user-1")
+
+    def user_holds(self, holds, version=1):
+        self.mock_table.get_item.return_value = {
+            "Item": {
+                "holds": {
+                    room: {
+                        "held_since": Decimal(since),
+                        "expires_at": Decimal(expires),
+                    }
+                    for room, (since, expires) in holds.items()
+                },
+                "hold_version": Decimal(version),
+            }
+        }
+
+    @patch("app.repository.booking_repository.time.time", return_value=1_000)
+    def test_hold_nights(self, _mock_time):
+        self.mock_table.get_item.return_value = {}
+
+        self.repo.hold_nights(
+            101, date(2026, 1, 10), date(2026, 1, 13), "user-1", 1_600
+        )
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(items), 4)
+        user_holds = items[0]["Put"]
+        self.assertEqual(user_holds["Item"]["pk"], "Hotel#h1#User#user-1")
+        self.assertEqual(
+            user_holds["Item"]["holds"],
+            {"101": {"held_since": 1_000, "expires_at": 1_600}},
+        )
+        self.assertEqual(user_holds["ExpressionAttributeValues"], {":version": 0})
+        self.assertEqual(items[1]["Put"]["Item"]["hold_expires_at"], 1_600)
+        self.assertNotIn("booking_id", items[1]["Put"]["Item"])
+
+    @patch("app.repository.booking_repository.time.time", return_value=1_000)
+    def test_hold_nights_too_many_holds(self, _mock_time):
+        # the lapsed hold on 104 no longer counts
+        self.user_holds({"102": (900, 1_500), "103": (900, 1_500), "104": (0, 600)})
+        self.repo.hold_nights(
+            101, date(2026, 1, 10), date(2026, 1, 11), "user-1", 1_600
+        )
+
+        self.user_holds({"101": (900, 1_500), "102": (900, 1_500), "103": (900, 1_500)})
+        with self.assertRaises(AppException) as ctx:
+            self.repo.hold_nights(
+                105, date(2026, 1, 10), date(2026, 1, 11), "user-1", 1_600
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.mock_ddb_client.transact_write_items.call_count, 1)
+
+    @patch("app.repository.booking_repository.time.time", return_value=2_000)
+    def test_hold_nights_renewal_is_capped(self, _mock_time):
+        self.user_holds({"101": (1_000, 2_100)})
+        self.repo.hold_nights(
+            101, date(2026, 1, 10), date(2026, 1, 11), "user-1", 2_800
+        )
+
+        held = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ][0]["Put"]["Item"]["holds"]["101"]
+        self.assertEqual(held["held_since"], 1_000)
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.hold_nights(
+                101, date(2026, 1, 10), date(2026, 1, 11), "user-1", 2_900
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+
+    @patch("app.repository.booking_repository.time.time", return_value=1_000)
+    def test_hold_nights_retries_when_holds_change(self, _mock_time):
+        self.mock_table.get_item.return_value = {}
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [
+                        {"Code": "ConditionalCheckFailed"},
+                        {"Code": "None"},
+                    ],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            None,
+        ]
+
+        self.repo.hold_nights(
+            101, date(2026, 1, 10), date(2026, 1, 11), "user-1", 1_600
+        )
+
+        self.assertEqual(self.mock_ddb_client.transact_write_items.call_count, 2)
+
+    @patch("app.repository.booking_repository.time.time", return_value=1_000)
+    def test_hold_nights_conflict(self, _mock_time):
+        self.mock_table.get_item.return_value = {}
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.hold_nights(
+                101, date(2026, 1, 10), date(2026, 1, 11), "user-1", 1_600
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+
+    def test_save_booking_night_taken(self):
+        error_response = {
+            "Error": {"Code": "TransactionCanceledException"},
+            "CancellationReasons": [
+                {"Code": "None"},
+                {"Code": "None"},
+                {"Code": "None"},
+                {"Code": "ConditionalCheckFailed"},
+            ],
+        }
+
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response=error_response,
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.save_booking(self.booking, 5)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            ctx.exception.message, "Room already booked for the selected dates"
+        )
+
+    def test_cancel_booking_releases_nights(self):
+        self.repo.cancel_booking(self.booking)
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertIn("REMOVE active_pk", items[1]["Update"]["UpdateExpression"])
+        self.assertIn("departures_pk", items[1]["Update"]["UpdateExpression"])
+        self.assertEqual(
+            [i["Delete"]["Key"]["sk"] for i in items[2:4]],
+            ["Night#2026-01-10", "Night#2026-01-11"],
+        )
+        self.assertEqual(items[4]["Update"]["ExpressionAttributeValues"][":delta"], -1)
+        self.assertEqual(items[6]["Update"]["ExpressionAttributeValues"], {":c0": -1})
+        self.assertEqual(items[7]["Update"]["ExpressionAttributeValues"][":zero"], 0)
+
+    def test_cancel_booking_conflict(self):
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.cancel_booking(self.booking)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+
+    def test_get_active_bookings_paginates(self):
+        item = self.booking.model_dump(mode="json")
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [item]},
+        ]
+
+        result = self.repo.get_active_bookings(date(2026, 1, 1))
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["IndexName"], "ActiveBookingIndex"
+        )
+
+    def test_get_departures_queries_one_day(self):
+        item = self.booking.model_dump(mode="json")
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": []},
+        ]
+
+        result = self.repo.get_departures(date(2026, 1, 12))
+
+        self.assertEqual([b.id for b in result], ["booking-1"])
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "DeparturesIndex")
+        self.assertEqual(kwargs["ExclusiveStartKey"], {"pk": "x"})
+
+    def test_get_arrivals_ddb_error(self):
+        self.mock_table.query.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalServerError"}},
+            operation_name="Query",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.get_arrivals(date(2026, 1, 10))
+
+        self.assertEqual(
+            ctx.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
     def test_save_booking_conflict(self):
         error_response = {
@@ -52,7 +317,7 @@ class TestBookingRepository(unittest.TestCase):
         )
 
         with self.assertRaises(AppException) as ctx:
-            self.repo.save_booking(self.booking)
+            self.repo.save_booking(self.booking, 5)
 
         self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
 
@@ -122,3 +387,268 @@ class TestBookingRepository(unittest.TestCase):
 
         with self.assertRaises(AppException):
             self.repo.get_bookings_by_userID("user-1")
+
+    def make_move(self, booking_id, from_room, to_room):
+        return BookingMoveDTO(
+            booking_id=booking_id,
+            user_id="user-1",
+            check_in=date(2026, 1, 10),
+            check_out=date(2026, 1, 12),
+            from_room=from_room,
+            to_room=to_room,
+            to_room_id=f"room-{to_room}",
+        )
+
+    def test_apply_booking_moves_swap_in_one_transaction(self):
+        moves = [self.make_move("b-1", 101, 102), self.make_move("b-2", 102, 101)]
+
+        skipped = self.repo.apply_booking_moves(moves)
+
+        self.assertEqual(skipped, [])
+        self.mock_ddb_client.transact_write_items.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        # both bookings' copies and folios plus the four nights rewritten to
+        # their new owner
+        self.assertEqual(len(items), 10)
+        puts = [i["Put"] for i in items if "Put" in i]
+        self.assertEqual(
+            {p["ExpressionAttributeValues"][":previous"] for p in puts},
+            {"b-1", "b-2"},
+        )
+        self.assertFalse(any("Delete" in i for i in items))
+
+    def test_apply_booking_moves_frees_old_nights(self):
+        self.repo.apply_booking_moves([self.make_move("b-1", 101, 102)])
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        deletes = [i["Delete"]["Key"] for i in items if "Delete" in i]
+        self.assertEqual(
+            deletes,
+            [
+                {"pk": "Hotel#h1#Room#101", "sk": "Night#2026-01-10"},
+                {"pk": "Hotel#h1#Room#101", "sk": "Night#2026-01-11"},
+            ],
+        )
+
+    def test_apply_booking_moves_updates_folio_room(self):
+        self.repo.apply_booking_moves([self.make_move("b-1", 101, 102)])
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        folio = next(
+            i["Update"]
+            for i in items
+            if "Update" in i and i["Update"]["Key"]["sk"] == "FOLIO"
+        )
+        self.assertEqual(folio["Key"]["pk"], "Hotel#h1#Booking#b-1")
+        self.assertEqual(folio["UpdateExpression"], "SET room_num = :to_room")
+        self.assertEqual(folio["ExpressionAttributeValues"], {":to_room": 102})
+
+    def test_apply_booking_moves_skips_group_over_the_limit(self):
+        # two swapped 60-night stays need 126 actions between them
+        long_stay = {
+            "check_in": date(2026, 1, 1),
+            "check_out": date(2026, 3, 2),
+        }
+        swap = [
+            self.make_move("b-1", 101, 102).model_copy(update=long_stay),
+            self.make_move("b-2", 102, 101).model_copy(update=long_stay),
+        ]
+        single = self.make_move("b-3", 103, 104)
+
+        skipped = self.repo.apply_booking_moves(swap + [single])
+
+        self.assertEqual([move.booking_id for move in skipped], ["b-1", "b-2"])
+        self.mock_ddb_client.transact_write_items.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            {i["Put"]["Item"]["booking_id"] for i in items if "Put" in i}, {"b-3"}
+        )
+
+    def test_apply_booking_moves_conflict(self):
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
+            },
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.apply_booking_moves([self.make_move("b-1", 101, 102)])
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+
+    def test_apply_booking_moves_ddb_error(self):
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.apply_booking_moves([self.make_move("b-1", 101, 102)])
+
+        self.assertEqual(
+            ctx.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    def make_group(self, rooms, nights=2):
+        return [
+            self.booking.model_copy(
+                update={
+                    "id": f"booking-{room}",
+                    "room_num": room,
+                    "group_id": "group-1",
+                    "check_out": date(2026, 1, 10 + nights),
+                }
+            )
+            for room in rooms
+        ]
+
+    def test_save_group_booking_single_transaction(self):
+        group = self.make_group([101, 102, 103])
+
+        self.repo.save_group_booking(group, {"Deluxe": 10})
+
+        self.mock_ddb_client.transact_write_items.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        # 3 x (2 booking copies + 2 nights + folio) + 2 shared counters
+        # + 1 arrivals counter
+        self.assertEqual(len(items), 18)
+        self.assertEqual(items[-1]["Update"]["ExpressionAttributeValues"], {":c0": 3})
+        counters = [
+            i["Update"]
+            for i in items
+            if "Update" in i
+            and i["Update"]["Key"]["pk"].startswith("Hotel#h1#Inventory#")
+        ]
+        self.assertEqual(
+            [c["ExpressionAttributeValues"] for c in counters],
+            [{":delta": 3, ":limit": 7}, {":delta": 3, ":limit": 7}],
+        )
+
+    def test_save_group_booking_over_capacity(self):
+        with self.assertRaises(AppException) as ctx:
+            self.repo.save_group_booking(
+                self.make_group([101, 102, 103]), {"Deluxe": 2}
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.mock_ddb_client.transact_write_items.assert_not_called()
+
+    def test_save_group_booking_reserves_large_groups(self):
+        group = self.make_group(range(101, 113), nights=7)
+
+        self.repo.save_group_booking(group, {"Deluxe": 20})
+
+        calls = self.mock_ddb_client.transact_write_items.call_args_list
+        self.assertGreater(len(calls), 2)
+        for call in calls:
+            self.assertLessEqual(len(call.kwargs["TransactItems"]), 100)
+        first = calls[0].kwargs["TransactItems"][0]["Put"]["Item"]
+        self.assertEqual(first["held_by"], "group-1")
+        last = calls[-1].kwargs["TransactItems"][-1]["Update"]
+        self.assertEqual(last["ExpressionAttributeValues"], {":c0": 12})
+
+    def test_save_group_booking_undoes_reservation_on_conflict(self):
+        group = self.make_group(range(101, 113), nights=7)
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            None,
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            None,
+        ]
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.save_group_booking(group, {"Deluxe": 20})
+
+        self.assertEqual(
+            ctx.exception.message, "Room already booked for the selected dates"
+        )
+        undo = self.mock_ddb_client.transact_write_items.call_args_list[2]
+        items = undo.kwargs["TransactItems"]
+        deletes = [i["Delete"] for i in items if "Delete" in i]
+        releases = [i["Update"] for i in items if "Update" in i]
+        self.assertEqual(len(deletes), 84)
+        self.assertEqual(releases[0]["ExpressionAttributeValues"][":delta"], -12)
+        self.assertIn("held_by = :group_id", deletes[0]["ConditionExpression"])
+
+    def test_save_group_booking_undo_deletes_written_folios(self):
+        group = self.make_group(range(101, 113), nights=7)
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            None,
+            None,
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            None,
+            None,
+        ]
+
+        with self.assertRaises(AppException):
+            self.repo.save_group_booking(group, {"Deluxe": 20})
+
+        undo_items = [
+            item
+            for call in self.mock_ddb_client.transact_write_items.call_args_list[3:]
+            for item in call.kwargs["TransactItems"]
+        ]
+        folio_deletes = [
+            i["Delete"]
+            for i in undo_items
+            if "Delete" in i and i["Delete"]["Key"]["sk"] == "FOLIO"
+        ]
+        self.assertEqual(len(folio_deletes), 10)
+        self.assertNotIn("ConditionExpression", folio_deletes[0])
+
+    def test_get_folio(self):
+        self.mock_table.get_item.return_value = {
+            "Item": {
+                "pk": "Hotel#h1#Booking#booking-1",
+                "sk": "FOLIO",
+                "booking_id": "booking-1",
+                "user_id": "user-1",
+                "room_num": 101,
+                "check_in": "2026-01-10",
+                "check_out": "2026-01-12",
+                "nights": Decimal(2),
+                "room_rate": Decimal(4500),
+                "room_charges": Decimal(9000),
+                "service_charges": Decimal(350),
+                "service_count": Decimal(1),
+            }
+        }
+
+        folio = self.repo.get_folio("booking-1")
+
+        self.assertEqual(folio.room_charges, 9000)
+        self.assertEqual(folio.service_charges, 350)
+        self.mock_table.get_item.assert_called_once_with(
+            Key={"pk": "Hotel#h1#Booking#booking-1", "sk": "FOLIO"}
+        )
+
+    def test_get_folio_not_found(self):
+        self.mock_table.get_item.return_value = {}
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.get_folio("booking-1")
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
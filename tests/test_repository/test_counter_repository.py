@@ -0,0 +1,128 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+from fastapi import status
+
+from app.app_exception.app_exception import AppException
+from app.repository.counter_repository import (
+    COUNTER_SHARDS,
+    CounterRepository,
+    counter_updates,
+)
+
+
+class TestCounterUpdates(unittest.TestCase):
+    @patch("app.repository.counter_repository.random.randrange", return_value=7)
+    def test_one_add_on_a_random_shard(self, mock_randrange):
+        ops = counter_updates(
+            "test-table", "h1", {"ratings": 1, "rating_total": 4, "unchanged": 0}
+        )
+
+        mock_randrange.assert_called_once_with(COUNTER_SHARDS)
+        self.assertEqual(
+            ops,
+            [
+                {
+                    "Update": {
+                        "TableName": "test-table",
+                        "Key": {"pk": "Hotel#h1#Counters#7", "sk": "TOTALS"},
+                        "UpdateExpression": "ADD #c0 :c0, #c1 :c1",
+                        "ExpressionAttributeNames": {
+                            "#c0": "rating_total",
+                            "#c1": "ratings",
+                        },
+                        "ExpressionAttributeValues": {":c0": 4, ":c1": 1},
+                    }
+                }
+            ],
+        )
+
+    def test_day_counters_use_the_day_item(self):
+        ops = counter_updates("test-table", "h1", {"arrivals": -1}, date(2026, 3, 10))
+
+        self.assertEqual(ops[0]["Update"]["Key"]["sk"], "Day#2026-03-10")
+
+    def test_no_op_without_changes(self):
+        self.assertEqual(counter_updates("test-table", "h1", {"ratings": 0}), [])
+
+
+class TestCounterRepository(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+
+        self.repo = CounterRepository(
+            ddb_resource=self.mock_ddb_resource,
+            table_name="test-table",
+            hotel_id="h1",
+        )
+
+    def test_read_sums_every_shard_in_one_batch(self):
+        self.mock_ddb_resource.batch_get_item.side_effect = [
+            {
+                "Responses": {
+                    "test-table": [
+                        {
+                            "pk": "Hotel#h1#Counters#0",
+                            "sk": "TOTALS",
+                            "rooms_available": Decimal(3),
+                            "pending_food": Decimal(2),
+                        },
+                        {
+                            "pk": "Hotel#h1#Counters#0",
+                            "sk": "Day#2026-03-10",
+                            "arrivals": Decimal(1),
+                        },
+                    ]
+                },
+                "UnprocessedKeys": {"test-table": {"Keys": [{"pk": "x"}]}},
+            },
+            {
+                "Responses": {
+                    "test-table": [
+                        {
+                            "pk": "Hotel#h1#Counters#4",
+                            "sk": "TOTALS",
+                            "rooms_available": Decimal(-1),
+                        }
+                    ]
+                }
+            },
+        ]
+
+        counters = self.repo.read_counters(date(2026, 3, 10))
+
+        self.assertEqual(
+            counters, {"rooms_available": 2, "pending_food": 2, "arrivals": 1}
+        )
+        keys = self.mock_ddb_resource.batch_get_item.call_args_list[0].kwargs[
+            "RequestItems"
+        ]["test-table"]["Keys"]
+        self.assertEqual(len(keys), 2 * COUNTER_SHARDS)
+        self.assertFalse(
+            self.mock_ddb_resource.batch_get_item.call_args_list[0].kwargs[
+                "RequestItems"
+            ]["test-table"]["ConsistentRead"]
+        )
+        self.assertEqual(
+            keys[:2],
+            [
+                {"pk": "Hotel#h1#Counters#0", "sk": "TOTALS"},
+                {"pk": "Hotel#h1#Counters#0", "sk": "Day#2026-03-10"},
+            ],
+        )
+
+    def test_read_ddb_error(self):
+        self.mock_ddb_resource.batch_get_item.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalError"}},
+            operation_name="BatchGetItem",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.read_counters(date(2026, 3, 10))
+
+        self.assertEqual(
+            ctx.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
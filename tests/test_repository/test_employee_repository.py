@@ -20,6 +20,7 @@ class TestEmployeeRepository(unittest.TestCase):
         self.repo = EmployeeRepository(
             ddb_resource=self.mock_ddb_resource,
             table_name="test-table",
+            hotel_id="h1",
         )
 
         self.user = User(
@@ -35,6 +36,13 @@ class TestEmployeeRepository(unittest.TestCase):
         self.repo.create_employee(self.user)
 
         self.mock_ddb_client.transact_write_items.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            items[2]["Put"]["Item"]["directory_sk"],
+            "Employee#CleaningStaff#true#emp-1",
+        )
 
     def test_create_employee_email_conflict(self):
         error_response = {
@@ -83,6 +91,35 @@ class TestEmployeeRepository(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].id, "emp-1")
 
+    def test_get_employees_by_role_and_availability(self):
+        self.mock_table.query.return_value = {"Items": []}
+
+        self.repo.get_employees(Role.KITCHEN_STAFF, True)
+
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "EmployeeDirectoryIndex")
+        sort_key_condition = kwargs["KeyConditionExpression"].get_expression()[
+            "values"
+        ][1]
+        self.assertEqual(
+            sort_key_condition.get_expression()["values"][1],
+            "Employee#KitchenStaff#true#",
+        )
+
+    def test_get_employees_reads_every_page(self):
+        item = self.user.model_dump()
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [item]},
+        ]
+
+        result = self.repo.get_employees(Role.CLEANING_STAFF)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["ExclusiveStartKey"], {"pk": "x"}
+        )
+
     def test_get_employees_ddb_error(self):
         self.mock_table.query.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
@@ -93,11 +130,27 @@ class TestEmployeeRepository(unittest.TestCase):
             self.repo.get_employees()
 
     def test_update_employee_availability_success(self):
+        self.mock_table.get_item.return_value = {"Item": self.user.model_dump()}
+
         self.repo.update_employee_availability("emp-1", False)
 
         self.mock_table.update_item.assert_called_once()
+        values = self.mock_table.update_item.call_args.kwargs[
+            "ExpressionAttributeValues"
+        ]
+        self.assertEqual(values[":directory_sk"], "Employee#CleaningStaff#false#emp-1")
+
+    def test_update_employee_availability_missing_employee(self):
+        self.mock_table.get_item.return_value = {}
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.update_employee_availability("emp-1", False)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
+        self.mock_table.update_item.assert_not_called()
 
     def test_update_employee_availability_not_found(self):
+        self.mock_table.get_item.return_value = {"Item": self.user.model_dump()}
         self.mock_table.update_item.side_effect = ClientError(
             error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
             operation_name="UpdateItem",
@@ -109,6 +162,7 @@ class TestEmployeeRepository(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_update_employee_availability_ddb_error(self):
+        self.mock_table.get_item.return_value = {"Item": self.user.model_dump()}
         self.mock_table.update_item.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
             operation_name="UpdateItem",
@@ -15,10 +15,12 @@ class TestFeedbackRepository(unittest.TestCase):
         self.mock_table = MagicMock()
 
         self.mock_ddb_resource.Table.return_value = self.mock_table
+        self.mock_ddb_client = self.mock_ddb_resource.meta.client
 
         self.repo = FeedbackRepository(
             ddb_resource=self.mock_ddb_resource,
             table_name="test-table",
+            hotel_id="h1",
         )
 
         self.feedback = Feedback(
@@ -33,12 +35,31 @@ class TestFeedbackRepository(unittest.TestCase):
     def test_save_feedback_success(self):
         self.repo.save_feedback(self.feedback)
 
-        self.mock_table.put_item.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(items[0]["Put"]["Item"]["sk"], "Feedback#fb-1")
+        counter = items[1]["Update"]
+        self.assertEqual(
+            counter["ExpressionAttributeNames"],
+            {"#c0": "rating_total", "#c1": "ratings"},
+        )
+        self.assertEqual(counter["ExpressionAttributeValues"], {":c0": 5, ":c1": 1})
+
+    def test_save_feedback_without_rating_skips_counters(self):
+        self.feedback.rating = None
+
+        self.repo.save_feedback(self.feedback)
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(items), 1)
 
     def test_save_feedback_ddb_error(self):
-        self.mock_table.put_item.side_effect = ClientError(
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
-            operation_name="PutItem",
+            operation_name="TransactWriteItems",
         )
 
         with self.assertRaises(AppException) as ctx:
@@ -60,6 +81,24 @@ class TestFeedbackRepository(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].id, "fb-1")
 
+    def test_get_all_feedbacks_reads_every_page(self):
+        second = self.feedback.model_copy(update={"id": "fb-2"})
+        self.mock_table.query.side_effect = [
+            {
+                "Items": [self.feedback.model_dump(mode="json")],
+                "LastEvaluatedKey": {"pk": "p", "sk": "s"},
+            },
+            {"Items": [second.model_dump(mode="json")]},
+        ]
+
+        result = self.repo.get_all_feedbacks()
+
+        self.assertEqual([feedback.id for feedback in result], ["fb-1", "fb-2"])
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["ExclusiveStartKey"],
+            {"pk": "p", "sk": "s"},
+        )
+
     def test_get_all_feedbacks_empty(self):
         self.mock_table.query.return_value = {"Items": []}
 
@@ -81,14 +120,45 @@ class TestFeedbackRepository(unittest.TestCase):
         )
 
     def test_delete_feedback_success(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.feedback.model_dump(mode="json")
+        }
+
         self.repo.delete_feedback("fb-1")
 
-        self.mock_table.delete_item.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            items[0]["Delete"]["Key"],
+            {"pk": "Hotel#h1#Feedbacks", "sk": "Feedback#fb-1"},
+        )
+        self.assertEqual(
+            items[1]["Update"]["ExpressionAttributeValues"], {":c0": -5, ":c1": -1}
+        )
+
+    def test_delete_missing_feedback_is_a_no_op(self):
+        self.mock_table.get_item.return_value = {}
+
+        self.repo.delete_feedback("fb-1")
+
+        self.mock_ddb_client.transact_write_items.assert_not_called()
+
+    def test_delete_feedback_already_deleted_concurrently(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.feedback.model_dump(mode="json")
+        }
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
+
+        self.repo.delete_feedback("fb-1")
 
     def test_delete_feedback_ddb_error(self):
-        self.mock_table.delete_item.side_effect = ClientError(
+        self.mock_table.get_item.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
-            operation_name="DeleteItem",
+            operation_name="GetItem",
         )
 
         with self.assertRaises(AppException) as ctx:
@@ -0,0 +1,26 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.repository.housekeeping_repository import HousekeepingRepository
+
+
+class TestHousekeepingRepository(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+        self.repo = HousekeepingRepository(
+            ddb_resource=self.mock_ddb_resource,
+            table_name="test-table",
+            hotel_id="h1",
+        )
+
+    def test_entries_live_in_the_days_board_partition(self):
+        self.repo.update_entries(date(2026, 3, 10), {"Room#101": {"type": "Deluxe"}})
+
+        self.assertEqual(
+            self.mock_table.update_item.call_args.kwargs["Key"],
+            {"pk": "Hotel#h1#HousekeepingBoard#2026-03-10", "sk": "Room#101"},
+        )
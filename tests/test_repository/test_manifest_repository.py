@@ -0,0 +1,26 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock
+
+from app.repository.manifest_repository import ManifestRepository
+
+
+class TestManifestRepository(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+
+        self.repo = ManifestRepository(
+            ddb_resource=self.mock_ddb_resource,
+            table_name="test-table",
+            hotel_id="h1",
+        )
+
+    def test_entries_live_in_the_days_manifest_partition(self):
+        self.repo.save_entries(date(2026, 3, 10), {"Pending#sr-1": None})
+
+        batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+        batch.delete_item.assert_called_once_with(
+            Key={"pk": "Hotel#h1#Manifest#2026-03-10", "sk": "Pending#sr-1"}
+        )
@@ -14,10 +14,12 @@ class TestRoomRepository(unittest.TestCase):
         self.mock_table = MagicMock()
 
         self.mock_ddb_resource.Table.return_value = self.mock_table
+        self.mock_ddb_client = self.mock_ddb_resource.meta.client
 
         self.repo = RoomRepository(
             ddb_resource=self.mock_ddb_resource,
             table_name="test-table",
+            hotel_id="h1",
         )
 
         self.room = Room(
@@ -32,12 +34,21 @@ class TestRoomRepository(unittest.TestCase):
     def test_add_room_success(self):
         self.repo.add_room(self.room)
 
-        self.mock_table.put_item.assert_called_once()
+        ops = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(ops[0]["Put"]["Item"]["catalog_sk"], "Standard#0000002000#101")
+        counter = ops[1]["Update"]
+        self.assertTrue(counter["Key"]["pk"].startswith("Hotel#h1#Counters#"))
+        self.assertEqual(
+            counter["ExpressionAttributeNames"], {"#c0": "rooms_available"}
+        )
+        self.assertEqual(counter["ExpressionAttributeValues"], {":c0": 1})
 
     def test_add_room_already_exists(self):
-        self.mock_table.put_item.side_effect = ClientError(
-            error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
-            operation_name="PutItem",
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
         )
 
         with self.assertRaises(AppException) as ctx:
@@ -46,9 +57,9 @@ class TestRoomRepository(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
 
     def test_add_room_ddb_error(self):
-        self.mock_table.put_item.side_effect = ClientError(
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
-            operation_name="PutItem",
+            operation_name="TransactWriteItems",
         )
 
         with self.assertRaises(AppException) as ctx:
@@ -121,6 +132,24 @@ class TestRoomRepository(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].number, 101)
 
+    def test_get_all_rooms_reads_every_page(self):
+        second = self.room.model_copy(update={"number": 102})
+        self.mock_table.query.side_effect = [
+            {
+                "Items": [self.room.model_dump(mode="json")],
+                "LastEvaluatedKey": {"pk": "p", "sk": "s"},
+            },
+            {"Items": [second.model_dump(mode="json")]},
+        ]
+
+        result = self.repo.get_all_rooms()
+
+        self.assertEqual([room.number for room in result], [101, 102])
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["ExclusiveStartKey"],
+            {"pk": "p", "sk": "s"},
+        )
+
     def test_get_all_rooms_empty(self):
         self.mock_table.query.return_value = {"Items": []}
 
@@ -159,31 +188,58 @@ class TestRoomRepository(unittest.TestCase):
             self.repo.get_available_rooms()
 
     def test_delete_room_success(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
+
+        self.repo.delete_room(101)
+
+        ops = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            ops[0]["Delete"]["ExpressionAttributeValues"], {":available": True}
+        )
+        self.assertEqual(ops[1]["Update"]["ExpressionAttributeValues"], {":c0": -1})
+
+    def test_delete_unavailable_room_leaves_counter(self):
+        self.room.is_available = False
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
+
         self.repo.delete_room(101)
 
-        self.mock_table.delete_item.assert_called_once()
+        ops = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(ops), 1)
 
     def test_delete_room_not_found(self):
-        self.mock_table.delete_item.side_effect = ClientError(
-            error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
-            operation_name="DeleteItem",
-        )
+        self.mock_table.get_item.return_value = {}
 
         with self.assertRaises(AppException) as ctx:
             self.repo.delete_room(101)
 
         self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
+        self.mock_ddb_client.transact_write_items.assert_not_called()
 
     def test_delete_room_ddb_error(self):
-        self.mock_table.delete_item.side_effect = ClientError(
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
-            operation_name="DeleteItem",
+            operation_name="TransactWriteItems",
         )
 
         with self.assertRaises(AppException):
             self.repo.delete_room(101)
 
     def test_update_room_success(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
         fields = {
             "price": 2500,
             "description": "Updated room",
@@ -192,8 +248,80 @@ class TestRoomRepository(unittest.TestCase):
         self.repo.update_room(101, fields)
 
         self.mock_table.update_item.assert_called_once()
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(
+            kwargs["ExpressionAttributeValues"][":catalog_sk"],
+            "Standard#0000002500#101",
+        )
+        self.assertEqual(kwargs["ExpressionAttributeValues"][":old_price"], 2000)
+
+    def test_update_room_availability_moves_counter(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
+
+        self.repo.update_room(101, {"is_available": False})
+
+        self.mock_table.update_item.assert_not_called()
+        ops = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            ops[0]["Update"]["ExpressionAttributeValues"][":old_available"], True
+        )
+        self.assertEqual(ops[1]["Update"]["ExpressionAttributeValues"], {":c0": -1})
+
+    def test_update_room_without_catalog_fields_skips_read(self):
+        self.repo.update_room(101, {"description": "Updated room"})
+
+        self.mock_table.get_item.assert_not_called()
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertNotIn(":catalog_sk", kwargs["ExpressionAttributeValues"])
+
+    def test_search_rooms_uses_catalog_key_range(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.room.model_dump(mode="json")]
+        }
+
+        result = self.repo.search_rooms(
+            RoomType.RoomTypeDeluxe, max_price=5000, available_only=True
+        )
+
+        self.assertEqual(len(result), 1)
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "RoomCatalogIndex")
+        bounds = kwargs["KeyConditionExpression"].get_expression()["values"][1]
+        self.assertEqual(
+            bounds.get_expression()["values"][1:],
+            ("Deluxe#0000000000#", "Deluxe#0000005000#~"),
+        )
+        self.assertIn("FilterExpression", kwargs)
+
+    def test_search_rooms_reads_every_page(self):
+        item = self.room.model_dump(mode="json")
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [item]},
+        ]
+
+        result = self.repo.search_rooms(RoomType.RoomTypeStandard)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(self.mock_table.query.call_count, 2)
+
+    def test_search_rooms_ddb_error(self):
+        self.mock_table.query.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalError"}},
+            operation_name="Query",
+        )
+
+        with self.assertRaises(AppException):
+            self.repo.search_rooms(RoomType.RoomTypeSuite)
 
     def test_update_room_not_found(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
         self.mock_table.update_item.side_effect = ClientError(
             error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
             operation_name="UpdateItem",
@@ -205,6 +333,9 @@ class TestRoomRepository(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_update_room_ddb_error(self):
+        self.mock_table.get_item.return_value = {
+            "Item": self.room.model_dump(mode="json")
+        }
         self.mock_table.update_item.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
             operation_name="UpdateItem",
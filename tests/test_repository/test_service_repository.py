@@ -1,12 +1,14 @@
 import unittest
+from decimal import Decimal
 from unittest.mock import MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from botocore.exceptions import ClientError
 from fastapi import status
 
 from app.repository.service_request_repository import ServiceRequestRepository
 from app.app_exception.app_exception import AppException
 from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from app.utils import ids
 
 
 class TestServiceRequestRepository(unittest.TestCase):
@@ -21,6 +23,7 @@ class TestServiceRequestRepository(unittest.TestCase):
         self.repo = ServiceRequestRepository(
             ddb_resource=self.mock_ddb_resource,
             table_name="test-table",
+            hotel_id="h1",
         )
 
         self.service_request = ServiceRequest(
@@ -39,16 +42,29 @@ class TestServiceRequestRepository(unittest.TestCase):
     def test_save_service_request_success(self):
         self.repo.save_service_request(self.service_request)
 
-        self.mock_ddb_client.transact_write_items.assert_called_once()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        item = items[0]["Put"]["Item"]
+        self.assertEqual(item["pk"], "Hotel#h1#ServiceRequest#sr-1")
+        self.assertEqual(item["status_type"], "Hotel#h1#Pending#Cleaning")
+        self.assertEqual(item["guest_pk"], "Hotel#h1#User#user-1")
+        self.assertEqual(item["booking_pk"], "Hotel#h1#Booking#booking-1")
+        self.assertNotIn("assignee_pk", item)
+        self.assertEqual(item["queue_pk"], "Hotel#h1#Queue#Cleaning")
+        self.assertTrue(
+            item["changes_pk"].startswith("Hotel#h1#ServiceRequestChanges#")
+        )
+        self.assertEqual(item["change_id"], self.service_request.change_id)
+        counter = items[1]["Update"]
+        self.assertEqual(
+            counter["ExpressionAttributeNames"], {"#c0": "pending_cleaning"}
+        )
+        self.assertEqual(counter["ExpressionAttributeValues"], {":c0": 1})
 
     def test_save_service_request_conflict(self):
-        error_response = {
-            "Error": {"Code": "TransactionCanceledException"},
-            "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
-        }
-
         self.mock_ddb_client.transact_write_items.side_effect = ClientError(
-            error_response=error_response,
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
             operation_name="TransactWriteItems",
         )
 
@@ -73,7 +89,9 @@ class TestServiceRequestRepository(unittest.TestCase):
 
         result = self.repo.get_all_pending_service_requests()
 
-        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result), len(ServiceType))
+        for call in self.mock_table.query.call_args_list:
+            self.assertEqual(call.kwargs["IndexName"], "StatusTypeIndex")
 
     def test_get_all_pending_service_requests_ddb_error(self):
         self.mock_table.query.side_effect = ClientError(
@@ -102,17 +120,88 @@ class TestServiceRequestRepository(unittest.TestCase):
         with self.assertRaises(AppException):
             self.repo.get_pending_service_requests_by_user_id("user-1")
 
+    def test_query_service_requests_by_status_type_success(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")]
+        }
+
+        result = self.repo.query_service_requests_by_status_type(
+            ServiceStatus.DONE,
+            ServiceType.FOOD,
+            created_from=datetime(2026, 1, 10, 9),
+            created_to=datetime(2026, 1, 10, 10),
+        )
+
+        self.assertEqual(len(result), 1)
+        kwargs = self.mock_table.query.call_args.kwargs
+        self.assertEqual(kwargs["IndexName"], "StatusTypeIndex")
+        self.assertNotIn("FilterExpression", kwargs)
+
+    def test_query_service_requests_by_status_type_reads_every_page(self):
+        item = self.service_request.model_dump(mode="json")
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [item]},
+        ]
+
+        result = self.repo.query_service_requests_by_status_type(
+            ServiceStatus.PENDING, ServiceType.CLEANING
+        )
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["ExclusiveStartKey"], {"pk": "x"}
+        )
+
+    def test_query_service_requests_by_status_type_ddb_error(self):
+        self.mock_table.query.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalError"}},
+            operation_name="Query",
+        )
+
+        with self.assertRaises(AppException):
+            self.repo.query_service_requests_by_status_type(
+                ServiceStatus.PENDING, ServiceType.CLEANING
+            )
+
     def test_assign_service_request_success(self):
-        self.mock_table.get_item.return_value = {
-            "Item": self.service_request.model_dump(mode="json")
+        self.mock_ddb_client.get_item.return_value = {
+            "Item": self.service_request.model_copy(
+                update={"is_assigned": True, "assigned_to": "emp-1"}
+            ).model_dump(mode="json")
         }
 
-        self.repo.assign_service_request("sr-1", "emp-1")
+        assigned = self.repo.assign_service_request("sr-1", "emp-1")
 
-        self.mock_ddb_client.transact_write_items.assert_called_once()
+        self.assertEqual(assigned.assigned_to, "emp-1")
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        update = items[0]["Update"]
+        self.assertEqual(
+            update["Key"], {"pk": "Hotel#h1#ServiceRequest#sr-1", "sk": "META"}
+        )
+        self.assertEqual(
+            update["ExpressionAttributeValues"][":assignee_pk"], "Hotel#h1#User#emp-1"
+        )
+        # the employee's open tasks move with the assignment
+        load = items[1]["Update"]
+        self.assertEqual(
+            load["Key"], {"pk": "Hotel#h1#OpenAssignments", "sk": "Employee#emp-1"}
+        )
+        self.assertEqual(load["ExpressionAttributeValues"], {":delta": 1})
+        self.assertTrue(
+            self.mock_ddb_client.get_item.call_args.kwargs["ConsistentRead"]
+        )
 
     def test_assign_service_request_not_found(self):
-        self.mock_table.get_item.return_value = {}
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
+            },
+            operation_name="TransactWriteItems",
+        )
 
         with self.assertRaises(AppException) as ctx:
             self.repo.assign_service_request("sr-1", "emp-1")
@@ -120,20 +209,388 @@ class TestServiceRequestRepository(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_assign_service_request_already_assigned(self):
-        self.mock_table.get_item.return_value = {
-            "Item": self.service_request.model_dump(mode="json")
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [
+                    {
+                        "Code": "ConditionalCheckFailed",
+                        "Item": {"pk": "Hotel#h1#ServiceRequest#sr-1"},
+                    }
+                ],
+            },
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.assign_service_request("sr-1", "emp-1")
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+
+    def queued(self, service_request_id):
+        return self.service_request.model_copy(update={"id": service_request_id})
+
+    def test_assign_service_requests_in_one_transaction(self):
+        assignments = [(self.queued("sr-1"), "emp-1"), (self.queued("sr-2"), "emp-2")]
+
+        assigned = self.repo.assign_service_requests(assignments)
+
+        self.assertEqual(
+            [(r.id, r.assigned_to) for r in assigned],
+            [("sr-1", "emp-1"), ("sr-2", "emp-2")],
+        )
+        self.assertTrue(all(r.is_assigned for r in assigned))
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        # two assignments, then each employee's load
+        self.assertEqual(len(items), 4)
+        # the returned rows carry the change ids that were written
+        self.assertEqual(
+            [i["Update"]["ExpressionAttributeValues"][":change_id"] for i in items[:2]],
+            [r.change_id for r in assigned],
+        )
+        self.assertEqual(
+            [
+                (i["Update"]["Key"]["sk"], i["Update"]["ExpressionAttributeValues"])
+                for i in items[2:]
+            ],
+            [("Employee#emp-1", {":delta": 1}), ("Employee#emp-2", {":delta": 1})],
+        )
+        self.assertIn("REMOVE queue_pk", items[0]["Update"]["UpdateExpression"])
+        self.assertEqual(
+            items[1]["Update"]["ExpressionAttributeValues"][":assignee_pk"],
+            "Hotel#h1#User#emp-2",
+        )
+
+    def test_assign_service_requests_drops_taken_and_retries(self):
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [
+                        {"Code": "None"},
+                        {"Code": "ConditionalCheckFailed"},
+                    ],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            {},
+        ]
+
+        assigned = self.repo.assign_service_requests(
+            [(self.queued("sr-1"), "emp-1"), (self.queued("sr-2"), "emp-2")]
+        )
+
+        self.assertEqual([(r.id, r.assigned_to) for r in assigned], [("sr-1", "emp-1")])
+        self.assertEqual(self.mock_ddb_client.transact_write_items.call_count, 2)
+
+    def test_assign_service_requests_splits_large_batches(self):
+        assignments = [(self.queued(f"sr-{i}"), "emp-1") for i in range(150)]
+
+        assigned = self.repo.assign_service_requests(assignments)
+
+        self.assertEqual(len(assigned), 150)
+        self.assertEqual(self.mock_ddb_client.transact_write_items.call_count, 3)
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            items[-1]["Update"]["ExpressionAttributeValues"], {":delta": 50}
+        )
+
+    def test_assigned_pending_pages_follow_last_evaluated_key(self):
+        item = self.service_request.model_dump(mode="json")
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [item]},
+        ]
+
+        pages = list(self.repo.assigned_pending_pages("emp-1", page_size=1))
+
+        self.assertEqual(len(pages), 2)
+        second = self.mock_table.query.call_args_list[1].kwargs
+        self.assertEqual(second["ExclusiveStartKey"], {"pk": "x"})
+        self.assertEqual(second["Limit"], 1)
+
+    def test_unassign_service_requests_requeues_and_drops_moved(self):
+        assigned = self.service_request.model_copy(
+            update={"is_assigned": True, "assigned_to": "emp-1"}
+        )
+        finished = assigned.model_copy(update={"id": "sr-2"})
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [
+                        {"Code": "None"},
+                        {"Code": "None"},
+                        {"Code": "ConditionalCheckFailed"},
+                        {"Code": "None"},
+                    ],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            {},
+        ]
+
+        unassigned = self.repo.unassign_service_requests([assigned, finished], "emp-1")
+
+        self.assertEqual([r.id for r in unassigned], ["sr-1"])
+        self.assertFalse(unassigned[0].is_assigned)
+        self.assertIsNone(unassigned[0].assigned_to)
+        update = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ][0]["Update"]
+        self.assertIn(
+            "REMOVE assigned_to, assignee_pk, assignee_sk", update["UpdateExpression"]
+        )
+        self.assertEqual(
+            update["ExpressionAttributeValues"][":queue_pk"], "Hotel#h1#Queue#Cleaning"
+        )
+        self.assertEqual(update["ExpressionAttributeValues"][":emp"], "emp-1")
+        # the change stays in the old assignee's feed
+        change = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ][1]["Put"]["Item"]
+        self.assertEqual(change["assignee_pk"], "Hotel#h1#User#emp-1")
+        self.assertEqual(change["change_id"], unassigned[0].change_id)
+        self.assertNotIn("assignee_sk", change)
+        self.assertNotIn("assigned_to", change)
+        self.assertFalse(change["is_assigned"])
+        # the retry releases only the request that was still theirs
+        load = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ][2]["Update"]
+        self.assertEqual(load["ExpressionAttributeValues"], {":delta": -1})
+
+    def test_get_queued_service_requests_pages_up_to_limit(self):
+        item = self.service_request.model_dump(mode="json")
+        self.mock_table.query.side_effect = [
+            {"Items": [item], "LastEvaluatedKey": {"pk": "x"}},
+            {"Items": [item]},
+        ]
+
+        queued = self.repo.get_queued_service_requests(ServiceType.CLEANING, 5)
+
+        self.assertEqual(len(queued), 2)
+        kwargs = self.mock_table.query.call_args_list[0].kwargs
+        self.assertEqual(kwargs["IndexName"], "QueueIndex")
+        self.assertEqual(kwargs["Limit"], 5)
+        self.assertEqual(self.mock_table.query.call_args_list[1].kwargs["Limit"], 4)
+
+    def test_get_open_assignments(self):
+        self.mock_table.query.return_value = {
+            "Items": [
+                {
+                    "pk": "Hotel#h1#OpenAssignments",
+                    "sk": "Employee#emp-1",
+                    "open_tasks": Decimal(3),
+                },
+                {"pk": "Hotel#h1#OpenAssignments", "sk": "Employee#emp-2"},
+            ]
+        }
+
+        self.assertEqual(self.repo.get_open_assignments(), {"emp-1": 3, "emp-2": 0})
+
+    def test_add_open_tasks(self):
+        self.repo.add_open_tasks("emp-1", 2)
+
+        kwargs = self.mock_ddb_client.update_item.call_args.kwargs
+        self.assertEqual(
+            kwargs["Key"], {"pk": "Hotel#h1#OpenAssignments", "sk": "Employee#emp-1"}
+        )
+        self.assertEqual(kwargs["ExpressionAttributeValues"], {":delta": 2})
+
+    def test_count_open_assignments(self):
+        self.mock_table.query.side_effect = [
+            {"Count": 2, "LastEvaluatedKey": {"pk": "x"}},
+            {"Count": 1},
+        ]
+
+        self.assertEqual(self.repo.count_open_assignments("emp-1"), 3)
+        self.assertEqual(
+            self.mock_table.query.call_args_list[0].kwargs["Select"], "COUNT"
+        )
+
+    def test_get_changes_since_walks_day_partitions(self):
+        since = ids.min_id_at(datetime.now(timezone.utc) - timedelta(days=1))
+        self.mock_table.query.side_effect = [
+            {"Items": [self.service_request.model_dump(mode="json")]},
+            {"Items": []},
+        ]
+
+        result = self.repo.get_changes_since(since)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(self.mock_table.query.call_count, 2)
+        for call in self.mock_table.query.call_args_list:
+            self.assertEqual(call.kwargs["IndexName"], "ChangesIndex")
+
+    def test_get_changes_since_stops_at_limit(self):
+        since = ids.min_id_at(datetime.now(timezone.utc) - timedelta(days=3))
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")] * 2
+        }
+
+        result = self.repo.get_changes_since(since, limit=2)
+
+        self.assertEqual(len(result), 2)
+        self.mock_table.query.assert_called_once()
+
+    def test_get_assigned_changes_since(self):
+        self.mock_table.query.return_value = {"Items": []}
+
+        self.repo.get_assigned_changes_since("emp-1", ids.new_id())
+
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["IndexName"],
+            "AssigneeChangesIndex",
+        )
+
+    def test_get_service_requests_by_booking_id_success(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")]
+        }
+
+        result = self.repo.get_service_requests_by_booking_id("booking-1")
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(
+            self.mock_table.query.call_args.kwargs["IndexName"], "BookingIndex"
+        )
+
+    def test_delete_service_requests_by_booking(self):
+        done = self.service_request.model_copy(
+            update={"id": "sr-2", "status": ServiceStatus.DONE}
+        )
+        self.mock_table.query.return_value = {
+            "Items": [
+                self.service_request.model_dump(mode="json"),
+                done.model_dump(mode="json"),
+            ]
+        }
+
+        self.repo.delete_service_requests_by_booking("booking-1")
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            [item["Delete"]["Key"]["pk"] for item in items[:2]],
+            ["Hotel#h1#ServiceRequest#sr-1", "Hotel#h1#ServiceRequest#sr-2"],
+        )
+        # each delete holds only while the request has the status it was read with
+        self.assertEqual(
+            [item["Delete"]["ExpressionAttributeValues"] for item in items[:2]],
+            [{":status": "Pending"}, {":status": "Done"}],
+        )
+        # only the pending request is taken off its counter
+        counter = items[2]["Update"]
+        self.assertEqual(
+            counter["ExpressionAttributeNames"], {"#c0": "pending_cleaning"}
+        )
+        self.assertEqual(counter["ExpressionAttributeValues"], {":c0": -1})
+
+    def test_delete_service_requests_by_booking_releases_assignee(self):
+        assigned = self.service_request.model_copy(
+            update={"is_assigned": True, "assigned_to": "emp-1"}
+        )
+        self.mock_table.query.return_value = {
+            "Items": [assigned.model_dump(mode="json")]
+        }
+
+        self.repo.delete_service_requests_by_booking("booking-1")
+
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(
+            items[0]["Delete"]["ConditionExpression"],
+            "#status = :status AND assigned_to = :assigned_to",
+        )
+        self.assertEqual(items[2]["Update"]["Key"]["sk"], "Employee#emp-1")
+        self.assertEqual(
+            items[2]["Update"]["ExpressionAttributeValues"], {":delta": -1}
+        )
+
+    def test_delete_service_requests_by_booking_rereads_changed_requests(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")]
+        }
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            None,
+        ]
+        done = self.service_request.model_copy(update={"status": ServiceStatus.DONE})
+        self.mock_ddb_resource.batch_get_item.return_value = {
+            "Responses": {"test-table": [done.model_dump(mode="json")]}
         }
 
+        self.repo.delete_service_requests_by_booking("booking-1")
+
+        # finished meanwhile: deleted as Done and no longer counted as pending
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(items), 1)
+        self.assertEqual(
+            items[0]["Delete"]["ExpressionAttributeValues"], {":status": "Done"}
+        )
+
+    def test_delete_service_requests_by_booking_drops_deleted_requests(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")]
+        }
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
+        self.mock_ddb_resource.batch_get_item.return_value = {"Responses": {}}
+
+        self.repo.delete_service_requests_by_booking("booking-1")
+
+        self.mock_ddb_client.transact_write_items.assert_called_once()
+
+    def test_delete_service_requests_by_booking_gives_up(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")]
+        }
         self.mock_ddb_client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "TransactionCanceledException"}},
             operation_name="TransactWriteItems",
         )
+        self.mock_ddb_resource.batch_get_item.return_value = {
+            "Responses": {"test-table": [self.service_request.model_dump(mode="json")]}
+        }
 
         with self.assertRaises(AppException) as ctx:
-            self.repo.assign_service_request("sr-1", "emp-1")
+            self.repo.delete_service_requests_by_booking("booking-1")
 
         self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
 
+    def test_delete_service_requests_by_booking_ddb_error(self):
+        self.mock_table.query.return_value = {
+            "Items": [self.service_request.model_dump(mode="json")]
+        }
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalError"}},
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.delete_service_requests_by_booking("booking-1")
+
+        self.assertEqual(
+            ctx.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
     def test_get_assigned_service_requests_success(self):
         self.mock_table.query.return_value = {
             "Items": [self.service_request.model_dump(mode="json")]
@@ -177,32 +634,249 @@ class TestServiceRequestRepository(unittest.TestCase):
             self.repo.get_service_request_by_id("sr-1")
 
     def test_update_service_request_success(self):
-        assigned_item = self.service_request.model_dump(mode="json")
-        assigned_item["assigned_to"] = "emp-1"
+        self.service_request.assigned_to = "emp-1"
+
+        self.repo.update_service_request(self.service_request, ServiceStatus.DONE)
+
+        self.mock_table.update_item.assert_not_called()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(items), 3)
+        update = items[0]["Update"]
+        values = update["ExpressionAttributeValues"]
+        self.assertEqual(values[":status_type"], "Hotel#h1#Done#Cleaning")
+        self.assertEqual(values[":guest_sk"], "Made#Done#sr-1")
+        self.assertEqual(values[":assignee_sk"], "Service#Done#sr-1")
+        self.assertIn("REMOVE queue_pk", update["UpdateExpression"])
+        self.assertEqual(items[1]["Update"]["ExpressionAttributeValues"], {":c0": -1})
+        # finishing it releases the assignee's open task, and only holds
+        # while it is still theirs
+        self.assertIn("assigned_to = :assigned_to", update["ConditionExpression"])
+        self.assertEqual(items[2]["Update"]["Key"]["sk"], "Employee#emp-1")
+        self.assertEqual(
+            items[2]["Update"]["ExpressionAttributeValues"], {":delta": -1}
+        )
 
-        self.mock_table.get_item.return_value = {"Item": assigned_item}
+    def test_update_service_request_without_status_change_skips_counters(self):
+        done = self.service_request.model_copy(update={"status": ServiceStatus.DONE})
 
-        self.repo.update_service_request("sr-1", ServiceStatus.DONE)
+        self.repo.update_service_request(done, ServiceStatus.DONE)
 
-        self.mock_ddb_client.transact_write_items.assert_called_once()
+        self.mock_table.update_item.assert_called_once()
+        self.mock_ddb_client.transact_write_items.assert_not_called()
+
+    def test_update_service_request_with_charge_bills_folio(self):
+        self.repo.update_service_request(self.service_request, ServiceStatus.DONE, 350)
+
+        self.mock_table.update_item.assert_not_called()
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertIn("charge = :charge", items[0]["Update"]["UpdateExpression"])
+        folio = items[1]["Update"]
+        self.assertEqual(folio["Key"]["sk"], "FOLIO")
+        self.assertEqual(folio["ExpressionAttributeValues"][":charge"], 350)
+        self.assertEqual(len(items), 3)
+
+    def test_update_service_request_with_charge_conflict(self):
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.update_service_request(
+                self.service_request, ServiceStatus.DONE, 350
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_update_service_request_not_found(self):
-        self.mock_table.get_item.return_value = {}
+        self.mock_ddb_client.transact_write_items.side_effect = ClientError(
+            error_response={"Error": {"Code": "TransactionCanceledException"}},
+            operation_name="TransactWriteItems",
+        )
 
         with self.assertRaises(AppException) as ctx:
-            self.repo.update_service_request("sr-1", ServiceStatus.DONE)
+            self.repo.update_service_request(self.service_request, ServiceStatus.DONE)
 
         self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
 
-    def test_update_service_request_ddb_error(self):
-        self.mock_table.get_item.return_value = {
-            "Item": self.service_request.model_dump(mode="json")
-        }
+    def test_get_service_requests_by_ids_retries_unprocessed_keys(self):
+        item = self.service_request.model_dump(mode="json")
+        self.mock_ddb_resource.batch_get_item.side_effect = [
+            {
+                "Responses": {"test-table": [item]},
+                "UnprocessedKeys": {"test-table": {"Keys": [{"pk": "x"}]}},
+            },
+            {"Responses": {"test-table": [item]}},
+        ]
+
+        result = self.repo.get_service_requests_by_ids(["sr-1", "sr-2"])
+
+        self.assertEqual(len(result), 2)
+        keys = self.mock_ddb_resource.batch_get_item.call_args_list[0].kwargs[
+            "RequestItems"
+        ]["test-table"]["Keys"]
+        self.assertEqual(keys[1]["pk"], "Hotel#h1#ServiceRequest#sr-2")
+        self.assertEqual(
+            self.mock_ddb_resource.batch_get_item.call_args_list[1].kwargs,
+            {"RequestItems": {"test-table": {"Keys": [{"pk": "x"}]}}},
+        )
+
+    def _bulk_requests(self):
+        food = self.service_request.model_copy(
+            update={"id": "sr-2", "type": ServiceType.FOOD}
+        )
+        other = self.service_request.model_copy(
+            update={"id": "sr-3", "booking_id": "booking-2"}
+        )
+        return [self.service_request, food, other]
+
+    def test_update_service_requests_status_resets_each_booking_once(self):
+        failed = self.repo.update_service_requests_status(
+            self._bulk_requests(), ServiceStatus.DONE
+        )
+
+        self.assertEqual(failed, {})
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        # two requests and two booking copies, then one request and two
+        # copies, then the pending counters
+        self.assertEqual(len(items), 8)
+        self.assertEqual(
+            items[7]["Update"]["ExpressionAttributeNames"],
+            {"#c0": "pending_cleaning", "#c1": "pending_food"},
+        )
+        self.assertEqual(
+            items[7]["Update"]["ExpressionAttributeValues"], {":c0": -2, ":c1": -1}
+        )
+        self.assertEqual(
+            items[2]["Update"]["UpdateExpression"],
+            "SET clean_req = :false, food_req = :false",
+        )
+        self.assertEqual(
+            items[3]["Update"]["Key"],
+            {"pk": "Hotel#h1#Booking#booking-1", "sk": "META"},
+        )
+        self.assertEqual(
+            items[4]["Update"]["Key"]["pk"], "Hotel#h1#ServiceRequest#sr-3"
+        )
+
+    def test_update_service_requests_status_bills_each_folio_once(self):
+        failed = self.repo.update_service_requests_status(
+            self._bulk_requests(), ServiceStatus.DONE, {"sr-1": 200, "sr-2": 150}
+        )
+
+        self.assertEqual(failed, {})
+        items = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        # the first booking's two charges land on its folio as one action,
+        # after its requests and flag resets; the uncharged booking has none
+        self.assertEqual(len(items), 9)
+        folio = items[4]["Update"]
+        self.assertEqual(
+            folio["Key"], {"pk": "Hotel#h1#Booking#booking-1", "sk": "FOLIO"}
+        )
+        self.assertEqual(
+            folio["ExpressionAttributeValues"], {":charge": 350, ":count": 2}
+        )
+        self.assertEqual(
+            items[0]["Update"]["ExpressionAttributeValues"][":charge"], 200
+        )
+
+    def test_update_service_requests_status_reports_failures_and_retries(self):
+        self.mock_ddb_client.transact_write_items.side_effect = [
+            ClientError(
+                error_response={
+                    "Error": {"Code": "TransactionCanceledException"},
+                    "CancellationReasons": [
+                        {"Code": "ConditionalCheckFailed"},
+                        {"Code": "None"},
+                        {"Code": "None"},
+                        {"Code": "None"},
+                        {"Code": "None"},
+                        {"Code": "ConditionalCheckFailed"},
+                        {"Code": "None"},
+                    ],
+                },
+                operation_name="TransactWriteItems",
+            ),
+            {},
+        ]
+
+        failed = self.repo.update_service_requests_status(
+            self._bulk_requests(), ServiceStatus.DONE
+        )
+
+        self.assertEqual(
+            failed,
+            {
+                "sr-1": "Service request not found or not pending",
+                "sr-3": "Booking not found",
+            },
+        )
+        retried = self.mock_ddb_client.transact_write_items.call_args.kwargs[
+            "TransactItems"
+        ]
+        self.assertEqual(len(retried), 4)
+        self.assertEqual(retried[3]["Update"]["ExpressionAttributeValues"], {":c0": -1})
+        self.assertEqual(
+            retried[1]["Update"]["UpdateExpression"], "SET food_req = :false"
+        )
 
+    def test_update_service_requests_status_splits_transactions(self):
+        service_requests = [
+            self.service_request.model_copy(
+                update={"id": f"sr-{i}", "booking_id": f"booking-{i}"}
+            )
+            for i in range(40)
+        ]
+
+        failed = self.repo.update_service_requests_status(
+            service_requests, ServiceStatus.DONE
+        )
+
+        self.assertEqual(failed, {})
+        sizes = [
+            len(call.kwargs["TransactItems"])
+            for call in self.mock_ddb_client.transact_write_items.call_args_list
+        ]
+        self.assertEqual(sizes, [100, 22])
+
+    def test_update_service_request_ddb_error(self):
         self.mock_ddb_client.transact_write_items.side_effect = ClientError(
             error_response={"Error": {"Code": "InternalError"}},
             operation_name="TransactWriteItems",
         )
 
         with self.assertRaises(AppException):
-            self.repo.update_service_request("sr-1", ServiceStatus.DONE)
+            self.repo.update_service_request(self.service_request, ServiceStatus.DONE)
+
+    def test_claim_escalation_success(self):
+        self.assertTrue(self.repo.claim_escalation("sr-1", 1))
+
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"]["pk"], "Hotel#h1#ServiceRequest#sr-1")
+        self.assertIn("escalated_stage < :stage", kwargs["ConditionExpression"])
+        self.assertEqual(kwargs["ExpressionAttributeValues"], {":stage": 1})
+
+    def test_claim_escalation_already_claimed(self):
+        self.mock_table.update_item.side_effect = ClientError(
+            error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
+            operation_name="UpdateItem",
+        )
+
+        self.assertFalse(self.repo.claim_escalation("sr-1", 2))
+
+    def test_release_escalation_restores_previous_stage(self):
+        self.repo.release_escalation("sr-1", 2)
+
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["ConditionExpression"], "escalated_stage = :stage")
+        self.assertEqual(
+            kwargs["ExpressionAttributeValues"], {":stage": 2, ":previous": 1}
+        )
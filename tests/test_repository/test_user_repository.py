@@ -20,6 +20,7 @@ class TestUserRepository(unittest.TestCase):
         self.repo = UserRepository(
             ddb_resource=self.mock_ddb_resource,
             table_name="test-table",
+            hotel_id="h1",
         )
 
         self.user = User(
@@ -77,3 +78,43 @@ class TestUserRepository(unittest.TestCase):
 
     def test_get_user_by_email_not_found(self):
         self.mock_table.query.return_val
+
+    def test_get_users_by_ids_batches_and_retries_unprocessed(self):
+        item = {
+            "id": "emp-1",
+            "name": "Asha",
+            "email": "asha@example.com",
+            "password": "hashed",
+            "role": "CleaningStaff",
+            "available": True,
+        }
+        self.mock_ddb_resource.batch_get_item.side_effect = [
+            {
+                "Responses": {"test-table": [item]},
+                "UnprocessedKeys": {"test-table": {"Keys": [{"pk": "x"}]}},
+            },
+            {"Responses": {"test-table": []}},
+        ]
+
+        found = self.repo.get_users_by_ids(["emp-1", "emp-2"])
+
+        self.assertEqual(list(found), ["emp-1"])
+        self.assertEqual(found["emp-1"].role, Role.CLEANING_STAFF)
+        keys = self.mock_ddb_resource.batch_get_item.call_args_list[0].kwargs[
+            "RequestItems"
+        ]["test-table"]["Keys"]
+        self.assertEqual(keys[1], {"pk": "Hotel#h1#User#emp-2", "sk": "PROFILE"})
+        self.assertEqual(self.mock_ddb_resource.batch_get_item.call_count, 2)
+
+    def test_get_users_by_ids_ddb_error(self):
+        self.mock_ddb_resource.batch_get_item.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalError"}},
+            operation_name="BatchGetItem",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.get_users_by_ids(["emp-1"])
+
+        self.assertEqual(
+            ctx.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
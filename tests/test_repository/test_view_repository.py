@@ -0,0 +1,132 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+from fastapi import status
+
+from app.app_exception.app_exception import AppException
+from app.repository.view_repository import ViewRepository
+
+DAY = date(2026, 3, 10)
+PK = "Hotel#h1#Board#2026-03-10"
+
+
+class BoardRepository(ViewRepository):
+    VIEW = "Board"
+    VIEW_NAME = "board"
+
+
+class TestViewRepository(unittest.TestCase):
+    def setUp(self):
+        self.mock_ddb_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_ddb_resource.Table.return_value = self.mock_table
+        self.batch = self.mock_table.batch_writer.return_value.__enter__.return_value
+
+        self.repo = BoardRepository(
+            ddb_resource=self.mock_ddb_resource,
+            table_name="test-table",
+            hotel_id="h1",
+        )
+
+    def test_get_entries_reads_every_page(self):
+        self.mock_table.query.side_effect = [
+            {
+                "Items": [{"pk": PK, "sk": "META", "built_at": "t"}],
+                "LastEvaluatedKey": {"pk": PK, "sk": "META"},
+            },
+            {"Items": [{"pk": PK, "sk": "Room#101", "number": Decimal("101")}]},
+        ]
+
+        entries = self.repo.get_entries(DAY)
+
+        self.assertEqual(
+            entries, {"META": {"built_at": "t"}, "Room#101": {"number": 101}}
+        )
+        self.assertIsInstance(entries["Room#101"]["number"], int)
+        second = self.mock_table.query.call_args_list[1].kwargs
+        self.assertEqual(second["ExclusiveStartKey"], {"pk": PK, "sk": "META"})
+        self.assertTrue(second["ConsistentRead"])
+
+    def test_get_entries_of_an_unbuilt_day(self):
+        self.mock_table.query.return_value = {
+            "Items": [{"pk": PK, "sk": "Room#101", "number": Decimal("101")}]
+        }
+
+        self.assertIsNone(self.repo.get_entries(DAY))
+
+    def test_replace_entries_drops_stale_and_marks_built(self):
+        self.mock_table.query.return_value = {
+            "Items": [{"sk": "Room#101"}, {"sk": "Room#102"}]
+        }
+
+        entries = self.repo.replace_entries(DAY, lambda: {"Room#101": {"number": 101}})
+
+        self.assertEqual(set(entries), {"Room#101", "META"})
+        self.batch.delete_item.assert_called_once_with(Key={"pk": PK, "sk": "Room#102"})
+        items = [c.kwargs["Item"] for c in self.batch.put_item.call_args_list]
+        self.assertEqual(items[0], {"pk": PK, "sk": "Room#101", "number": 101})
+        self.assertEqual(items[-1]["sk"], "META")
+
+    def test_replace_entries_failure(self):
+        self.mock_table.query.side_effect = ClientError(
+            error_response={"Error": {"Code": "InternalServerError"}},
+            operation_name="Query",
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.repo.replace_entries(DAY, dict)
+
+        self.assertEqual(
+            ctx.exception.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+        self.assertEqual(ctx.exception.message, "Failed to save board")
+
+    def test_save_entries_puts_and_deletes_whole_items(self):
+        self.repo.save_entries(DAY, {"Room#101": {"number": 101}, "Room#102": None})
+
+        self.batch.put_item.assert_called_once_with(
+            Item={"pk": PK, "sk": "Room#101", "number": 101}
+        )
+        self.batch.delete_item.assert_called_once_with(Key={"pk": PK, "sk": "Room#102"})
+
+    def test_save_entries_failure_is_logged_not_raised(self):
+        self.batch.put_item.side_effect = ClientError(
+            error_response={
+                "Error": {"Code": "ProvisionedThroughputExceededException"}
+            },
+            operation_name="BatchWriteItem",
+        )
+
+        with self.assertLogs("app.repository.view_repository", "ERROR") as logs:
+            self.repo.save_entries(DAY, {"Room#101": {"number": 101}})
+
+        self.assertIn("Lost board update for hotel h1", logs.output[0])
+
+    def test_update_entries_sets_fields_of_existing_entries(self):
+        self.repo.update_entries(DAY, {"Room#101": {"state": "ready"}})
+
+        kwargs = self.mock_table.update_item.call_args.kwargs
+        self.assertEqual(kwargs["Key"], {"pk": PK, "sk": "Room#101"})
+        self.assertEqual(kwargs["UpdateExpression"], "SET #f0 = :f0")
+        self.assertEqual(kwargs["ConditionExpression"], "attribute_exists(pk)")
+        self.assertEqual(kwargs["ExpressionAttributeNames"], {"#f0": "state"})
+        self.assertEqual(kwargs["ExpressionAttributeValues"], {":f0": "ready"})
+
+    def test_update_entries_skips_missing_entries(self):
+        self.mock_table.update_item.side_effect = [
+            ClientError(
+                error_response={"Error": {"Code": "ConditionalCheckFailedException"}},
+                operation_name="UpdateItem",
+            ),
+            {},
+        ]
+
+        with self.assertNoLogs("app.repository.view_repository"):
+            self.repo.update_entries(
+                DAY, {"Room#101": {"state": "ready"}, "Room#102": {"state": "ready"}}
+            )
+
+        self.assertEqual(self.mock_table.update_item.call_count, 2)
@@ -5,6 +5,7 @@ from fastapi.testclient import TestClient
 from fastapi import status
 
 from app.app import app
+from app.dtos.booking_response import AllocationPlanDTO
 from app.services.booking_service import BookingService
 from app.dependencies import get_ddb_resource, get_table_name
 
@@ -57,6 +58,142 @@ class TestBookingRoutes(unittest.TestCase):
 
         self.mock_booking_service.book_room.assert_called_once()
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_book_room_by_type_success(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = self.mock_user
+
+        self.mock_booking_service.book_room_by_type.return_value = {"id": "booking-1"}
+
+        payload = {
+            "room_type": "Deluxe",
+            "check_in_date": date.today().isoformat(),
+            "check_out_date": (date.today() + timedelta(days=2)).isoformat(),
+        }
+
+        response = self.client.post("/bookings/by-type", json=payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        request = self.mock_booking_service.book_room_by_type.call_args.args[0]
+        self.assertEqual(request.room_type.value, "Deluxe")
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_book_group_needs_two_rooms(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = self.mock_user
+
+        payload = {
+            "room_numbers": [101],
+            "check_in_date": date.today().isoformat(),
+            "check_out_date": (date.today() + timedelta(days=1)).isoformat(),
+        }
+
+        response = self.client.post("/bookings/group", json=payload)
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_CONTENT)
+        self.mock_booking_service.book_group.assert_not_called()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_book_group_success(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = self.mock_user
+
+        self.mock_booking_service.book_group.return_value = []
+
+        payload = {
+            "room_numbers": [101, 102, 103],
+            "check_in_date": date.today().isoformat(),
+            "check_out_date": (date.today() + timedelta(days=1)).isoformat(),
+        }
+
+        response = self.client.post("/bookings/group", json=payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        request = self.mock_booking_service.book_group.call_args.args[0]
+        self.assertEqual(request.room_numbers, [101, 102, 103])
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_reallocate_rooms_as_manager(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {**self.mock_user, "role": "Manager"}
+
+        self.mock_booking_service.reallocate_rooms.return_value = AllocationPlanDTO(
+            moves=[], short_gaps_before=2, short_gaps_after=0, applied=True
+        )
+
+        response = self.client.post("/bookings/reallocate", params={"apply": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["message"], "Rooms Reallocated")
+        self.mock_booking_service.reallocate_rooms.assert_called_once_with(True)
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_folio_success(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = self.mock_user
+
+        self.mock_booking_service.get_folio.return_value = {"total": 6350}
+
+        response = self.client.get("/bookings/booking-1/folio")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"], {"total": 6350})
+        self.mock_booking_service.get_folio.assert_called_once_with(
+            "booking-1", self.mock_user
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_departures_as_manager(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {**self.mock_user, "role": "Manager"}
+
+        self.mock_booking_service.get_departures.return_value = []
+
+        response = self.client.get(
+            "/bookings/departures", params={"date": "2026-03-12"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["message"], "Departures Fetched Successfully")
+        self.mock_booking_service.get_departures.assert_called_once_with(
+            date(2026, 3, 12)
+        )
+
+    @patch("app.routes.bookings.hotel_today", return_value=date(2026, 3, 10))
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_arrivals_defaults_to_hotel_today(
+        self, mock_verify_jwt, mock_get_token, _mock_today
+    ):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {**self.mock_user, "role": "Manager"}
+
+        self.mock_booking_service.get_arrivals.return_value = []
+
+        response = self.client.get("/bookings/arrivals")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.mock_booking_service.get_arrivals.assert_called_once_with(
+            date(2026, 3, 10)
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_arrivals_as_guest_forbidden(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = self.mock_user
+
+        response = self.client.get("/bookings/arrivals")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.mock_booking_service.get_arrivals.assert_not_called()
+
     @patch("app.dependencies.get_token")
     @patch("app.utils.jwt.verify_jwt")
     def test_cancel_booking_success(self, mock_verify_jwt, mock_get_token):
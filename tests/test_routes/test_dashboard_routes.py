@@ -0,0 +1,70 @@
+import unittest
+from datetime import date
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+from fastapi import status
+
+from app.app import app
+from app.dtos.dashboard_response import DashboardCountersDTO
+from app.models.service_request import ServiceType
+from app.services.dashboard_service import DashboardService
+from app.dependencies import get_ddb_resource, get_table_name
+
+
+class TestDashboardRoutes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        self.mock_dashboard_service = Mock(spec=DashboardService)
+
+        app.dependency_overrides[DashboardService] = lambda: self.mock_dashboard_service
+        app.dependency_overrides[get_ddb_resource] = lambda: Mock()
+        app.dependency_overrides[get_table_name] = lambda: "Table"
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_counters_as_manager(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {"sub": "manager-1", "role": "Manager"}
+
+        self.mock_dashboard_service.get_counters.return_value = DashboardCountersDTO(
+            day=date(2026, 3, 10),
+            rooms_available=12,
+            pending_requests={ServiceType.CLEANING: 1, ServiceType.FOOD: 0},
+            bookings_today=4,
+            ratings=2,
+            average_rating=4.5,
+        )
+
+        response = self.client.get("/dashboard/counters")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["message"], "Dashboard counters fetched successfully")
+        self.assertEqual(
+            body["data"],
+            {
+                "day": "2026-03-10",
+                "rooms_available": 12,
+                "pending_requests": {"Cleaning": 1, "Food": 0},
+                "bookings_today": 4,
+                "ratings": 2,
+                "average_rating": 4.5,
+            },
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_counters_as_staff_forbidden(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {"sub": "staff-1", "role": "KitchenStaff"}
+
+        response = self.client.get("/dashboard/counters")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.mock_dashboard_service.get_counters.assert_not_called()
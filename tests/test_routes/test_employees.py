@@ -4,6 +4,10 @@ from fastapi.testclient import TestClient
 from fastapi import status
 
 from app.app import app
+from app.models.users import Role
+from app.models.service_request import ServiceType
+from app.services.assignment_stream_service import AssignmentStreamService
+from app.services.dispatch_service import DispatchService
 from app.services.employee_service import EmployeeService
 from app.services.service_request_service import ServiceRequestService
 from app.dependencies import get_ddb_resource, get_table_name
@@ -17,6 +21,8 @@ class TestEmployeeRoutes(unittest.TestCase):
     def setUp(self):
         self.mock_employee_service = Mock(spec=EmployeeService)
         self.mock_service_request_service = Mock(spec=ServiceRequestService)
+        self.mock_stream_service = Mock(spec=AssignmentStreamService)
+        self.mock_dispatch_service = Mock(spec=DispatchService)
 
         self.mock_manager_user = {
             "sub": "manager-1",
@@ -34,6 +40,10 @@ class TestEmployeeRoutes(unittest.TestCase):
         app.dependency_overrides[ServiceRequestService] = (
             lambda: self.mock_service_request_service
         )
+        app.dependency_overrides[AssignmentStreamService] = (
+            lambda: self.mock_stream_service
+        )
+        app.dependency_overrides[DispatchService] = lambda: self.mock_dispatch_service
         app.dependency_overrides[get_ddb_resource] = lambda: Mock()
         app.dependency_overrides[get_table_name] = lambda: "EmployeesTable"
 
@@ -82,6 +92,23 @@ class TestEmployeeRoutes(unittest.TestCase):
 
         self.mock_employee_service.get_employees.assert_called_once()
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_employees_with_filters(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_manager_user
+
+        self.mock_employee_service.get_employees.return_value = []
+
+        response = self.client.get(
+            "/employees/", params={"role": "CleaningStaff", "available": "true"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.mock_employee_service.get_employees.assert_called_once_with(
+            Role.CLEANING_STAFF, True
+        )
+
     @patch("app.dependencies.get_token")
     @patch("app.utils.jwt.verify_jwt")
     def test_update_employee_availability_success(
@@ -106,6 +133,20 @@ class TestEmployeeRoutes(unittest.TestCase):
             "Employee availability updated successfully",
         )
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_employee_heartbeat(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        response = self.client.post("/employees/heartbeat", json={})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["message"], "Heartbeat received")
+        current_user, request = self.mock_employee_service.heartbeat.call_args.args
+        self.assertEqual(current_user, self.mock_staff_user)
+        self.assertTrue(request.available)
+
     @patch("app.dependencies.get_token")
     @patch("app.utils.jwt.verify_jwt")
     def test_delete_employee_success(self, mock_verify_jwt, mock_get_token):
@@ -113,6 +154,7 @@ class TestEmployeeRoutes(unittest.TestCase):
         mock_verify_jwt.return_value = self.mock_manager_user
 
         employee_id = "emp-456"
+        self.mock_employee_service.delete_employee.return_value = {ServiceType.FOOD}
 
         response = self.client.delete(f"/employees/{employee_id}")
 
@@ -120,6 +162,9 @@ class TestEmployeeRoutes(unittest.TestCase):
         self.assertEqual(response.json()["message"], "Employee deleted successfully")
 
         self.mock_employee_service.delete_employee.assert_called_once_with(employee_id)
+        self.mock_dispatch_service.dispatch_quietly.assert_called_once_with(
+            ServiceType.FOOD
+        )
 
     @patch("app.dependencies.get_token")
     @patch("app.utils.jwt.verify_jwt")
@@ -151,6 +196,121 @@ class TestEmployeeRoutes(unittest.TestCase):
             self.mock_staff_user
         )
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_service_request_queue_success(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        self.mock_service_request_service.get_service_queue.return_value = []
+
+        response = self.client.get("/employees/service-requests/queue")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.mock_service_request_service.get_service_queue.assert_called_once_with(
+            self.mock_staff_user
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_claim_service_request_success(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        self.mock_service_request_service.claim_service_request.return_value = None
+
+        response = self.client.post("/employees/service-requests/claim")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["message"], "Service request claimed successfully"
+        )
+        self.mock_service_request_service.claim_service_request.assert_called_once_with(
+            self.mock_staff_user
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_update_service_request_statuses(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        self.mock_service_request_service.update_service_requests.return_value = {
+            "updated": ["sr-1"],
+            "failed": [
+                {"service_request_id": "sr-2", "message": "Service request not found"}
+            ],
+        }
+
+        response = self.client.put(
+            "/employees/service-requests/status",
+            json={"service_request_ids": ["sr-1", "sr-2"], "status": "Done"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["updated"], ["sr-1"])
+        self.mock_service_request_service.update_service_requests.assert_called_once()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_update_service_request_statuses_rejects_empty_list(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        response = self.client.put(
+            "/employees/service-requests/status",
+            json={"service_request_ids": [], "status": "Done"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_CONTENT)
+        self.mock_service_request_service.update_service_requests.assert_not_called()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_stream_assigned_service_requests(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        async def events():
+            yield "id: e-1\nevent: assigned\ndata: {}\n\n"
+
+        self.mock_stream_service.events.return_value = events()
+
+        response = self.client.get(
+            "/employees/service-requests/stream", headers={"Last-Event-ID": "e-0"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(
+            response.headers["content-type"].startswith("text/event-stream")
+        )
+        self.assertIn("event: assigned", response.text)
+        self.mock_stream_service.events.assert_called_once_with("staff-1", "e-0")
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_assigned_service_request_changes(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_staff_user
+
+        self.mock_service_request_service.get_assigned_changes.return_value = {
+            "changes": [],
+            "cursor": "cursor-1",
+        }
+
+        response = self.client.get(
+            "/employees/service-requests/changes", params={"since": "cursor-0"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.mock_service_request_service.get_assigned_changes.assert_called_once_with(
+            self.mock_staff_user, "cursor-0"
+        )
+
     @patch("app.dependencies.get_token")
     @patch("app.utils.jwt.verify_jwt")
     def test_update_service_request_status_success(
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+from fastapi import status
+
+from app.app import app
+from app.services.housekeeping_service import HousekeepingService
+from app.dependencies import get_ddb_resource, get_table_name
+
+
+class TestHousekeepingRoutes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        self.mock_housekeeping_service = Mock(spec=HousekeepingService)
+
+        app.dependency_overrides[HousekeepingService] = (
+            lambda: self.mock_housekeeping_service
+        )
+        app.dependency_overrides[get_ddb_resource] = lambda: Mock()
+        app.dependency_overrides[get_table_name] = lambda: "Table"
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_board_as_cleaning_staff(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {"sub": "staff-1", "role": "CleaningStaff"}
+
+        self.mock_housekeeping_service.get_board.return_value = {
+            "date": "2026-03-10",
+            "counts": {"ready": 1},
+        }
+
+        response = self.client.get("/housekeeping/board")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "status_code": 200,
+                "message": "Housekeeping board fetched successfully",
+                "data": {"date": "2026-03-10", "counts": {"ready": 1}},
+            },
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_board_as_guest_forbidden(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {"sub": "guest-1", "role": "Guest"}
+
+        response = self.client.get("/housekeeping/board")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.mock_housekeeping_service.get_board.assert_not_called()
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import Mock, patch
+from fastapi.testclient import TestClient
+from fastapi import status
+
+from app.app import app
+from app.services.manifest_service import ManifestService
+from app.dependencies import get_ddb_resource, get_table_name
+
+
+class TestManifestRoutes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def setUp(self):
+        self.mock_manifest_service = Mock(spec=ManifestService)
+
+        app.dependency_overrides[ManifestService] = lambda: self.mock_manifest_service
+        app.dependency_overrides[get_ddb_resource] = lambda: Mock()
+        app.dependency_overrides[get_table_name] = lambda: "Table"
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_today_manifest(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {"sub": "manager-1", "role": "Manager"}
+
+        self.mock_manifest_service.get_manifest.return_value = {
+            "date": "2026-03-10",
+            "arrivals": [],
+        }
+
+        response = self.client.get("/manifest/today")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            {
+                "status_code": 200,
+                "message": "Manifest Fetched Successfully",
+                "data": {"date": "2026-03-10", "arrivals": []},
+            },
+        )
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_today_manifest_as_guest_forbidden(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "fake-token"
+        mock_verify_jwt.return_value = {"sub": "guest-1", "role": "Guest"}
+
+        response = self.client.get("/manifest/today")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.mock_manifest_service.get_manifest.assert_not_called()
@@ -1,4 +1,5 @@
 import unittest
+from datetime import date, timedelta
 from unittest.mock import Mock, patch
 from fastapi.testclient import TestClient
 from fastapi import status
@@ -76,6 +77,98 @@ class TestRoomRoutes(unittest.TestCase):
 
         self.mock_room_service.get_available_rooms.assert_called_once()
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_rooms_with_filters_as_guest(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_guest_user
+
+        self.mock_room_service.search_rooms.return_value = []
+
+        response = self.client.get(
+            "/rooms/", params={"type": "Deluxe", "max_price": 5000}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        args = self.mock_room_service.search_rooms.call_args
+        self.assertEqual(args.args[0].value, "Deluxe")
+        self.assertEqual(args.args[2], 5000)
+        self.assertTrue(args.kwargs["available_only"])
+        self.mock_room_service.get_available_rooms.assert_not_called()
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_room_availability(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_guest_user
+
+        self.mock_room_service.get_free_rooms.return_value = []
+
+        response = self.client.get(
+            "/rooms/availability",
+            params={"check_in": "2026-03-10", "check_out": "2026-03-12"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        args = self.mock_room_service.get_free_rooms.call_args.args
+        self.assertEqual(args[0].isoformat(), "2026-03-10")
+        self.assertIsNone(args[2])
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_room_calendar_as_manager(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_manager_user
+
+        self.mock_room_service.get_calendar.return_value = {"rooms": []}
+
+        response = self.client.get(
+            "/rooms/calendar",
+            params={"from": "2026-03-01", "to": "2026-05-30", "encoding": "bitset"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        start, end, encoding = self.mock_room_service.get_calendar.call_args.args
+        self.assertEqual((end - start).days, 90)
+        self.assertEqual(encoding, "bitset")
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_room_calendar_forbidden_for_guest(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_guest_user
+
+        response = self.client.get(
+            "/rooms/calendar", params={"from": "2026-03-01", "to": "2026-05-30"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_hold_room_as_guest(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_guest_user
+
+        self.mock_room_service.hold_room.return_value = {"room_number": 101}
+        today = date.today()
+
+        response = self.client.post(
+            "/rooms/101/hold",
+            json={
+                "check_in_date": today.isoformat(),
+                "check_out_date": (today + timedelta(days=1)).isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        room_num, request, user = self.mock_room_service.hold_room.call_args.args
+        self.assertEqual(room_num, 101)
+        self.assertEqual(request.minutes, 10)
+        self.assertEqual(user["sub"], "guest-1")
+
     def test_get_rooms_unauthorized(self):
         response = self.client.get("/rooms/")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
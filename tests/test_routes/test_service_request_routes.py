@@ -4,6 +4,8 @@ from fastapi.testclient import TestClient
 from fastapi import status
 
 from app.app import app
+from app.models.service_request import ServiceType
+from app.services.dispatch_service import DispatchService
 from app.services.service_request_service import ServiceRequestService
 from app.dependencies import get_ddb_resource, get_table_name
 
@@ -15,6 +17,7 @@ class TestServiceRequestRoutes(unittest.TestCase):
 
     def setUp(self):
         self.mock_service_request_service = Mock(spec=ServiceRequestService)
+        self.mock_dispatch_service = Mock(spec=DispatchService)
 
         self.mock_guest_user = {
             "sub": "guest-1",
@@ -31,6 +34,7 @@ class TestServiceRequestRoutes(unittest.TestCase):
         app.dependency_overrides[ServiceRequestService] = (
             lambda: self.mock_service_request_service
         )
+        app.dependency_overrides[DispatchService] = lambda: self.mock_dispatch_service
         app.dependency_overrides[get_ddb_resource] = lambda: Mock()
         app.dependency_overrides[get_table_name] = lambda: "ServiceRequestsTable"
 
@@ -56,6 +60,9 @@ class TestServiceRequestRoutes(unittest.TestCase):
             response.json()["message"],
             "Service request created successfully",
         )
+        self.mock_dispatch_service.dispatch_quietly.assert_called_once_with(
+            ServiceType.CLEANING
+        )
 
     def test_create_service_request_unauthorized(self):
         response = self.client.post("/service-requests/", json={})
@@ -98,6 +105,31 @@ class TestServiceRequestRoutes(unittest.TestCase):
 
         self.mock_service_request_service.get_all_pending_service_requests.assert_called_once()
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_service_requests_as_manager_with_filters(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_manager_user
+
+        self.mock_service_request_service.search_service_requests.return_value = []
+
+        response = self.client.get(
+            "/service-requests/",
+            params={
+                "status": "Done",
+                "type": "Food",
+                "created_from": "2026-01-10T09:00:00",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        args = self.mock_service_request_service.search_service_requests.call_args.args
+        self.assertEqual(args[0].value, "Done")
+        self.assertEqual(args[1].value, "Food")
+        self.mock_service_request_service.get_all_pending_service_requests.assert_not_called()
+
     @patch("app.dependencies.get_token")
     @patch("app.utils.jwt.verify_jwt")
     def test_get_service_requests_as_guest_success(
@@ -127,6 +159,29 @@ class TestServiceRequestRoutes(unittest.TestCase):
             self.mock_guest_user
         )
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_get_service_request_changes_as_manager(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_manager_user
+
+        self.mock_service_request_service.get_changes.return_value = {
+            "changes": [],
+            "cursor": "cursor-1",
+        }
+
+        response = self.client.get(
+            "/service-requests/changes", params={"since": "cursor-0"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["cursor"], "cursor-1")
+        self.mock_service_request_service.get_changes.assert_called_once_with(
+            "cursor-0"
+        )
+
     def test_get_service_requests_unauthorized(self):
         response = self.client.get("/service-requests/")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -168,6 +223,41 @@ class TestServiceRequestRoutes(unittest.TestCase):
             "Service request assigned successfully",
         )
 
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_assign_service_requests_in_bulk(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_manager_user
+        self.mock_service_request_service.assign_service_requests.return_value = {
+            "assigned": [{"service_request_id": "sr-1", "employee_id": "emp-1"}],
+            "failed": [],
+        }
+
+        response = self.client.post(
+            "/service-requests/assign",
+            json={
+                "assignments": [
+                    {"service_request_id": "sr-1", "employee_id": "emp-1"}
+                ]
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]["assigned"]), 1)
+        assign = self.mock_service_request_service.assign_service_requests
+        self.assertEqual(assign.call_args.args[0].assignments[0].employee_id, "emp-1")
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_assign_service_requests_in_bulk_forbidden_for_guest(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_guest_user
+
+        response = self.client.post("/service-requests/assign", json={})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_assign_service_request_unauthorized(self):
         response = self.client.post("/service-requests/assign/sr-1", json={})
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -182,3 +272,29 @@ class TestServiceRequestRoutes(unittest.TestCase):
 
         response = self.client.post("/service-requests/assign/sr-1", json={})
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_dispatch_service_requests(self, mock_verify_jwt, mock_get_token):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_manager_user
+        self.mock_dispatch_service.dispatch.return_value = 3
+
+        response = self.client.post("/service-requests/dispatch?type=Food")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"], {"assigned": 3})
+        self.mock_dispatch_service.dispatch.assert_called_once_with(ServiceType.FOOD)
+
+    @patch("app.dependencies.get_token")
+    @patch("app.utils.jwt.verify_jwt")
+    def test_dispatch_service_requests_forbidden_for_guest(
+        self, mock_verify_jwt, mock_get_token
+    ):
+        mock_get_token.return_value = "token"
+        mock_verify_jwt.return_value = self.mock_guest_user
+
+        response = self.client.post("/service-requests/dispatch")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.mock_dispatch_service.dispatch.assert_not_called()
@@ -0,0 +1,194 @@
+import threading
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from app.models.service_request import ServiceStatus
+from app.scheduling.sla_scheduler import (
+    MAX_RETRY_DELAY,
+    RETRY_DELAY,
+    EscalationStage,
+    SlaScheduler,
+)
+from tests.factories import CREATED_AT, make_service_request
+
+
+class TestSlaScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = CREATED_AT.timestamp()
+        self.stored = {}
+        self.claimed = set()
+        self.escalate = MagicMock()
+        self.release = MagicMock(side_effect=self.unclaim)
+        self.scheduler = SlaScheduler(
+            loader=MagicMock(return_value=[]),
+            fetch=self.stored.get,
+            claim=self.claim,
+            release=self.release,
+            escalate=self.escalate,
+            clock=lambda: self.now,
+        )
+
+    def claim(self, service_request_id, stage):
+        if (service_request_id, stage) in self.claimed:
+            return False
+        self.claimed.add((service_request_id, stage))
+        return True
+
+    def unclaim(self, service_request_id, stage):
+        self.claimed.discard((service_request_id, stage))
+
+    def advance(self, minutes):
+        self.now += timedelta(minutes=minutes).total_seconds()
+
+    def save(self, service_request):
+        self.stored[service_request.id] = service_request
+        self.scheduler.track(service_request)
+
+    def test_unassigned_request_escalates_at_deadline(self):
+        request = make_service_request("sr-1")
+        self.save(request)
+
+        self.advance(9)
+        self.assertEqual(self.scheduler.fire_due(), 0)
+
+        self.advance(1)
+        self.assertEqual(self.scheduler.fire_due(), 1)
+        self.escalate.assert_called_once_with(request, EscalationStage.UNASSIGNED)
+        # still tracked against the completion deadline
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_unfinished_request_escalates_after_unassigned(self):
+        self.save(make_service_request("sr-1"))
+
+        self.advance(45)
+        self.scheduler.fire_due()
+        self.scheduler.fire_due()
+
+        stages = [c.args[1] for c in self.escalate.call_args_list]
+        self.assertEqual(
+            stages, [EscalationStage.UNASSIGNED, EscalationStage.UNFINISHED]
+        )
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_assignment_moves_to_completion_deadline(self):
+        self.save(make_service_request("sr-1"))
+        self.scheduler.assigned("sr-1", "emp-1")
+
+        self.advance(30)
+        self.assertEqual(self.scheduler.fire_due(), 0)
+
+        self.stored["sr-1"] = make_service_request("sr-1", assigned_to="emp-1")
+        self.advance(15)
+        self.assertEqual(self.scheduler.fire_due(), 1)
+        self.assertEqual(self.escalate.call_args.args[1], EscalationStage.UNFINISHED)
+
+    def test_done_request_is_cancelled(self):
+        request = make_service_request("sr-1")
+        self.save(request)
+
+        request.status = ServiceStatus.DONE
+        self.scheduler.track(request)
+        self.advance(60)
+
+        self.assertEqual(self.scheduler.fire_due(), 0)
+        self.escalate.assert_not_called()
+
+    def test_skips_requests_changed_elsewhere(self):
+        self.save(make_service_request("sr-1"))
+        self.save(make_service_request("sr-2"))
+        # assigned by another instance, deleted with its booking
+        self.stored["sr-1"] = make_service_request("sr-1", assigned_to="emp-1")
+        del self.stored["sr-2"]
+
+        self.advance(10)
+
+        self.assertEqual(self.scheduler.fire_due(), 0)
+        self.escalate.assert_not_called()
+        self.assertEqual(len(self.scheduler), 1)
+
+    def test_failed_escalation_does_not_stop_others(self):
+        self.save(make_service_request("sr-1"))
+        self.save(make_service_request("sr-2"))
+        self.escalate.side_effect = [Exception("queue down"), None]
+
+        self.advance(10)
+
+        self.assertEqual(self.scheduler.fire_due(), 1)
+        self.assertEqual(self.escalate.call_count, 2)
+        self.release.assert_called_once_with("sr-1", EscalationStage.UNASSIGNED)
+
+    def test_failed_escalation_is_retried_with_backoff(self):
+        request = make_service_request("sr-1")
+        self.save(request)
+        self.escalate.side_effect = [Exception("queue down")] * 2 + [None]
+
+        self.advance(10)
+        self.assertEqual(self.scheduler.fire_due(), 0)
+        self.assertEqual(len(self.scheduler), 1)
+
+        self.now += RETRY_DELAY
+        self.assertEqual(self.scheduler.fire_due(), 0)
+
+        # the second failure waits twice as long
+        self.now += RETRY_DELAY
+        self.assertEqual(self.scheduler.fire_due(), 0)
+        self.now += RETRY_DELAY
+        self.assertEqual(self.scheduler.fire_due(), 1)
+        self.assertEqual(self.escalate.call_count, 3)
+
+    def test_retry_delay_is_capped(self):
+        self.save(make_service_request("sr-1"))
+        self.escalate.side_effect = Exception("queue down")
+
+        self.advance(10)
+        for _ in range(10):
+            self.scheduler.fire_due()
+            self.now += MAX_RETRY_DELAY
+
+        self.assertEqual(self.escalate.call_count, 10)
+
+    def test_stage_claimed_elsewhere_is_not_escalated_again(self):
+        request = make_service_request("sr-1")
+        self.save(request)
+        self.claimed.add(("sr-1", EscalationStage.UNASSIGNED))
+
+        self.advance(10)
+
+        self.assertEqual(self.scheduler.fire_due(), 0)
+        self.escalate.assert_not_called()
+        # still due against the completion deadline
+        self.advance(35)
+        self.assertEqual(self.scheduler.fire_due(), 1)
+        self.assertEqual(self.escalate.call_args.args[1], EscalationStage.UNFINISHED)
+
+    def test_load_tracks_pending_requests_by_stage(self):
+        self.scheduler.load(
+            [
+                make_service_request("sr-1"),
+                make_service_request("sr-2", assigned_to="emp-1"),
+            ]
+        )
+        self.stored["sr-1"] = make_service_request("sr-1")
+
+        self.advance(10)
+
+        self.assertEqual(self.scheduler.fire_due(), 1)
+        self.assertEqual(self.escalate.call_args.args[0].id, "sr-1")
+
+    def test_worker_loads_and_fires_overdue_requests(self):
+        overdue = make_service_request("sr-1")
+        fired = threading.Event()
+        scheduler = SlaScheduler(
+            loader=MagicMock(return_value=[overdue]),
+            fetch=lambda _: overdue,
+            claim=lambda *_: True,
+            release=lambda *_: None,
+            escalate=lambda *_: fired.set(),
+        )
+
+        scheduler.start()
+        try:
+            self.assertTrue(fired.wait(timeout=2))
+        finally:
+            scheduler.stop()
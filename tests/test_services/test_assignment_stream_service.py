@@ -0,0 +1,105 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.models.service_request import ServiceType
+from app.services.assignment_stream_service import AssignmentStreamService
+from app.streaming.assignment_broker import AssignmentBroker
+from app.utils import ids
+from tests.factories import make_service_request
+
+
+async def take(stream, count):
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        if len(chunks) == count:
+            break
+    await stream.aclose()
+    return chunks
+
+
+class TestAssignmentStreamService(unittest.TestCase):
+    def setUp(self):
+        self.broker = AssignmentBroker()
+        self.mock_service_request_repo = MagicMock()
+        self.service = AssignmentStreamService(
+            broker=self.broker,
+            service_request_repo=self.mock_service_request_repo,
+        )
+
+    def test_streams_published_events(self):
+        async def scenario():
+            stream = self.service.events("emp-1", None)
+            reader = asyncio.ensure_future(take(stream, 1))
+            await asyncio.sleep(0)
+            self.broker.publish(
+                "emp-1",
+                "assigned",
+                make_service_request("sr-1", ServiceType.CLEANING, "emp-1"),
+            )
+            return await reader
+
+        chunks = asyncio.run(scenario())
+
+        self.assertTrue(chunks[0].startswith("id: "))
+        self.assertIn("event: assigned", chunks[0])
+        self.assertEqual(self.broker.subscriber_count(), 0)
+        self.mock_service_request_repo.get_assigned_changes_since.assert_not_called()
+
+    @patch("app.services.assignment_stream_service.HEARTBEAT_SECONDS", 0.01)
+    def test_sends_heartbeats_when_idle(self):
+        chunks = asyncio.run(take(self.service.events("emp-1", None), 2))
+
+        self.assertEqual(chunks, [": heartbeat\n\n", ": heartbeat\n\n"])
+
+    def test_resume_from_buffer_reads_nothing(self):
+        first = self.broker.publish(
+            "emp-1",
+            "assigned",
+            make_service_request("sr-1", ServiceType.CLEANING, "emp-1"),
+        )
+        self.broker.publish(
+            "emp-1",
+            "status",
+            make_service_request("sr-1", ServiceType.CLEANING, "emp-1"),
+        )
+
+        chunks = asyncio.run(take(self.service.events("emp-1", first.id), 1))
+
+        self.assertIn("event: status", chunks[0])
+        self.mock_service_request_repo.get_assigned_changes_since.assert_not_called()
+
+    def test_resume_from_another_instance_reads_changes(self):
+        self.broker.publish(
+            "emp-1",
+            "assigned",
+            make_service_request("sr-1", ServiceType.CLEANING, "emp-1"),
+        )
+        last_event_id = ids.new_id()
+        self.mock_service_request_repo.get_assigned_changes_since.return_value = [
+            make_service_request("sr-2", ServiceType.CLEANING, "emp-1")
+        ]
+
+        chunks = asyncio.run(take(self.service.events("emp-1", last_event_id), 1))
+
+        self.assertIn("event: changed", chunks[0])
+        self.mock_service_request_repo.get_assigned_changes_since.assert_called_once_with(
+            "emp-1", last_event_id
+        )
+
+    def test_resume_from_before_buffer_reads_changes(self):
+        last_event_id = ids.new_id()
+        change_id = ids.new_id()
+        self.mock_service_request_repo.get_assigned_changes_since.return_value = [
+            make_service_request(
+                "sr-1", ServiceType.CLEANING, "emp-1", change_id=change_id
+            )
+        ]
+
+        chunks = asyncio.run(take(self.service.events("emp-1", last_event_id), 1))
+
+        self.assertTrue(chunks[0].startswith(f"id: {change_id}\nevent: changed\n"))
+        self.mock_service_request_repo.get_assigned_changes_since.assert_called_once_with(
+            "emp-1", last_event_id
+        )
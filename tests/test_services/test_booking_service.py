@@ -6,18 +6,32 @@ from fastapi import status
 
 from app.services.booking_service import BookingService
 from app.app_exception.app_exception import AppException
-from app.models.bookings import BookingStatus
-from app.dtos.booking_requests import CreateBookingRequest
+from app.models.bookings import BookingStatus, Folio
+from app.dtos.booking_requests import (
+    CreateBookingByTypeRequest,
+    CreateBookingRequest,
+    CreateGroupBookingRequest,
+)
+from app.dtos.booking_response import AllocationPlanDTO, BookingMoveDTO
+from app.models.rooms import RoomType
 
 
 class TestBookingService(unittest.TestCase):
     def setUp(self):
         self.mock_booking_repo = MagicMock()
         self.mock_room_repo = MagicMock()
+        self.mock_index = MagicMock()
+        self.mock_index.is_free.return_value = True
+        self.mock_index.capacity.return_value = 10
+        self.mock_manifest_service = MagicMock()
+        self.mock_housekeeping_service = MagicMock()
 
         self.service = BookingService(
             booking_repo=self.mock_booking_repo,
             room_repo=self.mock_room_repo,
+            availability_index=self.mock_index,
+            manifest_service=self.mock_manifest_service,
+            housekeeping_service=self.mock_housekeeping_service,
         )
 
         self.valid_user = {"sub": "user-123"}
@@ -31,6 +45,9 @@ class TestBookingService(unittest.TestCase):
     def test_book_room_success(self):
         room = MagicMock()
         room.id = "room-1"
+        room.number = 101
+        room.type = RoomType.RoomTypeStandard
+        room.price = 3000
         room.is_available = True
 
         self.mock_room_repo.get_room_by_number.return_value = room
@@ -41,11 +58,13 @@ class TestBookingService(unittest.TestCase):
         )
 
         self.assertEqual(booking.user_id, "user-123")
+        self.assertEqual(booking.room_rate, 3000)
         self.assertEqual(booking.room_num, 101)
         self.assertEqual(booking.status, BookingStatus.Booking_Status_Booked)
 
-        self.mock_room_repo.update_room_availability.assert_called_once_with(101, False)
+        self.mock_room_repo.update_room_availability.assert_not_called()
         self.mock_booking_repo.save_booking.assert_called_once()
+        self.mock_index.add_booking.assert_called_once_with(booking)
 
     def test_book_room_room_not_available(self):
         room = MagicMock()
@@ -57,11 +76,51 @@ class TestBookingService(unittest.TestCase):
             self.service.book_room(self.valid_request, self.valid_user)
 
         self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(ctx.exception.message, "Room already booked")
+        self.assertEqual(ctx.exception.message, "Room is not available for booking")
+
+    def test_book_room_dates_taken(self):
+        room = MagicMock()
+        room.id = "room-1"
+        room.number = 101
+        room.type = RoomType.RoomTypeStandard
+        room.is_available = True
+
+        self.mock_room_repo.get_room_by_number.return_value = room
+        self.mock_index.is_free.return_value = False
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.book_room(self.valid_request, self.valid_user)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            ctx.exception.message, "Room already booked for the selected dates"
+        )
+        self.mock_booking_repo.save_booking.assert_not_called()
+
+    def test_book_room_lost_race_invalidates_index(self):
+        room = MagicMock()
+        room.id = "room-1"
+        room.number = 101
+        room.type = RoomType.RoomTypeStandard
+        room.is_available = True
+
+        self.mock_room_repo.get_room_by_number.return_value = room
+        self.mock_booking_repo.save_booking.side_effect = AppException(
+            message="Room already booked for the selected dates",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+        with self.assertRaises(AppException):
+            self.service.book_room(self.valid_request, self.valid_user)
+
+        self.mock_index.invalidate.assert_called_once()
+        self.mock_index.add_booking.assert_not_called()
 
     def test_book_room_invalid_user_context(self):
         room = MagicMock()
         room.id = "room-1"
+        room.number = 101
+        room.type = RoomType.RoomTypeStandard
         room.is_available = True
 
         self.mock_room_repo.get_room_by_number.return_value = room
@@ -75,6 +134,8 @@ class TestBookingService(unittest.TestCase):
     def test_book_room_repo_exception_propagates(self):
         room = MagicMock()
         room.id = "room-1"
+        room.number = 101
+        room.type = RoomType.RoomTypeStandard
         room.is_available = True
 
         self.mock_room_repo.get_room_by_number.return_value = room
@@ -86,11 +147,173 @@ class TestBookingService(unittest.TestCase):
         with self.assertRaises(AppException):
             self.service.book_room(self.valid_request, self.valid_user)
 
+    def make_room(self, number):
+        room = MagicMock()
+        room.id = f"room-{number}"
+        room.number = number
+        room.type = RoomType.RoomTypeDeluxe
+        return room
+
+    def by_type_request(self):
+        return CreateBookingByTypeRequest(
+            room_type=RoomType.RoomTypeDeluxe,
+            check_in_date=date.today(),
+            check_out_date=date.today() + timedelta(days=2),
+        )
+
+    def test_book_room_by_type_success(self):
+        self.mock_index.free_rooms.return_value = [self.make_room(201)]
+
+        booking = self.service.book_room_by_type(
+            self.by_type_request(), self.valid_user
+        )
+
+        self.assertEqual(booking.room_num, 201)
+        self.assertEqual(booking.room_type, RoomType.RoomTypeDeluxe)
+        self.mock_booking_repo.save_booking.assert_called_once_with(booking, 10)
+
+    def test_book_room_by_type_retries_taken_room(self):
+        self.mock_index.free_rooms.side_effect = [
+            [self.make_room(201)],
+            [self.make_room(202)],
+        ]
+        self.mock_booking_repo.save_booking.side_effect = [
+            AppException(
+                message="Room already booked for the selected dates",
+                status_code=status.HTTP_409_CONFLICT,
+            ),
+            None,
+        ]
+
+        booking = self.service.book_room_by_type(
+            self.by_type_request(), self.valid_user
+        )
+
+        self.assertEqual(booking.room_num, 202)
+        self.mock_index.invalidate.assert_called_once()
+
+    def test_book_room_by_type_sold_out(self):
+        self.mock_index.free_rooms.return_value = []
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.book_room_by_type(self.by_type_request(), self.valid_user)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.mock_booking_repo.save_booking.assert_not_called()
+
+    def test_book_room_by_type_counter_exhausted_not_retried(self):
+        self.mock_index.free_rooms.return_value = [self.make_room(201)]
+        self.mock_booking_repo.save_booking.side_effect = AppException(
+            message="No rooms of this type left for the selected dates",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+        with self.assertRaises(AppException):
+            self.service.book_room_by_type(self.by_type_request(), self.valid_user)
+
+        self.mock_booking_repo.save_booking.assert_called_once()
+
+    def group_request(self):
+        return CreateGroupBookingRequest(
+            room_numbers=[201, 202],
+            check_in_date=date.today(),
+            check_out_date=date.today() + timedelta(days=1),
+        )
+
+    def test_book_group_success(self):
+        self.mock_index.get_room.side_effect = self.make_room
+
+        group = self.service.book_group(self.group_request(), self.valid_user)
+
+        self.assertEqual([b.room_num for b in group], [201, 202])
+        self.assertEqual(len({b.group_id for b in group}), 1)
+        self.mock_booking_repo.save_group_booking.assert_called_once_with(
+            group, {"Deluxe": 10}
+        )
+        self.assertEqual(self.mock_index.add_booking.call_count, 2)
+        self.mock_room_repo.get_room_by_number.assert_not_called()
+
+    def test_book_group_room_taken(self):
+        self.mock_index.get_room.side_effect = self.make_room
+        self.mock_index.is_free.side_effect = [True, False]
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.book_group(self.group_request(), self.valid_user)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.mock_booking_repo.save_group_booking.assert_not_called()
+
+    def test_book_group_loads_unknown_room(self):
+        self.mock_index.get_room.side_effect = [self.make_room(201), None]
+        self.mock_room_repo.get_room_by_number.return_value = self.make_room(202)
+
+        self.service.book_group(self.group_request(), self.valid_user)
+
+        self.mock_room_repo.get_room_by_number.assert_called_once_with(202)
+
+    def make_plan(self, before, after):
+        move = BookingMoveDTO(
+            booking_id="booking-1",
+            user_id="user-123",
+            check_in=date.today() + timedelta(days=3),
+            check_out=date.today() + timedelta(days=5),
+            from_room=101,
+            to_room=102,
+            to_room_id="room-102",
+        )
+        return AllocationPlanDTO(
+            moves=[move], short_gaps_before=before, short_gaps_after=after
+        )
+
+    @patch("app.services.booking_service.plan_allocation")
+    def test_reallocate_rooms_dry_run(self, mock_plan):
+        mock_plan.return_value = self.make_plan(3, 0)
+
+        plan = self.service.reallocate_rooms()
+
+        self.assertFalse(plan.applied)
+        self.mock_booking_repo.apply_booking_moves.assert_not_called()
+
+    @patch("app.services.booking_service.plan_allocation")
+    def test_reallocate_rooms_apply(self, mock_plan):
+        mock_plan.return_value = self.make_plan(3, 0)
+        self.mock_booking_repo.apply_booking_moves.return_value = []
+
+        plan = self.service.reallocate_rooms(apply=True)
+
+        self.assertTrue(plan.applied)
+        self.assertEqual(len(plan.moves), 1)
+        self.mock_booking_repo.apply_booking_moves.assert_called_once_with(plan.moves)
+        self.mock_index.invalidate.assert_called_once()
+
+    @patch("app.services.booking_service.plan_allocation")
+    def test_reallocate_rooms_reports_skipped_moves(self, mock_plan):
+        mock_plan.return_value = self.make_plan(3, 0)
+        move = mock_plan.return_value.moves[0]
+        self.mock_booking_repo.apply_booking_moves.return_value = [move]
+
+        plan = self.service.reallocate_rooms(apply=True)
+
+        self.assertEqual(plan.moves, [])
+        self.assertEqual(plan.skipped, [move])
+        self.mock_housekeeping_service.record_booking_moves.assert_called_once_with([])
+
+    @patch("app.services.booking_service.plan_allocation")
+    def test_reallocate_rooms_skips_without_gain(self, mock_plan):
+        mock_plan.return_value = self.make_plan(1, 1)
+
+        plan = self.service.reallocate_rooms(apply=True)
+
+        self.assertEqual(plan.moves, [])
+        self.mock_booking_repo.apply_booking_moves.assert_not_called()
+
     @patch("app.services.booking_service.BookingEventPublisher")
     def test_cancel_booking_success(self, mock_event_publisher_cls):
         booking = MagicMock()
         booking.status = BookingStatus.Booking_Status_Booked
         booking.room_num = 101
+        booking.id = "booking-123"
+        booking.room_type = RoomType.RoomTypeStandard
 
         mock_event_publisher = MagicMock()
         mock_event_publisher_cls.return_value = mock_event_publisher
@@ -101,9 +324,12 @@ class TestBookingService(unittest.TestCase):
 
         self.assertEqual(booking.status, BookingStatus.Booking_Status_Cancelled)
 
-        self.mock_room_repo.update_room_availability.assert_called_once_with(101, True)
-        self.mock_booking_repo.update_booking.assert_called_once_with(booking)
-        mock_event_publisher.publish_booking_cancelled.assert_called_once_with(booking)
+        self.mock_booking_repo.cancel_booking.assert_called_once_with(booking)
+        self.mock_index.remove_booking.assert_called_once_with("booking-123")
+        self.mock_manifest_service.record_booking.assert_called_once_with(booking)
+        mock_event_publisher.publish_booking_cancelled.assert_called_once_with(
+            booking, self.mock_booking_repo.hotel_id
+        )
 
     def test_cancel_booking_already_cancelled(self):
         booking = MagicMock()
@@ -127,3 +353,53 @@ class TestBookingService(unittest.TestCase):
         self.mock_booking_repo.get_bookings_by_userID.assert_called_once_with(
             "user-123"
         )
+
+    def test_get_arrivals(self):
+        bookings = [MagicMock()]
+        self.mock_booking_repo.get_arrivals.return_value = bookings
+
+        result = self.service.get_arrivals(date(2026, 3, 10))
+
+        self.assertEqual(result, bookings)
+        self.mock_booking_repo.get_arrivals.assert_called_once_with(date(2026, 3, 10))
+
+    def make_folio(self):
+        return Folio(
+            booking_id="booking-1",
+            user_id="user-123",
+            room_num=101,
+            check_in=date(2026, 3, 10),
+            check_out=date(2026, 3, 12),
+            nights=2,
+            room_rate=3000,
+            room_charges=6000,
+            service_charges=350,
+            service_count=1,
+        )
+
+    def test_get_folio_for_owner(self):
+        self.mock_booking_repo.get_folio.return_value = self.make_folio()
+
+        folio = self.service.get_folio(
+            "booking-1", {"sub": "user-123", "role": "Guest"}
+        )
+
+        self.assertEqual(folio.total, 6350)
+        self.mock_booking_repo.get_folio.assert_called_once_with("booking-1")
+
+    def test_get_folio_hides_other_guests_bill(self):
+        self.mock_booking_repo.get_folio.return_value = self.make_folio()
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.get_folio("booking-1", {"sub": "user-999", "role": "Guest"})
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_folio_for_manager(self):
+        self.mock_booking_repo.get_folio.return_value = self.make_folio()
+
+        folio = self.service.get_folio(
+            "booking-1", {"sub": "manager-1", "role": "Manager"}
+        )
+
+        self.assertEqual(folio.user_id, "user-123")
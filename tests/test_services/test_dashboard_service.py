@@ -0,0 +1,46 @@
+import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from app.models.service_request import ServiceType
+from app.services.dashboard_service import DashboardService
+
+
+class TestDashboardService(unittest.TestCase):
+    def setUp(self):
+        self.mock_counter_cache = MagicMock()
+
+        self.service = DashboardService(counter_cache=self.mock_counter_cache)
+
+    @patch("app.services.dashboard_service.hotel_today")
+    def test_get_counters(self, mock_today):
+        # the arrival counters are keyed by the hotel's day, not the server's
+        mock_today.return_value = date(2026, 3, 10)
+        self.mock_counter_cache.get.return_value = {
+            "rooms_available": 12,
+            "pending_food": 3,
+            "arrivals": 5,
+            "ratings": 3,
+            "rating_total": 13,
+        }
+
+        counters = self.service.get_counters()
+
+        self.mock_counter_cache.get.assert_called_once_with(date(2026, 3, 10))
+        self.assertEqual(counters.rooms_available, 12)
+        self.assertEqual(
+            counters.pending_requests,
+            {ServiceType.CLEANING: 0, ServiceType.FOOD: 3},
+        )
+        self.assertEqual(counters.bookings_today, 5)
+        self.assertEqual(counters.ratings, 3)
+        self.assertEqual(counters.average_rating, 4.33)
+
+    def test_no_ratings_has_no_average(self):
+        self.mock_counter_cache.get.return_value = {}
+
+        counters = self.service.get_counters()
+
+        self.assertEqual(counters.rooms_available, 0)
+        self.assertEqual(counters.ratings, 0)
+        self.assertIsNone(counters.average_rating)
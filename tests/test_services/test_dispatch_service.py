@@ -0,0 +1,153 @@
+import unittest
+from unittest.mock import MagicMock
+
+from fastapi import status
+
+from app.app_exception.app_exception import AppException
+from app.models.service_request import ServiceType
+from app.models.users import Role
+from app.presence.staff_presence import StaffPresence
+from app.services.dispatch_service import DispatchService
+from app.utils import ids
+from tests.factories import make_employee, make_service_request
+
+
+class TestDispatchService(unittest.TestCase):
+    def setUp(self):
+        self.mock_service_request_repo = MagicMock()
+        self.mock_employee_repo = MagicMock()
+        self.mock_manifest_service = MagicMock()
+        self.mock_housekeeping_service = MagicMock()
+        self.mock_sla_scheduler = MagicMock()
+        self.mock_assignment_broker = MagicMock()
+        self.staff_presence = StaffPresence(
+            loader=lambda: [], writer=MagicMock(), clock=lambda: 1000.0
+        )
+
+        self.mock_service_request_repo.assign_service_requests.side_effect = (
+            lambda assignments: [
+                service_request.model_copy(
+                    update={
+                        "is_assigned": True,
+                        "assigned_to": employee_id,
+                        "change_id": ids.new_id(),
+                    }
+                )
+                for service_request, employee_id in assignments
+            ]
+        )
+
+        self.service = DispatchService(
+            service_request_repo=self.mock_service_request_repo,
+            employee_repo=self.mock_employee_repo,
+            manifest_service=self.mock_manifest_service,
+            housekeeping_service=self.mock_housekeeping_service,
+            sla_scheduler=self.mock_sla_scheduler,
+            assignment_broker=self.mock_assignment_broker,
+            staff_presence=self.staff_presence,
+        )
+
+    def test_dispatch_balances_by_open_tasks(self):
+        self.mock_service_request_repo.get_queued_service_requests.return_value = [
+            make_service_request(f"sr-{i}") for i in range(4)
+        ]
+        self.mock_employee_repo.get_employees.return_value = [
+            make_employee("emp-1"),
+            make_employee("emp-2"),
+        ]
+        # emp-2 has never been assigned anything, so has no load item yet
+        self.mock_service_request_repo.get_open_assignments.return_value = {"emp-1": 2}
+
+        assigned = self.service.dispatch(ServiceType.FOOD)
+
+        self.assertEqual(assigned, 4)
+        self.mock_employee_repo.get_employees.assert_called_once_with(
+            Role.KITCHEN_STAFF
+        )
+        self.mock_service_request_repo.get_open_assignments.assert_called_once_with()
+        self.mock_service_request_repo.count_open_assignments.assert_not_called()
+        assignments = [
+            (service_request.id, employee_id)
+            for service_request, employee_id in (
+                self.mock_service_request_repo.assign_service_requests.call_args.args[0]
+            )
+        ]
+        self.assertEqual(
+            assignments,
+            [
+                ("sr-0", "emp-2"),
+                ("sr-1", "emp-2"),
+                ("sr-2", "emp-1"),
+                ("sr-3", "emp-2"),
+            ],
+        )
+        self.mock_manifest_service.record_assignments.assert_called_once_with(
+            assignments
+        )
+        self.mock_sla_scheduler.assigned.assert_any_call("sr-3", "emp-2")
+        self.assertEqual(self.mock_assignment_broker.publish.call_count, 4)
+        employee_id, event, published = (
+            self.mock_assignment_broker.publish.call_args.args
+        )
+        self.assertEqual((employee_id, event), ("emp-2", "assigned"))
+        self.assertEqual(published.assigned_to, "emp-2")
+        self.assertTrue(published.is_assigned)
+        self.assertIsNotNone(published.change_id)
+
+    def test_dispatch_all_types(self):
+        self.mock_service_request_repo.get_queued_service_requests.return_value = []
+
+        self.assertEqual(self.service.dispatch(), 0)
+
+        self.assertEqual(
+            self.mock_service_request_repo.get_queued_service_requests.call_count,
+            len(ServiceType),
+        )
+        self.mock_manifest_service.record_assignments.assert_not_called()
+
+    def test_dispatch_without_available_staff(self):
+        self.mock_service_request_repo.get_queued_service_requests.return_value = [
+            make_service_request("sr-1", ServiceType.CLEANING)
+        ]
+        self.mock_employee_repo.get_employees.return_value = []
+
+        self.assertEqual(self.service.dispatch(ServiceType.CLEANING), 0)
+
+        self.mock_employee_repo.get_employees.assert_called_once_with(
+            Role.CLEANING_STAFF
+        )
+        self.mock_service_request_repo.assign_service_requests.assert_not_called()
+
+    def test_dispatch_uses_live_presence_over_stored_flag(self):
+        self.mock_service_request_repo.get_queued_service_requests.return_value = [
+            make_service_request("sr-1")
+        ]
+        away = make_employee("emp-1")
+        back = make_employee("emp-2").model_copy(update={"available": False})
+        self.mock_employee_repo.get_employees.return_value = [away, back]
+        self.mock_service_request_repo.get_open_assignments.return_value = {}
+        self.staff_presence.heartbeat("emp-1", Role.KITCHEN_STAFF, False)
+        self.staff_presence.heartbeat("emp-2", Role.KITCHEN_STAFF, True)
+
+        self.service.dispatch(ServiceType.FOOD)
+
+        assignments = (
+            self.mock_service_request_repo.assign_service_requests.call_args.args[0]
+        )
+        self.assertEqual(
+            [
+                (service_request.id, employee_id)
+                for service_request, employee_id in assignments
+            ],
+            [("sr-1", "emp-2")],
+        )
+
+    def test_dispatch_quietly_swallows_app_errors(self):
+        self.mock_service_request_repo.get_queued_service_requests.side_effect = (
+            AppException(
+                message="Failed to fetch queued service requests",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        )
+
+        self.service.dispatch_quietly(ServiceType.FOOD)
@@ -1,20 +1,39 @@
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
 from fastapi import status
 
 from app.services.employee_service import EmployeeService
 from app.app_exception.app_exception import AppException
-from app.models.users import Role
-from app.dtos.employee_requests import CreateEmployeeRequest, UpdateEmployeeRequest
+from app.models.service_request import ServiceRequest, ServiceStatus, ServiceType
+from app.models.users import Role, User
+from app.dtos.employee_requests import (
+    CreateEmployeeRequest,
+    HeartbeatRequest,
+    UpdateEmployeeRequest,
+)
 from app.dtos.employee_response import EmployeeResponseDTO
 
 
 class TestEmployeeService(unittest.TestCase):
     def setUp(self):
         self.mock_employee_repo = MagicMock()
-
-        self.service = EmployeeService(employee_repo=self.mock_employee_repo)
+        self.mock_service_request_repo = MagicMock()
+        self.mock_manifest_service = MagicMock()
+        self.mock_housekeeping_service = MagicMock()
+        self.mock_sla_scheduler = MagicMock()
+        self.mock_staff_presence = MagicMock()
+        self.mock_staff_presence.overlay.side_effect = lambda employees: employees
+
+        self.service = EmployeeService(
+            employee_repo=self.mock_employee_repo,
+            service_request_repo=self.mock_service_request_repo,
+            manifest_service=self.mock_manifest_service,
+            housekeeping_service=self.mock_housekeeping_service,
+            sla_scheduler=self.mock_sla_scheduler,
+            staff_presence=self.mock_staff_presence,
+        )
 
     @patch("app.services.employee_service.uuid.uuid4")
     @patch("app.services.employee_service.auth.hash_password")
@@ -100,6 +119,33 @@ class TestEmployeeService(unittest.TestCase):
 
         self.mock_employee_repo.get_employees.assert_called_once()
 
+    def test_get_employees_by_role_and_availability(self):
+        available = User(
+            id="1",
+            name="A",
+            email="a@test.com",
+            password="",
+            role=Role.CLEANING_STAFF,
+            available=True,
+        )
+        away = available.model_copy(update={"id": "2", "available": False})
+        self.mock_employee_repo.get_employees.return_value = [available, away]
+
+        result = self.service.get_employees(Role.CLEANING_STAFF, True)
+
+        self.assertEqual([e.id for e in result], ["1"])
+        self.mock_employee_repo.get_employees.assert_called_once_with(
+            Role.CLEANING_STAFF
+        )
+        self.mock_staff_presence.overlay.assert_called_once_with([available, away])
+
+    def test_get_employees_by_availability_reads_directory_once(self):
+        self.mock_employee_repo.get_employees.return_value = []
+
+        self.service.get_employees(available=True)
+
+        self.mock_employee_repo.get_employees.assert_called_once_with()
+
     def test_update_employee_availability(self):
         request = UpdateEmployeeRequest(available=False)
 
@@ -112,16 +158,69 @@ class TestEmployeeService(unittest.TestCase):
             employee_id="emp-123",
             available=False,
         )
+        self.mock_staff_presence.record.assert_called_once_with("emp-123", False)
+
+    def test_heartbeat_only_touches_presence(self):
+        self.service.heartbeat(
+            {"sub": "emp-123", "role": "CleaningStaff"},
+            HeartbeatRequest(available=True),
+        )
+
+        self.mock_staff_presence.heartbeat.assert_called_once_with(
+            "emp-123", Role.CLEANING_STAFF, True
+        )
+        self.mock_employee_repo.update_employee_availability.assert_not_called()
 
     def test_delete_employee(self):
         employee = MagicMock()
         employee.email = "emp@test.com"
 
         self.mock_employee_repo.get_employee_by_id.return_value = employee
+        self.mock_service_request_repo.assigned_pending_pages.return_value = iter([])
 
-        self.service.delete_employee("emp-123")
+        requeued_types = self.service.delete_employee("emp-123")
 
         self.mock_employee_repo.delete_employee.assert_called_once_with(
             employee_id="emp-123",
             email="emp@test.com",
         )
+        self.assertEqual(requeued_types, set())
+        self.mock_service_request_repo.unassign_service_requests.assert_not_called()
+
+    def test_delete_employee_requeues_pending_assignments(self):
+        employee = MagicMock()
+        employee.email = "emp@test.com"
+        self.mock_employee_repo.get_employee_by_id.return_value = employee
+
+        def make(request_id, service_type):
+            return ServiceRequest(
+                id=request_id,
+                user_id="user-1",
+                booking_id="booking-1",
+                room_num=101,
+                type=service_type,
+                status=ServiceStatus.PENDING,
+                is_assigned=False,
+                created_at=datetime(2026, 1, 10, 9),
+                details="Clean room",
+            )
+
+        first_page = [make("sr-1", ServiceType.CLEANING)]
+        second_page = [make("sr-2", ServiceType.FOOD)]
+        self.mock_service_request_repo.assigned_pending_pages.return_value = iter(
+            [first_page, second_page]
+        )
+        self.mock_service_request_repo.unassign_service_requests.side_effect = (
+            lambda page, employee_id: page
+        )
+
+        requeued_types = self.service.delete_employee("emp-123")
+
+        self.assertEqual(requeued_types, {ServiceType.CLEANING, ServiceType.FOOD})
+        self.mock_employee_repo.delete_employee.assert_called_once()
+        self.mock_service_request_repo.unassign_service_requests.assert_any_call(
+            second_page, "emp-123"
+        )
+        self.assertEqual(self.mock_sla_scheduler.track.call_count, 2)
+        recorded = self.mock_manifest_service.record_service_requests.call_args.args[0]
+        self.assertEqual([r.id for r in recorded], ["sr-1", "sr-2"])
@@ -17,7 +17,7 @@ class TestFeedbackService(unittest.TestCase):
             "user_name": "Shyam",
         }
 
-    @patch("app.services.feedback_service.uuid.uuid4")
+    @patch("app.services.feedback_service.ids.new_id")
     @patch("app.services.feedback_service.datetime")
     def test_save_feedback_success(self, mock_datetime, mock_uuid):
         fixed_time = datetime(2026, 1, 10, 10, 0, 0)
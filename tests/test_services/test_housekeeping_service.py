@@ -0,0 +1,212 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from app.dtos.booking_response import BookingMoveDTO
+from app.models.bookings import BookingStatus
+from app.models.service_request import ServiceStatus, ServiceType
+from app.services.housekeeping_service import HousekeepingService
+from app.utils.hotel_time import hotel_today
+from tests.factories import make_booking, make_room, make_service_request
+
+
+class TestHousekeepingService(unittest.TestCase):
+    def setUp(self):
+        self.mock_housekeeping_repo = MagicMock()
+        self.mock_room_repo = MagicMock()
+        self.mock_booking_repo = MagicMock()
+        self.mock_service_request_repo = MagicMock()
+
+        # the board's entries, kept the way the view repository writes them
+        self.entries = {"META": {"built_at": "2026-03-10T00:00:00+00:00"}}
+        self.mock_housekeeping_repo.get_entries.side_effect = lambda day: dict(
+            self.entries
+        )
+        self.mock_housekeeping_repo.save_entries.side_effect = self.save_entries
+        self.mock_housekeeping_repo.update_entries.side_effect = self.update_entries
+
+        self.service = HousekeepingService(
+            housekeeping_repo=self.mock_housekeeping_repo,
+            room_repo=self.mock_room_repo,
+            booking_repo=self.mock_booking_repo,
+            service_request_repo=self.mock_service_request_repo,
+        )
+
+        self.today = hotel_today()
+
+    def save_entries(self, day, entries):
+        for key, entry in entries.items():
+            if entry is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = entry
+
+    def update_entries(self, day, updates):
+        for key, fields in updates.items():
+            if key in self.entries:
+                self.entries[key] = {**self.entries[key], **fields}
+
+    def with_rooms(self, *numbers):
+        for number in numbers:
+            self.service.record_room(make_room(number))
+
+    def statuses(self):
+        board = self.service.get_board()
+        return {e["number"]: e["status"] for e in board["rooms"]}
+
+    def test_get_board_is_one_read(self):
+        self.with_rooms(101)
+
+        board = self.service.get_board()
+
+        self.assertEqual(board["date"], self.today.isoformat())
+        self.assertEqual(board["rooms"][0]["status"], "ready")
+        self.mock_room_repo.get_all_rooms.assert_not_called()
+        self.mock_housekeeping_repo.replace_entries.assert_not_called()
+
+    def test_get_board_builds_on_first_read(self):
+        self.mock_housekeeping_repo.get_entries.side_effect = None
+        self.mock_housekeeping_repo.get_entries.return_value = None
+        self.mock_housekeeping_repo.replace_entries.side_effect = lambda day, build: {
+            **build(),
+            "META": {"built_at": "t"},
+        }
+        self.mock_room_repo.get_all_rooms.return_value = [
+            make_room(104, is_available=False),
+            make_room(101),
+            make_room(102),
+            make_room(103),
+            make_room(105),
+        ]
+        self.mock_booking_repo.get_active_bookings.return_value = [
+            make_booking("b-1", 101, self.today, self.today + timedelta(days=2)),
+            make_booking("b-2", 102, self.today - timedelta(days=1), self.today),
+            make_booking("b-3", 103, self.today, self.today + timedelta(days=1)),
+        ]
+        self.mock_service_request_repo.query_service_requests_by_status_type.return_value = [
+            make_service_request(
+                "sr-1", ServiceType.CLEANING, room_num=103, booking_id="b-3"
+            ),
+            make_service_request("sr-2", ServiceType.CLEANING, "emp-1", room_num=105),
+        ]
+
+        board = self.service.get_board()
+
+        self.assertEqual(
+            self.mock_housekeeping_repo.replace_entries.call_args.args[0], self.today
+        )
+        self.assertEqual(
+            {e["number"]: e["status"] for e in board["rooms"]},
+            {
+                101: "occupied",
+                102: "ready",
+                103: "pending_cleaning",
+                104: "out_of_service",
+                105: "cleaning_in_progress",
+            },
+        )
+        self.assertEqual(
+            board["counts"],
+            {
+                "cleaning_in_progress": 1,
+                "pending_cleaning": 1,
+                "occupied": 1,
+                "out_of_service": 1,
+                "ready": 1,
+            },
+        )
+        self.mock_service_request_repo.query_service_requests_by_status_type.assert_called_once_with(
+            ServiceStatus.PENDING, ServiceType.CLEANING
+        )
+
+    def test_cleaning_moves_from_pending_to_in_progress_to_ready(self):
+        self.with_rooms(101)
+
+        self.service.record_service_request(
+            make_service_request("sr-1", ServiceType.CLEANING, room_num=101)
+        )
+        self.assertEqual(self.statuses(), {101: "pending_cleaning"})
+
+        self.service.record_assignments([("sr-1", "emp-1"), ("sr-food", "emp-2")])
+        self.assertEqual(self.statuses(), {101: "cleaning_in_progress"})
+        self.mock_housekeeping_repo.update_entries.assert_called_with(
+            self.today,
+            {
+                "Cleaning#sr-1": {"state": "in_progress"},
+                "Cleaning#sr-food": {"state": "in_progress"},
+            },
+        )
+
+        done = make_service_request(
+            "sr-1", ServiceType.CLEANING, room_num=101, status=ServiceStatus.DONE
+        )
+        self.service.record_service_requests([done])
+        self.assertEqual(self.statuses(), {101: "ready"})
+        self.assertNotIn("Cleaning#sr-1", self.entries)
+
+    def test_food_requests_do_not_touch_the_board(self):
+        food = make_service_request("sr-1", ServiceType.FOOD, room_num=101)
+
+        self.service.record_service_requests([food])
+
+        self.mock_housekeeping_repo.save_entries.assert_not_called()
+
+    def test_cancelled_booking_frees_room_and_drops_its_cleaning(self):
+        self.with_rooms(101)
+        booking = make_booking("b-1", 101, self.today, self.today + timedelta(days=1))
+        self.service.record_booking(booking)
+        self.service.record_service_request(
+            make_service_request(
+                "sr-1", ServiceType.CLEANING, room_num=101, booking_id="b-1"
+            )
+        )
+        self.assertEqual(self.statuses(), {101: "pending_cleaning"})
+
+        booking.status = BookingStatus.Booking_Status_Cancelled
+        self.service.record_booking(booking)
+
+        self.assertEqual(self.statuses(), {101: "ready"})
+
+    def test_room_move_carries_booking_and_cleaning(self):
+        self.with_rooms(101, 102)
+        self.service.record_booking(
+            make_booking("b-1", 101, self.today, self.today + timedelta(days=1))
+        )
+        self.service.record_service_request(
+            make_service_request(
+                "sr-1", ServiceType.CLEANING, room_num=101, booking_id="b-1"
+            )
+        )
+
+        self.service.record_booking_moves(
+            [
+                BookingMoveDTO(
+                    booking_id="b-1",
+                    user_id="user-1",
+                    check_in=self.today,
+                    check_out=self.today + timedelta(days=1),
+                    from_room=101,
+                    to_room=102,
+                    to_room_id="room-102",
+                )
+            ]
+        )
+
+        self.assertEqual(self.statuses(), {101: "ready", 102: "pending_cleaning"})
+        board = self.service.get_board()
+        self.assertEqual(board["rooms"][1]["bookings"], ["b-1"])
+
+    def test_room_changes_and_removal(self):
+        self.with_rooms(101, 102)
+        self.service.record_room_changes(101, {"is_available": False, "price": 10})
+        self.assertEqual(self.statuses(), {101: "out_of_service", 102: "ready"})
+        self.mock_housekeeping_repo.update_entries.assert_called_once_with(
+            self.today, {"Room#101": {"is_available": False}}
+        )
+
+        self.service.remove_room(102)
+        self.assertEqual(self.statuses(), {101: "out_of_service"})
+
+        self.mock_housekeeping_repo.update_entries.reset_mock()
+        self.service.record_room_changes(101, {"price": 20})
+        self.mock_housekeeping_repo.update_entries.assert_not_called()
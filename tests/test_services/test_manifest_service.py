@@ -0,0 +1,164 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+from app.models.bookings import BookingStatus
+from app.models.rooms import Room, RoomType
+from app.models.service_request import ServiceStatus
+from app.models.users import Role, User
+from app.services.manifest_service import ManifestService
+from app.utils.hotel_time import hotel_today
+from tests.factories import make_booking, make_service_request
+
+
+class TestManifestService(unittest.TestCase):
+    def setUp(self):
+        self.mock_manifest_repo = MagicMock()
+        self.mock_booking_repo = MagicMock()
+        self.mock_service_request_repo = MagicMock()
+        self.mock_employee_repo = MagicMock()
+        self.mock_index = MagicMock()
+        self.mock_index.free_rooms.return_value = [
+            Room(
+                id="room-102",
+                number=102,
+                type=RoomType.RoomTypeDeluxe,
+                price=4500,
+                is_available=True,
+                description="Room",
+            )
+        ]
+
+        self.service = ManifestService(
+            manifest_repo=self.mock_manifest_repo,
+            booking_repo=self.mock_booking_repo,
+            service_request_repo=self.mock_service_request_repo,
+            employee_repo=self.mock_employee_repo,
+            availability_index=self.mock_index,
+        )
+
+        self.today = hotel_today()
+
+    def stored(self, entries):
+        self.mock_manifest_repo.get_entries.return_value = {
+            "META": {"built_at": "2026-03-10T00:10:00+00:00"},
+            **entries,
+        }
+
+    def saved(self):
+        return self.mock_manifest_repo.save_entries.call_args.args
+
+    def test_get_manifest_renders_stored_entries(self):
+        self.stored(
+            {
+                "Arrival#b-2": {"id": "b-2", "room_num": 104},
+                "Arrival#b-1": {"id": "b-1", "room_num": 103},
+                "Pending#sr-2": {"id": "sr-2", "created_at": "2026-03-10T10:00:00"},
+                "Pending#sr-1": {"id": "sr-1", "created_at": "2026-03-10T09:00:00"},
+                "AvailableRooms": {"rooms": {"Deluxe": [102]}},
+            }
+        )
+
+        manifest = self.service.get_manifest(date(2026, 3, 10))
+
+        self.assertEqual(manifest["date"], "2026-03-10")
+        self.assertEqual([b["id"] for b in manifest["arrivals"]], ["b-1", "b-2"])
+        self.assertEqual(manifest["departures"], [])
+        self.assertEqual(
+            [r["id"] for r in manifest["pending_service_requests"]], ["sr-1", "sr-2"]
+        )
+        self.assertEqual(manifest["available_rooms"], {"Deluxe": [102]})
+        self.assertEqual(manifest["staff_on_shift"], [])
+        self.assertEqual(manifest["built_at"], "2026-03-10T00:10:00+00:00")
+        self.mock_booking_repo.get_arrivals.assert_not_called()
+
+    def test_get_manifest_builds_missing_day(self):
+        self.mock_manifest_repo.get_entries.return_value = None
+        self.mock_manifest_repo.replace_entries.side_effect = lambda day, build: {
+            **build(),
+            "META": {"built_at": "t"},
+        }
+        self.mock_booking_repo.get_arrivals.return_value = [
+            make_booking("b-2", 104, self.today, self.today + timedelta(days=2)),
+            make_booking("b-1", 103, self.today, self.today + timedelta(days=1)),
+        ]
+        self.mock_booking_repo.get_departures.return_value = []
+        self.mock_service_request_repo.get_all_pending_service_requests.return_value = [
+            make_service_request("sr-1")
+        ]
+        self.mock_employee_repo.get_employees.side_effect = [
+            [
+                User(
+                    id="emp-1",
+                    name="Asha",
+                    email="asha@example.com",
+                    password="x",
+                    role=Role.KITCHEN_STAFF,
+                    available=True,
+                )
+            ],
+            [],
+        ]
+
+        manifest = self.service.get_manifest(self.today)
+
+        self.assertEqual(
+            self.mock_manifest_repo.replace_entries.call_args.args[0], self.today
+        )
+        self.assertEqual([b["id"] for b in manifest["arrivals"]], ["b-1", "b-2"])
+        self.assertEqual(manifest["pending_service_requests"][0]["id"], "sr-1")
+        self.assertEqual(manifest["available_rooms"], {"Deluxe": [102]})
+        self.assertEqual(manifest["staff_on_shift"][0]["role"], "KitchenStaff")
+
+    def test_record_booking_adds_todays_arrival(self):
+        self.service.record_booking(
+            make_booking("b-1", 101, self.today, self.today + timedelta(days=1))
+        )
+
+        day, entries = self.saved()
+        self.assertEqual(day, self.today)
+        self.assertEqual(entries["Arrival#b-1"]["room_num"], 101)
+        self.assertIsNone(entries["Departure#b-1"])
+        self.assertEqual(entries["AvailableRooms"], {"rooms": {"Deluxe": [102]}})
+
+    def test_record_cancelled_booking_drops_it(self):
+        booking = make_booking("b-1", 101, self.today, self.today + timedelta(days=1))
+        booking.status = BookingStatus.Booking_Status_Cancelled
+
+        self.service.record_booking(booking)
+
+        entries = self.saved()[1]
+        self.assertIsNone(entries["Arrival#b-1"])
+        self.assertIsNone(entries["Departure#b-1"])
+
+    def test_record_future_booking_skips_manifest(self):
+        self.service.record_booking(
+            make_booking(
+                "b-1",
+                101,
+                self.today + timedelta(days=3),
+                self.today + timedelta(days=4),
+            )
+        )
+
+        self.mock_manifest_repo.save_entries.assert_not_called()
+
+    def test_record_service_requests(self):
+        self.service.record_service_requests(
+            [
+                make_service_request("sr-1", status=ServiceStatus.DONE),
+                make_service_request("sr-2"),
+            ]
+        )
+
+        entries = self.saved()[1]
+        self.assertIsNone(entries["Pending#sr-1"])
+        self.assertEqual(entries["Pending#sr-2"]["id"], "sr-2")
+
+    def test_record_assignment_updates_the_pending_entry(self):
+        self.service.record_assignment("sr-1", "emp-1")
+
+        self.mock_manifest_repo.update_entries.assert_called_once_with(
+            self.today,
+            {"Pending#sr-1": {"is_assigned": True, "assigned_to": "emp-1"}},
+        )
@@ -1,4 +1,5 @@
 import unittest
+from datetime import date, timedelta
 from unittest.mock import MagicMock, patch
 
 from fastapi import status
@@ -6,13 +7,22 @@ from fastapi import status
 from app.models import rooms
 from app.services.room_service import RoomService
 from app.app_exception.app_exception import AppException
-from app.dtos.room_requests import AddRoomRequest, UpdateRoomRequest
+from app.dtos.room_requests import AddRoomRequest, HoldRoomRequest, UpdateRoomRequest
 
 
 class TestRoomService(unittest.TestCase):
     def setUp(self):
         self.mock_room_repo = MagicMock()
-        self.service = RoomService(room_repo=self.mock_room_repo)
+        self.mock_index = MagicMock()
+        self.mock_index.has_bookings_from.return_value = False
+        self.mock_booking_repo = MagicMock()
+        self.mock_housekeeping_service = MagicMock()
+        self.service = RoomService(
+            room_repo=self.mock_room_repo,
+            availability_index=self.mock_index,
+            booking_repo=self.mock_booking_repo,
+            housekeeping_service=self.mock_housekeeping_service,
+        )
 
     def test_get_all_rooms(self):
         rooms = [MagicMock(), MagicMock()]
@@ -32,6 +42,33 @@ class TestRoomService(unittest.TestCase):
         self.assertEqual(result, rooms)
         self.mock_room_repo.get_available_rooms.assert_called_once()
 
+    def test_search_rooms_by_type(self):
+        self.mock_room_repo.search_rooms.return_value = [MagicMock()]
+
+        result = self.service.search_rooms(
+            rooms.RoomType.RoomTypeDeluxe, max_price=5000, available_only=True
+        )
+
+        self.assertEqual(len(result), 1)
+        self.mock_room_repo.search_rooms.assert_called_once_with(
+            rooms.RoomType.RoomTypeDeluxe, None, 5000, True
+        )
+
+    def test_search_rooms_all_types(self):
+        self.mock_room_repo.search_rooms.return_value = []
+
+        self.service.search_rooms(min_price=1000)
+
+        self.assertEqual(
+            self.mock_room_repo.search_rooms.call_count, len(rooms.RoomType)
+        )
+
+    def test_search_rooms_invalid_price_range(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.search_rooms(min_price=5000, max_price=1000)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+
     @patch("app.services.room_service.uuid.uuid4")
     def test_add_room_success(self, mock_uuid):
         mock_uuid.return_value = "room-uuid"
@@ -51,6 +88,7 @@ class TestRoomService(unittest.TestCase):
         self.assertTrue(room.is_available)
 
         self.mock_room_repo.add_room.assert_called_once_with(room)
+        self.mock_index.add_room.assert_called_once_with(room)
 
     def test_delete_room_success(self):
         room = MagicMock()
@@ -61,12 +99,10 @@ class TestRoomService(unittest.TestCase):
         self.service.delete_room(101)
 
         self.mock_room_repo.delete_room.assert_called_once_with(101)
+        self.mock_index.remove_room.assert_called_once_with(101)
 
     def test_delete_room_room_not_available(self):
-        room = MagicMock()
-        room.is_available = False
-
-        self.mock_room_repo.get_room_by_number.return_value = room
+        self.mock_index.has_bookings_from.return_value = True
 
         with self.assertRaises(AppException) as ctx:
             self.service.delete_room(101)
@@ -76,6 +112,85 @@ class TestRoomService(unittest.TestCase):
 
         self.mock_room_repo.delete_room.assert_not_called()
 
+    def test_get_free_rooms(self):
+        free = [MagicMock()]
+        self.mock_index.free_rooms.return_value = free
+        check_in = date.today()
+        check_out = check_in + timedelta(days=2)
+
+        result = self.service.get_free_rooms(
+            check_in, check_out, rooms.RoomType.RoomTypeDeluxe
+        )
+
+        self.assertEqual(result, free)
+        self.mock_index.free_rooms.assert_called_once_with(
+            check_in, check_out, rooms.RoomType.RoomTypeDeluxe, None
+        )
+
+    def test_get_free_rooms_invalid_range(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.get_free_rooms(date.today(), date.today())
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.mock_index.free_rooms.assert_not_called()
+
+    def test_get_free_rooms_stay_too_long(self):
+        with self.assertRaises(AppException):
+            self.service.get_free_rooms(date.today(), date.today() + timedelta(days=31))
+
+    @patch("app.services.room_service.build_calendar")
+    def test_get_calendar_drops_bookings_after_range(self, mock_build):
+        start = date(2026, 3, 1)
+        end = date(2026, 6, 1)
+        inside = MagicMock(check_in=date(2026, 5, 31))
+        after = MagicMock(check_in=date(2026, 6, 1))
+        self.mock_booking_repo.get_active_bookings.return_value = [inside, after]
+
+        self.service.get_calendar(start, end)
+
+        self.mock_booking_repo.get_active_bookings.assert_called_once_with(start)
+        self.assertEqual(mock_build.call_args.args[1], [inside])
+
+    def test_get_calendar_invalid_range(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.get_calendar(date(2026, 3, 1), date(2027, 3, 10))
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.mock_booking_repo.get_active_bookings.assert_not_called()
+
+    def hold_request(self):
+        return HoldRoomRequest(
+            check_in_date=date.today(),
+            check_out_date=date.today() + timedelta(days=2),
+            minutes=5,
+        )
+
+    def test_hold_room_success(self):
+        room = MagicMock()
+        room.is_available = True
+        self.mock_room_repo.get_room_by_number.return_value = room
+        self.mock_index.is_free.return_value = True
+
+        hold = self.service.hold_room(101, self.hold_request(), {"sub": "user-1"})
+
+        self.assertEqual(hold.held_by, "user-1")
+        args = self.mock_booking_repo.hold_nights.call_args.args
+        self.assertEqual(args[:4], (101, hold.check_in, hold.check_out, "user-1"))
+        self.assertEqual(int(hold.expires_at.timestamp()), args[4])
+        self.mock_index.add_hold.assert_called_once()
+
+    def test_hold_room_already_taken(self):
+        room = MagicMock()
+        room.is_available = True
+        self.mock_room_repo.get_room_by_number.return_value = room
+        self.mock_index.is_free.return_value = False
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.hold_room(101, self.hold_request(), {"sub": "user-1"})
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_409_CONFLICT)
+        self.mock_booking_repo.hold_nights.assert_not_called()
+
     def test_update_room_no_fields_provided(self):
         request = UpdateRoomRequest()
 
@@ -103,6 +218,13 @@ class TestRoomService(unittest.TestCase):
             },
         )
 
+    def test_update_room_type(self):
+        request = UpdateRoomRequest(type=rooms.RoomType.RoomTypeSuite)
+
+        self.service.update_room(101, request)
+
+        self.mock_room_repo.update_room.assert_called_once_with(101, {"type": "Suite"})
+
     def test_update_room_update_fields_empty_after_processing(self):
         request = UpdateRoomRequest(
             type=None,
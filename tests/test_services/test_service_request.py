@@ -1,12 +1,19 @@
 import unittest
 from unittest.mock import MagicMock, patch
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from fastapi import status
 
-from app.services.service_request_service import ServiceRequestService
+from app.services.service_request_service import (
+    CLAIM_ATTEMPTS,
+    CLAIM_WINDOW,
+    ServiceRequestService,
+)
 from app.app_exception.app_exception import AppException
 from app.models.service_request import ServiceStatus, ServiceType, ServiceRequest
+from app.utils import ids
 from app.dtos.service_request import (
+    BulkAssignServiceRequests,
+    BulkUpdateServiceRequestStatus,
     CreateServiceRequest,
     UpdateServiceRequestStatus,
     assign_service_request_dto,
@@ -19,16 +26,24 @@ class TestServiceRequestService(unittest.TestCase):
         self.mock_service_repo = MagicMock()
         self.mock_booking_repo = MagicMock()
         self.mock_user_repo = MagicMock()
+        self.mock_manifest_service = MagicMock()
+        self.mock_housekeeping_service = MagicMock()
+        self.mock_sla_scheduler = MagicMock()
+        self.mock_assignment_broker = MagicMock()
 
         self.service = ServiceRequestService(
             service_request_repo=self.mock_service_repo,
             booking_repo=self.mock_booking_repo,
             user_repo=self.mock_user_repo,
+            manifest_service=self.mock_manifest_service,
+            housekeeping_service=self.mock_housekeeping_service,
+            sla_scheduler=self.mock_sla_scheduler,
+            assignment_broker=self.mock_assignment_broker,
         )
 
         self.current_user = {"sub": "user-123"}
 
-    @patch("app.services.service_request_service.uuid.uuid4")
+    @patch("app.services.service_request_service.ids.new_id")
     def test_create_service_request_internal(self, mock_uuid):
         mock_uuid.return_value = "sr-uuid"
         now = datetime(2026, 1, 10)
@@ -128,6 +143,62 @@ class TestServiceRequestService(unittest.TestCase):
         self.mock_service_repo.assign_service_request.assert_called_once_with(
             "sr-1", "emp-123"
         )
+        self.mock_assignment_broker.publish.assert_called_once_with(
+            "emp-123",
+            "assigned",
+            self.mock_service_repo.assign_service_request.return_value,
+        )
+
+    def test_assign_service_requests_reports_each_pair(self):
+        self.mock_user_repo.get_users_by_ids.return_value = {
+            "emp-1": MagicMock(),
+            "emp-2": MagicMock(),
+        }
+
+        def assign(service_request_id, employee_id):
+            if service_request_id == "sr-2":
+                raise AppException(
+                    message="Service request already assigned or state changed",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+            return MagicMock(id=service_request_id)
+
+        self.mock_service_repo.assign_service_request.side_effect = assign
+
+        result = self.service.assign_service_requests(
+            BulkAssignServiceRequests(
+                assignments=[
+                    {"service_request_id": "sr-1", "employee_id": "emp-1"},
+                    {"service_request_id": "sr-2", "employee_id": "emp-2"},
+                    {"service_request_id": "sr-3", "employee_id": "emp-9"},
+                    {"service_request_id": "sr-1", "employee_id": "emp-2"},
+                    {"service_request_id": "sr-4", "employee_id": "emp-2"},
+                ]
+            )
+        )
+
+        self.mock_user_repo.get_users_by_ids.assert_called_once_with(
+            ["emp-1", "emp-2", "emp-9"]
+        )
+        self.mock_user_repo.get_user_by_id.assert_not_called()
+        self.assertEqual(
+            [(a.service_request_id, a.employee_id) for a in result.assigned],
+            [("sr-1", "emp-1"), ("sr-4", "emp-2")],
+        )
+        self.assertEqual(
+            [(f.service_request_id, f.message) for f in result.failed],
+            [
+                ("sr-2", "Service request already assigned or state changed"),
+                ("sr-3", "Employee not found"),
+                ("sr-1", "Service request listed more than once"),
+            ],
+        )
+        self.assertEqual(self.mock_service_repo.assign_service_request.call_count, 3)
+        self.mock_manifest_service.record_assignments.assert_called_once_with(
+            [("sr-1", "emp-1"), ("sr-4", "emp-2")]
+        )
+        self.assertEqual(self.mock_sla_scheduler.assigned.call_count, 2)
+        self.assertEqual(self.mock_assignment_broker.publish.call_count, 2)
 
     def test_get_assigned_service_requests(self):
         sr = MagicMock()
@@ -178,7 +249,289 @@ class TestServiceRequestService(unittest.TestCase):
         self.service.update_service_request("sr-1", request)
 
         self.mock_service_repo.update_service_request.assert_called_once_with(
-            "sr-1", ServiceStatus.DONE
+            req, ServiceStatus.DONE, 0
         )
         self.mock_booking_repo.update_booking.assert_called_once_with(booking)
+        self.mock_manifest_service.record_service_request.assert_called_once_with(req)
+        self.mock_sla_scheduler.track.assert_called_once_with(req)
+        self.mock_assignment_broker.publish.assert_called_once_with(
+            req.assigned_to, "status", req
+        )
+
+    def test_update_service_requests_reports_each_failure(self):
+        def make(request_id, service_status=ServiceStatus.PENDING):
+            return ServiceRequest(
+                id=request_id,
+                user_id="user-1",
+                booking_id="booking-1",
+                room_num=101,
+                type=ServiceType.CLEANING,
+                status=service_status,
+                is_assigned=True,
+                assigned_to="emp-1",
+                created_at=datetime(2026, 1, 10, 9),
+                details="Clean room",
+            )
+
+        self.mock_service_repo.get_service_requests_by_ids.return_value = [
+            make("sr-1"),
+            make("sr-2"),
+            make("sr-3", ServiceStatus.DONE),
+        ]
+        self.mock_service_repo.update_service_requests_status.return_value = {
+            "sr-2": "Service request not found or not pending"
+        }
+
+        result = self.service.update_service_requests(
+            BulkUpdateServiceRequestStatus(
+                service_request_ids=["sr-1", "sr-2", "sr-3", "sr-4", "sr-1"],
+                status=ServiceStatus.DONE,
+                charges={"sr-1": 350},
+            )
+        )
+
+        self.assertEqual(result.updated, ["sr-1"])
+        self.assertEqual(
+            [(f.service_request_id, f.message) for f in result.failed],
+            [
+                ("sr-2", "Service request not found or not pending"),
+                ("sr-3", "Service request not pending"),
+                ("sr-4", "Service request not found"),
+            ],
+        )
+        self.mock_service_repo.get_service_requests_by_ids.assert_called_once_with(
+            ["sr-1", "sr-2", "sr-3", "sr-4"]
+        )
+        pending = self.mock_service_repo.update_service_requests_status.call_args.args[
+            0
+        ]
+        self.assertEqual([req.id for req in pending], ["sr-1", "sr-2"])
+        self.assertEqual(
+            self.mock_service_repo.update_service_requests_status.call_args.args[2],
+            {"sr-1": 350},
+        )
+        recorded = self.mock_manifest_service.record_service_requests.call_args.args[0]
+        self.assertEqual([req.status for req in recorded], [ServiceStatus.DONE])
+        self.mock_sla_scheduler.track.assert_called_once()
+        self.mock_assignment_broker.publish.assert_called_once()
+        self.mock_booking_repo.update_booking.assert_not_called()
+
+    def test_update_service_requests_invalid_status(self):
+        request = BulkUpdateServiceRequestStatus(
+            service_request_ids=["sr-1"], status=ServiceStatus.PENDING
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.update_service_requests(request)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+        self.mock_service_repo.get_service_requests_by_ids.assert_not_called()
+
+    def test_search_service_requests_all_types(self):
+        older = MagicMock(created_at=datetime(2026, 1, 10, 9))
+        newer = MagicMock(created_at=datetime(2026, 1, 10, 10))
+        self.mock_service_repo.query_service_requests_by_status_type.side_effect = [
+            [newer],
+            [older],
+        ]
+
+        result = self.service.search_service_requests(ServiceStatus.DONE)
+
+        self.assertEqual(result, [older, newer])
+        self.assertEqual(
+            self.mock_service_repo.query_service_requests_by_status_type.call_count,
+            len(ServiceType),
+        )
+
+    def test_search_service_requests_invalid_range(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.search_service_requests(
+                ServiceStatus.PENDING,
+                ServiceType.FOOD,
+                created_from=datetime(2026, 1, 11),
+                created_to=datetime(2026, 1, 10),
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_service_requests_mixed_bounds(self):
+        self.mock_service_repo.query_service_requests_by_status_type.return_value = []
+        aware = datetime(2026, 1, 10, 10, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+
+        self.service.search_service_requests(
+            ServiceStatus.DONE,
+            ServiceType.FOOD,
+            created_from=datetime(2026, 1, 10, 1),
+            created_to=aware,
+        )
+
+        # the aware bound is queried as naive server-local time
+        args = self.mock_service_repo.query_service_requests_by_status_type.call_args.args
+        self.assertIsNone(args[3].tzinfo)
+        self.assertEqual(args[3], aware.astimezone().replace(tzinfo=None))
+
+    def test_get_service_queue_for_kitchen_staff(self):
+        self.mock_service_repo.query_service_requests_by_status_type.return_value = []
+
+        self.service.get_service_queue({"sub": "emp-1", "role": "KitchenStaff"})
+
+        self.mock_service_repo.query_service_requests_by_status_type.assert_called_once_with(
+            ServiceStatus.PENDING, ServiceType.FOOD
+        )
+
+    def test_get_service_queue_invalid_role(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.get_service_queue({"sub": "user-1", "role": "Guest"})
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_403_FORBIDDEN)
+
+    def _queued(self, request_id):
+        return ServiceRequest(
+            id=request_id,
+            user_id="user-123",
+            booking_id="booking-1",
+            room_num=101,
+            type=ServiceType.CLEANING,
+            status=ServiceStatus.PENDING,
+            is_assigned=False,
+            created_at=datetime(2026, 1, 10),
+            details="Towels",
+        )
+
+    def _claimed(self, service_request_id):
+        return self._queued(service_request_id).model_copy(
+            update={
+                "is_assigned": True,
+                "assigned_to": "emp-1",
+                "change_id": "0190a1b2-0000-7000-8000-000000000001",
+            }
+        )
+
+    def test_claim_service_request_takes_oldest(self):
+        self.mock_service_repo.get_queued_service_requests.return_value = [
+            self._queued("sr-1"),
+            self._queued("sr-2"),
+        ]
+        stored = self._claimed("sr-1")
+        self.mock_service_repo.assign_service_request.return_value = stored
+
+        claimed = self.service.claim_service_request(
+            {"sub": "emp-1", "role": "CleaningStaff"}
+        )
+
+        # the stored row, not the pre-claim candidate, is returned and published
+        self.assertIs(claimed, stored)
+        self.assertEqual(claimed.assigned_to, "emp-1")
+        self.mock_service_repo.get_queued_service_requests.assert_called_once_with(
+            ServiceType.CLEANING, CLAIM_WINDOW
+        )
+        self.mock_service_repo.assign_service_request.assert_called_once_with(
+            "sr-1", "emp-1"
+        )
+        self.mock_manifest_service.record_assignment.assert_called_once_with(
+            "sr-1", "emp-1"
+        )
+        self.mock_sla_scheduler.assigned.assert_called_once_with("sr-1", "emp-1")
+        self.mock_assignment_broker.publish.assert_called_once_with(
+            "emp-1", "assigned", claimed
+        )
+
+    def test_claim_service_request_skips_taken_candidates(self):
+        self.mock_service_repo.get_queued_service_requests.return_value = [
+            self._queued("sr-1"),
+            self._queued("sr-2"),
+        ]
+        self.mock_service_repo.assign_service_request.side_effect = [
+            AppException(
+                message="Service request already assigned or state changed",
+                status_code=status.HTTP_409_CONFLICT,
+            ),
+            self._claimed("sr-2"),
+        ]
+
+        claimed = self.service.claim_service_request(
+            {"sub": "emp-1", "role": "CleaningStaff"}
+        )
+
+        self.assertEqual(claimed.id, "sr-2")
+
+    def test_claim_service_request_rereads_window_then_gives_up(self):
+        self.mock_service_repo.get_queued_service_requests.return_value = [
+            self._queued("sr-1")
+        ]
+        self.mock_service_repo.assign_service_request.side_effect = AppException(
+            message="Service request already assigned or state changed",
+            status_code=status.HTTP_409_CONFLICT,
+        )
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.claim_service_request(
+                {"sub": "emp-1", "role": "CleaningStaff"}
+            )
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.mock_service_repo.get_queued_service_requests.call_count,
+            CLAIM_ATTEMPTS,
+        )
+
+    def test_claim_service_request_invalid_role(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.claim_service_request({"sub": "user-1", "role": "Guest"})
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_get_changes_returns_last_change_as_cursor(self):
+        since = ids.new_id()
+        change = ServiceRequest(
+            id="sr-1",
+            user_id="user-123",
+            booking_id="booking-1",
+            room_num=101,
+            type=ServiceType.FOOD,
+            status=ServiceStatus.PENDING,
+            is_assigned=False,
+            created_at=datetime(2026, 1, 10),
+            details="Tea",
+            change_id="later-change",
+        )
+        self.mock_service_repo.get_changes_since.return_value = [change]
+
+        result = self.service.get_changes(since)
+
+        self.assertEqual(result.cursor, "later-change")
+        self.mock_service_repo.get_changes_since.assert_called_once_with(since)
+
+    def test_get_changes_without_cursor_starts_today(self):
+        self.mock_service_repo.get_changes_since.return_value = []
+
+        result = self.service.get_changes(None)
+
+        self.assertEqual(
+            ids.id_timestamp(result.cursor).date(), datetime.now(timezone.utc).date()
+        )
+
+    def test_get_changes_invalid_cursor(self):
+        with self.assertRaises(AppException) as ctx:
+            self.service.get_changes("not-a-cursor")
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_changes_expired_cursor(self):
+        since = ids.min_id_at(datetime.now(timezone.utc) - timedelta(days=30))
+
+        with self.assertRaises(AppException) as ctx:
+            self.service.get_changes(since)
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_410_GONE)
+
+    def test_get_assigned_changes(self):
+        since = ids.new_id()
+        self.mock_service_repo.get_assigned_changes_since.return_value = []
+
+        result = self.service.get_assigned_changes({"sub": "emp-1"}, since)
+
+        self.assertEqual(result.cursor, since)
+        self.mock_service_repo.get_assigned_changes_since.assert_called_once_with(
+            "emp-1", since
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import unittest
+
+from app.streaming.assignment_broker import AssignmentBroker
+from app.utils import ids
+from tests.factories import make_service_request
+
+
+class TestAssignmentBroker(unittest.TestCase):
+    def setUp(self):
+        self.broker = AssignmentBroker(capacity=3)
+
+    def test_publish_from_worker_thread_reaches_subscriber(self):
+        async def scenario():
+            subscription, replay = self.broker.subscribe("emp-1", None)
+            worker = threading.Thread(
+                target=self.broker.publish,
+                args=(
+                    "emp-1",
+                    "assigned",
+                    make_service_request("sr-1", assigned_to="emp-1"),
+                ),
+            )
+            worker.start()
+            events = await subscription.next_events(timeout=2)
+            worker.join()
+            self.broker.unsubscribe(subscription)
+            return replay, events
+
+        replay, events = asyncio.run(scenario())
+
+        self.assertEqual(replay, [])
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].event, "assigned")
+        self.assertIn('"id":"sr-1"', events[0].data)
+        self.assertEqual(self.broker.subscriber_count(), 0)
+
+    def test_other_employees_events_are_not_delivered(self):
+        async def scenario():
+            subscription, _ = self.broker.subscribe("emp-1", None)
+            self.broker.publish(
+                "emp-2", "assigned", make_service_request("sr-1", assigned_to="emp-1")
+            )
+            return await subscription.next_events(timeout=0.05)
+
+        self.assertEqual(asyncio.run(scenario()), [])
+
+    def test_resume_replays_newer_events_of_the_employee(self):
+        first = self.broker.publish(
+            "emp-1", "assigned", make_service_request("sr-1", assigned_to="emp-1")
+        )
+        self.broker.publish(
+            "emp-2", "assigned", make_service_request("sr-2", assigned_to="emp-1")
+        )
+        third = self.broker.publish(
+            "emp-1", "status", make_service_request("sr-1", assigned_to="emp-1")
+        )
+
+        async def scenario():
+            return self.broker.subscribe("emp-1", first.id)[1]
+
+        self.assertEqual(asyncio.run(scenario()), [third])
+
+    def test_event_id_is_the_change_id(self):
+        service_request = make_service_request("sr-1", assigned_to="emp-1")
+
+        event = self.broker.publish("emp-1", "assigned", service_request)
+
+        self.assertEqual(event.id, service_request.change_id)
+
+    def test_resume_from_an_id_not_in_the_buffer_needs_a_reload(self):
+        self.broker.publish(
+            "emp-1", "assigned", make_service_request("sr-1", assigned_to="emp-1")
+        )
+
+        async def scenario():
+            # newer than the buffer, e.g. issued by another instance
+            return self.broker.subscribe("emp-1", ids.new_id())[1]
+
+        self.assertIsNone(asyncio.run(scenario()))
+
+    def test_resume_from_before_the_buffer_needs_a_reload(self):
+        first = self.broker.publish(
+            "emp-1", "assigned", make_service_request("sr-1", assigned_to="emp-1")
+        )
+        for i in range(3):
+            self.broker.publish(
+                "emp-1", "status", make_service_request(f"sr-{i}", assigned_to="emp-1")
+            )
+
+        async def scenario():
+            return self.broker.subscribe("emp-1", first.id)[1]
+
+        self.assertIsNone(asyncio.run(scenario()))
+
+    def test_encode_is_a_server_sent_event(self):
+        event = self.broker.publish(
+            "emp-1", "assigned", make_service_request("sr-1", assigned_to="emp-1")
+        )
+
+        encoded = event.encode()
+
+        self.assertTrue(encoded.startswith(f"id: {event.id}\nevent: assigned\ndata: "))
+        self.assertTrue(encoded.endswith("\n\n"))
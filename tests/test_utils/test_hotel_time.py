@@ -0,0 +1,25 @@
+import os
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.utils.hotel_time import hotel_today
+
+
+class TestHotelTime(unittest.TestCase):
+    @patch.dict(os.environ, {"hotel_timezone": "Asia/Kolkata"})
+    @patch("app.utils.hotel_time.datetime")
+    def test_hotel_today_uses_the_hotel_timezone(self, mock_datetime):
+        # 20:00 UTC is already the next day in Kolkata
+        utc = datetime(2026, 3, 10, 20, tzinfo=timezone.utc)
+        mock_datetime.now.side_effect = lambda tz: utc.astimezone(tz)
+
+        self.assertEqual(hotel_today().isoformat(), "2026-03-11")
+
+    @patch.dict(os.environ, {"hotel_timezone": "UTC"})
+    @patch("app.utils.hotel_time.datetime")
+    def test_hotel_today_reads_the_configured_timezone(self, mock_datetime):
+        utc = datetime(2026, 3, 10, 20, tzinfo=timezone.utc)
+        mock_datetime.now.side_effect = lambda tz: utc.astimezone(tz)
+
+        self.assertEqual(hotel_today().isoformat(), "2026-03-10")
@@ -0,0 +1,28 @@
+import unittest
+import uuid
+from datetime import datetime, timezone
+
+from app.utils import ids
+
+
+class TestIds(unittest.TestCase):
+    def test_new_id_is_uuid7_and_time_ordered(self):
+        generated = [ids.new_id() for _ in range(5000)]
+
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+        self.assertEqual(uuid.UUID(generated[0]).version, 7)
+
+    def test_min_id_at_sorts_before_ids_of_that_moment(self):
+        before = ids.min_id_at(datetime.now(timezone.utc))
+        generated = ids.new_id()
+
+        self.assertLessEqual(before, generated)
+        self.assertEqual(
+            ids.id_timestamp(before).replace(microsecond=0),
+            ids.id_timestamp(generated).replace(microsecond=0),
+        )
+
+    def test_id_timestamp_rejects_random_uuid(self):
+        with self.assertRaises(ValueError):
+            ids.id_timestamp(str(uuid.uuid4()))
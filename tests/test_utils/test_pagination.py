@@ -0,0 +1,24 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.utils.pagination import query_all
+
+
+class TestQueryAll(unittest.TestCase):
+    def test_follows_last_evaluated_key(self):
+        table = MagicMock()
+        table.query.side_effect = [
+            {"Items": [{"id": 1}], "LastEvaluatedKey": {"pk": "a"}},
+            {"Items": [{"id": 2}], "LastEvaluatedKey": {"pk": "b"}},
+            {"Items": []},
+        ]
+
+        items = query_all(table, IndexName="Index", Limit=1)
+
+        self.assertEqual(items, [{"id": 1}, {"id": 2}])
+        calls = table.query.call_args_list
+        self.assertEqual(calls[0].kwargs, {"IndexName": "Index", "Limit": 1})
+        self.assertEqual(
+            calls[2].kwargs,
+            {"IndexName": "Index", "Limit": 1, "ExclusiveStartKey": {"pk": "b"}},
+        )
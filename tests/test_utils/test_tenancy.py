@@ -0,0 +1,65 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi import HTTPException, status
+
+from app.dependencies import get_hotel_id
+from app.utils.tenancy import (
+    configured_hotel_ids,
+    default_hotel_id,
+    hotel_key,
+    is_known_hotel_id,
+)
+
+
+class TestTenancy(unittest.TestCase):
+    def test_hotel_key_prefixes_key(self):
+        self.assertEqual(hotel_key("h1", "Booking#b-1"), "Hotel#h1#Booking#b-1")
+
+    @patch.dict(os.environ, {"hotel_ids": " h1, h2 ,"})
+    def test_configured_hotel_ids(self):
+        self.assertEqual(configured_hotel_ids(), ["h1", "h2"])
+
+    @patch.dict(os.environ, {"hotel_ids": "", "default_hotel_id": "h9"})
+    def test_configured_hotel_ids_falls_back_to_default(self):
+        self.assertEqual(default_hotel_id(), "h9")
+        self.assertEqual(configured_hotel_ids(), ["h9"])
+
+    @patch.dict(os.environ, {"hotel_ids": "h1,h2"})
+    def test_is_known_hotel_id(self):
+        self.assertTrue(is_known_hotel_id("h2"))
+        self.assertFalse(is_known_hotel_id("h3"))
+
+
+class TestGetHotelId(unittest.TestCase):
+    def request(self, headers):
+        request = MagicMock()
+        request.headers = headers
+        return request
+
+    @patch.dict(os.environ, {"hotel_ids": "h1,h2"})
+    def test_header_names_a_configured_hotel(self):
+        self.assertEqual(get_hotel_id(self.request({"X-Hotel-Id": "h2"})), "h2")
+
+    @patch.dict(os.environ, {"hotel_ids": "h1,h2"})
+    def test_unknown_hotel_is_rejected(self):
+        with self.assertRaises(HTTPException) as ctx:
+            get_hotel_id(self.request({"X-Hotel-Id": "h3"}))
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_404_NOT_FOUND)
+
+    @patch.dict(os.environ, {"hotel_ids": "h1,h2"})
+    def test_key_separators_are_rejected(self):
+        with self.assertRaises(HTTPException) as ctx:
+            get_hotel_id(self.request({"X-Hotel-Id": "h1#Booking"}))
+
+        self.assertEqual(ctx.exception.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch("app.dependencies.jwt.verify_jwt")
+    @patch.dict(os.environ, {"hotel_ids": "h1,h2"})
+    def test_token_claim_is_checked_too(self, mock_verify):
+        mock_verify.return_value = {"hotel_id": "h9"}
+
+        with self.assertRaises(HTTPException):
+            get_hotel_id(self.request({"Authorization": "Bearer token"}))